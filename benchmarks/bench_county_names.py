@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+bench_county_names.py
+---------------------
+Microbenchmark: the legacy per-term `str.replace` passes vs the factorized,
+memoized `normalize_county_name` on the TRI facility county column.
+
+By default the column is synthetic at national 1A scale (~90k facility ×
+chemical records over ~3k distinct county spellings, mixed case, with and
+without suffixes). Pass `--tri_txt` to benchmark the real national file; its
+FACILITY COUNTY column is read with the streaming 1A reader.
+
+Usage:
+  python benchmarks/bench_county_names.py
+  python benchmarks/bench_county_names.py --tri_txt data_raw/us_series/US_1a_2022.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from scripts.common.county_names import (  # type: ignore # noqa: E402
+    COUNTY_SUFFIX_TERMS,
+    CountyNameMemo,
+    normalize_county_name,
+)
+from scripts.epa.tri_epa_pipeline import iter_tri_1a  # type: ignore # noqa: E402
+
+NATIONAL_ROWS = 90_000
+SUFFIXES = ["", "", "", " County", " COUNTY", " Parish", " Census Area", " City and Borough", " city"]
+
+
+def legacy_normalize(series: pd.Series) -> pd.Series:
+    cleaned = series.fillna("").str.lower().str.replace(r"[^a-z0-9\s]", " ", regex=True)
+    for term in COUNTY_SUFFIX_TERMS:
+        pattern = r"\b" + term.replace(" ", r"\s+") + r"\b"
+        cleaned = cleaned.str.replace(pattern, " ", regex=True)
+    return (
+        cleaned.str.replace(r"\bst\b", "saint", regex=True)
+        .str.replace(r"\band\b", "and", regex=True)
+        .str.replace(r"\s+", "", regex=True)
+        .str.strip()
+    )
+
+
+def synthetic_names(rows: int, seed: int = 42) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    prefixes = ("Harris", "St. Clair", "De Kalb", "Prince George's", "Doña Ana")
+    stems = [f"{prefix}{n}" for n in range(600) for prefix in prefixes]
+    spellings = {stem + rng.choice(SUFFIXES) for stem in stems}
+    vocab = sorted(spellings | {name.upper() for name in spellings if rng.random() < 0.3})
+    picks = rng.integers(0, len(vocab), size=rows)
+    names = pd.Series(np.asarray(vocab, dtype=object)[picks], name="cnty_nm")
+    return names.where(rng.random(rows) > 0.001)
+
+
+def tri_names(tri_txt: Path) -> pd.Series:
+    chunks = iter_tri_1a(tri_txt, keywords={"facility county": "FACILITY COUNTY"})
+    column = pd.concat(chunks, ignore_index=True).iloc[:, 0]
+    return column.astype(str).str.strip().str.upper().rename("cnty_nm")
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark county-name normalization.")
+    parser.add_argument("--tri_txt", help="National EPA 1A file to take county names from.")
+    parser.add_argument("--rows", type=int, default=NATIONAL_ROWS, help="Synthetic rows (default: %(default)s).")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repeats; best run is reported.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    names = tri_names(Path(args.tri_txt)) if args.tri_txt else synthetic_names(args.rows)
+    print(f"[BENCH] {len(names):,} rows, {names.nunique():,} distinct county names")
+
+    expected = legacy_normalize(names)
+    if not expected.equals(normalize_county_name(names, memo=CountyNameMemo())):
+        raise AssertionError("normalize_county_name differs from the legacy passes")
+
+    warm = CountyNameMemo()
+    normalize_county_name(names, memo=warm)
+    legacy_s = best_of(lambda: legacy_normalize(names), args.repeat)
+    cold_s = best_of(lambda: normalize_county_name(names, memo=CountyNameMemo()), args.repeat)
+    warm_s = best_of(lambda: normalize_county_name(names, memo=warm), args.repeat)
+    print(f"[BENCH] legacy passes     {legacy_s:7.3f}s")
+    print(f"[BENCH] factorized (cold) {cold_s:7.3f}s  speedup {legacy_s / cold_s:6.1f}x")
+    print(f"[BENCH] factorized (memo) {warm_s:7.3f}s  speedup {legacy_s / warm_s:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
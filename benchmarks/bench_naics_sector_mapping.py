@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+bench_naics_sector_mapping.py
+-----------------------------
+Microbenchmark: row-wise `Series.apply(derive_naics2)` vs the factorized
+`map_naics_sectors` on a national-scale industry_code column.
+
+The synthetic column mimics the QCEW singlefile: ~3.5M rows drawn from a few
+thousand distinct codes (sector ranges, 3–6 digit detail, "10" totals, and
+non-NAICS labels such as "1012"/"102" supersectors).
+
+Usage:
+  python benchmarks/bench_naics_sector_mapping.py
+  python benchmarks/bench_naics_sector_mapping.py --rows 500000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from qa.qcew_reconciliation import _normalize_naics2  # type: ignore # noqa: E402
+from scripts.common.naics import VALID_SECTORS, derive_naics2, map_naics_sectors  # type: ignore # noqa: E402
+
+NATIONAL_ROWS = 3_500_000
+
+
+def synthetic_codes(rows: int, seed: int = 42) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    prefixes = [f"{n:02d}" for n in range(10, 100)]
+    vocab = ["10", "101", "1011", "1012", "102", "31-33", "44-45", "48-49"]
+    for prefix in prefixes:
+        vocab.append(prefix)
+        for width in (3, 4, 5, 6):
+            suffixes = rng.integers(0, 10 ** (width - 2), size=8)
+            vocab.extend(f"{prefix}{int(s):0{width - 2}d}" for s in suffixes)
+    vocab = sorted(set(vocab))
+    picks = rng.integers(0, len(vocab), size=rows)
+    return pd.Series(np.asarray(vocab, dtype=object)[picks], name="indstr_cd")
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark NAICS sector mapping.")
+    parser.add_argument("--rows", type=int, default=NATIONAL_ROWS, help="Rows to map (default: %(default)s).")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repeats; best run is reported.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    codes = synthetic_codes(args.rows)
+    print(f"[BENCH] {len(codes):,} rows, {codes.nunique():,} distinct industry codes")
+
+    cases = [
+        ("derive_naics2 + VALID_SECTORS", derive_naics2, VALID_SECTORS),
+        ("qa _normalize_naics2", _normalize_naics2, None),
+    ]
+    for label, rule, allowed in cases:
+        def rowwise() -> pd.Series:
+            mapped = codes.apply(rule)
+            if allowed is not None:
+                mapped = mapped.where(mapped.isin(allowed))
+            return mapped
+
+        def vectorized() -> pd.Series:
+            return map_naics_sectors(codes, rule, allowed=allowed)
+
+        expected = rowwise()
+        actual = vectorized()
+        if not expected.fillna("<NA>").equals(actual.astype(object).fillna("<NA>")):
+            raise AssertionError(f"{label}: vectorized mapping differs from row-wise apply")
+
+        apply_s = best_of(rowwise, args.repeat)
+        vector_s = best_of(vectorized, args.repeat)
+        print(
+            f"[BENCH] {label:<32} apply {apply_s:7.3f}s  "
+            f"factorized {vector_s:7.3f}s  speedup {apply_s / vector_s:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,8 @@ Tolerances
 How to run
   python -m qa.abs_reconciliation --years 2022 2023 --counties 06075 06085 \
       --naics 42 62 --outdir artifacts/qa --publish_bq false
-  Optional: add --rdm_csv path/to/local_rdm.csv to bypass BigQuery.
+  Optional: add --rdm_csv path/to/local_rdm.csv to bypass BigQuery, or
+  --warehouse local to run the RDM queries with DuckDB over data_clean exports.
 
 Failure interpretation
   - pass_* flags indicate per-metric comparison success.
@@ -27,28 +28,62 @@ Failure interpretation
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
+import sys
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Optional
-from urllib.parse import urlencode
-from urllib.request import urlopen
 
+import numpy as np
 import pandas as pd
 
-from qa.utils import parse_bool, safe_divide
+from qa.utils import append_flag_notes, parse_bool, safe_divide_series, tolerance_pass
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from scripts.common.census_cache import (  # type: ignore # noqa: E402
+    CensusCacheMiss,
+    add_census_cache_arguments,
+    cached_frame,
+    configure_from_args,
+    default_cache,
+)
+from scripts.common.census_json import (  # type: ignore # noqa: E402
+    parse_census_numeric,
+    render_notes,
+)
+from scripts.common.keys import merge_on_keys  # type: ignore # noqa: E402
+from scripts.common.warehouse import (  # type: ignore # noqa: E402
+    add_warehouse_arguments,
+    configure_from_args as configure_warehouse_from_args,
+    query_warehouse,
+)
 
 
 CENSUS_BASE_URL = "https://api.census.gov/data/{year}/abscs"
 CENSUS_GET = "NAICS2022,NAME,FIRMPDEMP,EMP,PAYANN,RCPPDEMP"
-SUPPRESSED_VALUES = {"", "D", "N", "S", "NA", "N/A", "(D)", "(N)", "(S)"}
+
+MISSING_FROM_BOTH = 1
+MISSING_FROM_CENSUS = 2
+MISSING_FROM_RDM = 4
+MISSING_LABELS = {
+    MISSING_FROM_BOTH: "missing_from_both",
+    MISSING_FROM_CENSUS: "missing_from_census",
+    MISSING_FROM_RDM: "missing_from_rdm",
+}
 
 DEFAULT_COUNTIES = ["06075", "06085"]
 DEFAULT_NAICS = ["42", "62"]
 DEFAULT_YEARS = [2022, 2023]
 DEFAULT_OUTDIR = "artifacts/qa"
+DEFAULT_CENSUS_CONCURRENCY = 8
+# A year needing this many state-level pulls is fetched as one national pull.
+NATIONAL_PULL_MIN_STATES = 5
 
 ABS_TABLE = "rdm-datalab-portfolio.portfolio_data.econ_bnchmrk_abs_qcew"
 
@@ -119,174 +154,304 @@ class AbsConfig:
     rdm_csv: Optional[Path]
 
 
-def _parse_numeric(value: Any) -> tuple[Optional[float], Optional[str]]:
-    if value is None:
-        return None, "source_missing"
-    text = str(value).strip()
-    if text in SUPPRESSED_VALUES:
-        return None, "source_suppressed"
-    try:
-        return float(text), None
-    except ValueError:
-        return None, "source_non_numeric"
-
-
-def parse_census_payload(payload: str) -> dict[str, Any]:
+def _fetch_census_slice(year: int, state_fips: str, county_fips: str, naics2: str) -> dict[str, Any]:
+    params = {
+        "get": CENSUS_GET,
+        "for": f"county:{county_fips}",
+        "in": f"state:{state_fips}",
+        "NAICS2022": naics2,
+    }
     try:
-        data = json.loads(payload)
+        frame = cached_frame(CENSUS_BASE_URL.format(year=year), params)
+    except CensusCacheMiss:
+        # --offline and no snapshot: no request was made.
+        return {"notes": "census_cache_miss"}
     except json.JSONDecodeError as exc:
         return {"notes": f"census_json_error:{exc}"}
+    except Exception as exc:
+        return {"notes": f"census_http_error:{exc}"}
 
-    if not data or len(data) < 2:
+    if frame.empty:
         return {"notes": "census_empty_response"}
+    return frame.iloc[0].to_dict()
 
-    header = data[0]
-    row = data[1]
-    return dict(zip(header, row))
 
+@dataclass(frozen=True)
+class CensusPlan:
+    """How a set of (year, county, NAICS2) slices will be fetched.
 
-def _fetch_census_slice(year: int, state_fips: str, county_fips: str, naics2: str) -> dict[str, Any]:
+    `partitions` are bulk `for=county:*` responses keyed by (year, state);
+    state None means the national response. `slices` are fetched one by one.
+    """
+
+    partitions: tuple[tuple[int, Optional[str]], ...]
+    cached: frozenset
+    slices: tuple[tuple[int, str, str, str], ...]
+
+    @property
+    def request_count(self) -> int:
+        return len([p for p in self.partitions if p not in self.cached]) + len(self.slices)
+
+
+def _partition_params(state: Optional[str]) -> dict[str, str]:
+    params = {"get": CENSUS_GET, "for": "county:*"}
+    if state is not None:
+        params["in"] = f"state:{state}"
+    return params
+
+
+def plan_census_requests(
+    slices: list[tuple[int, str, str, str]],
+    national_threshold: int = NATIONAL_PULL_MIN_STATES,
+) -> CensusPlan:
+    """Group (year, state, county, NAICS2) slices into the fewest Census calls.
+
+    Per year: a cached national response covers everything; otherwise each
+    state is served from a cached state response when one exists. If
+    `national_threshold` or more states remain, one national pull covers them;
+    otherwise each remaining state is bulk-fetched when it needs more than one
+    slice, and a lone slice is fetched directly (same cost, smaller payload).
+    """
+    cache = default_cache()
+    partitions: list[tuple[int, Optional[str]]] = []
+    cached: set[tuple[int, Optional[str]]] = set()
+    direct: list[tuple[int, str, str, str]] = []
+
+    by_year: dict[int, dict[str, list[tuple[int, str, str, str]]]] = {}
+    for item in dict.fromkeys(slices):
+        by_year.setdefault(item[0], {}).setdefault(item[1], []).append(item)
+
+    for year, by_state in by_year.items():
+        url = CENSUS_BASE_URL.format(year=year)
+        if cache.contains(url, _partition_params(None)):
+            partitions.append((year, None))
+            cached.add((year, None))
+            continue
+        gaps = {}
+        for state, items in by_state.items():
+            if cache.contains(url, _partition_params(state)):
+                partitions.append((year, state))
+                cached.add((year, state))
+            else:
+                gaps[state] = items
+        if len(gaps) >= national_threshold:
+            partitions.append((year, None))
+            continue
+        for state, items in gaps.items():
+            if len(items) > 1:
+                partitions.append((year, state))
+            else:
+                direct.extend(items)
+
+    return CensusPlan(tuple(partitions), frozenset(cached), tuple(direct))
+
+
+def _partition_records(year: int, state: Optional[str]) -> dict[tuple[str, str, str], dict[str, Any]]:
+    """Bulk response → {(state, county, NAICS2): first record}, like a slice query."""
+    frame = cached_frame(CENSUS_BASE_URL.format(year=year), _partition_params(state))
+    records: dict[tuple[str, str, str], dict[str, Any]] = {}
+    for record in frame.to_dict("records"):
+        key = (
+            str(record.get("state", "")).zfill(2),
+            str(record.get("county", "")).zfill(3),
+            str(record.get("NAICS2022", "")).strip(),
+        )
+        records.setdefault(key, record)
+    return records
+
+
+def fetch_census_records(
+    slices: list[tuple[int, str, str, str]],
+) -> dict[tuple[int, str, str, str], dict[str, Any]]:
+    """Census record for each slice, fetched according to `plan_census_requests`."""
+    plan = plan_census_requests(slices)
+    print(
+        f"[ABS] Census plan: {len(set(slices))} slices -> {plan.request_count} request(s) "
+        f"({len(plan.cached)} cached partition(s))"
+    )
+    by_year: dict[int, dict[tuple[str, str, str], dict[str, Any]]] = {}
+    failed: set[tuple[int, Optional[str]]] = set()
+    for year, state in plan.partitions:
+        try:
+            by_year.setdefault(year, {}).update(_partition_records(year, state))
+        except Exception:
+            failed.add((year, state))
+
+    records: dict[tuple[int, str, str, str], dict[str, Any]] = {}
+    direct = set(plan.slices)
+    for item in dict.fromkeys(slices):
+        year, state_fips, county_fips, naics2 = item
+        covered = (year, None) in plan.partitions or (year, state_fips) in plan.partitions
+        partition_failed = (year, None) in failed or (year, state_fips) in failed
+        if item in direct or not covered or partition_failed:
+            # Direct slices, plus slices whose bulk pull failed, go one by one
+            # so errors are reported per slice as before.
+            records[item] = _fetch_census_slice(year, state_fips, county_fips, naics2)
+        else:
+            record = by_year.get(year, {}).get((state_fips, county_fips, naics2))
+            records[item] = record if record is not None else {"notes": "census_empty_response"}
+    return records
+
+
+def fetch_census_data(years: list[int], counties: list[str], naics: list[str]) -> pd.DataFrame:
+    slices = [
+        (year, str(county).zfill(5)[:2], str(county).zfill(5)[2:], str(naics2).zfill(2))
+        for year in years
+        for county in counties
+        for naics2 in naics
+    ]
+    records = fetch_census_records(slices)
+    frame = pd.DataFrame([records[item] for item in slices], index=pd.RangeIndex(len(slices)))
+    n = len(slices)
+    masks = np.zeros(n, dtype=np.uint8)
+    values: dict[str, np.ndarray] = {}
+    for source in ("FIRMPDEMP", "EMP", "PAYANN", "RCPPDEMP"):
+        values[source], note = parse_census_numeric(frame.get(source), n)
+        masks |= note
+    notes = render_notes(masks)
+    if "notes" in frame:
+        # Fetch errors ("census_http_error:…") join the parse notes, sorted.
+        for i, error in enumerate(frame["notes"].tolist()):
+            if isinstance(error, str):
+                notes[i] = ";".join(sorted({error, *filter(None, notes[i].split(";"))}))
+
+    return pd.DataFrame(
+        {
+            "year_num": [item[0] for item in slices],
+            "state_cnty_fips_cd": [item[1] + item[2] for item in slices],
+            "state_fips": [item[1] for item in slices],
+            "county_fips": [item[2] for item in slices],
+            "naics2_sector_cd": [item[3] for item in slices],
+            "source_census_firmpdemp": values["FIRMPDEMP"],
+            "source_census_emp": values["EMP"],
+            "source_census_payann_usd": values["PAYANN"] * 1000,
+            "source_census_rcppdemp_usd": values["RCPPDEMP"] * 1000,
+            "notes": notes,
+        }
+    )
+
+
+STATE_ROW_COLUMNS = [
+    "year_num",
+    "state_cnty_fips_cd",
+    "naics2_sector_cd",
+    "source_census_firmpdemp",
+    "source_census_emp",
+    "source_census_payann_usd",
+    "source_census_rcppdemp_usd",
+    "notes",
+]
+
+
+def _state_error_row(year: int, state: str, note: str) -> pd.DataFrame:
+    row = {
+        "year_num": year,
+        "state_cnty_fips_cd": f"{state}000",
+        "naics2_sector_cd": "",
+        "source_census_firmpdemp": np.nan,
+        "source_census_emp": np.nan,
+        "source_census_payann_usd": np.nan,
+        "source_census_rcppdemp_usd": np.nan,
+        "notes": note,
+    }
+    return pd.DataFrame([row], columns=STATE_ROW_COLUMNS)
+
+
+def _fetch_state_frame(year: int, state: str) -> pd.DataFrame:
     params = {
         "get": CENSUS_GET,
-        "for": f"county:{county_fips}",
-        "in": f"state:{state_fips}",
-        "NAICS2022": naics2,
+        "for": "county:*",
+        "in": f"state:{state}",
     }
-    url = f"{CENSUS_BASE_URL.format(year=year)}?{urlencode(params)}"
+    return cached_frame(CENSUS_BASE_URL.format(year=year), params)
+
+
+def _state_rows(year: int, state: str, frame: pd.DataFrame) -> pd.DataFrame:
+    """Turn one state's county × NAICS2 response into reconciliation rows.
+
+    Numeric parsing and suppression notes are computed column-wise; note
+    strings are rendered once per distinct note mask.
+    """
+    n = len(frame)
+    masks = np.zeros(n, dtype=np.uint8)
+    values: dict[str, np.ndarray] = {}
+    for source in ("FIRMPDEMP", "EMP", "PAYANN", "RCPPDEMP"):
+        values[source], note = parse_census_numeric(frame.get(source), n)
+        masks |= note
+
+    def _text(column: str) -> pd.Series:
+        if column not in frame:
+            return pd.Series([""] * n, index=frame.index, dtype=object)
+        return frame[column].map(str)
+
+    return pd.DataFrame(
+        {
+            "year_num": np.full(n, year, dtype=np.int64),
+            "state_cnty_fips_cd": (_text("state").str.zfill(2) + _text("county").str.zfill(3)).to_numpy(),
+            "naics2_sector_cd": _text("NAICS2022").str.strip().to_numpy(),
+            "source_census_firmpdemp": values["FIRMPDEMP"],
+            "source_census_emp": values["EMP"],
+            "source_census_payann_usd": values["PAYANN"] * 1000,
+            "source_census_rcppdemp_usd": values["RCPPDEMP"] * 1000,
+            "notes": render_notes(masks),
+        },
+        columns=STATE_ROW_COLUMNS,
+    )
+
+
+def _fetch_state_rows(year: int, state: str) -> pd.DataFrame:
     try:
-        with urlopen(url, timeout=30) as resp:
-            payload = resp.read().decode("utf-8")
+        frame = _fetch_state_frame(year, state)
+    except CensusCacheMiss:
+        return _state_error_row(year, state, "census_cache_miss")
+    except json.JSONDecodeError as exc:
+        return _state_error_row(year, state, f"census_json_error:{exc}")
     except Exception as exc:
-        return {"notes": f"census_http_error:{exc}"}
+        return _state_error_row(year, state, f"census_http_error:{exc}")
+    return _state_rows(year, state, frame)
 
-    return parse_census_payload(payload)
 
+async def _fetch_states_async(
+    jobs: list[tuple[int, str]], concurrency: int
+) -> dict[tuple[int, str], pd.DataFrame]:
+    """Fetch every (year, state) with at most `concurrency` requests in flight.
 
-def fetch_census_data(years: list[int], counties: list[str], naics: list[str]) -> pd.DataFrame:
-    rows: list[dict[str, Any]] = []
-    for year in years:
-        for county in counties:
-            county = str(county).zfill(5)
-            state_fips = county[:2]
-            county_fips = county[2:]
-            for naics2 in naics:
-                record = _fetch_census_slice(year, state_fips, county_fips, str(naics2).zfill(2))
-                notes: list[str] = []
-                if "notes" in record:
-                    notes.append(record["notes"])
-                firm, note = _parse_numeric(record.get("FIRMPDEMP"))
-                if note:
-                    notes.append(note)
-                emp, note = _parse_numeric(record.get("EMP"))
-                if note:
-                    notes.append(note)
-                payann, note = _parse_numeric(record.get("PAYANN"))
-                if note:
-                    notes.append(note)
-                rcpt, note = _parse_numeric(record.get("RCPPDEMP"))
-                if note:
-                    notes.append(note)
-
-                rows.append(
-                    {
-                        "year_num": year,
-                        "state_cnty_fips_cd": county,
-                        "state_fips": state_fips,
-                        "county_fips": county_fips,
-                        "naics2_sector_cd": str(naics2).zfill(2),
-                        "source_census_firmpdemp": firm,
-                        "source_census_emp": emp,
-                        "source_census_payann_usd": payann * 1000 if payann is not None else None,
-                        "source_census_rcppdemp_usd": rcpt * 1000 if rcpt is not None else None,
-                        "notes": ";".join(sorted(set(notes))) if notes else "",
-                    }
-                )
-    return pd.DataFrame(rows)
-
-
-def fetch_census_data_states(years: list[int], states: Optional[list[str]] = None) -> pd.DataFrame:
-    """Bulk-pull ABS by state to cover all counties × NAICS2 for each year."""
-    rows: list[dict[str, Any]] = []
+    Requests run on worker threads through the shared pooled client (and the
+    snapshot cache); each response is turned into rows as soon as it arrives.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(job: tuple[int, str]) -> tuple[tuple[int, str], pd.DataFrame]:
+        async with semaphore:
+            return job, await asyncio.to_thread(_fetch_state_rows, *job)
+
+    results: dict[tuple[int, str], pd.DataFrame] = {}
+    for finished in asyncio.as_completed([fetch(job) for job in jobs]):
+        job, frame = await finished
+        results[job] = frame
+    return results
+
+
+def fetch_census_data_states(
+    years: list[int],
+    states: Optional[list[str]] = None,
+    concurrency: int = 1,
+) -> pd.DataFrame:
+    """Bulk-pull ABS by state to cover all counties × NAICS2 for each year.
+
+    With `concurrency` > 1 the state requests are fanned out concurrently; rows
+    are still returned in (year, state) order, identical to a sequential run.
+    """
     target_states = states or STATE_FIPS
-    for year in years:
-        for state in target_states:
-            params = {
-                "get": CENSUS_GET,
-                "for": "county:*",
-                "in": f"state:{state}",
-            }
-            url = f"{CENSUS_BASE_URL.format(year=year)}?{urlencode(params)}"
-            try:
-                with urlopen(url, timeout=60) as resp:
-                    payload = resp.read().decode("utf-8")
-            except Exception as exc:
-                rows.append(
-                    {
-                        "year_num": year,
-                        "state_cnty_fips_cd": f"{state}000",
-                        "naics2_sector_cd": "",
-                        "source_census_firmpdemp": None,
-                        "source_census_emp": None,
-                        "source_census_payann_usd": None,
-                        "source_census_rcppdemp_usd": None,
-                        "notes": f"census_http_error:{exc}",
-                    }
-                )
-                continue
-
-            try:
-                data = json.loads(payload)
-            except json.JSONDecodeError as exc:
-                rows.append(
-                    {
-                        "year_num": year,
-                        "state_cnty_fips_cd": f"{state}000",
-                        "naics2_sector_cd": "",
-                        "source_census_firmpdemp": None,
-                        "source_census_emp": None,
-                        "source_census_payann_usd": None,
-                        "source_census_rcppdemp_usd": None,
-                        "notes": f"census_json_error:{exc}",
-                    }
-                )
-                continue
-
-            if not data or len(data) < 2:
-                continue
-
-            header = data[0]
-            for row in data[1:]:
-                record = dict(zip(header, row))
-                notes: list[str] = []
-                firm, note = _parse_numeric(record.get("FIRMPDEMP"))
-                if note:
-                    notes.append(note)
-                emp, note = _parse_numeric(record.get("EMP"))
-                if note:
-                    notes.append(note)
-                payann, note = _parse_numeric(record.get("PAYANN"))
-                if note:
-                    notes.append(note)
-                rcpt, note = _parse_numeric(record.get("RCPPDEMP"))
-                if note:
-                    notes.append(note)
-
-                state_fips = str(record.get("state", "")).zfill(2)
-                county_fips = str(record.get("county", "")).zfill(3)
-                naics2 = str(record.get("NAICS2022", "")).strip()
-                rows.append(
-                    {
-                        "year_num": year,
-                        "state_cnty_fips_cd": f"{state_fips}{county_fips}",
-                        "naics2_sector_cd": naics2,
-                        "source_census_firmpdemp": firm,
-                        "source_census_emp": emp,
-                        "source_census_payann_usd": payann * 1000 if payann is not None else None,
-                        "source_census_rcppdemp_usd": rcpt * 1000 if rcpt is not None else None,
-                        "notes": ";".join(sorted(set(notes))) if notes else "",
-                    }
-                )
-    return pd.DataFrame(rows)
+    jobs = [(year, state) for year in years for state in target_states]
+    if concurrency > 1:
+        by_job = asyncio.run(_fetch_states_async(jobs, concurrency))
+    else:
+        by_job = {job: _fetch_state_rows(*job) for job in jobs}
+    frames = [by_job[job] for job in jobs if not by_job[job].empty]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
 
 
 def fetch_rdm_abs(
@@ -333,12 +498,6 @@ def fetch_rdm_abs(
                 "rdm_abs_rcpt_usd_amt",
             ]
         ]
-    try:
-        from google.cloud import bigquery
-    except ImportError as exc:
-        raise RuntimeError("google-cloud-bigquery is required to fetch RDM data") from exc
-
-    client = bigquery.Client()
     query = f"""
         SELECT
             year_num,
@@ -353,26 +512,20 @@ def fetch_rdm_abs(
           AND state_cnty_fips_cd IN UNNEST(@counties)
           AND naics2_sector_cd IN UNNEST(@naics)
     """
-    job_config = bigquery.QueryJobConfig(
-        query_parameters=[
-            bigquery.ArrayQueryParameter("years", "INT64", years),
-            bigquery.ArrayQueryParameter("counties", "STRING", [str(c).zfill(5) for c in counties]),
-            bigquery.ArrayQueryParameter("naics", "STRING", [str(n).zfill(2) for n in naics]),
-        ]
+    df = query_warehouse(
+        query,
+        {
+            "years": [int(y) for y in years],
+            "counties": [str(c).zfill(5) for c in counties],
+            "naics": [str(n).zfill(2) for n in naics],
+        },
     )
-    df = client.query(query, job_config=job_config).to_dataframe()
     df["state_cnty_fips_cd"] = df["state_cnty_fips_cd"].astype(str).str.zfill(5)
     df["naics2_sector_cd"] = df["naics2_sector_cd"].astype(str).str.zfill(2)
     return df
 
 
 def fetch_rdm_abs_all(years: list[int]) -> pd.DataFrame:
-    try:
-        from google.cloud import bigquery
-    except ImportError as exc:
-        raise RuntimeError("google-cloud-bigquery is required to fetch RDM data") from exc
-
-    client = bigquery.Client()
     query = """
         SELECT
           year_num,
@@ -385,24 +538,14 @@ def fetch_rdm_abs_all(years: list[int]) -> pd.DataFrame:
         FROM `rdm-datalab-portfolio.portfolio_data.econ_bnchmrk_abs_qcew`
         WHERE year_num IN UNNEST(@years)
     """
-    job_config = bigquery.QueryJobConfig(
-        query_parameters=[
-            bigquery.ArrayQueryParameter("years", "INT64", [int(y) for y in years]),
-        ]
-    )
-    df = client.query(query, job_config=job_config).to_dataframe()
+    df = query_warehouse(query, {"years": [int(y) for y in years]})
     df["state_cnty_fips_cd"] = df["state_cnty_fips_cd"].astype(str).str.zfill(5)
     df["naics2_sector_cd"] = df["naics2_sector_cd"].astype(str).str.strip()
     return df
 
 
 def reconcile_abs(census_df: pd.DataFrame, rdm_df: pd.DataFrame) -> pd.DataFrame:
-    merged = census_df.merge(
-        rdm_df,
-        how="outer",
-        on=["year_num", "state_cnty_fips_cd", "naics2_sector_cd"],
-        suffixes=("", "_rdm"),
-    )
+    merged = merge_on_keys(census_df, rdm_df, how="outer", suffixes=("", "_rdm"))
     merged["state_cnty_fips_cd"] = merged["state_cnty_fips_cd"].astype(str).str.zfill(5)
     merged["state_fips"] = merged["state_cnty_fips_cd"].str[:2]
     merged["county_fips"] = merged["state_cnty_fips_cd"].str[2:]
@@ -427,63 +570,36 @@ def reconcile_abs(census_df: pd.DataFrame, rdm_df: pd.DataFrame) -> pd.DataFrame
     merged["delta_payroll_usd"] = _delta("rdm_abs_payroll_usd_amt", "source_census_payann_usd")
     merged["delta_receipts_usd"] = _delta("rdm_abs_rcpt_usd_amt", "source_census_rcppdemp_usd")
 
-    merged["delta_firms_pct"] = merged.apply(
-        lambda row: safe_divide(row["delta_firms"], row["source_census_firmpdemp"]), axis=1
-    )
-    merged["delta_emp_pct"] = merged.apply(
-        lambda row: safe_divide(row["delta_emp"], row["source_census_emp"]), axis=1
-    )
-    merged["delta_payroll_pct"] = merged.apply(
-        lambda row: safe_divide(row["delta_payroll_usd"], row["source_census_payann_usd"]), axis=1
+    merged["delta_firms_pct"] = safe_divide_series(merged["delta_firms"], merged["source_census_firmpdemp"])
+    merged["delta_emp_pct"] = safe_divide_series(merged["delta_emp"], merged["source_census_emp"])
+    merged["delta_payroll_pct"] = safe_divide_series(
+        merged["delta_payroll_usd"], merged["source_census_payann_usd"]
     )
-    merged["delta_receipts_pct"] = merged.apply(
-        lambda row: safe_divide(row["delta_receipts_usd"], row["source_census_rcppdemp_usd"]), axis=1
+    merged["delta_receipts_pct"] = safe_divide_series(
+        merged["delta_receipts_usd"], merged["source_census_rcppdemp_usd"]
     )
 
-    def _pass_exact(delta: Any, left: Any, right: Any) -> bool:
-        if pd.isna(left) or pd.isna(right):
-            return False
-        return delta == 0
-
-    def _pass_tol(delta: Any, left: Any, right: Any, tol: float) -> bool:
-        if pd.isna(left) or pd.isna(right):
-            return False
-        return abs(delta) <= tol
-
-    merged["pass_firms"] = merged.apply(
-        lambda row: _pass_exact(row["delta_firms"], row["rdm_abs_firms"], row["source_census_firmpdemp"]),
-        axis=1,
+    merged["pass_firms"] = tolerance_pass(
+        merged["delta_firms"], merged["rdm_abs_firms"], merged["source_census_firmpdemp"]
     )
-    merged["pass_emp"] = merged.apply(
-        lambda row: _pass_exact(row["delta_emp"], row["rdm_abs_emp"], row["source_census_emp"]),
-        axis=1,
+    merged["pass_emp"] = tolerance_pass(merged["delta_emp"], merged["rdm_abs_emp"], merged["source_census_emp"])
+    merged["pass_payroll"] = tolerance_pass(
+        merged["delta_payroll_usd"], merged["rdm_abs_payroll_usd_amt"], merged["source_census_payann_usd"], 1000
     )
-    merged["pass_payroll"] = merged.apply(
-        lambda row: _pass_tol(row["delta_payroll_usd"], row["rdm_abs_payroll_usd_amt"], row["source_census_payann_usd"], 1000),
-        axis=1,
-    )
-    merged["pass_receipts"] = merged.apply(
-        lambda row: _pass_tol(row["delta_receipts_usd"], row["rdm_abs_rcpt_usd_amt"], row["source_census_rcppdemp_usd"], 1000),
-        axis=1,
+    merged["pass_receipts"] = tolerance_pass(
+        merged["delta_receipts_usd"], merged["rdm_abs_rcpt_usd_amt"], merged["source_census_rcppdemp_usd"], 1000
     )
     merged["pass_all"] = merged["pass_firms"] & merged["pass_emp"] & merged["pass_payroll"] & merged["pass_receipts"]
 
-    notes = []
-    for _, row in merged.iterrows():
-        row_notes = row.get("notes", "")
-        if pd.isna(row_notes):
-            row_notes = ""
-        if not isinstance(row_notes, str):
-            row_notes = str(row_notes)
-        flags = [row_notes] if row_notes else []
-        if pd.isna(row["source_census_firmpdemp"]) and pd.isna(row["rdm_abs_firms"]):
-            flags.append("missing_from_both")
-        elif pd.isna(row["source_census_firmpdemp"]):
-            flags.append("missing_from_census")
-        elif pd.isna(row["rdm_abs_firms"]):
-            flags.append("missing_from_rdm")
-        notes.append(";".join([flag for flag in flags if flag]))
-    merged["notes"] = notes
+    census_missing = merged["source_census_firmpdemp"].isna().to_numpy()
+    rdm_missing = merged["rdm_abs_firms"].isna().to_numpy()
+    masks = np.select(
+        [census_missing & rdm_missing, census_missing, rdm_missing],
+        [MISSING_FROM_BOTH, MISSING_FROM_CENSUS, MISSING_FROM_RDM],
+        0,
+    )
+    notes = merged["notes"] if "notes" in merged.columns else pd.Series("", index=merged.index)
+    merged["notes"] = append_flag_notes(notes, masks, MISSING_LABELS)
 
     keep = [
         "year_num",
@@ -576,6 +692,8 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     parser.add_argument("--publish_bq", default="false")
     parser.add_argument("--bq_table", default="rdm-datalab-portfolio.portfolio_data.qa_abs_reconciliation")
     parser.add_argument("--rdm_csv", default=None)
+    add_census_cache_arguments(parser)
+    add_warehouse_arguments(parser)
     return parser.parse_args(argv)
 
 
@@ -585,14 +703,16 @@ def run(config: AbsConfig) -> pd.DataFrame:
     return reconcile_abs(census_df, rdm_df)
 
 
-def run_full_surface(years: list[int]) -> pd.DataFrame:
-    census_df = fetch_census_data_states(years)
+def run_full_surface(years: list[int], concurrency: int = DEFAULT_CENSUS_CONCURRENCY) -> pd.DataFrame:
+    census_df = fetch_census_data_states(years, concurrency=concurrency)
     rdm_df = fetch_rdm_abs_all(years)
     return reconcile_abs(census_df, rdm_df)
 
 
 def main(argv: Optional[list[str]] = None) -> None:
     args = parse_args(argv)
+    configure_from_args(args)
+    configure_warehouse_from_args(args)
     config = AbsConfig(
         years=args.years,
         counties=[str(c).zfill(5) for c in args.counties],
@@ -3,9 +3,15 @@ import argparse
 import csv
 import glob
 import os
+import sys
 from datetime import datetime
+from pathlib import Path
 
-import pandas as pd
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from scripts.common.table_io import read_columns  # type: ignore # noqa: E402
 
 REQUIRED_FIELDS = [
     "file_name",
@@ -716,10 +722,9 @@ def build_rows(file_paths, file_type):
     file_order = []
 
     for path in file_paths:
-        df = pd.read_csv(path, nrows=0)
         file_name = os.path.basename(path)
         file_order.append(file_name)
-        for col in df.columns:
+        for col in read_columns(path):
             attrs = infer_row(col, file_type, overrides)
             row = {
                 "file_name": file_name,
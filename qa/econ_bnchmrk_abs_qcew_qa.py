@@ -9,12 +9,21 @@ and executes structural, numeric, and cross-source tests.
 from __future__ import annotations
 
 import math
+import sys
 from pathlib import Path
 from typing import List, Tuple
 
 import numpy as np
 import pandas as pd
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from scripts.common.county_fips_index import load_county_fips_index  # type: ignore # noqa: E402
+from scripts.common.keys import decode_fips, merge_on_keys  # type: ignore # noqa: E402
+from scripts.common.table_io import read_table  # type: ignore # noqa: E402
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
@@ -67,8 +76,10 @@ def log(msg: str) -> None:
 def load_dataset() -> pd.DataFrame:
     """Load ABS + QCEW CSVs and merge them with FULL OUTER logic."""
     log("[LOAD] Reading ABS + QCEW CSVs …")
-    abs_df = pd.read_csv(ABS_PATH, dtype=str)
-    qcew_df = pd.read_csv(QCEW_PATH, dtype=str)
+    # Parse straight into the DDL types (CSV or Parquet); INT64 columns come
+    # back as float64 so the NaN-based checks below keep NumPy semantics.
+    abs_df = read_table(ABS_PATH, "econ_bnchmrk_abs", nullable_ints=False)
+    qcew_df = read_table(QCEW_PATH, "econ_bnchmrk_qcew", nullable_ints=False)
 
     # Apply same county-level filters used in the ETL
     abs_df["state_cnty_fips_cd"] = abs_df["state_cnty_fips_cd"].astype(str).str.replace(r"\D", "", regex=True).str.zfill(5)
@@ -89,8 +100,7 @@ def load_dataset() -> pd.DataFrame:
     valid_fips = set(abs_df["state_cnty_fips_cd"])
     qcew_df = qcew_df[qcew_df["state_cnty_fips_cd"].isin(valid_fips)]
 
-    merge_cols = ["year_num", "state_cnty_fips_cd", "naics2_sector_cd"]
-    merged = abs_df.merge(qcew_df, how="outer", on=merge_cols, suffixes=("", "_qcew"))
+    merged = merge_on_keys(abs_df, qcew_df, how="outer", suffixes=("", "_qcew"))
 
     df = pd.DataFrame({
         "year_num": merged["year_num"],
@@ -122,7 +132,9 @@ def load_dataset() -> pd.DataFrame:
         "year_num",
     ]
     for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
+        # Already typed on read; only columns absent from the inputs need coercion.
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors="coerce")
 
     # Build canonical state_cnty_fips_cd (zero-filled 5 digits)
     df["state_cnty_fips_cd"] = (
@@ -182,11 +194,9 @@ def load_dataset() -> pd.DataFrame:
 
 
 def load_valid_fips() -> pd.DataFrame:
-    """Load Simplemaps county list to validate state/county combinations."""
-    ref = pd.read_csv(SIMPLEMAPS_PATH, dtype=str)
-    ref["state_id"] = ref["state_id"].astype(str)
-    ref["county_fips"] = ref["county_fips"].astype(str).str.zfill(5)
-    return ref
+    """Simplemaps county FIPS (from the compiled county index) to validate state/county combinations."""
+    index = load_county_fips_index(SIMPLEMAPS_PATH)
+    return pd.DataFrame({"county_fips": decode_fips(index.valid_fips)})
 
 
 def validate_fips(df: pd.DataFrame, ref: pd.DataFrame) -> Tuple[int, pd.DataFrame]:
@@ -1,13 +1,32 @@
 #!/usr/bin/env python3
+"""
+Offline sanity checks for the fact export and its NAICS / county references.
+
+The fact export is streamed in row chunks (`--chunksize`) and every column is
+parsed once per chunk into a `FactProfile`: counts, exact distinct sets (bounded
+by the county and sector domains), per-year coverage and null rates, 64-bit
+key hashes for duplicate detection, scientific-notation flags and the top-10
+outlier candidates per year. Profiles merge chunk by chunk, so memory stays
+bounded for multi-year national exports while the JSON/MD report is the one
+a full in-memory read produced. The references are small and read whole.
+"""
 import argparse
 import json
 import os
 import re
 import sys
 from datetime import datetime
+from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from scripts.common.table_io import DEFAULT_CHUNK_ROWS, iter_table, read_table  # type: ignore # noqa: E402
+
 # Explicit column mapping for known exports.
 # Update these lists if column names drift in the source exports.
 COLUMN_MAP = {
@@ -50,6 +69,23 @@ EXPECTED_YEARS = {2022, 2023}
 EXPECTED_COUNTIES = 3283
 EXPECTED_NAICS2 = 20
 
+KEY_FIELDS = ["year_num", "state_cnty_fips_cd", "naics2_sector_cd"]
+FACT_NUMERIC_COLS = [
+    "abs_firms",
+    "abs_emp",
+    "abs_payroll_usd_amt",
+    "abs_rcpt_usd_amt",
+    "qcew_emp",
+    "qcew_wages_usd",
+    "qcew_avg_weekly_wage_usd",
+]
+ABS_COLS = ["abs_firms", "abs_emp", "abs_payroll_usd_amt", "abs_rcpt_usd_amt"]
+ERROR_METRICS = ["abs_firms", "abs_emp", "qcew_emp"]
+WARN_METRICS = ["abs_payroll_usd_amt", "abs_rcpt_usd_amt", "qcew_wages_usd", "qcew_avg_weekly_wage_usd"]
+NULL_RATE_METRICS = {"abs_firms": "abs_firms_null_pct", "qcew_emp": "qcew_emp_null_pct"}
+OUTLIER_METRICS = ["abs_rcpt_usd_amt", "abs_payroll_usd_amt", "qcew_wages_usd"]
+OUTLIER_TOP_N = 10
+
 
 def add_check(results, name, severity, passed, detail):
     results.append(
@@ -74,61 +110,341 @@ def resolve_columns(df, mapping):
     return resolved, missing
 
 
-def read_csv_checked(path, label, results):
+def locate_export(path, label, results):
+    parquet_path = os.path.splitext(path)[0] + ".parquet"
+    if not os.path.exists(path) and os.path.exists(parquet_path):
+        path = parquet_path
+    is_parquet = path.endswith(".parquet") or os.path.isdir(path)
     if not os.path.exists(path):
         add_check(results, f"{label}: file exists", "ERROR", False, f"Missing file: {path}")
-        return None
+        return None, is_parquet
     if os.path.getsize(path) == 0:
         add_check(results, f"{label}: file non-empty", "ERROR", False, f"Empty file: {path}")
-        return None
+        return None, is_parquet
+    return path, is_parquet
 
-    try:
-        df = pd.read_csv(path, dtype=str, low_memory=False, on_bad_lines="error")
-    except Exception as exc:
-        add_check(results, f"{label}: CSV parses cleanly", "ERROR", False, f"Parse error: {exc}")
-        return None
 
-    add_check(results, f"{label}: CSV parses cleanly", "ERROR", True, "Parsed without malformed rows.")
+def as_export_text(typed):
+    # Render typed Parquet columns as the text a CSV export would hold,
+    # so the value checks behave the same for both formats.
+    return typed.astype("string").astype(object).mask(typed.isna())
 
-    if df.columns.empty or len(df.columns) == 1:
+
+def check_headers(columns, label, results):
+    if columns.empty or len(columns) == 1:
         add_check(
             results,
             f"{label}: delimiter sanity",
             "ERROR",
             False,
-            f"Parsed {len(df.columns)} column(s); possible delimiter issue.",
+            f"Parsed {len(columns)} column(s); possible delimiter issue.",
         )
     else:
-        add_check(results, f"{label}: delimiter sanity", "ERROR", True, f"Parsed {len(df.columns)} columns.")
+        add_check(results, f"{label}: delimiter sanity", "ERROR", True, f"Parsed {len(columns)} columns.")
 
-    if any(col is None or str(col).strip() == "" for col in df.columns):
+    if any(col is None or str(col).strip() == "" for col in columns):
         add_check(results, f"{label}: non-empty headers", "ERROR", False, "Found empty column name(s).")
     else:
         add_check(results, f"{label}: non-empty headers", "ERROR", True, "All column names present.")
 
-    if len(set(df.columns)) != len(df.columns):
+    if len(set(columns)) != len(columns):
         add_check(results, f"{label}: unique headers", "ERROR", False, "Duplicate column names found.")
     else:
         add_check(results, f"{label}: unique headers", "ERROR", True, "Column names are unique.")
 
+
+def read_csv_checked(path, label, results):
+    path, is_parquet = locate_export(path, label, results)
+    if path is None:
+        return None
+
+    kind = "Parquet" if is_parquet else "CSV"
+    try:
+        if is_parquet:
+            df = as_export_text(read_table(path))
+        else:
+            df = pd.read_csv(path, dtype=str, low_memory=False, on_bad_lines="error")
+    except Exception as exc:
+        add_check(results, f"{label}: {kind} parses cleanly", "ERROR", False, f"Parse error: {exc}")
+        return None
+
+    add_check(results, f"{label}: {kind} parses cleanly", "ERROR", True, "Parsed without malformed rows.")
+    check_headers(df.columns, label, results)
     return df
 
 
-def numeric_stats(series):
-    original = series.copy()
+def count_matches(series, pattern):
+    # Regex counts run in Arrow's vectorized kernels when pyarrow is present.
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        return int(series.astype(str).str.contains(pattern, regex=True, na=False).sum())
+    strings = pa.array(series.to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+    return int(pc.sum(pc.match_substring_regex(strings, pattern)).as_py() or 0)
+
+
+def numeric_counts(series):
     numeric = pd.to_numeric(series, errors="coerce")
-    total = len(series)
-    nulls = numeric.isna().sum()
-    non_numeric = original.notna() & original.astype(str).str.strip().ne("") & numeric.isna()
-    return numeric, {
-        "null_pct": (nulls / total * 100) if total else 0.0,
-        "non_numeric_pct": (non_numeric.sum() / total * 100) if total else 0.0,
-    }
+    unparsed = series[series.notna() & numeric.isna()]
+    non_numeric = int(unparsed.astype(str).str.strip().ne("").sum())
+    return numeric, int(numeric.isna().sum()), non_numeric
 
 
 def detect_scientific(series):
-    mask = series.astype(str).str.contains(r"[eE][+-]?\d+", regex=True, na=False)
-    return int(mask.sum())
+    return count_matches(series, r"[eE][+-]?\d+")
+
+
+def top_rows(candidates):
+    # Per year: largest values first, ties and then null values in file
+    # order, as DataFrame.nlargest orders them (nulls only fill short years).
+    ordered = candidates.assign(_null=candidates["value"].isna()).sort_values(
+        ["_null", "value", "_row"], ascending=[True, False, True], kind="mergesort"
+    )
+    return ordered.groupby("year", sort=False).head(OUTLIER_TOP_N).drop(columns="_null")
+
+
+def by_year(values):
+    # Same key/value types as the groupby("_year_num_int") dicts in the report.
+    years = sorted(values)
+    return pd.Series([values[y] for y in years], index=pd.Index(years, dtype="Int64")).to_dict()
+
+
+class FactProfile:
+    """Mergeable single-pass summary of (part of) the fact export.
+
+    `from_chunk` profiles one chunk; `merge` folds in the profile of the rows
+    that follow. Duplicate keys are found from 64-bit hashes of every
+    (year, FIPS, NAICS) key seen; only keys seen more than once keep their
+    values, which come from the chunk where the repeat shows up.
+    """
+
+    def __init__(self, cols, columns):
+        self.cols = cols
+        self.columns = columns
+        self.has_year = "year_num" in cols and "naics2_sector_cd" in cols
+        self.rows = 0
+        self.fips_bad = 0
+        self.fips_values = set()
+        self.naics_values = set()
+        self.naics_blank = False
+        self.year_non_numeric = 0
+        self.year_non_integer = False
+        self.year_values = set()
+        self.year_rows = {}
+        self.year_counties = {}
+        self.year_naics = {}
+        self.year_nulls = {metric: {} for metric in NULL_RATE_METRICS}
+        self.metric_counts = {}
+        self.metric_all_int = {}
+        self.partial_abs = 0
+        self.key_hashes = np.empty(0, dtype=np.uint64)
+        self.dup_counts = {}
+        self.dup_keys = {}
+        self.top = {}
+        self._chunk_keys = None
+
+    @classmethod
+    def from_chunk(cls, chunk, cols, row_offset=0):
+        profile = cls(cols, list(chunk.columns))
+        profile.rows = len(chunk)
+        fips_col = cols.get("state_cnty_fips_cd")
+        naics_col = cols.get("naics2_sector_cd")
+
+        if fips_col:
+            fips_text = chunk[fips_col].astype(str)
+            profile.fips_bad = len(fips_text) - count_matches(fips_text, r"^\d{5}$")
+            profile.fips_values = set(fips_text.unique())
+        if naics_col:
+            naics_text = chunk[naics_col].astype(str)
+            profile.naics_blank = bool((naics_text.str.strip() == "").any())
+            profile.naics_values = set(naics_text.unique())
+
+        numerics = {}
+        for metric in FACT_NUMERIC_COLS:
+            if metric not in cols:
+                continue
+            series = chunk[cols[metric]]
+            numeric, nulls, non_numeric = numeric_counts(series)
+            numerics[metric] = numeric
+            profile.metric_all_int[metric] = numeric.dtype.kind in "iu"
+            profile.metric_counts[metric] = {
+                "nulls": nulls,
+                "non_numeric": non_numeric,
+                "scientific": detect_scientific(series),
+                "negative": int((numeric < 0).sum()),
+            }
+
+        if all(metric in numerics for metric in ABS_COLS):
+            abs_numeric = pd.concat([numerics[metric] for metric in ABS_COLS], axis=1)
+            partial = abs_numeric.notna().any(axis=1) & abs_numeric.isna().any(axis=1)
+            profile.partial_abs = int(partial.sum())
+
+        if profile.has_year:
+            year_numeric = pd.to_numeric(chunk[cols["year_num"]], errors="coerce")
+            profile.year_non_numeric = int(year_numeric.isna().sum())
+            profile.year_non_integer = bool((year_numeric.dropna() % 1 != 0).any())
+            profile.year_values = set(year_numeric.dropna().astype(int).unique())
+            # Non-integer years fail the check above; leave them out of the per-year stats.
+            whole = year_numeric.where(year_numeric % 1 == 0)
+            has_year = whole.notna()
+            years = whole[has_year].astype("int64")
+            profile.year_rows = {int(y): int(n) for y, n in years.value_counts().items()}
+            for target, column in ((profile.year_counties, fips_col), (profile.year_naics, naics_col)):
+                if column:
+                    values = chunk.loc[has_year, column]
+                    for year, group in values[values.notna()].groupby(years[values.notna()]):
+                        target[int(year)] = set(group.unique())
+            for metric in NULL_RATE_METRICS:
+                if metric in numerics:
+                    nulls = numerics[metric][has_year].isna().groupby(years).sum()
+                    profile.year_nulls[metric] = {int(y): int(n) for y, n in nulls.items()}
+            if fips_col:
+                for metric in OUTLIER_METRICS:
+                    if metric not in numerics:
+                        continue
+                    numeric = numerics[metric][has_year]
+                    candidates = pd.DataFrame(
+                        {
+                            "_row": row_offset + np.flatnonzero(has_year.to_numpy()),
+                            "year": years.to_numpy(),
+                            "state_cnty_fips_cd": chunk.loc[has_year, fips_col].to_numpy(dtype=object),
+                            "naics2_sector_cd": chunk.loc[has_year, naics_col].to_numpy(dtype=object),
+                            "value": numeric.to_numpy(dtype=float, na_value=np.nan),
+                            "exact": numeric.astype(object).to_numpy(),
+                        }
+                    )
+                    profile.top[metric] = top_rows(candidates)
+
+        key_cols = [cols.get(field) for field in KEY_FIELDS]
+        if all(key_cols):
+            keys = chunk[key_cols]
+            keys = keys[keys.notna().all(axis=1)]
+            hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy(dtype=np.uint64)
+            uniques, first, counts = np.unique(hashes, return_index=True, return_counts=True)
+            profile.key_hashes = uniques
+            profile._chunk_keys = (uniques, first, keys)
+            for pos in np.flatnonzero(counts > 1):
+                key = int(uniques[pos])
+                profile.dup_counts[key] = int(counts[pos])
+                profile.dup_keys[key] = tuple(keys.iloc[first[pos]])
+        return profile
+
+    def _key_values(self, key):
+        if key in self.dup_keys:
+            return self.dup_keys[key]
+        uniques, first, keys = self._chunk_keys
+        return tuple(keys.iloc[first[np.searchsorted(uniques, np.uint64(key))]])
+
+    def merge(self, other):
+        """Fold in `other`, the profile of the rows that follow this one."""
+        self.rows += other.rows
+        self.fips_bad += other.fips_bad
+        self.fips_values |= other.fips_values
+        self.naics_values |= other.naics_values
+        self.naics_blank = self.naics_blank or other.naics_blank
+        self.year_non_numeric += other.year_non_numeric
+        self.year_non_integer = self.year_non_integer or other.year_non_integer
+        self.year_values |= other.year_values
+        for year, count in other.year_rows.items():
+            self.year_rows[year] = self.year_rows.get(year, 0) + count
+        for mine, theirs in ((self.year_counties, other.year_counties), (self.year_naics, other.year_naics)):
+            for year, values in theirs.items():
+                mine.setdefault(year, set()).update(values)
+        for metric, nulls in other.year_nulls.items():
+            for year, count in nulls.items():
+                self.year_nulls[metric][year] = self.year_nulls[metric].get(year, 0) + count
+        for metric, counts in other.metric_counts.items():
+            mine = self.metric_counts.setdefault(metric, dict.fromkeys(counts, 0))
+            for name, count in counts.items():
+                mine[name] += count
+            self.metric_all_int[metric] = self.metric_all_int.get(metric, True) and other.metric_all_int[metric]
+        self.partial_abs += other.partial_abs
+        for metric, candidates in other.top.items():
+            if metric in self.top:
+                candidates = top_rows(pd.concat([self.top[metric], candidates], ignore_index=True))
+            self.top[metric] = candidates
+
+        repeated = np.intersect1d(self.key_hashes, other.key_hashes, assume_unique=True)
+        for key in map(int, repeated):
+            self.dup_counts[key] = self.dup_counts.get(key, 1) + other.dup_counts.get(key, 1)
+            if key not in self.dup_keys:
+                self.dup_keys[key] = other._key_values(key)
+        for key, count in other.dup_counts.items():
+            if key not in self.dup_counts:
+                self.dup_counts[key] = count
+                self.dup_keys[key] = other.dup_keys[key]
+        self.key_hashes = np.union1d(self.key_hashes, other.key_hashes)
+        self._chunk_keys = None
+        return self
+
+    def duplicate_keys(self):
+        key_cols = [self.cols[field] for field in KEY_FIELDS]
+        if not self.dup_counts:
+            return pd.Series(dtype=int), key_cols
+        frame = pd.DataFrame([self.dup_keys[key] for key in self.dup_counts], columns=key_cols)
+        frame["row_count"] = list(self.dup_counts.values())
+        # Same order as groupby(keys).size() filtered to > 1 and sorted descending.
+        counts = frame.groupby(key_cols)["row_count"].sum().rename(None)
+        return counts.sort_values(ascending=False), key_cols
+
+    def outlier_rows(self, metric):
+        rows = []
+        candidates = self.top[metric]
+        all_int = self.metric_all_int[metric]
+        for year in sorted(self.year_rows):
+            group = candidates[candidates["year"] == year]
+            if self.year_rows[year] <= OUTLIER_TOP_N:
+                # nlargest hands groups this short to sort_values, whose tie
+                # order is the sort kernel's: replay it on the same values.
+                group = group.sort_values("_row", kind="mergesort")
+                values = group["exact"].astype("int64") if all_int else group["value"]
+                order = values.reset_index(drop=True).sort_values(ascending=False).index
+                group = group.iloc[order]
+            for row in group.itertuples(index=False):
+                value = row.exact if all_int else float(row.value)
+                rows.append(
+                    {
+                        "year": int(year),
+                        "state_cnty_fips_cd": row.state_cnty_fips_cd,
+                        "naics2_sector_cd": row.naics2_sector_cd,
+                        "value": value,
+                    }
+                )
+        return rows
+
+
+def stream_fact_checked(path, label, results, chunksize=DEFAULT_CHUNK_ROWS):
+    path, is_parquet = locate_export(path, label, results)
+    if path is None:
+        return None
+
+    kind = "Parquet" if is_parquet else "CSV"
+    try:
+        if is_parquet:
+            chunks = (as_export_text(chunk) for chunk in iter_table(path, chunksize))
+        else:
+            chunks = iter_table(path, chunksize, dtype=str, on_bad_lines="error")
+        chunk = next(chunks)
+    except Exception as exc:
+        add_check(results, f"{label}: {kind} parses cleanly", "ERROR", False, f"Parse error: {exc}")
+        return None
+
+    cols, _ = resolve_columns(chunk, COLUMN_MAP["fact"])
+    profile = FactProfile.from_chunk(chunk, cols)
+    while True:
+        try:
+            chunk = next(chunks, None)
+        except Exception as exc:
+            add_check(results, f"{label}: {kind} parses cleanly", "ERROR", False, f"Parse error: {exc}")
+            return None
+        if chunk is None:
+            break
+        profile.merge(FactProfile.from_chunk(chunk, cols, row_offset=profile.rows))
+
+    add_check(results, f"{label}: {kind} parses cleanly", "ERROR", True, "Parsed without malformed rows.")
+    check_headers(pd.Index(profile.columns), label, results)
+    return profile
 
 
 def format_table(rows, headers):
@@ -146,22 +462,29 @@ def main():
     parser.add_argument("--naics", required=True, help="Path to NAICS reference CSV.")
     parser.add_argument("--county", required=True, help="Path to county reference CSV.")
     parser.add_argument("--outdir", required=True, help="Output directory for reports.")
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=DEFAULT_CHUNK_ROWS,
+        help=f"Fact rows per streamed chunk (default {DEFAULT_CHUNK_ROWS:,}).",
+    )
     args = parser.parse_args()
 
     results = []
     run_ts = datetime.now()
     run_id = run_ts.strftime("%Y%m%d_%H%M%S")
 
-    fact_df = read_csv_checked(args.fact, "fact", results)
+    fact = stream_fact_checked(args.fact, "fact", results, args.chunksize)
     naics_df = read_csv_checked(args.naics, "naics", results)
     county_df = read_csv_checked(args.county, "county", results)
 
-    if fact_df is None or naics_df is None or county_df is None:
+    if fact is None or naics_df is None or county_df is None:
         error_count = sum(1 for r in results if r["severity"] == "ERROR" and not r["passed"])
         print(f"Sanity checks failed early. Errors: {error_count}")
         sys.exit(1)
 
-    fact_cols, missing_fact = resolve_columns(fact_df, COLUMN_MAP["fact"])
+    fact_cols = fact.cols
+    missing_fact = [canonical for canonical in COLUMN_MAP["fact"] if canonical not in fact_cols]
     if missing_fact:
         add_check(
             results,
@@ -218,8 +541,7 @@ def main():
         )
 
     if "state_cnty_fips_cd" in fact_cols:
-        fips_series = fact_df[fact_cols["state_cnty_fips_cd"]].astype(str)
-        bad_len = (~fips_series.str.fullmatch(r"\d{5}")).sum()
+        bad_len = fact.fips_bad
         if bad_len:
             add_check(
                 results,
@@ -231,32 +553,24 @@ def main():
         else:
             add_check(results, "fact: state_cnty_fips_cd format", "ERROR", True, "All FIPS codes are 5 digits.")
 
-    year_stats = {}
-    numeric_summary = {}
-    scientific_counts = {}
-    null_rates_by_year = {}
-
-    if all(col in fact_cols for col in ("year_num", "naics2_sector_cd")):
-        year_series = fact_df[fact_cols["year_num"]]
-        year_numeric, year_stat = numeric_stats(year_series)
-        if year_numeric.isna().any():
+    if fact.has_year:
+        if fact.year_non_numeric:
             add_check(
                 results,
                 "fact: year_num parse",
                 "ERROR",
                 False,
-                f"{int(year_numeric.isna().sum())} rows have non-numeric year_num.",
+                f"{fact.year_non_numeric} rows have non-numeric year_num.",
             )
         else:
             add_check(results, "fact: year_num parse", "ERROR", True, "All year_num values parse numeric.")
 
-        if (year_numeric.dropna() % 1 != 0).any():
+        if fact.year_non_integer:
             add_check(results, "fact: year_num integer", "ERROR", False, "Non-integer year_num values found.")
         else:
             add_check(results, "fact: year_num integer", "ERROR", True, "All year_num values are integers.")
 
-        year_values = set(year_numeric.dropna().astype(int).unique())
-        unexpected_years = sorted(year_values - EXPECTED_YEARS)
+        unexpected_years = sorted(fact.year_values - EXPECTED_YEARS)
         if unexpected_years:
             add_check(
                 results,
@@ -268,40 +582,30 @@ def main():
         else:
             add_check(results, "fact: year_num expected set", "WARN", True, "Only expected years present.")
 
-        fact_df["_year_num_int"] = year_numeric.astype("Int64")
-
-        naics_series = fact_df[fact_cols["naics2_sector_cd"]].astype(str)
-        if naics_series.isna().any() or (naics_series.str.strip() == "").any():
+        if fact.naics_blank:
             add_check(results, "fact: naics2_sector_cd non-null", "ERROR", False, "Null NAICS2 codes found.")
         else:
             add_check(results, "fact: naics2_sector_cd non-null", "ERROR", True, "NAICS2 codes present.")
 
-    fact_numeric_cols = [
-        "abs_firms",
-        "abs_emp",
-        "abs_payroll_usd_amt",
-        "abs_rcpt_usd_amt",
-        "qcew_emp",
-        "qcew_wages_usd",
-        "qcew_avg_weekly_wage_usd",
-    ]
-
-    for col in fact_numeric_cols:
-        if col not in fact_cols:
+    numeric_summary = {}
+    scientific_counts = {}
+    total = fact.rows
+    for col in FACT_NUMERIC_COLS:
+        if col not in fact.metric_counts:
             continue
-        series = fact_df[fact_cols[col]]
-        numeric, stats = numeric_stats(series)
-        fact_df[f"_{col}_num"] = numeric
-        numeric_summary[col] = stats
-        scientific_counts[col] = detect_scientific(series)
+        counts = fact.metric_counts[col]
+        numeric_summary[col] = {
+            "null_pct": (counts["nulls"] / total * 100) if total else 0.0,
+            "non_numeric_pct": (counts["non_numeric"] / total * 100) if total else 0.0,
+        }
+        scientific_counts[col] = counts["scientific"]
 
     if numeric_summary:
         add_check(results, "fact: numeric parse summary", "WARN", True, "Numeric columns parsed (see report).")
 
     if "naics2_sector_cd" in fact_cols and "naics2_sector_cd" in naics_cols:
         expected_naics = set(naics_df[naics_cols["naics2_sector_cd"]].astype(str).dropna().unique())
-        fact_naics = set(fact_df[fact_cols["naics2_sector_cd"]].astype(str).dropna().unique())
-        unexpected_naics = sorted(fact_naics - expected_naics)
+        unexpected_naics = sorted(fact.naics_values - expected_naics)
         if unexpected_naics:
             add_check(
                 results,
@@ -313,10 +617,9 @@ def main():
         else:
             add_check(results, "fact: naics2_sector_cd set", "WARN", True, "NAICS2 codes match reference.")
 
-    key_cols = [fact_cols.get("year_num"), fact_cols.get("state_cnty_fips_cd"), fact_cols.get("naics2_sector_cd")]
+    key_cols = [fact_cols.get(field) for field in KEY_FIELDS]
     if all(key_cols):
-        dup_counts = fact_df.groupby(key_cols).size()
-        dup_keys = dup_counts[dup_counts > 1].sort_values(ascending=False)
+        dup_keys, key_cols = fact.duplicate_keys()
         if not dup_keys.empty:
             add_check(
                 results,
@@ -331,7 +634,7 @@ def main():
         dup_keys = pd.Series(dtype=int)
 
     if "state_cnty_fips_cd" in fact_cols and "state_cnty_fips_cd" in county_cols:
-        fact_fips = set(fact_df[fact_cols["state_cnty_fips_cd"]].astype(str).dropna().unique())
+        fact_fips = fact.fips_values
         county_fips = set(county_df[county_cols["state_cnty_fips_cd"]].astype(str).dropna().unique())
         missing_fips = sorted(fact_fips - county_fips)
         if missing_fips:
@@ -358,7 +661,7 @@ def main():
             add_check(results, "join: county extra keys", "WARN", True, "All county keys used by fact.")
 
     if "naics2_sector_cd" in fact_cols and "naics2_sector_cd" in naics_cols:
-        fact_naics = set(fact_df[fact_cols["naics2_sector_cd"]].astype(str).dropna().unique())
+        fact_naics = fact.naics_values
         ref_naics = set(naics_df[naics_cols["naics2_sector_cd"]].astype(str).dropna().unique())
         missing_naics = sorted(fact_naics - ref_naics)
         if missing_naics:
@@ -384,43 +687,30 @@ def main():
         else:
             add_check(results, "join: naics extra keys", "WARN", True, "All naics keys used by fact.")
 
-    if "_year_num_int" in fact_df:
-        year_counts = (
-            fact_df.groupby("_year_num_int").size().dropna().astype(int).to_dict()
-        )
-        year_stats["rows_by_year"] = year_counts
-        distinct_counties = (
-            fact_df.groupby("_year_num_int")[fact_cols["state_cnty_fips_cd"]]
-            .nunique()
-            .dropna()
-            .astype(int)
-            .to_dict()
-        )
-        distinct_naics = (
-            fact_df.groupby("_year_num_int")[fact_cols["naics2_sector_cd"]]
-            .nunique()
-            .dropna()
-            .astype(int)
-            .to_dict()
-        )
+    rows_by_year = by_year(fact.year_rows)
+    distinct_counties = by_year({year: len(fact.year_counties.get(year, ())) for year in fact.year_rows})
+    distinct_naics = by_year({year: len(fact.year_naics.get(year, ())) for year in fact.year_rows})
+    null_rates_by_year = {}
 
-        for year, cnt in distinct_counties.items():
-            if cnt != EXPECTED_COUNTIES:
-                add_check(
-                    results,
-                    f"coverage: distinct counties {year}",
-                    "WARN",
-                    False,
-                    f"{cnt} counties (expected {EXPECTED_COUNTIES}).",
-                )
-            else:
-                add_check(
-                    results,
-                    f"coverage: distinct counties {year}",
-                    "WARN",
-                    True,
-                    f"{cnt} counties (expected {EXPECTED_COUNTIES}).",
-                )
+    if fact.has_year:
+        if "state_cnty_fips_cd" in fact_cols:
+            for year, cnt in distinct_counties.items():
+                if cnt != EXPECTED_COUNTIES:
+                    add_check(
+                        results,
+                        f"coverage: distinct counties {year}",
+                        "WARN",
+                        False,
+                        f"{cnt} counties (expected {EXPECTED_COUNTIES}).",
+                    )
+                else:
+                    add_check(
+                        results,
+                        f"coverage: distinct counties {year}",
+                        "WARN",
+                        True,
+                        f"{cnt} counties (expected {EXPECTED_COUNTIES}).",
+                    )
 
         for year, cnt in distinct_naics.items():
             if cnt != EXPECTED_NAICS2:
@@ -440,28 +730,15 @@ def main():
                     f"{cnt} NAICS2 codes (expected {EXPECTED_NAICS2}).",
                 )
 
-        if "abs_firms" in fact_cols and "_abs_firms_num" in fact_df:
-            abs_null_pct = (
-                fact_df.groupby("_year_num_int")["_abs_firms_num"]
-                .apply(lambda s: s.isna().mean() * 100)
-                .to_dict()
-            )
-            null_rates_by_year["abs_firms_null_pct"] = abs_null_pct
+        for metric, key in NULL_RATE_METRICS.items():
+            if metric in fact.metric_counts:
+                nulls = fact.year_nulls[metric]
+                null_rates_by_year[key] = by_year(
+                    {year: nulls.get(year, 0) / rows * 100 for year, rows in fact.year_rows.items()}
+                )
 
-        if "qcew_emp" in fact_cols and "_qcew_emp_num" in fact_df:
-            qcew_null_pct = (
-                fact_df.groupby("_year_num_int")["_qcew_emp_num"]
-                .apply(lambda s: s.isna().mean() * 100)
-                .to_dict()
-            )
-            null_rates_by_year["qcew_emp_null_pct"] = qcew_null_pct
-
-    abs_cols = ["abs_firms", "abs_emp", "abs_payroll_usd_amt", "abs_rcpt_usd_amt"]
-    if all(col in fact_df.columns for col in [f"_{c}_num" for c in abs_cols]):
-        abs_numeric = fact_df[[f"_{c}_num" for c in abs_cols]]
-        abs_any = abs_numeric.notna().any(axis=1)
-        abs_partial = abs_any & abs_numeric.isna().any(axis=1)
-        partial_count = int(abs_partial.sum())
+    if all(col in fact.metric_counts for col in ABS_COLS):
+        partial_count = fact.partial_abs
         if partial_count:
             add_check(
                 results,
@@ -473,17 +750,8 @@ def main():
         else:
             add_check(results, "coverage: partial ABS rows", "WARN", True, "No partial ABS rows.")
 
-    negative_errors = 0
-    negative_warns = 0
-    error_metrics = ["abs_firms", "abs_emp", "qcew_emp"]
-    warn_metrics = ["abs_payroll_usd_amt", "abs_rcpt_usd_amt", "qcew_wages_usd", "qcew_avg_weekly_wage_usd"]
-
-    for metric in error_metrics:
-        num_col = f"_{metric}_num"
-        if num_col in fact_df:
-            count = int((fact_df[num_col] < 0).sum())
-            if count:
-                negative_errors += count
+    negative_errors = sum(fact.metric_counts[m]["negative"] for m in ERROR_METRICS if m in fact.metric_counts)
+    negative_warns = sum(fact.metric_counts[m]["negative"] for m in WARN_METRICS if m in fact.metric_counts)
 
     if negative_errors:
         add_check(
@@ -496,13 +764,6 @@ def main():
     else:
         add_check(results, "fact: negative firms/emp", "ERROR", True, "No negative firm/emp values.")
 
-    for metric in warn_metrics:
-        num_col = f"_{metric}_num"
-        if num_col in fact_df:
-            count = int((fact_df[num_col] < 0).sum())
-            if count:
-                negative_warns += count
-
     if negative_warns:
         add_check(
             results,
@@ -546,14 +807,6 @@ def main():
         {"Severity": "WARN", "Passed": len(warn_pass), "Failed": len(warn_fails)},
     ]
 
-    key_stats = {
-        "rows": len(fact_df),
-        "years": sorted(fact_df["_year_num_int"].dropna().unique().tolist())
-        if "_year_num_int" in fact_df
-        else [],
-        "distinct_counties_by_year": year_stats.get("rows_by_year", {}),
-    }
-
     dup_rows = []
     if dup_keys is not None and not dup_keys.empty:
         dup_keys = dup_keys.reset_index().rename(columns={0: "row_count"})
@@ -580,29 +833,14 @@ def main():
         )
 
     outlier_sections = []
-    outlier_metrics = ["abs_rcpt_usd_amt", "abs_payroll_usd_amt", "qcew_wages_usd"]
-    for metric in outlier_metrics:
-        num_col = f"_{metric}_num"
-        if num_col not in fact_df or "_year_num_int" not in fact_df:
+    for metric in OUTLIER_METRICS:
+        if metric not in fact.top:
             continue
-        metric_rows = []
-        for year in sorted(fact_df["_year_num_int"].dropna().unique()):
-            subset = fact_df[fact_df["_year_num_int"] == year]
-            top = subset.nlargest(10, num_col)
-            for _, row in top.iterrows():
-                metric_rows.append(
-                    {
-                        "year": int(year),
-                        "state_cnty_fips_cd": row[fact_cols["state_cnty_fips_cd"]],
-                        "naics2_sector_cd": row[fact_cols["naics2_sector_cd"]],
-                        "value": row[num_col],
-                    }
-                )
         outlier_sections.append(
             {
                 "metric": metric,
                 "table": format_table(
-                    metric_rows,
+                    fact.outlier_rows(metric),
                     ["year", "state_cnty_fips_cd", "naics2_sector_cd", "value"],
                 ),
             }
@@ -622,20 +860,14 @@ def main():
     report_lines.append(format_table(summary_rows, ["Severity", "Passed", "Failed"]))
     report_lines.append("")
     report_lines.append("## Key stats")
-    report_lines.append(f"- Rows: {len(fact_df)}")
-    if "_year_num_int" in fact_df:
-        report_lines.append(f"- Years: {sorted(fact_df['_year_num_int'].dropna().unique().tolist())}")
-        report_lines.append(f"- Rows by year: {year_stats.get('rows_by_year', {})}")
-    if "_year_num_int" in fact_df and "state_cnty_fips_cd" in fact_cols:
-        year_counts = (
-            fact_df.groupby("_year_num_int")[fact_cols["state_cnty_fips_cd"]].nunique().to_dict()
-        )
-        report_lines.append(f"- Distinct counties by year: {year_counts}")
-    if "_year_num_int" in fact_df and "naics2_sector_cd" in fact_cols:
-        naics_counts = (
-            fact_df.groupby("_year_num_int")[fact_cols["naics2_sector_cd"]].nunique().to_dict()
-        )
-        report_lines.append(f"- Distinct NAICS2 by year: {naics_counts}")
+    report_lines.append(f"- Rows: {fact.rows}")
+    if fact.has_year:
+        report_lines.append(f"- Years: {sorted(fact.year_rows)}")
+        report_lines.append(f"- Rows by year: {rows_by_year}")
+    if fact.has_year and "state_cnty_fips_cd" in fact_cols:
+        report_lines.append(f"- Distinct counties by year: {distinct_counties}")
+    if fact.has_year:
+        report_lines.append(f"- Distinct NAICS2 by year: {distinct_naics}")
     if null_rates_by_year:
         report_lines.append(f"- ABS firms null % by year: {null_rates_by_year.get('abs_firms_null_pct', {})}")
         report_lines.append(f"- QCEW emp null % by year: {null_rates_by_year.get('qcew_emp_null_pct', {})}")
@@ -5,11 +5,14 @@ Freeze national ABS/QCEW totals by year and write a markdown snapshot.
 Usage:
   python -m qa.national_totals_snapshot --years 2022 2023 \
       --outpath artifacts/qa/national_totals_snapshot.md
+  Add --warehouse local to query the data_clean exports with DuckDB instead
+  of BigQuery.
 """
 
 from __future__ import annotations
 
 import argparse
+import sys
 from datetime import datetime, timezone
 from decimal import Decimal
 from pathlib import Path
@@ -17,6 +20,15 @@ from typing import Iterable, Optional
 
 import pandas as pd
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from scripts.common.warehouse import (  # type: ignore # noqa: E402
+    add_warehouse_arguments,
+    configure_from_args,
+    query_warehouse,
+)
 
 # Default parameters for a standard release snapshot.
 DEFAULT_YEARS = [2022, 2023]
@@ -30,6 +42,7 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Write national totals snapshot.")
     parser.add_argument("--years", nargs="+", type=int, default=DEFAULT_YEARS)
     parser.add_argument("--outpath", default=DEFAULT_OUTPATH)
+    add_warehouse_arguments(parser)
     return parser.parse_args(argv)
 
 
@@ -82,14 +95,9 @@ def safe_divide(numerator: Optional[Decimal], denominator: Optional[Decimal]) ->
 
 
 def fetch_totals(years: Iterable[int]) -> pd.DataFrame:
-    # Single BigQuery query, grouped by year, for deterministic rollups.
-    try:
-        from google.cloud import bigquery
-    except ImportError as exc:
-        raise RuntimeError("google-cloud-bigquery is required to fetch totals") from exc
-
+    # Single warehouse query, grouped by year, for deterministic rollups.
     years_list = sorted({int(y) for y in years})
-    log(f"Querying BigQuery for years={years_list}...")
+    log(f"Querying the warehouse for years={years_list}...")
     query = f"""
         SELECT
           year_num,
@@ -107,16 +115,10 @@ def fetch_totals(years: Iterable[int]) -> pd.DataFrame:
         GROUP BY year_num
         ORDER BY year_num
     """
-    client = bigquery.Client()
-    job_config = bigquery.QueryJobConfig(
-        query_parameters=[
-            bigquery.ArrayQueryParameter("years", "INT64", years_list),
-        ]
-    )
-    df = client.query(query, job_config=job_config).to_dataframe()
+    df = query_warehouse(query, {"years": years_list})
     if df.empty:
         raise RuntimeError(f"No rows returned for years: {years_list}")
-    log(f"Received {len(df)} year rows from BigQuery.")
+    log(f"Received {len(df)} year rows from the warehouse.")
     return df
 
 
@@ -239,6 +241,7 @@ def write_markdown(outpath: Path, df: pd.DataFrame) -> None:
 def main(argv: Optional[list[str]] = None) -> None:
     # Entry point: parse args, query totals, compute YoY, and write snapshot.
     args = parse_args(argv)
+    configure_from_args(args)
     outpath = Path(args.outpath)
     log(f"Starting snapshot (years={sorted({int(y) for y in args.years})}).")
     df = fetch_totals(args.years)
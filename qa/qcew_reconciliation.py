@@ -17,7 +17,10 @@ Tolerances
 How to run
   python -m qa.qcew_reconciliation --years 2022 2023 --counties 06075 06085 \
       --naics 42 62 --outdir artifacts/qa --publish_bq false
-  Optional: add --rdm_csv path/to/local_rdm.csv to bypass BigQuery.
+  Optional: add --rdm_csv path/to/local_rdm.csv to bypass BigQuery, or
+  --warehouse local to run the RDM query with DuckDB over data_clean exports.
+  Full surface (every county × NAICS2, partitioned Parquet artifact):
+  python -m qa.reconciliation --mode qcew_full_surface --years 2022 2023 --outdir artifacts/qa
 
 Failure interpretation
   - pass_* flags indicate per-metric comparison success.
@@ -27,15 +30,37 @@ Failure interpretation
 from __future__ import annotations
 
 import argparse
+import sys
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Optional
 
+import numpy as np
 import pandas as pd
 
-from qa.utils import parse_bool, safe_divide
+from qa.utils import append_flag_notes, parse_bool, safe_divide_series, tolerance_pass
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from scripts.common.census_json import (  # type: ignore # noqa: E402
+    NOTE_MISSING,
+    NOTE_NON_NUMERIC,
+    NOTE_SUPPRESSED,
+    render_notes,
+)
+from scripts.common.keys import merge_on_keys  # type: ignore # noqa: E402
+from scripts.common.naics import map_naics_sectors  # type: ignore # noqa: E402
+from scripts.common.table_io import write_table  # type: ignore # noqa: E402
+from scripts.common.warehouse import (  # type: ignore # noqa: E402
+    add_warehouse_arguments,
+    configure_from_args,
+    query_warehouse,
+)
+from scripts.qcew.qcew_reader import STORE_ATTR, iter_qcew_filtered, read_qcew_filtered  # type: ignore # noqa: E402
 
 
 DEFAULT_COUNTIES = ["06075", "06085"]
@@ -48,6 +73,44 @@ DEFAULT_CACHE_DIR = "data_raw/qcew/source_qa"
 QCEW_TABLE = "rdm-datalab-portfolio.portfolio_data.econ_bnchmrk_abs_qcew"
 
 SUPPRESSED_VALUES = {"", "D", "N", "S", "NA", "N/A", "(D)", "(N)", "(S)"}
+METRIC_COLUMNS = ("annual_avg_emplvl", "total_annual_wages", "annual_avg_wkly_wage")
+# Typed Parquet stores hold suppressed cells ("D", "N", ...) as nulls; they are
+# restored to this token so they are noted the same way as in the raw CSV.
+STORE_SUPPRESSED_TOKEN = "D"
+
+# Normalized singlefile columns read by the full-surface pass, and the
+# columns kept per county × NAICS2 row.
+SOURCE_COLUMNS = [
+    "area_fips",
+    "industry_code",
+    "year",
+    "qtr",
+    "own_code",
+    "agglvl_code",
+    "annual_avg_emplvl",
+    "total_annual_wages",
+    "annual_avg_wkly_wage",
+]
+SOURCE_KEYS = ["year", "state_cnty_fips_cd", "naics2_sector_cd"]
+SOURCE_KEEP = [
+    "year",
+    "state_cnty_fips_cd",
+    "state_fips",
+    "county_fips",
+    "naics2_sector_cd",
+    "annual_avg_emplvl",
+    "total_annual_wages",
+    "annual_avg_wkly_wage",
+]
+
+MISSING_FROM_BOTH = 1
+MISSING_FROM_SOURCE = 2
+MISSING_FROM_RDM = 4
+MISSING_LABELS = {
+    MISSING_FROM_BOTH: "missing_from_both",
+    MISSING_FROM_SOURCE: "missing_from_source",
+    MISSING_FROM_RDM: "missing_from_rdm",
+}
 
 
 @dataclass(frozen=True)
@@ -66,18 +129,6 @@ class QcewConfig:
     rdm_csv: Optional[Path]
 
 
-def _parse_numeric(value: Any) -> tuple[Optional[float], Optional[str]]:
-    if value is None:
-        return None, "source_missing"
-    text = str(value).strip()
-    if text in SUPPRESSED_VALUES:
-        return None, "source_suppressed"
-    try:
-        return float(text), None
-    except ValueError:
-        return None, "source_non_numeric"
-
-
 def _normalize_naics2(code: str) -> Optional[str]:
     cleaned = "".join(ch for ch in str(code).strip() if ch.isdigit() or ch == "-")
     if not cleaned:
@@ -142,39 +193,69 @@ def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df.rename(columns=rename_map)
 
 
+def _resolve_raw_path(config: QcewConfig, year: int) -> Path:
+    raw_path = Path(config.raw_template.format(year=year))
+    if raw_path.exists():
+        return raw_path
+    cached = config.cache_dir / f"{year}.annual.singlefile.csv"
+    if cached.exists():
+        return cached
+    raise FileNotFoundError(
+        f"QCEW source file not found for {year}. Expected {raw_path} or {cached}."
+    )
+
+
+def _source_filters(config: QcewConfig, year: int) -> dict[str, list[str]]:
+    return {
+        "year": [str(year)],
+        "qtr": ["A"],
+        "own_code": [str(config.ownership_code)],
+        "agglvl_code": [str(config.agg_level)],
+    }
+
+
+def _prepare_source(normalized: pd.DataFrame, year: int, config: QcewConfig) -> pd.DataFrame:
+    """Annual county × NAICS2 rows for `year` with fips/sector key columns added."""
+    normalized = normalized.copy()
+    normalized["year"] = normalized["year"].astype(str)
+    normalized = normalized[normalized["year"] == str(year)].copy()
+    if "qtr" in normalized.columns:
+        normalized = normalized[normalized["qtr"].astype(str).str.upper() == "A"].copy()
+    if "own_code" in normalized.columns:
+        normalized = normalized[normalized["own_code"].astype(str) == str(config.ownership_code)].copy()
+    else:
+        normalized["own_code"] = str(config.ownership_code)
+    normalized = normalized[normalized["agglvl_code"].astype(str) == str(config.agg_level)].copy()
+
+    normalized["area_fips"] = normalized["area_fips"].astype(str).str.zfill(5)
+    normalized = normalized[normalized["area_fips"].str.len() == 5].copy()
+    normalized["state_cnty_fips_cd"] = normalized["area_fips"]
+    normalized["state_fips"] = normalized["area_fips"].str[:2]
+    normalized["county_fips"] = normalized["area_fips"].str[2:]
+    normalized["naics2_sector_cd"] = map_naics_sectors(
+        normalized["industry_code"], _normalize_naics2
+    )
+    normalized = normalized[normalized["naics2_sector_cd"].notna()].copy()
+    normalized["naics2_sector_cd"] = normalized["naics2_sector_cd"].astype(str)
+    if normalized.attrs.get(STORE_ATTR):
+        for column in METRIC_COLUMNS:
+            if column in normalized.columns:
+                values = normalized[column].astype(object)
+                normalized[column] = values.where(values.notna(), STORE_SUPPRESSED_TOKEN)
+    return normalized
+
+
 def load_qcew_source(config: QcewConfig) -> pd.DataFrame:
     frames: list[pd.DataFrame] = []
     for year in config.years:
-        raw_path = Path(config.raw_template.format(year=year))
-        if not raw_path.exists():
-            cached = config.cache_dir / f"{year}.annual.singlefile.csv"
-            if cached.exists():
-                raw_path = cached
-            else:
-                raise FileNotFoundError(
-                    f"QCEW source file not found for {year}. Expected {raw_path} or {cached}."
-                )
-        raw = pd.read_csv(raw_path, dtype=str, low_memory=False)
-        normalized = _normalize_columns(raw)
-        normalized["year"] = normalized["year"].astype(str)
-        normalized = normalized[normalized["year"] == str(year)].copy()
-        if "qtr" in normalized.columns:
-            normalized = normalized[normalized["qtr"].astype(str).str.upper() == "A"].copy()
-        if "own_code" in normalized.columns:
-            normalized = normalized[normalized["own_code"].astype(str) == str(config.ownership_code)].copy()
-        else:
-            normalized["own_code"] = str(config.ownership_code)
-        normalized = normalized[normalized["agglvl_code"].astype(str) == str(config.agg_level)].copy()
-
-        normalized["area_fips"] = normalized["area_fips"].astype(str).str.zfill(5)
-        normalized = normalized[normalized["area_fips"].str.len() == 5].copy()
-        normalized["state_cnty_fips_cd"] = normalized["area_fips"]
-        normalized["state_fips"] = normalized["area_fips"].str[:2]
-        normalized["county_fips"] = normalized["area_fips"].str[2:]
-        normalized["naics2_sector_cd"] = normalized["industry_code"].apply(_normalize_naics2)
-        normalized = normalized[normalized["naics2_sector_cd"].notna()].copy()
-
-        frames.append(normalized)
+        raw_path = _resolve_raw_path(config, year)
+        # Push the annual/ownership/level/county filters into the reader so only
+        # the requested counties are materialized (row-group lookups when an
+        # indexed Parquet store exists for this file).
+        keep = _source_filters(config, year)
+        keep["area_fips"] = sorted(set(config.counties) | {c.lstrip("0") for c in config.counties})
+        normalized = read_qcew_filtered(raw_path, _normalize_columns, keep=keep)
+        frames.append(_prepare_source(normalized, year, config))
 
     combined = pd.concat(frames, ignore_index=True)
     combined = combined[combined["state_cnty_fips_cd"].isin(config.counties)].copy()
@@ -185,12 +266,38 @@ def load_qcew_source(config: QcewConfig) -> pd.DataFrame:
     return combined
 
 
+def load_qcew_source_full(config: QcewConfig) -> pd.DataFrame:
+    """Every county × NAICS2 row for `config.years`, one streaming pass per file.
+
+    Chunks are filtered to annual county/sector rows and projected to the
+    reconciliation columns as they are read, so memory holds the county-sector
+    surface (~3k counties × 20 sectors per year), never the raw singlefile.
+    """
+    parts: list[pd.DataFrame] = []
+    for year in config.years:
+        raw_path = _resolve_raw_path(config, year)
+        chunks = iter_qcew_filtered(
+            raw_path,
+            _normalize_columns,
+            keep=_source_filters(config, year),
+            columns=SOURCE_COLUMNS,
+        )
+        for chunk in chunks:
+            prepared = _prepare_source(chunk, year, config)[SOURCE_KEEP]
+            parts.append(prepared.drop_duplicates(subset=SOURCE_KEYS))
+    if not parts:
+        return pd.DataFrame(columns=SOURCE_KEEP)
+    combined = pd.concat(parts, ignore_index=True)
+    return combined.drop_duplicates(subset=SOURCE_KEYS).reset_index(drop=True)
+
+
 def fetch_rdm_qcew(
     years: list[int],
-    counties: list[str],
-    naics: list[str],
+    counties: Optional[list[str]],
+    naics: Optional[list[str]],
     rdm_csv: Optional[Path] = None,
 ) -> pd.DataFrame:
+    """RDM QCEW facts for `years`; `counties`/`naics` of None mean all of them."""
     if rdm_csv:
         df = pd.read_csv(rdm_csv, dtype=str)
         required = {
@@ -207,8 +314,10 @@ def fetch_rdm_qcew(
         df["naics2_sector_cd"] = df["naics2_sector_cd"].astype(str).str.zfill(2)
         df["year_num"] = pd.to_numeric(df["year_num"], errors="coerce")
         df = df[df["year_num"].isin(years)]
-        df = df[df["state_cnty_fips_cd"].isin([str(c).zfill(5) for c in counties])]
-        df = df[df["naics2_sector_cd"].isin([str(n).zfill(2) for n in naics])]
+        if counties is not None:
+            df = df[df["state_cnty_fips_cd"].isin([str(c).zfill(5) for c in counties])]
+        if naics is not None:
+            df = df[df["naics2_sector_cd"].isin([str(n).zfill(2) for n in naics])]
         df = df.rename(
             columns={
                 "qcew_ann_avg_emp_lvl_num": "rdm_qcew_emp",
@@ -228,12 +337,14 @@ def fetch_rdm_qcew(
                 "rdm_qcew_avg_weekly_wage_usd",
             ]
         ]
-    try:
-        from google.cloud import bigquery
-    except ImportError as exc:
-        raise RuntimeError("google-cloud-bigquery is required to fetch RDM data") from exc
-
-    client = bigquery.Client()
+    params: dict[str, list] = {"years": [int(y) for y in years]}
+    where = ["year_num IN UNNEST(@years)"]
+    if counties is not None:
+        where.append("state_cnty_fips_cd IN UNNEST(@counties)")
+        params["counties"] = [str(c).zfill(5) for c in counties]
+    if naics is not None:
+        where.append("naics2_sector_cd IN UNNEST(@naics)")
+        params["naics"] = [str(n).zfill(2) for n in naics]
     query = f"""
         SELECT
             year_num,
@@ -243,58 +354,58 @@ def fetch_rdm_qcew(
             qcew_ttl_ann_wage_usd_amt AS rdm_qcew_wages_usd,
             qcew_avg_wkly_wage_usd_amt AS rdm_qcew_avg_weekly_wage_usd
         FROM `{QCEW_TABLE}`
-        WHERE year_num IN UNNEST(@years)
-          AND state_cnty_fips_cd IN UNNEST(@counties)
-          AND naics2_sector_cd IN UNNEST(@naics)
+        WHERE {" AND ".join(where)}
     """
-    job_config = bigquery.QueryJobConfig(
-        query_parameters=[
-            bigquery.ArrayQueryParameter("years", "INT64", years),
-            bigquery.ArrayQueryParameter("counties", "STRING", [str(c).zfill(5) for c in counties]),
-            bigquery.ArrayQueryParameter("naics", "STRING", [str(n).zfill(2) for n in naics]),
-        ]
-    )
-    df = client.query(query, job_config=job_config).to_dataframe()
+    df = query_warehouse(query, params)
     df["state_cnty_fips_cd"] = df["state_cnty_fips_cd"].astype(str).str.zfill(5)
     df["naics2_sector_cd"] = df["naics2_sector_cd"].astype(str).str.zfill(2)
     return df
 
 
-def reconcile_qcew(source_df: pd.DataFrame, rdm_df: pd.DataFrame, allow_wage_tolerance: bool) -> pd.DataFrame:
-    rows: list[dict[str, Any]] = []
-    for _, row in source_df.iterrows():
-        notes: list[str] = []
-        emp, emp_note = _parse_numeric(row.get("annual_avg_emplvl"))
-        if emp_note:
-            notes.append(emp_note)
-        wages, wages_note = _parse_numeric(row.get("total_annual_wages"))
-        if wages_note:
-            notes.append(wages_note)
-        avg_wage, avg_note = _parse_numeric(row.get("annual_avg_wkly_wage"))
-        if avg_note:
-            notes.append(avg_note)
-
-        rows.append(
-            {
-                "year_num": int(row["year"]),
-                "state_cnty_fips_cd": row["state_cnty_fips_cd"],
-                "state_fips": row["state_fips"],
-                "county_fips": row["county_fips"],
-                "naics2_sector_cd": row["naics2_sector_cd"],
-                "source_qcew_annual_avg_emplvl": emp,
-                "source_qcew_total_annual_wages_usd": wages,
-                "source_qcew_avg_weekly_wage_usd": avg_wage,
-                "notes": ";".join(sorted(set(notes))) if notes else "",
-            }
-        )
+def _parse_numeric_column(values: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """Parse a source metric column → (float values with NaN, source note bits).
+
+    None is `source_missing`; suppression tokens are `source_suppressed`;
+    anything else that does not parse as a float is `source_non_numeric`.
+    Other nulls and "nan" text parse to NaN without a note.
+    """
+    objects = values.astype(object)
+    is_none = np.fromiter((v is None for v in objects), dtype=bool, count=len(objects))
+    null = objects.isna().to_numpy()
+    text = objects.where(~null).astype("string").str.strip()
+    suppressed = text.isin(SUPPRESSED_VALUES).fillna(False).to_numpy(dtype=bool)
+    nan_text = text.str.lower().str.lstrip("+-").eq("nan").fillna(False).to_numpy(dtype=bool)
+    parsed = pd.to_numeric(text.where(~suppressed), errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    non_numeric = np.isnan(parsed) & ~null & ~suppressed & ~nan_text
+    notes = is_none * NOTE_MISSING + suppressed * NOTE_SUPPRESSED + non_numeric * NOTE_NON_NUMERIC
+    return parsed, notes.astype(np.uint8)
+
 
-    source_clean = pd.DataFrame(rows)
-    merged = source_clean.merge(
-        rdm_df,
-        how="outer",
-        on=["year_num", "state_cnty_fips_cd", "naics2_sector_cd"],
-        suffixes=("", "_rdm"),
+def reconcile_qcew(source_df: pd.DataFrame, rdm_df: pd.DataFrame, allow_wage_tolerance: bool) -> pd.DataFrame:
+    n = len(source_df)
+    source_masks = np.zeros(n, dtype=np.uint8)
+    parsed: dict[str, np.ndarray] = {}
+    for column in METRIC_COLUMNS:
+        if column in source_df.columns:
+            parsed[column], note = _parse_numeric_column(source_df[column])
+        else:
+            parsed[column], note = np.full(n, np.nan), np.full(n, NOTE_MISSING, dtype=np.uint8)
+        source_masks |= note
+
+    source_clean = pd.DataFrame(
+        {
+            "year_num": source_df["year"].astype(int).to_numpy(),
+            "state_cnty_fips_cd": source_df["state_cnty_fips_cd"].to_numpy(),
+            "state_fips": source_df["state_fips"].to_numpy(),
+            "county_fips": source_df["county_fips"].to_numpy(),
+            "naics2_sector_cd": source_df["naics2_sector_cd"].to_numpy(),
+            "source_qcew_annual_avg_emplvl": parsed["annual_avg_emplvl"],
+            "source_qcew_total_annual_wages_usd": parsed["total_annual_wages"],
+            "source_qcew_avg_weekly_wage_usd": parsed["annual_avg_wkly_wage"],
+            "notes": render_notes(source_masks),
+        }
     )
+    merged = merge_on_keys(source_clean, rdm_df, how="outer", suffixes=("", "_rdm"))
     merged["state_cnty_fips_cd"] = merged["state_cnty_fips_cd"].astype(str).str.zfill(5)
     merged["state_fips"] = merged["state_cnty_fips_cd"].str[:2]
     merged["county_fips"] = merged["state_cnty_fips_cd"].str[2:]
@@ -322,66 +433,48 @@ def reconcile_qcew(source_df: pd.DataFrame, rdm_df: pd.DataFrame, allow_wage_tol
         merged["rdm_qcew_avg_weekly_wage_usd"] - merged["source_qcew_avg_weekly_wage_usd"]
     )
 
-    merged["delta_emp_pct"] = merged.apply(
-        lambda r: safe_divide(r["delta_emp"], r["source_qcew_annual_avg_emplvl"]), axis=1
+    merged["delta_emp_pct"] = safe_divide_series(merged["delta_emp"], merged["source_qcew_annual_avg_emplvl"])
+    merged["delta_wages_pct"] = safe_divide_series(
+        merged["delta_wages_usd"], merged["source_qcew_total_annual_wages_usd"]
     )
-    merged["delta_wages_pct"] = merged.apply(
-        lambda r: safe_divide(r["delta_wages_usd"], r["source_qcew_total_annual_wages_usd"]), axis=1
+    merged["delta_avg_weekly_wage_pct"] = safe_divide_series(
+        merged["delta_avg_weekly_wage_usd"], merged["source_qcew_avg_weekly_wage_usd"]
     )
-    merged["delta_avg_weekly_wage_pct"] = merged.apply(
-        lambda r: safe_divide(r["delta_avg_weekly_wage_usd"], r["source_qcew_avg_weekly_wage_usd"]), axis=1
-    )
-
-    def _pass_exact(delta: Any, left: Any, right: Any) -> Optional[bool]:
-        if pd.isna(left) or pd.isna(right):
-            return None
-        return delta == 0
 
-    def _pass_tol(delta: Any, left: Any, right: Any, tol: float) -> Optional[bool]:
-        if pd.isna(left) or pd.isna(right):
-            return None
-        return abs(delta) <= tol
-
-    merged["pass_emp"] = merged.apply(
-        lambda r: _pass_exact(r["delta_emp"], r["rdm_qcew_emp"], r["source_qcew_annual_avg_emplvl"]),
-        axis=1,
+    merged["pass_emp"] = tolerance_pass(
+        merged["delta_emp"], merged["rdm_qcew_emp"], merged["source_qcew_annual_avg_emplvl"], missing=None
     )
-    merged["pass_wages"] = merged.apply(
-        lambda r: _pass_exact(r["delta_wages_usd"], r["rdm_qcew_wages_usd"], r["source_qcew_total_annual_wages_usd"]),
-        axis=1,
+    merged["pass_wages"] = tolerance_pass(
+        merged["delta_wages_usd"],
+        merged["rdm_qcew_wages_usd"],
+        merged["source_qcew_total_annual_wages_usd"],
+        missing=None,
     )
-    merged["pass_avg_weekly_wage"] = merged.apply(
-        lambda r: _pass_tol(r["delta_avg_weekly_wage_usd"], r["rdm_qcew_avg_weekly_wage_usd"], r["source_qcew_avg_weekly_wage_usd"], 1.0)
-        if allow_wage_tolerance
-        else _pass_exact(r["delta_avg_weekly_wage_usd"], r["rdm_qcew_avg_weekly_wage_usd"], r["source_qcew_avg_weekly_wage_usd"]),
-        axis=1,
+    merged["pass_avg_weekly_wage"] = tolerance_pass(
+        merged["delta_avg_weekly_wage_usd"],
+        merged["rdm_qcew_avg_weekly_wage_usd"],
+        merged["source_qcew_avg_weekly_wage_usd"],
+        1.0 if allow_wage_tolerance else 0.0,
+        missing=None,
     )
 
-    pass_all = []
-    notes = []
-    for _, row in merged.iterrows():
-        row_notes = row.get("notes", "")
-        flags = [row_notes] if row_notes else []
-        if pd.isna(row["source_qcew_annual_avg_emplvl"]) and pd.isna(row["rdm_qcew_emp"]):
-            flags.append("missing_from_both")
-            pass_all.append(None)
-        elif pd.isna(row["source_qcew_annual_avg_emplvl"]):
-            flags.append("missing_from_source")
-            pass_all.append(None)
-        elif pd.isna(row["rdm_qcew_emp"]):
-            flags.append("missing_from_rdm")
-            pass_all.append(False)
-        else:
-            if row["pass_emp"] is True and row["pass_wages"] is True:
-                pass_all.append(True)
-            elif row["pass_emp"] is None or row["pass_wages"] is None:
-                pass_all.append(None)
-            else:
-                pass_all.append(False)
-        notes.append(";".join([flag for flag in flags if flag]))
-
-    merged["pass_all"] = pass_all
-    merged["notes"] = notes
+    source_missing = merged["source_qcew_annual_avg_emplvl"].isna().to_numpy()
+    rdm_missing = merged["rdm_qcew_emp"].isna().to_numpy()
+    masks = np.select(
+        [source_missing & rdm_missing, source_missing, rdm_missing],
+        [MISSING_FROM_BOTH, MISSING_FROM_SOURCE, MISSING_FROM_RDM],
+        0,
+    )
+    emp_known = merged["pass_emp"].notna().to_numpy()
+    wages_known = merged["pass_wages"].notna().to_numpy()
+    both_pass = (merged["pass_emp"] == True).to_numpy() & (merged["pass_wages"] == True).to_numpy()  # noqa: E712
+    pass_all = np.select(
+        [source_missing, rdm_missing, both_pass, ~(emp_known & wages_known)],
+        [None, False, True, None],
+        False,
+    )
+    merged["pass_all"] = pd.Series(pass_all, index=merged.index, dtype=object)
+    merged["notes"] = append_flag_notes(merged["notes"], masks, MISSING_LABELS)
 
     keep = [
         "year_num",
@@ -435,6 +528,36 @@ def write_outputs(df: pd.DataFrame, outdir: Path, publish_bq: bool, bq_table: st
     return out_path, latest_path
 
 
+def write_outputs_full(
+    df: pd.DataFrame,
+    outdir: Path,
+    publish_bq: bool,
+    bq_table: str,
+    fmt: str = "parquet",
+) -> tuple[Path, Path]:
+    """Write the full-surface result; Parquet output is partitioned by year_num."""
+    outdir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    out_path = write_table(df, outdir / f"qcew_reconciliation_full_{timestamp}.csv", fmt)
+    latest_path = write_table(df, outdir / "qcew_reconciliation_full_latest.csv", fmt)
+
+    if publish_bq:
+        try:
+            from google.cloud import bigquery
+        except ImportError as exc:
+            raise RuntimeError("google-cloud-bigquery is required to publish results") from exc
+
+        client = bigquery.Client()
+        run_id = str(uuid.uuid4())
+        run_ts = datetime.now(timezone.utc)
+        load_df = df.copy()
+        load_df["run_id"] = run_id
+        load_df["run_ts_utc"] = run_ts
+        job_config = bigquery.LoadJobConfig(write_disposition="WRITE_APPEND")
+        client.load_table_from_dataframe(load_df, bq_table, job_config=job_config).result()
+    return out_path, latest_path
+
+
 def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="QCEW annual averages reconciliation QA.")
     parser.add_argument("--years", nargs="+", type=int, default=DEFAULT_YEARS)
@@ -449,6 +572,7 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     parser.add_argument("--agg_level", default="74")
     parser.add_argument("--allow_wage_tolerance", default="true")
     parser.add_argument("--rdm_csv", default=None)
+    add_warehouse_arguments(parser)
     return parser.parse_args(argv)
 
 
@@ -458,8 +582,16 @@ def run(config: QcewConfig) -> pd.DataFrame:
     return reconcile_qcew(source_df, rdm_df, config.allow_wage_tolerance)
 
 
+def run_full_surface(config: QcewConfig) -> pd.DataFrame:
+    """Reconcile every county × NAICS2 × year; `config.counties`/`naics` are ignored."""
+    source_df = load_qcew_source_full(config)
+    rdm_df = fetch_rdm_qcew(config.years, None, None, config.rdm_csv)
+    return reconcile_qcew(source_df, rdm_df, config.allow_wage_tolerance)
+
+
 def main(argv: Optional[list[str]] = None) -> None:
     args = parse_args(argv)
+    configure_from_args(args)
     config = QcewConfig(
         years=args.years,
         counties=[str(c).zfill(5) for c in args.counties],
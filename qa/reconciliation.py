@@ -8,29 +8,51 @@ Purpose
 How to run
   python -m qa.reconciliation --systems abs qcew --years 2022 2023 \
       --counties 06075 06085 --naics 42 62 --outdir artifacts/qa --publish_bq false
+  Full surface (every county × NAICS2): --mode abs_full_surface or
+  --mode qcew_full_surface (QCEW writes a year_num-partitioned Parquet
+  artifact unless --full_format csv).
+  --concurrent true runs the selected systems side by side (ABS waits on
+  Census, QCEW on the singlefile scan), so the standard run takes about as
+  long as the slower system; the combined CSV and summary follow both.
 """
 
 from __future__ import annotations
 
 import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import pandas as pd
 
 from qa.abs_reconciliation import (
+    DEFAULT_CENSUS_CONCURRENCY,
     AbsConfig,
     run as run_abs,
     run_full_surface as run_abs_full_surface,
     write_outputs_full as write_abs_outputs_full,
 )
-from qa.qcew_reconciliation import QcewConfig, run as run_qcew
+from qa.qcew_reconciliation import (
+    QcewConfig,
+    run as run_qcew,
+    run_full_surface as run_qcew_full_surface,
+    write_outputs_full as write_qcew_outputs_full,
+)
 from qa.utils import parse_bool
+from scripts.common.census_cache import add_census_cache_arguments, configure_from_args
+from scripts.common.table_io import FORMATS
+from scripts.common.warehouse import (
+    add_warehouse_arguments,
+    configure_from_args as configure_warehouse_from_args,
+)
 
 
 DEFAULT_OUTDIR = "artifacts/qa"
 DEFAULT_ABS_FULL_BQ_TABLE = "rdm-datalab-portfolio.portfolio_data.qa_abs_reconciliation_full"
+DEFAULT_QCEW_FULL_BQ_TABLE = "rdm-datalab-portfolio.portfolio_data.qa_qcew_reconciliation_full"
+SYSTEM_LABELS = {"abs": "ABS", "qcew": "QCEW"}
 
 
 def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
@@ -42,8 +64,31 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     parser.add_argument("--naics", nargs="+", default=["42", "62"])
     parser.add_argument("--outdir", default=DEFAULT_OUTDIR)
     parser.add_argument("--publish_bq", default="false")
-    parser.add_argument("--bq_table", default=DEFAULT_ABS_FULL_BQ_TABLE)
+    parser.add_argument(
+        "--concurrent",
+        default="false",
+        help="Run the selected systems in parallel workers (standard mode).",
+    )
+    parser.add_argument(
+        "--bq_table",
+        default=None,
+        help="BigQuery table for full-surface modes (default: the mode's qa_*_reconciliation_full table).",
+    )
     parser.add_argument("--rdm_csv", default=None)
+    parser.add_argument(
+        "--census_concurrency",
+        type=int,
+        default=DEFAULT_CENSUS_CONCURRENCY,
+        help="Concurrent Census state requests in abs_full_surface mode (1 = sequential).",
+    )
+    parser.add_argument(
+        "--full_format",
+        choices=FORMATS,
+        default="parquet",
+        help="Artifact format for qcew_full_surface mode (parquet is partitioned by year_num).",
+    )
+    add_census_cache_arguments(parser)
+    add_warehouse_arguments(parser)
     return parser.parse_args(argv)
 
 
@@ -87,16 +132,92 @@ def write_summary(outdir: Path, abs_df: pd.DataFrame | None, qcew_df: pd.DataFra
     return summary_path
 
 
+def qcew_config_from_args(args: argparse.Namespace, outdir: Path, publish_bq: bool) -> QcewConfig:
+    return QcewConfig(
+        years=args.years,
+        counties=[str(c).zfill(5) for c in args.counties],
+        naics=[str(n).zfill(2) for n in args.naics],
+        outdir=outdir,
+        publish_bq=publish_bq,
+        bq_table="rdm-datalab-portfolio.portfolio_data.qa_qcew_reconciliation",
+        raw_template="data_raw/qcew/{year}.annual.singlefile.csv",
+        cache_dir=Path("data_raw/qcew/source_qa"),
+        ownership_code="5",
+        agg_level="74",
+        allow_wage_tolerance=True,
+        rdm_csv=Path(args.rdm_csv) if args.rdm_csv else None,
+    )
+
+
+def abs_config_from_args(args: argparse.Namespace, outdir: Path, publish_bq: bool) -> AbsConfig:
+    return AbsConfig(
+        years=args.years,
+        counties=[str(c).zfill(5) for c in args.counties],
+        naics=[str(n).zfill(2) for n in args.naics],
+        outdir=outdir,
+        publish_bq=publish_bq,
+        bq_table="rdm-datalab-portfolio.portfolio_data.qa_abs_reconciliation",
+        rdm_csv=Path(args.rdm_csv) if args.rdm_csv else None,
+    )
+
+
+def _run_system(system: str, runner: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    label = SYSTEM_LABELS[system]
+    log(f"Starting {label} reconciliation...")
+    started = time.perf_counter()
+    try:
+        df = runner()
+    except Exception as exc:
+        log(f"{label} reconciliation failed: {exc!r}")
+        raise
+    df = df.copy()
+    df["source_system"] = system
+    log(f"{label} reconciliation complete (rows: {len(df)}, {time.perf_counter() - started:.1f}s).")
+    return df
+
+
+def run_systems(
+    runners: dict[str, Callable[[], pd.DataFrame]], concurrent: bool = False
+) -> dict[str, pd.DataFrame]:
+    """Run each system's reconciliation; {system: frame} in `runners` order.
+
+    With `concurrent`, every system gets its own worker thread (the work is
+    network- or disk-bound, so threads overlap it without pickling configs or
+    losing the process-wide cache/warehouse settings). All workers are waited
+    for; the first failure is then re-raised.
+    """
+    if not concurrent or len(runners) <= 1:
+        return {system: _run_system(system, runner) for system, runner in runners.items()}
+
+    started = time.perf_counter()
+    results: dict[str, pd.DataFrame] = {}
+    error: Optional[BaseException] = None
+    with ThreadPoolExecutor(max_workers=len(runners), thread_name_prefix="recon") as pool:
+        futures = {pool.submit(_run_system, system, runner): system for system, runner in runners.items()}
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as exc:
+                error = error or exc
+            log(f"Finished {len(results)}/{len(runners)} systems ({time.perf_counter() - started:.1f}s elapsed).")
+    if error is not None:
+        raise error
+    return {system: results[system] for system in runners}
+
+
 def main(argv: Optional[list[str]] = None) -> None:
     # ---------------------------
     # Parse CLI args and prepare
     # ---------------------------
     args = parse_args(argv)
+    configure_from_args(args)
+    warehouse = configure_warehouse_from_args(args)
     mode = args.mode.lower()
     systems = [s.lower() for s in args.systems]
     outdir = Path(args.outdir)
     outdir.mkdir(parents=True, exist_ok=True)
     publish_bq = parse_bool(args.publish_bq)
+    concurrent = parse_bool(args.concurrent)
     log(f"Systems: {systems}")
     log(f"Mode: {mode}")
     log(f"Years: {args.years}")
@@ -104,21 +225,25 @@ def main(argv: Optional[list[str]] = None) -> None:
     log(f"NAICS: {args.naics}")
     log(f"Output dir: {outdir}")
     log(f"Publish to BigQuery: {publish_bq}")
-    log(f"BigQuery table: {args.bq_table}")
+    log(f"Concurrent systems: {concurrent}")
+    log(f"BigQuery table: {args.bq_table or 'mode default'}")
     log(f"RDM CSV override: {args.rdm_csv or 'None'}")
+    log(f"Warehouse: {warehouse.name}")
     abs_df = None
     qcew_df = None
 
     if mode == "abs_full_surface":
         log("Starting ABS full-surface reconciliation...")
         try:
-            abs_df = run_abs_full_surface(args.years)
+            abs_df = run_abs_full_surface(args.years, concurrency=args.census_concurrency)
         except Exception as exc:
             log(f"ABS full-surface reconciliation failed: {exc!r}")
             raise
         abs_df = abs_df.copy()
         abs_df["source_system"] = "abs"
-        out_path, latest_path = write_abs_outputs_full(abs_df, outdir, publish_bq, args.bq_table)
+        out_path, latest_path = write_abs_outputs_full(
+            abs_df, outdir, publish_bq, args.bq_table or DEFAULT_ABS_FULL_BQ_TABLE
+        )
         total = len(abs_df)
         passed = int(abs_df["pass_all"].sum()) if total else 0
         failures = abs_df[abs_df["pass_all"] == False]
@@ -134,56 +259,35 @@ def main(argv: Optional[list[str]] = None) -> None:
                 )
         return
 
-    if "abs" in systems:
-        # ---------------------------
-        # ABS reconciliation workflow
-        # ---------------------------
-        log("Starting ABS reconciliation...")
-        abs_config = AbsConfig(
-            years=args.years,
-            counties=[str(c).zfill(5) for c in args.counties],
-            naics=[str(n).zfill(2) for n in args.naics],
-            outdir=outdir,
-            publish_bq=publish_bq,
-            bq_table="rdm-datalab-portfolio.portfolio_data.qa_abs_reconciliation",
-            rdm_csv=Path(args.rdm_csv) if args.rdm_csv else None,
-        )
+    if mode == "qcew_full_surface":
+        log("Starting QCEW full-surface reconciliation...")
         try:
-            abs_df = run_abs(abs_config)
+            qcew_df = run_qcew_full_surface(qcew_config_from_args(args, outdir, publish_bq))
         except Exception as exc:
-            log(f"ABS reconciliation failed: {exc!r}")
-            raise
-        abs_df = abs_df.copy()
-        abs_df["source_system"] = "abs"
-        log(f"ABS reconciliation complete (rows: {len(abs_df)}).")
-
-    if "qcew" in systems:
-        # ---------------------------
-        # QCEW reconciliation workflow
-        # ---------------------------
-        log("Starting QCEW reconciliation...")
-        qcew_config = QcewConfig(
-            years=args.years,
-            counties=[str(c).zfill(5) for c in args.counties],
-            naics=[str(n).zfill(2) for n in args.naics],
-            outdir=outdir,
-            publish_bq=publish_bq,
-            bq_table="rdm-datalab-portfolio.portfolio_data.qa_qcew_reconciliation",
-            raw_template="data_raw/qcew/{year}.annual.singlefile.csv",
-            cache_dir=Path("data_raw/qcew/source_qa"),
-            ownership_code="5",
-            agg_level="74",
-            allow_wage_tolerance=True,
-            rdm_csv=Path(args.rdm_csv) if args.rdm_csv else None,
-        )
-        try:
-            qcew_df = run_qcew(qcew_config)
-        except Exception as exc:
-            log(f"QCEW reconciliation failed: {exc!r}")
+            log(f"QCEW full-surface reconciliation failed: {exc!r}")
             raise
         qcew_df = qcew_df.copy()
         qcew_df["source_system"] = "qcew"
-        log(f"QCEW reconciliation complete (rows: {len(qcew_df)}).")
+        out_path, latest_path = write_qcew_outputs_full(
+            qcew_df, outdir, publish_bq, args.bq_table or DEFAULT_QCEW_FULL_BQ_TABLE, args.full_format
+        )
+        total = len(qcew_df)
+        passed = int((qcew_df["pass_all"] == True).sum()) if total else 0
+        failures = int((qcew_df["pass_all"] == False).sum())
+        log(f"Wrote {out_path} and {latest_path}")
+        log(f"QCEW pass_all: {passed}/{total} ({failures} failures)")
+        return
+
+    runners: dict[str, Callable[[], pd.DataFrame]] = {}
+    if "abs" in systems:
+        abs_config = abs_config_from_args(args, outdir, publish_bq)
+        runners["abs"] = lambda: run_abs(abs_config)
+    if "qcew" in systems:
+        qcew_config = qcew_config_from_args(args, outdir, publish_bq)
+        runners["qcew"] = lambda: run_qcew(qcew_config)
+    results = run_systems(runners, concurrent=concurrent)
+    abs_df = results.get("abs")
+    qcew_df = results.get("qcew")
 
     # ---------------------------
     # Combine outputs and persist
@@ -3,6 +3,9 @@ from __future__ import annotations
 import math
 from typing import Optional
 
+import numpy as np
+import pandas as pd
+
 
 def parse_bool(value: str | bool | None, default: bool = False) -> bool:
     """Parse common CLI truthy/falsey strings."""
@@ -28,3 +31,47 @@ def safe_divide(numerator: Optional[float], denominator: Optional[float]) -> Opt
         return None
     return numerator / denominator
 
+
+
+def safe_divide_series(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
+    """Vectorized `safe_divide`: NaN where either side is missing or the denominator is 0."""
+    valid = numerator.notna() & denominator.notna() & (denominator != 0)
+    return (numerator / denominator.where(valid)).where(valid)
+
+
+def tolerance_pass(
+    delta: pd.Series,
+    left: pd.Series,
+    right: pd.Series,
+    tol: float = 0.0,
+    missing: Optional[bool] = False,
+) -> pd.Series:
+    """|delta| <= tol where both sides are present, `missing` elsewhere.
+
+    With `missing=None` the result is an object column of True/False/None.
+    """
+    present = left.notna() & right.notna()
+    passed = delta.abs() <= tol
+    if missing is False:
+        return passed & present
+    return passed.astype(object).where(present, missing)
+
+
+def append_flag_notes(notes: pd.Series, masks: np.ndarray, labels: dict[int, str]) -> pd.Series:
+    """Append the labels of the bits set in `masks` to `notes` (";"-joined).
+
+    Only rows with a non-zero mask are rendered; the others keep their notes.
+    """
+    out = notes.where(notes.notna(), "").astype(str)
+    flagged = np.asarray(masks) != 0
+    if not flagged.any():
+        return out
+    flagged_masks = np.asarray(masks)[flagged]
+    rendered = np.empty(len(flagged_masks), dtype=object)
+    for mask in np.unique(flagged_masks):
+        rendered[flagged_masks == mask] = ";".join(
+            label for bit, label in sorted(labels.items()) if mask & bit
+        )
+    current = out.to_numpy(dtype=object)[flagged]
+    out.iloc[np.flatnonzero(flagged)] = np.where(current != "", current + ";" + rendered, rendered)
+    return out
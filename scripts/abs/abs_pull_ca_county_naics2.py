@@ -17,10 +17,17 @@ NOTE: PAYANN and RCPPDEMP are in thousands of dollars ($1,000s).
 from __future__ import annotations
 
 import sys
-import requests
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
 
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from scripts.common.census_client import default_client  # type: ignore # noqa: E402
+
 
 ABS_URL = "https://api.census.gov/data/2022/abscs"
 GET_FIELDS = [
@@ -42,13 +49,9 @@ def fetch_abs_abscs_county_naics2(state_fips: str = "06") -> pd.DataFrame:
         "in": f"state:{state_fips}",
         "INDLEVEL": "2"
     }
-    r = requests.get(ABS_URL, params=params, timeout=90)
-    r.raise_for_status()
-    data = r.json()
-    if not data or len(data) < 2:
+    df = default_client().get_frame(ABS_URL, params)
+    if df.empty:
         raise RuntimeError("Empty response from ABS API (check parameters or network).")
-    hdr = data[0]
-    df = pd.DataFrame(data[1:], columns=hdr)
     return df
 
 
@@ -6,6 +6,7 @@ Usage:
   python scripts/abs/econ_bnchmrk_abs.py \
       --years 2022 2023 \
       --out_csv data_clean/abs/econ_bnchmrk_abs_multiyear.csv
+  # Add --workers 2 to pull/normalize the vintages in parallel processes.
   # Manual step: upload econ_bnchmrk_abs_multiyear.csv to GCS after inspecting output
 
 Mirrors notebooks/abs/econ_bnchmrk_2022_abs.ipynb:
@@ -23,12 +24,26 @@ MVP Scope:
 from __future__ import annotations
 
 import argparse
+import sys
 from pathlib import Path
 from typing import Optional
 
 import numpy as np
 import pandas as pd
-import requests
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from scripts.common.batch import iter_year_results  # type: ignore # noqa: E402
+from scripts.common.census_cache import (  # type: ignore # noqa: E402
+    add_census_cache_arguments,
+    cached_frame,
+    configure_from_args,
+    install_census_cache,
+)
+from scripts.common.keys import count_duplicate_keys  # type: ignore # noqa: E402
+from scripts.common.table_io import FORMATS, write_table  # type: ignore # noqa: E402
 
 ABS_BASE_FIELDS = [
     "NAME",
@@ -78,10 +93,7 @@ def fetch_abs(year: int) -> pd.DataFrame:
     url = f"https://api.census.gov/data/{year}/abscs"
     params = {"get": build_field_list(year), "for": "county:*", "INDLEVEL": "2"}
     print(f"[ABS] Fetching year {year} from {url} …")
-    resp = requests.get(url, params=params, timeout=60)
-    resp.raise_for_status()
-    header, *rows = resp.json()
-    df = pd.DataFrame(rows, columns=header)
+    df = cached_frame(url, params)
     df["year_num"] = year
     return df
 
@@ -177,6 +189,13 @@ def normalize_abs(df: pd.DataFrame, year: int) -> pd.DataFrame:
     return df
 
 
+def process_year(year: int) -> pd.DataFrame:
+    """Fetch, filter, and normalize one ABS vintage."""
+    raw = fetch_abs(year)
+    raw = filter_abs_private_employer(raw, year)
+    return normalize_abs(raw, year)
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Download ABS county × NAICS2 benchmarking data."
@@ -203,11 +222,25 @@ def parse_args() -> argparse.Namespace:
         default=str(DEFAULT_STACKED_OUT),
         help=f"Combined multiyear output path (default: {DEFAULT_STACKED_OUT})",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Process vintages in parallel with this many worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="csv",
+        help="Output format; parquet writes year_num-partitioned zstd datasets (default: csv).",
+    )
+    add_census_cache_arguments(parser)
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
+    cache = configure_from_args(args)
     if args.years:
         years = sorted(set(args.years))
     elif args.year:
@@ -216,26 +249,32 @@ def main() -> None:
         years = MVP_YEARS.copy()
 
     per_year_template = args.per_year_pattern
-    stacked_frames = []
-
-    for year in years:
-        raw = fetch_abs(year)
-        raw = filter_abs_private_employer(raw, year)
-        df = normalize_abs(raw, year)
-        per_year_path = Path(per_year_template.format(year=year))
-        per_year_path.parent.mkdir(parents=True, exist_ok=True)
-        df.to_csv(per_year_path, index=False)
+    frames_by_year: dict[int, pd.DataFrame] = {}
+
+    year_args = {year: (year,) for year in years}
+    # Workers get the parent's cache settings (--offline, --refresh_census, …)
+    # even when they are spawned rather than forked.
+    results = iter_year_results(
+        process_year,
+        year_args,
+        workers=args.workers,
+        initializer=install_census_cache,
+        initargs=(cache,),
+    )
+    for year, df in results:
+        per_year_path = write_table(
+            df, per_year_template.format(year=year), args.format, table="econ_bnchmrk_abs"
+        )
         print(f"[ABS] Wrote {per_year_path} ({len(df):,} rows).")
-        stacked_frames.append(df)
+        frames_by_year[year] = df
+    stacked_frames = [frames_by_year[year] for year in years]
 
     if args.out_csv:
         combined = pd.concat(stacked_frames, ignore_index=True)
-        dupes = combined.duplicated(subset=["year_num", "state_cnty_fips_cd", "naics2_sector_cd"]).sum()
+        dupes = count_duplicate_keys(combined)
         if dupes:
             raise AssertionError(f"Found {dupes} duplicate rows in combined ABS output.")
-        out_path = Path(args.out_csv)
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        combined.to_csv(out_path, index=False)
+        out_path = write_table(combined, args.out_csv, args.format, table="econ_bnchmrk_abs")
         print(f"[ABS] Wrote combined dataset: {out_path} ({len(combined):,} rows).")
 
 
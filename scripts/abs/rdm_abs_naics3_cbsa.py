@@ -11,11 +11,23 @@
 #   - abs_cbsa_naics3_discrepancies.csv
 #
 import argparse
+import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import re
 
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from scripts.common.aggregate import GroupSumAggregator  # type: ignore # noqa: E402
+from scripts.common.keys import FIPS_MISSING, decode_fips, encode_fips  # type: ignore # noqa: E402
+from scripts.common.table_io import FORMATS, write_table  # type: ignore # noqa: E402
+
+ABS_MEASURES = ["FIRMPDEMP","EMP","PAYANN","RCPPDEMP"]
+DEFAULT_CHUNKSIZE = 100_000
+
 def zfill_series(s, n):
     return s.astype(str).str.extract(r"(\d+)", expand=False).fillna("").str.zfill(n)
 
@@ -88,65 +100,137 @@ def normalize_crosswalk(df):
         df["cbsa_pop"] = pd.to_numeric(df["cbsa_pop"], errors="coerce")
     return df
 
+class AbsRollup:
+    """County recon + CBSA × NAICS3 sums folded chunk by chunk.
+
+    Group keys are integer codes: county as the 5-digit FIPS (keys.encode_fips),
+    CBSA code through the same 5-digit codec, NAICS3 as its integer value.
+    Only the four per-key aggregators are kept, so the ABS file can be
+    streamed with --chunksize instead of loaded whole.
+    """
+
+    def __init__(self, xwalk_df, year=None):
+        self.year = year
+        if xwalk_df.duplicated(["state_fips", "county_fips"]).any():
+            raise ValueError("Crosswalk has more than one CBSA row per county.")
+        county = encode_fips(xwalk_df["state_fips"] + xwalk_df["county_fips"])
+        cbsa_by_county = pd.Series(encode_fips(xwalk_df["cbsa_code"]), index=county)
+        self._cbsa_by_county = cbsa_by_county[cbsa_by_county.index != FIPS_MISSING]
+        titles = xwalk_df.dropna(subset=["cbsa_code"]).drop_duplicates("cbsa_code")
+        self._cbsa_titles = pd.Series(
+            titles["cbsa_title"].to_numpy(), index=encode_fips(titles["cbsa_code"])
+        )
+        self.county_parts = GroupSumAggregator(["county_code"], ABS_MEASURES)
+        self.county_totals = GroupSumAggregator(["county_code"], ABS_MEASURES)
+        self.cbsa_parts = GroupSumAggregator(["cbsa_code", "naics3_code"], ABS_MEASURES)
+        self.cbsa_totals = GroupSumAggregator(["cbsa_code"], ABS_MEASURES)
+        self.skipped = 0
+        # A measure stays int64 only if it parsed as integers in every chunk,
+        # matching the dtype to_numeric gives the whole column.
+        self._integer = dict.fromkeys(ABS_MEASURES, True)
+
+    def update(self, abs_chunk):
+        for col in ABS_MEASURES:
+            self._integer[col] &= pd.api.types.is_integer_dtype(abs_chunk[col])
+        base = abs_chunk
+        if self.year is not None and "year" in base.columns:
+            base = base[base["year"] == self.year]
+        county = encode_fips(base["state"] + base["county"])
+        coded = base[ABS_MEASURES].astype(float).assign(
+            county_code=county,
+            cbsa_code=self._cbsa_by_county.reindex(county).fillna(FIPS_MISSING).astype(np.int32).to_numpy(),
+            naics3_code=pd.to_numeric(base["naics3"], errors="coerce").fillna(-1).astype(np.int32).to_numpy(),
+        )
+        self.skipped += int((county == FIPS_MISSING).sum())
+        coded = coded[county != FIPS_MISSING]
+        is_total = (base["naics3"] == "000").to_numpy()[county != FIPS_MISSING]
+        self.county_parts.update(coded[~is_total])
+        self.county_totals.update(coded[is_total])
+        # Counties outside the crosswalk have no CBSA (groupby used to drop their NaN key).
+        in_cbsa = coded["cbsa_code"] != FIPS_MISSING
+        self.cbsa_parts.update(coded[~is_total & in_cbsa])
+        self.cbsa_totals.update(coded[is_total & in_cbsa])
+        return self
+
+    def _finalize(self, agg):
+        out = agg.finalize(min_count=1)
+        for col in ABS_MEASURES:
+            if self._integer[col]:
+                out[col] = out[col].astype(np.int64)
+        return out
+
+    def _county_frame(self, agg):
+        out = self._finalize(agg)
+        fips = decode_fips(out.pop("county_code").to_numpy())
+        out.insert(0, "state", fips.str[:2].to_numpy())
+        out.insert(1, "county", fips.str[2:].to_numpy())
+        return out
+
+    def _cbsa_frame(self, agg):
+        out = self._finalize(agg)
+        codes = out.pop("cbsa_code").to_numpy()
+        out.insert(0, "cbsa_code", decode_fips(codes).to_numpy())
+        out.insert(1, "cbsa_title", self._cbsa_titles.reindex(codes).to_numpy())
+        if "naics3_code" in out.columns:
+            naics = out.pop("naics3_code")
+            out.insert(2, "naics3", naics.astype(str).where(naics >= 0, "").to_numpy())
+        return out
+
+    def recon_report(self, atol=1.0):
+        if self.skipped:
+            print(f"Skipped {self.skipped:,} ABS rows without a 5-digit state+county FIPS.")
+        key = ["state","county"]
+        sums = self._county_frame(self.county_parts)
+        totals = self._county_frame(self.county_totals)
+
+        # Rename for clarity
+        sums = sums.rename(columns={"FIRMPDEMP":"sum_firms","EMP":"sum_emp","PAYANN":"sum_pay","RCPPDEMP":"sum_rcpts"})
+        totals = totals.rename(columns={"FIRMPDEMP":"tot_firms","EMP":"tot_emp","PAYANN":"tot_pay","RCPPDEMP":"tot_rcpts"})
+
+        rep = sums.merge(totals, on=key, how="outer")
+
+        for c in [("firms","sum_firms","tot_firms"),
+                  ("emp","sum_emp","tot_emp"),
+                  ("pay","sum_pay","tot_pay"),
+                  ("rcpts","sum_rcpts","tot_rcpts")]:
+            name, s_col, t_col = c
+            rep[f"delta_{name}"] = rep[s_col] - rep[t_col]
+            rep[f"pct_delta_{name}"] = np.where(rep[t_col].abs() > 0, rep[f"delta_{name}"]/rep[t_col], np.nan)
+            rep[f"flag_{name}"] = rep[f"delta_{name}"].abs() > atol
+
+        rep["recon_ok"] = ~(rep[[f"flag_{c}" for c in ["firms","emp","pay","rcpts"]]].any(axis=1))
+        return rep.sort_values(key)
+
+    def cbsa_naics3(self):
+        key = ["cbsa_code","cbsa_title","naics3"]
+        # Non-total NAICS3 → CBSA × NAICS3
+        out = self._cbsa_frame(self.cbsa_parts).sort_values(key, ignore_index=True)
+
+        # CBSA totals from county totals
+        all_cbsa = (self._cbsa_frame(self.cbsa_totals)
+                    .rename(columns={
+                        "FIRMPDEMP":"cbsa_tot_firms",
+                        "EMP":"cbsa_tot_emp",
+                        "PAYANN":"cbsa_tot_payroll",
+                        "RCPPDEMP":"cbsa_tot_receipts"
+                    }))
+        out = out.merge(all_cbsa, on=["cbsa_code","cbsa_title"], how="left")
+        return out
+
+def iter_abs_chunks(abs_path, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield normalized ABS chunks (the whole file at once when chunksize is 0)."""
+    if not chunksize:
+        yield normalize_abs_columns(pd.read_csv(abs_path, dtype=str))
+        return
+    for chunk in pd.read_csv(abs_path, dtype=str, chunksize=chunksize):
+        yield normalize_abs_columns(chunk)
+
 def reconcile_county_totals(abs_df, year=None, atol=1.0):
-    base = abs_df.copy()
-    if year is not None and "year" in base.columns:
-        base = base[base["year"] == year]
-
-    # Split totals vs parts
-    all_rows = base[base["naics3"] == "000"].copy()
-    parts    = base[base["naics3"] != "000"].copy()
-
-    key = ["state","county"]
-    sums = (parts.groupby(key, as_index=False)[["FIRMPDEMP","EMP","PAYANN","RCPPDEMP"]]
-                .sum(min_count=1))
-    totals = (all_rows.groupby(key, as_index=False)[["FIRMPDEMP","EMP","PAYANN","RCPPDEMP"]]
-                    .sum(min_count=1))
-
-    # Rename for clarity
-    sums = sums.rename(columns={"FIRMPDEMP":"sum_firms","EMP":"sum_emp","PAYANN":"sum_pay","RCPPDEMP":"sum_rcpts"})
-    totals = totals.rename(columns={"FIRMPDEMP":"tot_firms","EMP":"tot_emp","PAYANN":"tot_pay","RCPPDEMP":"tot_rcpts"})
-
-    rep = sums.merge(totals, on=key, how="outer")
-
-    for c in [("firms","sum_firms","tot_firms"),
-              ("emp","sum_emp","tot_emp"),
-              ("pay","sum_pay","tot_pay"),
-              ("rcpts","sum_rcpts","tot_rcpts")]:
-        name, s_col, t_col = c
-        rep[f"delta_{name}"] = rep[s_col] - rep[t_col]
-        rep[f"pct_delta_{name}"] = np.where(rep[t_col].abs() > 0, rep[f"delta_{name}"]/rep[t_col], np.nan)
-        rep[f"flag_{name}"] = rep[f"delta_{name}"].abs() > atol
-
-    rep["recon_ok"] = ~(rep[[f"flag_{c}" for c in ["firms","emp","pay","rcpts"]]].any(axis=1))
-    return rep.sort_values(key)
+    empty_xwalk = pd.DataFrame(columns=["state_fips","county_fips","cbsa_code","cbsa_title"], dtype=object)
+    return AbsRollup(empty_xwalk, year=year).update(abs_df).recon_report(atol=atol)
 
 def aggregate_to_cbsa(abs_df, xwalk_df, year=None):
-    base = abs_df.copy()
-    if year is not None and "year" in base.columns:
-        base = base[base["year"] == year]
-    base["state_fips"]  = base["state"]
-    base["county_fips"] = base["county"]
-    merged = base.merge(xwalk_df, on=["state_fips","county_fips"], how="left", validate="m:1")
-
-    # Non-total NAICS3 → CBSA × NAICS3
-    parts = merged[merged["naics3"] != "000"].copy()
-    key = ["cbsa_code","cbsa_title","naics3"]
-    out = (parts.groupby(key, as_index=False)[["FIRMPDEMP","EMP","PAYANN","RCPPDEMP"]]
-                .sum(min_count=1))
-
-    # CBSA totals from county totals
-    all_cbsa = (merged[merged["naics3"] == "000"]
-                .groupby(["cbsa_code","cbsa_title"], as_index=False)[["FIRMPDEMP","EMP","PAYANN","RCPPDEMP"]]
-                .sum(min_count=1)
-                .rename(columns={
-                    "FIRMPDEMP":"cbsa_tot_firms",
-                    "EMP":"cbsa_tot_emp",
-                    "PAYANN":"cbsa_tot_payroll",
-                    "RCPPDEMP":"cbsa_tot_receipts"
-                }))
-    out = out.merge(all_cbsa, on=["cbsa_code","cbsa_title"], how="left")
-    return out
+    return AbsRollup(xwalk_df, year=year).update(abs_df).cbsa_naics3()
 
 def filter_large_cbsa(cbsa_df, xwalk_df, large_by="firms", threshold=20000):
     if large_by == "population" and "cbsa_pop" in xwalk_df.columns:
@@ -168,31 +252,35 @@ def main():
     ap.add_argument("--large_threshold", type=int, default=20000)
     ap.add_argument("--outdir", default="data/processed")
     ap.add_argument("--recon_atol", type=float, default=1.0, help="Absolute tolerance for recon deltas")
+    ap.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE,
+                    help="ABS rows per streamed chunk (0 reads the whole file at once)")
+    ap.add_argument("--format", choices=FORMATS, default="csv",
+                    help="Output format for the four outputs; parquet writes zstd .parquet files")
     args = ap.parse_args()
 
     outdir = Path(args.outdir); outdir.mkdir(parents=True, exist_ok=True)
 
-    abs_df = pd.read_csv(args.abs, dtype=str)
-    abs_df = normalize_abs_columns(abs_df)
     xw = pd.read_csv(args.xwalk, dtype=str)
     xw = normalize_crosswalk(xw)
 
-    # Reconcile
-    recon = reconcile_county_totals(abs_df, year=args.year, atol=args.recon_atol)
-    recon.to_csv(outdir / "abs_county_naics3_recon_report.csv", index=False)
+    # Reconcile + aggregate in one pass over the ABS file
+    rollup = AbsRollup(xw, year=args.year)
+    for chunk in iter_abs_chunks(args.abs, args.chunksize):
+        rollup.update(chunk)
+    recon = rollup.recon_report(atol=args.recon_atol)
+    write_table(recon, outdir / "abs_county_naics3_recon_report.csv", args.format)
 
-    # Aggregate
-    cbsa = aggregate_to_cbsa(abs_df, xw, year=args.year)
-    cbsa.to_csv(outdir / "abs_cbsa_naics3.csv", index=False)
+    cbsa = rollup.cbsa_naics3()
+    write_table(cbsa, outdir / "abs_cbsa_naics3.csv", args.format)
 
     # Large CBSA filter
     cbsa_large = filter_large_cbsa(cbsa, xw, large_by=args.large_by, threshold=args.large_threshold)
-    cbsa_large.to_csv(outdir / "abs_cbsa_naics3_large.csv", index=False)
+    write_table(cbsa_large, outdir / "abs_cbsa_naics3_large.csv", args.format)
 
     # Discrepancies joined to CBSA context
     cw_small = xw.rename(columns={"state_fips":"state","county_fips":"county"})
     bad = recon[~recon["recon_ok"]].merge(cw_small, on=["state","county"], how="left")
-    bad.to_csv(outdir / "abs_cbsa_naics3_discrepancies.csv", index=False)
+    write_table(bad, outdir / "abs_cbsa_naics3_discrepancies.csv", args.format)
 
     print("Wrote outputs to", outdir.resolve())
 
@@ -9,11 +9,18 @@ Usage:
 """
 
 import argparse
+import sys
 from pathlib import Path
 from typing import List
 
 import pandas as pd
 
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from scripts.common.table_io import FORMATS, write_table  # type: ignore # noqa: E402
+
 GDP_COL_TEMPLATE = "{year}_gdp_num"
 SUPPRESSION_TOKENS = {"(D)", "(NA)"}
 
@@ -104,18 +111,22 @@ def main() -> None:
         required=True,
         help="Output CSV path for the cleaned GDP table.",
     )
+    ap.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="csv",
+        help="Output format; parquet writes a zstd file next to --out (default: csv).",
+    )
     args = ap.parse_args()
 
     raw_path = Path(args.bea_raw)
-    out_path = Path(args.out)
 
     df_raw = load_bea_csv(raw_path)
     suppressed = count_suppressed_tokens(df_raw, args.years)
     tidy = tidy_bea(df_raw, args.years)
     run_quality_checks(tidy, args.years)
 
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    tidy.to_csv(out_path, index=False)
+    out_path = write_table(tidy, args.out, args.format)
     print(
         f"Wrote {out_path} with {len(tidy):,} rows "
         f"(suppressed tokens encountered: {suppressed:,})."
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+aggregate.py
+------------
+Mergeable streaming group-by sums for the county × NAICS rollups.
+
+`GroupSumAggregator` keeps one row per group key holding the running sum and
+the non-null count of every value column. Chunks are folded in with `update`,
+partial states from other chunks/workers are combined with `merge`, and
+`finalize` returns the same frame as `df.groupby(keys, as_index=False)[values]
+.sum(min_count=...)` over everything seen. State size is bounded by the number
+of distinct keys (e.g., ~3k counties × 20 sectors), not by the input rows, so
+national detail → NAICS2 rollups never need the filtered frame in memory.
+Key columns can be anything groupby accepts; streaming callers pass the
+integer codes from keys.py (see rdm_abs_naics3_cbsa.AbsRollup) so the state
+is indexed by ints rather than Python strings.
+
+Ratios (average weekly wage, per-employee amounts, …) are not additive; callers
+derive them from the finalized sums.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import pandas as pd
+
+COUNT_SUFFIX = "__n"
+
+
+class GroupSumAggregator:
+    def __init__(self, keys: list[str], values: list[str]) -> None:
+        self.keys = list(keys)
+        self.values = list(values)
+        self._state: Optional[pd.DataFrame] = None
+
+    @property
+    def n_groups(self) -> int:
+        return 0 if self._state is None else len(self._state)
+
+    def update(self, frame: pd.DataFrame) -> "GroupSumAggregator":
+        """Fold one chunk of rows into the running sums/counts."""
+        if frame.empty:
+            return self
+        grouped = frame.groupby(self.keys, observed=True, sort=False)[self.values]
+        partial = pd.concat(
+            [grouped.sum(), grouped.count().add_suffix(COUNT_SUFFIX)], axis=1
+        )
+        self._absorb(partial)
+        return self
+
+    def merge(self, other: "GroupSumAggregator") -> "GroupSumAggregator":
+        """Combine another aggregator's partial state (same keys/values) into this one."""
+        if other.keys != self.keys or other.values != self.values:
+            raise ValueError("Cannot merge aggregators with different keys/values.")
+        if other._state is not None:
+            self._absorb(other._state)
+        return self
+
+    def _absorb(self, partial: pd.DataFrame) -> None:
+        if self._state is None:
+            self._state = partial
+            return
+        self._state = (
+            pd.concat([self._state, partial])
+            .groupby(level=self.keys, observed=True, sort=False)
+            .sum()
+        )
+
+    def finalize(self, min_count: int = 0) -> pd.DataFrame:
+        """Return keys + summed values, sorted by key like a plain groupby.
+
+        Groups with fewer than `min_count` non-null inputs get NaN, mirroring
+        `sum(min_count=...)`.
+        """
+        if self._state is None:
+            return pd.DataFrame(columns=self.keys + self.values)
+        out = self._state[self.values].copy()
+        if min_count:
+            for col in self.values:
+                out[col] = out[col].where(self._state[col + COUNT_SUFFIX] >= min_count)
+        out = out.sort_index().reset_index()
+        for key in self.keys:
+            if isinstance(out[key].dtype, pd.CategoricalDtype):
+                out[key] = out[key].astype(object)
+        return out[self.keys + self.values]
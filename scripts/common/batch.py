@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+batch.py
+--------
+Per-year fan-out shared by the multi-year builders (QCEW, ABS, TRI).
+
+Each vintage is independent until the final stack + duplicate check, so the
+builders hand their single-year function here and consume results as each
+year finishes. `workers <= 1` keeps the original sequential loop (and its
+ordering), which is also what tests and debuggers get by default.
+
+The function must be a module-level callable and its arguments picklable,
+since parallel runs execute in a process pool. Process-wide settings (the
+Census snapshot cache, …) are not inherited by `spawn` workers (the default
+on macOS/Windows); pass an `initializer` that installs them in each worker.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Iterator, Mapping, Optional, Sequence
+
+
+def iter_year_results(
+    func: Callable[..., Any],
+    year_args: Mapping[int, Sequence[Any]],
+    workers: int = 1,
+    initializer: Optional[Callable[..., Any]] = None,
+    initargs: Sequence[Any] = (),
+) -> Iterator[tuple[int, Any]]:
+    """Yield (year, func(*args)) pairs, in completion order when parallel.
+
+    `initializer(*initargs)` runs once in each worker process; sequential runs
+    skip it, since the calling process is already configured.
+    """
+    if workers <= 1 or len(year_args) <= 1:
+        for year, args in year_args.items():
+            yield year, func(*args)
+        return
+
+    pool = ProcessPoolExecutor(
+        max_workers=min(workers, len(year_args)), initializer=initializer, initargs=tuple(initargs)
+    )
+    try:
+        futures = {pool.submit(func, *args): year for year, args in year_args.items()}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    except BaseException:
+        # Don't keep rebuilding other vintages once one year has failed.
+        pool.shutdown(wait=True, cancel_futures=True)
+        raise
+    else:
+        pool.shutdown(wait=True)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+census_cache.py
+---------------
+On-disk snapshot cache for Census API responses.
+
+ABS and ACS vintages almost never change once published, yet every benchmark
+rebuild and QA rerun downloaded the same payloads again. Responses are now
+kept as normalized Parquet snapshots (all columns as the strings the API
+returned, nulls preserved):
+
+  {cache_dir}/{dataset}/{year}/{digest}.parquet   # the response rows
+  {cache_dir}/{dataset}/{year}/{digest}.json      # url, params, fetched_at, rows
+
+The digest is a SHA-256 over the endpoint path and the sorted query parameters
+(get-fields, `for`/`in` geography and predicates such as NAICS2022); the API
+key is excluded so keyed and anonymous runs share snapshots.
+
+Freshness controls:
+  - ttl_days : refetch snapshots older than this (default: never expire).
+  - refresh  : ignore existing snapshots and refetch (then overwrite them).
+  - offline  : never touch the network; a missing snapshot raises
+               CensusCacheMiss. Lets QA run in air-gapped environments.
+
+Scripts expose these through `add_census_cache_arguments` /
+`configure_from_args`; library code calls `cached_frame(url, params)`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Mapping, Optional
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+from scripts.common.census_client import default_client  # type: ignore
+
+DEFAULT_CACHE_DIR = "data_raw/census_cache"
+_DATASET_RE = re.compile(r"/data/(\d{4})/(.+?)/?$")
+
+
+class CensusCacheMiss(LookupError):
+    """Offline mode was asked for a response that is not in the cache."""
+
+
+def snapshot_key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    query = {str(k): str(v) for k, v in (params or {}).items() if k != "key"}
+    canonical = json.dumps({"path": urlsplit(url).path, "params": query}, sort_keys=True)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _dataset_parts(url: str) -> tuple[str, str]:
+    match = _DATASET_RE.search(urlsplit(url).path)
+    if not match:
+        return "other", "0000"
+    year, dataset = match.groups()
+    return dataset.replace("/", "_"), year
+
+
+class CensusSnapshotCache:
+    def __init__(
+        self,
+        cache_dir: Path = Path(DEFAULT_CACHE_DIR),
+        ttl_days: Optional[float] = None,
+        refresh: bool = False,
+        offline: bool = False,
+    ) -> None:
+        if refresh and offline:
+            raise ValueError("refresh and offline are mutually exclusive.")
+        self.cache_dir = Path(cache_dir)
+        self.ttl = timedelta(days=ttl_days) if ttl_days is not None else None
+        self.refresh = refresh
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+
+    def paths(self, url: str, params: Optional[Mapping[str, Any]] = None) -> tuple[Path, Path]:
+        dataset, year = _dataset_parts(url)
+        stem = self.cache_dir / dataset / year / snapshot_key(url, params)[:24]
+        return stem.with_suffix(".parquet"), stem.with_suffix(".json")
+
+    def manifest(self, url: str, params: Optional[Mapping[str, Any]] = None) -> Optional[dict]:
+        _, manifest_path = self.paths(url, params)
+        if not manifest_path.exists():
+            return None
+        return json.loads(manifest_path.read_text())
+
+    def _is_fresh(self, manifest: dict) -> bool:
+        if self.ttl is None:
+            return True
+        fetched_at = datetime.fromisoformat(manifest["fetched_at"])
+        return datetime.now(timezone.utc) - fetched_at <= self.ttl
+
+    def contains(self, url: str, params: Optional[Mapping[str, Any]] = None) -> bool:
+        """True if `get_frame` would be served from disk without a fetch."""
+        data_path, _ = self.paths(url, params)
+        manifest = self.manifest(url, params)
+        if manifest is None or not data_path.exists():
+            return False
+        return self.offline or (not self.refresh and self._is_fresh(manifest))
+
+    def load(self, url: str, params: Optional[Mapping[str, Any]] = None) -> Optional[pd.DataFrame]:
+        """Cached frame if a fresh snapshot exists (offline mode ignores TTL)."""
+        if not self.contains(url, params):
+            return None
+        data_path, _ = self.paths(url, params)
+        df = pd.read_parquet(data_path)
+        return df.astype(object).where(df.notna(), None)
+
+    def store(
+        self, url: str, params: Optional[Mapping[str, Any]], frame: pd.DataFrame
+    ) -> pd.DataFrame:
+        """Write a snapshot; returns the normalized frame as a cache hit would."""
+        data_path, manifest_path = self.paths(url, params)
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        normalized = frame.astype("string").astype(object)
+        normalized = normalized.where(frame.notna(), None)
+        fd, tmp = tempfile.mkstemp(dir=data_path.parent, suffix=".parquet.tmp")
+        os.close(fd)
+        normalized.to_parquet(tmp, index=False, compression="zstd")
+        os.replace(tmp, data_path)
+        dataset, year = _dataset_parts(url)
+        manifest = {
+            "url": urlsplit(url)._replace(query="").geturl(),
+            "params": {str(k): str(v) for k, v in (params or {}).items() if k != "key"},
+            "dataset": dataset,
+            "year": year,
+            "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "rows": int(len(normalized)),
+            "columns": [str(c) for c in normalized.columns],
+        }
+        manifest_path.write_text(json.dumps(manifest, indent=2))
+        return normalized
+
+    def get_frame(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None,
+        fetch: Optional[Callable[[str, Optional[Mapping[str, Any]]], pd.DataFrame]] = None,
+    ) -> pd.DataFrame:
+        """Serve from the snapshot cache, fetching (and storing) on a miss."""
+        cached = self.load(url, params)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        if self.offline:
+            raise CensusCacheMiss(f"Offline and no cached Census snapshot for {url} {dict(params or {})}")
+        self.misses += 1
+        fetch = fetch or default_client().get_frame
+        return self.store(url, params, fetch(url, params))
+
+
+_default_cache: Optional[CensusSnapshotCache] = None
+_default_lock = threading.Lock()
+
+
+def configure_census_cache(
+    cache_dir: Optional[str] = None,
+    ttl_days: Optional[float] = None,
+    refresh: bool = False,
+    offline: bool = False,
+) -> CensusSnapshotCache:
+    """Replace the process-wide cache used by `cached_frame`."""
+    global _default_cache
+    with _default_lock:
+        _default_cache = CensusSnapshotCache(
+            Path(cache_dir or DEFAULT_CACHE_DIR), ttl_days=ttl_days, refresh=refresh, offline=offline
+        )
+        return _default_cache
+
+
+def install_census_cache(cache: CensusSnapshotCache) -> CensusSnapshotCache:
+    """Make an existing cache process-wide (e.g. as a worker-pool initializer)."""
+    global _default_cache
+    with _default_lock:
+        _default_cache = cache
+        return _default_cache
+
+
+def default_cache() -> CensusSnapshotCache:
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = CensusSnapshotCache()
+        return _default_cache
+
+
+def cached_frame(url: str, params: Optional[Mapping[str, Any]] = None) -> pd.DataFrame:
+    """Census array-of-arrays response as a DataFrame, via the snapshot cache."""
+    return default_cache().get_frame(url, params)
+
+
+def add_census_cache_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--census_cache_dir",
+        default=DEFAULT_CACHE_DIR,
+        help="Directory for cached Census API snapshots (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--census_cache_ttl_days",
+        type=float,
+        default=None,
+        help="Refetch cached Census snapshots older than this many days (default: never).",
+    )
+    parser.add_argument(
+        "--refresh_census",
+        action="store_true",
+        help="Ignore cached Census snapshots and refetch them.",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Serve Census data only from the snapshot cache; never call the API.",
+    )
+
+
+def configure_from_args(args: argparse.Namespace) -> CensusSnapshotCache:
+    return configure_census_cache(
+        cache_dir=args.census_cache_dir,
+        ttl_days=args.census_cache_ttl_days,
+        refresh=args.refresh_census,
+        offline=args.offline,
+    )
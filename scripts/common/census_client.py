@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+census_client.py
+----------------
+Shared HTTP client for the Census Data API (api.census.gov).
+
+Every Census pull (ABS benchmarks, the CA ABS pull, ACS population refresh and
+the ABS reconciliation QA) goes through `CensusClient`, which provides:
+
+  - keep-alive connection pooling per host (one TLS handshake per connection,
+    reused across requests and threads),
+  - gzip transfer encoding,
+  - exponential backoff with jitter on 429/5xx and connection errors,
+    honouring `Retry-After`,
+  - a token-bucket rate limiter shared by all threads using the client,
+  - optional API key injection (`key=` parameter; `CENSUS_API_KEY` env var).
+
+Built on the standard library (`http.client`) so QA modules stay free of
+third-party HTTP dependencies. `base_url` may point at any http(s) server,
+which is how the tests exercise it against a local stub.
+"""
+
+from __future__ import annotations
+
+import gzip
+import http.client
+import json
+import os
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping, Optional
+from urllib.parse import urlencode, urljoin, urlsplit
+
+import pandas as pd
+
+from scripts.common.census_json import decode_census_json  # type: ignore
+
+CENSUS_BASE_URL = "https://api.census.gov"
+CENSUS_API_KEY_ENV = "CENSUS_API_KEY"
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+DEFAULT_RATE = 10.0  # requests per second
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_POOL_SIZE = 8
+
+
+class CensusAPIError(RuntimeError):
+    """A Census request failed after retries (or with a non-retryable status)."""
+
+    def __init__(self, message: str, status: Optional[int] = None, url: str = "") -> None:
+        super().__init__(message)
+        self.status = status
+        self.url = url
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens/second, bursts up to `capacity`."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1.0))
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until `tokens` are available; returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 5
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+    statuses: frozenset = RETRY_STATUSES
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait before retry number `attempt` (1-based)."""
+        if retry_after:
+            try:
+                return min(self.max_backoff, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        base = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+        return base * random.uniform(0.5, 1.0)
+
+
+class _ConnectionPool:
+    """Idle keep-alive connections for one (scheme, host, port)."""
+
+    def __init__(self, scheme: str, netloc: str, timeout: float, size: int) -> None:
+        self.scheme = scheme
+        self.netloc = netloc
+        self.timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=size)
+
+    def get(self) -> http.client.HTTPConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            factory = (
+                http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            )
+            return factory(self.netloc, timeout=self.timeout)
+
+    def put(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class CensusClient:
+    """Pooled, rate-limited, retrying GET client for Census API endpoints."""
+
+    def __init__(
+        self,
+        base_url: str = CENSUS_BASE_URL,
+        api_key: Optional[str] = None,
+        rate: float = DEFAULT_RATE,
+        burst: Optional[float] = None,
+        retry: RetryPolicy = RetryPolicy(),
+        timeout: float = DEFAULT_TIMEOUT,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.base_url = base_url.rstrip("/") + "/"
+        self.api_key = api_key if api_key is not None else os.environ.get(CENSUS_API_KEY_ENV) or None
+        self.limiter = TokenBucket(rate, burst, sleep=sleep)
+        self.retry = retry
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._sleep = sleep
+        self._pools: dict[tuple[str, str], _ConnectionPool] = {}
+        self._pools_lock = threading.Lock()
+        self.requests_sent = 0
+        self.connections_opened = 0
+
+    def __enter__(self) -> "CensusClient":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._pools_lock:
+            for pool in self._pools.values():
+                pool.close()
+            self._pools.clear()
+
+    def build_url(self, url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        """Absolute URL for `url` (absolute or relative to base_url) plus query params."""
+        query = dict(params or {})
+        if self.api_key and "key" not in query:
+            query["key"] = self.api_key
+        full = urljoin(self.base_url, url.lstrip("/")) if "://" not in url else url
+        if query:
+            full = f"{full}{'&' if '?' in full else '?'}{urlencode(query)}"
+        return full
+
+    def _pool_for(self, scheme: str, netloc: str) -> _ConnectionPool:
+        with self._pools_lock:
+            key = (scheme, netloc)
+            if key not in self._pools:
+                self._pools[key] = _ConnectionPool(scheme, netloc, self.timeout, self.pool_size)
+            return self._pools[key]
+
+    @staticmethod
+    def _exchange(
+        conn: http.client.HTTPConnection, target: str
+    ) -> tuple[http.client.HTTPResponse, bytes]:
+        conn.request(
+            "GET", target, headers={"Accept-Encoding": "gzip", "Connection": "keep-alive"}
+        )
+        resp = conn.getresponse()
+        return resp, resp.read()  # drained, so the connection can be reused
+
+    def _send(self, url: str) -> tuple[int, Mapping[str, str], bytes]:
+        parts = urlsplit(url)
+        pool = self._pool_for(parts.scheme, parts.netloc)
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+        conn = pool.get()
+        reused = conn.sock is not None
+        if not reused:
+            self.connections_opened += 1
+        try:
+            resp, body = self._exchange(conn, target or "/")
+        except (ConnectionResetError, BrokenPipeError, http.client.RemoteDisconnected):
+            conn.close()
+            if not reused:
+                raise
+            # The server dropped an idle keep-alive connection; reconnect once
+            # without spending a retry attempt.
+            self.connections_opened += 1
+            try:
+                resp, body = self._exchange(conn, target or "/")
+            except BaseException:
+                conn.close()
+                raise
+        except BaseException:
+            conn.close()
+            raise
+        headers = {k.lower(): v for k, v in resp.getheaders()}
+        if resp.will_close:
+            conn.close()
+        else:
+            pool.put(conn)
+        if headers.get("content-encoding", "").lower() == "gzip":
+            body = gzip.decompress(body)
+        return resp.status, headers, body
+
+    def get(self, url: str, params: Optional[Mapping[str, Any]] = None) -> bytes:
+        """GET with rate limiting and retries; returns the (decompressed) body.
+
+        A 204 (Census' answer for an empty selection) returns b"".
+        """
+        full = self.build_url(url, params)
+        for attempt in range(1, self.retry.max_attempts + 1):
+            self.limiter.acquire()
+            self.requests_sent += 1
+            try:
+                status, headers, body = self._send(full)
+            except (OSError, http.client.HTTPException) as exc:
+                if attempt == self.retry.max_attempts:
+                    raise CensusAPIError(f"Census request failed: {exc}", url=full) from exc
+                self._sleep(self.retry.delay(attempt))
+                continue
+            if status < 300:
+                return body
+            if status in self.retry.statuses and attempt < self.retry.max_attempts:
+                self._sleep(self.retry.delay(attempt, headers.get("retry-after")))
+                continue
+            snippet = body[:200].decode("utf-8", "replace").strip()
+            raise CensusAPIError(f"Census API returned HTTP {status}: {snippet}", status, full)
+        raise CensusAPIError("Census request failed", url=full)  # pragma: no cover
+
+    def get_text(self, url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        return self.get(url, params).decode("utf-8")
+
+    def get_json(self, url: str, params: Optional[Mapping[str, Any]] = None) -> Any:
+        return json.loads(self.get(url, params))
+
+    def get_frame(self, url: str, params: Optional[Mapping[str, Any]] = None) -> pd.DataFrame:
+        """Census array-of-arrays payload → DataFrame (first row is the header).
+
+        Decoded column-wise by `decode_census_json`; an empty body gives an
+        empty frame.
+        """
+        return decode_census_json(self.get(url, params))
+
+
+_default_client: Optional[CensusClient] = None
+_default_lock = threading.Lock()
+
+
+def default_client() -> CensusClient:
+    """Process-wide client so callers share one connection pool and rate limit."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = CensusClient()
+        return _default_client
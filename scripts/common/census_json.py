@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+census_json.py
+--------------
+Columnar decoding of Census Data API payloads.
+
+The API answers with a 2-D JSON array: a header row followed by one array per
+record, all values as strings (or null). Loading that with `json.loads` builds
+the whole list-of-lists, and the callers then built a dict per row and parsed
+every cell in Python. Here the payload is walked one row array at a time
+(`JSONDecoder.raw_decode`) and each value is appended straight into its
+column buffer, so no full row list or per-row dict is ever held.
+
+Numeric columns are parsed vectorized by `parse_census_numeric`, which maps
+suppression tokens to null plus a note bit:
+
+  NOTE_MISSING      (1) value absent / JSON null      -> "source_missing"
+  NOTE_SUPPRESSED   (2) D, N, S, (D), NA, "" …          -> "source_suppressed"
+  NOTE_NON_NUMERIC  (4) anything else float() rejects   -> "source_non_numeric"
+
+`render_notes` turns OR-ed note masks into the sorted ";"-joined strings the
+QA outputs use, rendering each distinct mask only once.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Iterator, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+SUPPRESSED_VALUES = frozenset({"", "D", "N", "S", "NA", "N/A", "(D)", "(N)", "(S)"})
+
+NOTE_MISSING = 1
+NOTE_SUPPRESSED = 2
+NOTE_NON_NUMERIC = 4
+NOTE_LABELS = {
+    NOTE_MISSING: "source_missing",
+    NOTE_SUPPRESSED: "source_suppressed",
+    NOTE_NON_NUMERIC: "source_non_numeric",
+}
+
+_WHITESPACE = " \t\n\r"
+_DECODER = json.JSONDecoder()
+
+
+def iter_census_rows(payload: Union[str, bytes]) -> Iterator[list]:
+    """Yield each row array of a Census payload, header first."""
+    text = payload.decode("utf-8") if isinstance(payload, bytes) else payload
+    pos = 0
+    end = len(text)
+    while pos < end and text[pos] in _WHITESPACE:
+        pos += 1
+    if pos == end:
+        return
+    if text[pos] != "[":
+        raise json.JSONDecodeError("Expecting '['", text, pos)
+    pos += 1
+    expect_row = True
+    while True:
+        while pos < end and text[pos] in _WHITESPACE:
+            pos += 1
+        if pos == end:
+            raise json.JSONDecodeError("Unterminated Census payload", text, pos)
+        char = text[pos]
+        if char == "]":
+            return
+        if char == ",":
+            if expect_row:
+                raise json.JSONDecodeError("Unexpected ','", text, pos)
+            expect_row = True
+            pos += 1
+            continue
+        if not expect_row:
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, pos)
+        row, pos = _DECODER.raw_decode(text, pos)
+        if not isinstance(row, list):
+            raise json.JSONDecodeError("Census rows must be arrays", text, pos)
+        expect_row = False
+        yield row
+
+
+def decode_census_json(payload: Union[str, bytes]) -> pd.DataFrame:
+    """Census 2-D JSON array → DataFrame of object columns (nulls as None)."""
+    rows = iter_census_rows(payload)
+    header = next(rows, None)
+    if header is None:
+        return pd.DataFrame()
+    buffers: list[list] = [[] for _ in header]
+    width = len(header)
+    for number, row in enumerate(rows, start=1):
+        if len(row) != width:
+            raise ValueError(f"Census row {number} has {len(row)} values; header has {width}.")
+        for buffer, value in zip(buffers, row):
+            buffer.append(value)
+    return pd.DataFrame(
+        {str(name): pd.Series(buffer, dtype=object) for name, buffer in zip(header, buffers)},
+        columns=[str(name) for name in header],
+    )
+
+
+def parse_census_numeric(values: Optional[pd.Series], length: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized float parse → (float64 values with NaN, uint8 note bits).
+
+    `values=None` (column absent from the payload) marks every row missing.
+    """
+    if values is None:
+        return np.full(length, np.nan), np.full(length, NOTE_MISSING, dtype=np.uint8)
+    missing = values.isna().to_numpy()
+    text = values.astype("string").str.strip()
+    suppressed = text.isin(SUPPRESSED_VALUES).fillna(False).to_numpy(dtype=bool) & ~missing
+    candidates = text.where(~(suppressed | missing))
+    parsed = pd.to_numeric(candidates, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    non_numeric = np.isnan(parsed) & ~(suppressed | missing)
+    notes = (
+        missing * NOTE_MISSING + suppressed * NOTE_SUPPRESSED + non_numeric * NOTE_NON_NUMERIC
+    ).astype(np.uint8)
+    return parsed, notes
+
+
+def render_notes(masks: np.ndarray) -> np.ndarray:
+    """OR-ed note bits → sorted ";"-joined labels ("" where no bit is set)."""
+    masks = np.asarray(masks, dtype=np.uint8)
+    uniques, inverse = np.unique(masks, return_inverse=True)
+    rendered = np.array(
+        [
+            ";".join(sorted(label for bit, label in NOTE_LABELS.items() if mask & bit))
+            for mask in uniques
+        ],
+        dtype=object,
+    )
+    return rendered[inverse.reshape(masks.shape)]
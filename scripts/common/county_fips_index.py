@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+county_fips_index.py
+--------------------
+Compiled (state code, normalized county name) → 5-digit county FIPS index.
+
+The TRI enrichment used to rebuild its name lookup from the Simplemaps
+uscounties CSV on every run (melt of county / county_ascii / county_full,
+three normalizations, dedup, manual overrides). `load_county_fips_index`
+compiles that lookup once into a small directory of NumPy arrays:
+
+  {index_dir}/{digest}/key_hash.npy    # uint64 blake2b of "STATE\\x1fname", sorted
+  {index_dir}/{digest}/fips.npy        # int32 FIPS aligned with key_hash
+  {index_dir}/{digest}/state_code.npy  # aligned state codes (<U2)
+  {index_dir}/{digest}/name.npy        # aligned normalized names (<U…)
+  {index_dir}/{digest}/valid_fips.npy  # sorted int32 FIPS of every Simplemaps row
+  {index_dir}/{digest}/manifest.json   # source path, sha256, overrides, entries
+
+The digest covers the Simplemaps file bytes, the override list and the
+county-name rules digest, so a new reference vintage, an override edit or a
+normalization change each compile a fresh index. Later runs memory-map the
+arrays (`np.load(mmap_mode="r")`) instead of parsing the CSV. `resolve`
+factorizes the (state, name) pairs, hashes the distinct ones and binary
+searches the sorted hashes; matches are confirmed against the stored state and
+name, so a hash collision can never return a wrong FIPS. A loaded index
+pickles as its directory path, so process-pool workers re-map the same files
+instead of receiving copies of the arrays.
+
+`valid_fips` is kept separately because distinct counties can share a
+normalized name within a state ("Baltimore County" / "Baltimore city"); only
+the first wins in the name map, but both are valid FIPS for QA.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from scripts.common.county_names import RULES_DIGEST, CountyNameMemo, normalize_county_name  # type: ignore
+from scripts.common.keys import FIPS_MISSING, decode_fips, encode_fips  # type: ignore
+
+DEFAULT_INDEX_DIR = "data_raw/county_fips_index"
+SIMPLEMAPS_NAME_COLS = ["county", "county_ascii", "county_full"]
+
+# Names the Simplemaps vintage no longer carries (legacy CT counties replaced
+# by planning regions, the split Valdez-Cordova census area).
+MANUAL_OVERRIDES: tuple[tuple[str, str, str], ...] = (
+    ("CT", "fairfield", "09001"),
+    ("CT", "hartford", "09003"),
+    ("CT", "litchfield", "09005"),
+    ("CT", "middlesex", "09007"),
+    ("CT", "newhaven", "09009"),
+    ("CT", "newlondon", "09011"),
+    ("CT", "tolland", "09013"),
+    ("CT", "windham", "09015"),
+    ("AK", "valdezcordova", "02261"),
+)
+
+_KEY_SEP = "\x1f"
+_ARRAYS = ("key_hash", "fips", "state_code", "name", "valid_fips")
+
+Overrides = Sequence[tuple[str, str, str]]
+
+
+def _hash_keys(keys: Sequence[str]) -> np.ndarray:
+    return np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+            for key in keys
+        ),
+        dtype=np.uint64,
+        count=len(keys),
+    )
+
+
+def build_lookup_frame(
+    simplemaps_csv: Union[str, Path],
+    overrides: Overrides = MANUAL_OVERRIDES,
+    memo: Optional[CountyNameMemo] = None,
+) -> pd.DataFrame:
+    """(state_code, county_name_norm) → county_fips_5 rows from the Simplemaps CSV."""
+    county_ref = pd.read_csv(simplemaps_csv, dtype=str)
+    for col in SIMPLEMAPS_NAME_COLS:
+        county_ref[f"{col}_norm"] = normalize_county_name(county_ref[col], memo=memo)
+
+    lookup = (
+        county_ref.assign(state_code=county_ref["state_id"].str.upper())
+        .melt(
+            id_vars=["state_code", "county_fips"],
+            value_vars=[f"{col}_norm" for col in SIMPLEMAPS_NAME_COLS],
+            value_name="county_name_norm",
+        )
+        .dropna(subset=["county_name_norm"])
+        .drop_duplicates(["state_code", "county_name_norm"])
+        .assign(county_fips_5=lambda df: df["county_fips"].astype(str).str.zfill(5))
+    )
+
+    manual_overrides = pd.DataFrame(
+        list(overrides), columns=["state_code", "county_name_norm", "county_fips_5"]
+    )
+    lookup = (
+        pd.concat([lookup, manual_overrides], ignore_index=True)
+        .drop_duplicates(["state_code", "county_name_norm"], keep="last")
+        .reset_index(drop=True)
+    )
+    return lookup
+
+
+class CountyFipsIndex:
+    """Sorted-hash map from (state code, normalized county name) to int32 FIPS."""
+
+    def __init__(
+        self,
+        key_hash: np.ndarray,
+        fips: np.ndarray,
+        state_code: np.ndarray,
+        name: np.ndarray,
+        valid_fips: np.ndarray,
+        manifest: Optional[dict] = None,
+        path: Optional[Path] = None,
+    ) -> None:
+        self.key_hash = key_hash
+        self.fips = fips
+        self.state_code = state_code
+        self.name = name
+        self.valid_fips = valid_fips
+        self.manifest = manifest or {}
+        self.path = path
+
+    def __len__(self) -> int:
+        return len(self.key_hash)
+
+    def __reduce_ex__(self, protocol):
+        if self.path is not None:
+            return (type(self).load, (self.path,))
+        return super().__reduce_ex__(protocol)
+
+    @classmethod
+    def from_frame(cls, lookup: pd.DataFrame, valid_fips: Optional[pd.Series] = None) -> "CountyFipsIndex":
+        """Compile a `build_lookup_frame`-shaped frame (one row per state/name)."""
+        states = lookup["state_code"].astype(str).tolist()
+        names = lookup["county_name_norm"].astype(str).tolist()
+        hashes = _hash_keys([s + _KEY_SEP + n for s, n in zip(states, names)])
+        order = np.argsort(hashes, kind="stable")
+        hashes = hashes[order]
+        if len(hashes) and (np.diff(hashes) == 0).any():
+            raise ValueError("County FIPS index has duplicate or colliding (state, name) keys.")
+        fips = encode_fips(lookup["county_fips_5"])[order]
+        valid = encode_fips(valid_fips if valid_fips is not None else lookup["county_fips_5"])
+        return cls(
+            key_hash=hashes,
+            fips=fips.astype(np.int32),
+            state_code=np.array(states, dtype="<U2")[order] if states else np.array([], dtype="<U2"),
+            name=np.array(names, dtype=str)[order] if names else np.array([], dtype="<U1"),
+            valid_fips=np.unique(valid[valid != FIPS_MISSING]).astype(np.int32),
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "CountyFipsIndex":
+        """Memory-map a saved index directory."""
+        path = Path(path)
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode="r") for name in _ARRAYS}
+        manifest = json.loads((path / "manifest.json").read_text())
+        return cls(**arrays, manifest=manifest, path=path)
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write the arrays + manifest to `path` (atomically, via a sibling temp dir)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=path.parent, prefix=f".{path.name}."))
+        try:
+            for name in _ARRAYS:
+                np.save(tmp / f"{name}.npy", np.asarray(getattr(self, name)))
+            (tmp / "manifest.json").write_text(json.dumps(self.manifest, indent=2))
+            if path.exists():
+                shutil.rmtree(path)
+            os.replace(tmp, path)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        return path
+
+    def resolve(self, state_codes: pd.Series, names: pd.Series) -> np.ndarray:
+        """int32 FIPS for each (state code, normalized name) pair; -1 if unknown."""
+        pairs = state_codes.astype("string") + _KEY_SEP + names.astype("string")
+        positions, uniques = pd.factorize(pairs, sort=False)
+        found = np.full(len(uniques) + 1, FIPS_MISSING, dtype=np.int32)
+        if len(uniques) and len(self.key_hash):
+            keys = [str(key) for key in uniques]
+            hashes = _hash_keys(keys)
+            pos = np.minimum(np.searchsorted(self.key_hash, hashes), len(self.key_hash) - 1)
+            hit = np.asarray(self.key_hash[pos]) == hashes
+            for i in np.flatnonzero(hit):
+                state, name = keys[i].split(_KEY_SEP, 1)
+                if self.state_code[pos[i]] == state and self.name[pos[i]] == name:
+                    found[i] = self.fips[pos[i]]
+        # factorize marks missing pairs -1, which picks the trailing -1 slot.
+        return found[positions]
+
+    def to_frame(self) -> pd.DataFrame:
+        """The compiled entries as (state_code, county_name_norm, county_fips_5)."""
+        return pd.DataFrame(
+            {
+                "state_code": np.asarray(self.state_code, dtype=object),
+                "county_name_norm": np.asarray(self.name, dtype=object),
+                "county_fips_5": decode_fips(np.asarray(self.fips)).to_numpy(),
+            }
+        )
+
+
+def index_digest(simplemaps_csv: Union[str, Path], overrides: Overrides = MANUAL_OVERRIDES) -> tuple[str, str]:
+    """(index digest, Simplemaps file sha256) for the compiled-artifact cache key."""
+    file_sha = hashlib.sha256(Path(simplemaps_csv).read_bytes()).hexdigest()
+    canonical = json.dumps(
+        {"simplemaps": file_sha, "overrides": [list(o) for o in overrides], "rules": RULES_DIGEST},
+        sort_keys=True,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16], file_sha
+
+
+def compile_county_fips_index(
+    simplemaps_csv: Union[str, Path],
+    overrides: Overrides = MANUAL_OVERRIDES,
+    memo: Optional[CountyNameMemo] = None,
+) -> CountyFipsIndex:
+    """Build the index in memory from the Simplemaps CSV."""
+    lookup = build_lookup_frame(simplemaps_csv, overrides, memo=memo)
+    valid = pd.read_csv(simplemaps_csv, dtype=str, usecols=["county_fips"])["county_fips"]
+    index = CountyFipsIndex.from_frame(lookup, valid_fips=valid.str.zfill(5))
+    digest, file_sha = index_digest(simplemaps_csv, overrides)
+    index.manifest = {
+        "digest": digest,
+        "simplemaps": str(simplemaps_csv),
+        "simplemaps_sha256": file_sha,
+        "overrides": [list(o) for o in overrides],
+        "rules": RULES_DIGEST,
+        "entries": len(index),
+        "valid_fips": int(len(index.valid_fips)),
+        "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    return index
+
+
+def load_county_fips_index(
+    simplemaps_csv: Union[str, Path],
+    index_dir: Optional[Union[str, Path]] = DEFAULT_INDEX_DIR,
+    overrides: Overrides = MANUAL_OVERRIDES,
+    rebuild: bool = False,
+) -> CountyFipsIndex:
+    """Memory-mapped index for this Simplemaps file + overrides, compiling it on first use.
+
+    With `index_dir=None` the index is compiled in memory and not persisted.
+    """
+    if index_dir is None:
+        return compile_county_fips_index(simplemaps_csv, overrides)
+    digest, _ = index_digest(simplemaps_csv, overrides)
+    path = Path(index_dir) / digest
+    if rebuild or not (path / "manifest.json").exists():
+        compile_county_fips_index(simplemaps_csv, overrides).save(path)
+        print(f"[FIPS] Compiled county FIPS index {path}")
+    return CountyFipsIndex.load(path)
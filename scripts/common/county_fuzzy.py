@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+county_fuzzy.py
+---------------
+Trigram fallback for county names the exact FIPS index cannot resolve.
+
+New TRI years keep bringing spelling variants (truncated names such as
+"VALDEZ CORDOV", dropped words such as "ST JOHN BAPTIST") that used to end
+up as hand-written manual overrides. `CountyNameMatcher` indexes the
+normalized names of a `CountyFipsIndex` per state as trigram postings lists.
+A query only touches the postings of its own trigrams in its own state, so
+the cost grows with the handful of names that share trigrams, not with the
+reference.
+
+Candidates are scored by the Dice coefficient of their trigram sets
+(2·|A∩B| / (|A|+|B|), names padded as "  name "). The default threshold of
+0.80 accepts truncations and dropped words (0.81–0.89 on the examples above)
+but not letter transpositions (~0.6), which stay in the mismatch report.
+A match is accepted only when the best score reaches `threshold` and beats
+the best candidate for a *different* FIPS by at least `margin`; names
+spelled for the same county (county / county_ascii / county_full) do not
+count against each other.
+Accepted matches are returned with the runner-up so callers can write an
+audit trail.
+"""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from scripts.common.county_fips_index import CountyFipsIndex  # type: ignore
+
+DEFAULT_THRESHOLD = 0.80
+DEFAULT_MARGIN = 0.05
+
+AUDIT_COLUMNS = [
+    "state_code",
+    "county_name_norm",
+    "matched_name_norm",
+    "county_fips_5",
+    "score",
+    "runner_up_name_norm",
+    "runner_up_score",
+]
+
+
+def trigrams(name: str) -> frozenset[str]:
+    padded = f"  {name} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+@dataclass(frozen=True)
+class FuzzyMatch:
+    state_code: str
+    county_name_norm: str
+    matched_name_norm: str
+    county_fips: int
+    score: float
+    runner_up_name_norm: Optional[str]
+    runner_up_score: float
+
+
+class _StateNames:
+    def __init__(self) -> None:
+        self.names: list[str] = []
+        self.fips: list[int] = []
+        self.sizes: list[int] = []
+        self.postings: dict[str, list[int]] = defaultdict(list)
+
+    def add(self, name: str, fips: int) -> None:
+        entry = len(self.names)
+        grams = trigrams(name)
+        self.names.append(name)
+        self.fips.append(fips)
+        self.sizes.append(len(grams))
+        for gram in grams:
+            self.postings[gram].append(entry)
+
+
+class CountyNameMatcher:
+    """Per-state trigram index over (normalized name, FIPS) pairs."""
+
+    def __init__(
+        self,
+        states: np.ndarray,
+        names: np.ndarray,
+        fips: np.ndarray,
+        threshold: float = DEFAULT_THRESHOLD,
+        margin: float = DEFAULT_MARGIN,
+    ) -> None:
+        self.threshold = threshold
+        self.margin = margin
+        self._states: dict[str, _StateNames] = defaultdict(_StateNames)
+        for state, name, code in zip(states.tolist(), names.tolist(), fips.tolist()):
+            if name:
+                self._states[state].add(name, int(code))
+
+    @classmethod
+    def from_index(
+        cls, index: CountyFipsIndex, threshold: float = DEFAULT_THRESHOLD, margin: float = DEFAULT_MARGIN
+    ) -> "CountyNameMatcher":
+        return cls(
+            np.asarray(index.state_code), np.asarray(index.name), np.asarray(index.fips), threshold, margin
+        )
+
+    def match(self, state_code: str, name: str) -> Optional[FuzzyMatch]:
+        """Best accepted match for one normalized name, or None."""
+        state = self._states.get(state_code)
+        if state is None or not name:
+            return None
+        grams = trigrams(name)
+        overlap: Counter[int] = Counter()
+        for gram in grams:
+            overlap.update(state.postings.get(gram, ()))
+        if not overlap:
+            return None
+
+        best_by_fips: dict[int, tuple[float, str]] = {}
+        for entry, shared in overlap.items():
+            score = 2.0 * shared / (len(grams) + state.sizes[entry])
+            code = state.fips[entry]
+            if code not in best_by_fips or score > best_by_fips[code][0]:
+                best_by_fips[code] = (score, state.names[entry])
+        ranked = sorted(best_by_fips.items(), key=lambda item: (-item[1][0], item[1][1]))
+        best_fips, (best_score, best_name) = ranked[0]
+        runner_up_score, runner_up_name = ranked[1][1] if len(ranked) > 1 else (0.0, None)
+        if best_score < self.threshold or best_score - runner_up_score < self.margin:
+            return None
+        return FuzzyMatch(
+            state_code=state_code,
+            county_name_norm=name,
+            matched_name_norm=best_name,
+            county_fips=best_fips,
+            score=round(best_score, 4),
+            runner_up_name_norm=runner_up_name,
+            runner_up_score=round(runner_up_score, 4),
+        )
+
+    def match_frame(self, state_codes: pd.Series, names: pd.Series) -> pd.DataFrame:
+        """Accepted matches (AUDIT_COLUMNS) for the distinct (state, name) pairs given."""
+        pairs = pd.DataFrame({"state_code": state_codes, "county_name_norm": names}).dropna()
+        rows = []
+        for state_code, name in pairs.drop_duplicates().itertuples(index=False):
+            found = self.match(state_code, name)
+            if found is not None:
+                rows.append(
+                    {
+                        "state_code": found.state_code,
+                        "county_name_norm": found.county_name_norm,
+                        "matched_name_norm": found.matched_name_norm,
+                        "county_fips_5": f"{found.county_fips:05d}",
+                        "score": found.score,
+                        "runner_up_name_norm": found.runner_up_name_norm,
+                        "runner_up_score": found.runner_up_score,
+                    }
+                )
+        return pd.DataFrame(rows, columns=AUDIT_COLUMNS)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+county_names.py
+---------------
+County-name normalization shared by the TRI FIPS enrichment (and anything
+else that joins on county names).
+
+`normalize_county_name` lowercases, turns punctuation into spaces, removes
+the COUNTY_SUFFIX_TERMS words ("county", "parish", "census area", …), spells
+out "st" as "saint" and drops all whitespace: "St. Louis County" → "saintlouis".
+
+Names repeat heavily (the TRI 1A file and the Simplemaps reference both carry
+a few thousand distinct names), so the column is factorized and the rules run
+once per distinct value. The suffix passes stay in their original order, one
+precompiled pattern each, because they interact ("borough" is removed before
+"city and borough" gets a chance to match). A single combined pattern screens
+out names that carry no suffix term at all, which skips the passes for most
+TRI names. Results are kept in a `CountyNameMemo`; with a path it is loaded
+from and saved to a JSON file tagged with a digest of the rules, so repeated
+runs only normalize names they have not seen before.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MEMO_PATH = "data_raw/county_name_cache/county_names.json"
+
+COUNTY_SUFFIX_TERMS = [
+    "county",
+    "parish",
+    "borough",
+    "boro",
+    "municipio",
+    "municipality",
+    "census area",
+    "census are",
+    "censu",
+    "census district",
+    "city and borough",
+    "city",
+    "island",
+]
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9\s]")
+_SUFFIX_PASSES = [
+    re.compile(r"\b" + term.replace(" ", r"\s+") + r"\b") for term in COUNTY_SUFFIX_TERMS
+]
+_ANY_SUFFIX_RE = re.compile(
+    r"\b(?:" + "|".join(term.replace(" ", r"\s+") for term in COUNTY_SUFFIX_TERMS) + r")\b"
+)
+_SAINT_RE = re.compile(r"\bst\b")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+RULES_DIGEST = hashlib.sha256(
+    json.dumps({"terms": COUNTY_SUFFIX_TERMS, "saint": "st", "version": 1}).encode()
+).hexdigest()[:16]
+
+
+def normalize_county_value(name: str) -> str:
+    """Normalized form of one county name (see module docstring)."""
+    cleaned = _NON_ALNUM_RE.sub(" ", name.lower())
+    if _ANY_SUFFIX_RE.search(cleaned):
+        for pattern in _SUFFIX_PASSES:
+            cleaned = pattern.sub(" ", cleaned)
+    cleaned = _SAINT_RE.sub("saint", cleaned)
+    return _WHITESPACE_RE.sub("", cleaned)
+
+
+class CountyNameMemo:
+    """Raw name → normalized name, optionally persisted as JSON."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None) -> None:
+        self.path = Path(path) if path else None
+        self._names: dict[str, str] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.path is not None and self.path.exists():
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+            # A memo written under different rules is stale; start over.
+            if payload.get("rules") == RULES_DIGEST:
+                self._names = dict(payload.get("names", {}))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def lookup(self, names: list[str]) -> list[str]:
+        with self._lock:
+            out = []
+            for name in names:
+                normalized = self._names.get(name)
+                if normalized is None:
+                    normalized = normalize_county_value(name)
+                    self._names[name] = normalized
+                    self._dirty = True
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                out.append(normalized)
+            return out
+
+    def update(self, entries: Mapping[str, str]) -> int:
+        """Merge entries normalized elsewhere (e.g. by a worker); returns the new count."""
+        with self._lock:
+            new = {name: value for name, value in entries.items() if name not in self._names}
+            if new:
+                self._names.update(new)
+                self._dirty = True
+            return len(new)
+
+    def save(self) -> Optional[Path]:
+        """Write new entries back to `path` (no-op without a path or changes)."""
+        if self.path is None or not self._dirty:
+            return None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            payload = {"rules": RULES_DIGEST, "names": dict(sorted(self._names.items()))}
+            self._dirty = False
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".json.tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        return self.path
+
+
+_default_memo: Optional[CountyNameMemo] = None
+_default_lock = threading.Lock()
+
+
+def configure_county_name_memo(path: Optional[Union[str, Path]] = None) -> CountyNameMemo:
+    """Replace the process-wide memo (persisted at `path` when given)."""
+    global _default_memo
+    with _default_lock:
+        _default_memo = CountyNameMemo(path)
+        return _default_memo
+
+
+def default_memo() -> CountyNameMemo:
+    global _default_memo
+    with _default_lock:
+        if _default_memo is None:
+            _default_memo = CountyNameMemo()
+        return _default_memo
+
+
+def normalize_county_name(series: pd.Series, memo: Optional[CountyNameMemo] = None) -> pd.Series:
+    """Vectorized county-name normalization; missing values become ""."""
+    if memo is None:
+        memo = default_memo()
+    positions, uniques = pd.factorize(series, sort=False)
+    is_text = np.array([isinstance(value, str) for value in uniques], dtype=bool)
+    normalized = np.full(len(uniques) + 1, np.nan, dtype=object)
+    normalized[:-1][is_text] = memo.lookup([value for value in uniques if isinstance(value, str)])
+    # factorize marks missing values -1, which picks the trailing "" slot.
+    normalized[-1] = normalize_county_value("")
+    return pd.Series(normalized[positions], index=series.index, name=series.name)
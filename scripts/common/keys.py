@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+keys.py
+-------
+Compact integer codec for the county × NAICS2 × year grain.
+
+Every extract carries `state_cnty_fips_cd`, `naics2_sector_cd` and `year_num`
+as object strings, which makes merges, duplicate checks and group-bys hash
+Python strings row by row. This codec maps them onto small integers:
+
+  - FIPS   → int32  (06075 → 6075; missing or not exactly 5 digits → -1)
+  - NAICS2 → uint8  code into NAICS_LABELS (0 = missing)
+  - year   → uint16 (missing → 0)
+  - composite → int64, bit-packed as year | fips + 1 | naics
+
+NAICS_LABELS covers every two-digit code ("00" totals through "99"
+unclassified) plus the published ranges (31-33, 44-45, 48-49) and is sorted
+lexically, so integer order matches the string order of the canonical
+labels. Decoding restores the canonical BigQuery string forms (5-digit
+zero-padded FIPS, sector labels), so encoded frames can be written out as-is
+after `decode_key_columns`.
+
+`count_duplicate_keys` and `merge_on_keys` only use the integer path when
+every non-null key has a code; a malformed FIPS ("06X75") or an unknown
+sector label ("4x") makes them fall back to the plain string keys, so two
+different bad values can never collide on the missing code.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+KEY_COLUMNS = ["year_num", "state_cnty_fips_cd", "naics2_sector_cd"]
+
+FIPS_MISSING = -1
+NAICS_MISSING = 0
+YEAR_MISSING = 0
+
+NAICS_LABELS: tuple[Optional[str], ...] = (None,) + tuple(
+    sorted({f"{n:02d}" for n in range(100)} | {"31-33", "44-45", "48-49"})
+)
+NAICS_CODES = {label: code for code, label in enumerate(NAICS_LABELS) if label is not None}
+
+_FIPS_BITS = 17  # fips + 1 <= 100_000 < 2**17
+_NAICS_BITS = 8
+
+
+def encode_fips(values: pd.Series) -> np.ndarray:
+    """5-digit FIPS strings (or 0–99999 numbers) → int32 (anything else → -1)."""
+    if pd.api.types.is_numeric_dtype(values):
+        numeric = pd.to_numeric(values, errors="coerce")
+        numeric = numeric.where(numeric.between(0, 99_999) & (numeric % 1 == 0))
+        return numeric.fillna(FIPS_MISSING).astype(np.int32).to_numpy()
+    text = values.astype("string").str.strip()
+    numeric = pd.to_numeric(text.where(text.str.fullmatch(r"\d{5}").fillna(False)), errors="coerce")
+    return numeric.fillna(FIPS_MISSING).astype(np.int32).to_numpy()
+
+
+def decode_fips(codes: np.ndarray, width: int = 5) -> pd.Series:
+    codes = np.asarray(codes)
+    text = pd.Series(codes.astype(str), dtype=object).str.zfill(width)
+    return text.where(codes != FIPS_MISSING, np.nan)
+
+
+def encode_naics(values: pd.Series) -> np.ndarray:
+    """Canonical NAICS2 labels → uint8 codes (missing → 0).
+
+    Unknown labels raise instead of being coerced, so a round trip can never
+    silently merge two different sectors.
+    """
+    positions, uniques = pd.factorize(values)
+    lookup = []
+    for label in uniques:
+        text = str(label).strip()
+        if text not in NAICS_CODES:
+            raise ValueError(f"Unknown NAICS2 sector label: {label!r}")
+        lookup.append(NAICS_CODES[text])
+    table = np.array(lookup + [NAICS_MISSING], dtype=np.uint8)
+    return table[positions]
+
+
+def decode_naics(codes: np.ndarray) -> pd.Series:
+    labels = np.array([np.nan if label is None else label for label in NAICS_LABELS], dtype=object)
+    return pd.Series(labels[np.asarray(codes, dtype=np.intp)], dtype=object)
+
+
+def encode_year(values: pd.Series) -> np.ndarray:
+    numeric = pd.to_numeric(values, errors="coerce")
+    return numeric.fillna(YEAR_MISSING).astype(np.uint16).to_numpy()
+
+
+def decode_year(codes: np.ndarray) -> pd.Series:
+    codes = np.asarray(codes)
+    years = pd.Series(codes.astype(np.int64))
+    if (codes == YEAR_MISSING).any():
+        return years.where(codes != YEAR_MISSING)
+    return years
+
+
+def pack_keys(year: np.ndarray, fips: np.ndarray, naics: np.ndarray) -> np.ndarray:
+    """Pack encoded (year, fips, naics) arrays into one int64 composite key."""
+    packed = np.asarray(year, dtype=np.int64) << (_FIPS_BITS + _NAICS_BITS)
+    packed |= (np.asarray(fips, dtype=np.int64) + 1) << _NAICS_BITS
+    packed |= np.asarray(naics, dtype=np.int64)
+    return packed
+
+
+def unpack_keys(packed: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    packed = np.asarray(packed, dtype=np.int64)
+    naics = (packed & ((1 << _NAICS_BITS) - 1)).astype(np.uint8)
+    fips = ((packed >> _NAICS_BITS) & ((1 << _FIPS_BITS) - 1)).astype(np.int32) - 1
+    year = (packed >> (_FIPS_BITS + _NAICS_BITS)).astype(np.uint16)
+    return year, fips, naics
+
+
+def composite_key(
+    df: pd.DataFrame,
+    year_col: str = "year_num",
+    fips_col: str = "state_cnty_fips_cd",
+    naics_col: str = "naics2_sector_cd",
+) -> np.ndarray:
+    """int64 composite key for each row of a county × NAICS2 × year frame."""
+    return pack_keys(
+        encode_year(df[year_col]),
+        encode_fips(df[fips_col]),
+        encode_naics(df[naics_col]),
+    )
+
+
+def count_duplicate_keys(
+    df: pd.DataFrame,
+    year_col: str = "year_num",
+    fips_col: str = "state_cnty_fips_cd",
+    naics_col: str = "naics2_sector_cd",
+) -> int:
+    """Number of rows repeating an earlier (year, FIPS, NAICS2) key."""
+    if df.empty:
+        return 0
+    cols = [year_col, fips_col, naics_col]
+    renamed = df[cols].set_axis(KEY_COLUMNS, axis=1)
+    if lossless_key_columns(renamed) is None:
+        return int(df.duplicated(cols).sum())
+    return int(pd.Series(composite_key(df, year_col, fips_col, naics_col)).duplicated().sum())
+
+
+_ENCODERS = {
+    "year_num": (encode_year, YEAR_MISSING),
+    "state_cnty_fips_cd": (encode_fips, FIPS_MISSING),
+    "naics2_sector_cd": (encode_naics, NAICS_MISSING),
+}
+
+
+def encode_key_columns(df: pd.DataFrame, columns: list[str] = KEY_COLUMNS) -> pd.DataFrame:
+    """Replace the key columns present in `df` with their integer codes."""
+    out = df.copy()
+    for col in columns:
+        if col in out.columns:
+            out[col] = _ENCODERS[col][0](out[col])
+    return out
+
+
+def lossless_key_columns(df: pd.DataFrame, columns: list[str] = KEY_COLUMNS) -> Optional[pd.DataFrame]:
+    """`encode_key_columns`, or None when a non-null key has no code.
+
+    The offending values are printed so a bad extract is visible rather than
+    silently keyed as missing.
+    """
+    try:
+        out = encode_key_columns(df, columns)
+    except ValueError as exc:
+        print(f"[KEYS] {exc}; using string keys.")
+        return None
+    for col in columns:
+        if col not in out.columns:
+            continue
+        lost = (out[col].to_numpy() == _ENCODERS[col][1]) & df[col].notna().to_numpy()
+        if lost.any():
+            sample = df.loc[lost, col].drop_duplicates().head(5).tolist()
+            print(f"[KEYS] {int(lost.sum()):,} {col} values have no code (e.g. {sample}); using string keys.")
+            return None
+    return out
+
+
+def decode_key_columns(df: pd.DataFrame, columns: list[str] = KEY_COLUMNS) -> pd.DataFrame:
+    """Inverse of `encode_key_columns`: restore canonical string/int forms."""
+    decoders = {
+        "year_num": decode_year,
+        "state_cnty_fips_cd": decode_fips,
+        "naics2_sector_cd": decode_naics,
+    }
+    out = df.copy()
+    for col in columns:
+        if col in out.columns:
+            out[col] = decoders[col](out[col].to_numpy()).to_numpy()
+    return out
+
+
+def merge_on_keys(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    how: str = "outer",
+    on: list[str] = KEY_COLUMNS,
+    **kwargs,
+) -> pd.DataFrame:
+    """`left.merge(right, on=keys)` with the join done on integer-coded keys.
+
+    Falls back to the string-key merge when either side has keys without a code.
+    """
+    left_coded = lossless_key_columns(left, on)
+    right_coded = lossless_key_columns(right, on) if left_coded is not None else None
+    if left_coded is None or right_coded is None:
+        return left.merge(right, how=how, on=on, **kwargs)
+    merged = left_coded.merge(right_coded, how=how, on=on, **kwargs)
+    return decode_key_columns(merged, on)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+naics.py
+--------
+Shared NAICS sector helpers for the QCEW/ABS prep scripts and QA modules.
+
+Industry codes are massively repeated in the raw files (the national QCEW
+singlefile has ~3.5M rows but only a few thousand distinct industry codes), so
+`map_naics_sectors` factorizes the column, runs the scalar sector rule once per
+distinct code, and broadcasts the result back as a categorical. Callers pass
+their own scalar rule (`derive_naics2` here, or a module-specific variant) so
+each keeps its exact semantics while sharing the vectorized path.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+# Canonical NAICS2 buckets we support downstream. This doubles as an explicit
+# allowlist so any surprise NAICS codes in the raw input will be dropped during
+# prep instead of leaking into BigQuery.
+VALID_SECTORS = {
+    "11",
+    "21",
+    "22",
+    "23",
+    "31-33",
+    "42",
+    "44-45",
+    "48-49",
+    "51",
+    "52",
+    "53",
+    "54",
+    "55",
+    "56",
+    "61",
+    "62",
+    "71",
+    "72",
+    "81",
+    "92",
+}
+
+# Two-digit prefixes that BLS/Census publish as a single sector range.
+SECTOR_RANGES = {
+    "31": "31-33",
+    "32": "31-33",
+    "33": "31-33",
+    "44": "44-45",
+    "45": "44-45",
+    "48": "48-49",
+    "49": "48-49",
+}
+
+SectorRule = Callable[[Optional[str]], Optional[str]]
+
+
+def derive_naics2(code: Optional[str]) -> Optional[str]:
+    """Map raw NAICS codes to canonical sector labels."""
+    if not isinstance(code, str):
+        return None
+    cleaned = "".join(ch for ch in code.strip() if ch.isdigit())
+    if len(cleaned) < 2:
+        return None
+    base = cleaned[:2]
+    sector = SECTOR_RANGES.get(base, base)
+    return sector if sector in VALID_SECTORS else None
+
+
+def map_naics_sectors(
+    codes: pd.Series,
+    rule: SectorRule = derive_naics2,
+    allowed: Optional[Iterable[str]] = None,
+) -> pd.Series:
+    """Vectorized `codes.apply(rule)` returning a categorical sector column.
+
+    Missing values and codes the rule rejects (or that fall outside `allowed`)
+    come back as NaN. Categories are sorted lexically so groupby/sort order
+    matches the plain string column it replaces.
+    """
+    positions, uniques = pd.factorize(codes, sort=False)
+    allowed_set = set(allowed) if allowed is not None else None
+    mapped = []
+    for value in uniques:
+        sector = rule(value)
+        if sector is not None and allowed_set is not None and sector not in allowed_set:
+            sector = None
+        mapped.append(sector)
+
+    categories = sorted({sector for sector in mapped if sector is not None})
+    category_pos = {sector: idx for idx, sector in enumerate(categories)}
+    # One trailing -1 slot so factorize's missing marker (-1) maps to NaN too.
+    unique_codes = np.array(
+        [category_pos[s] if s is not None else -1 for s in mapped] + [-1],
+        dtype=np.int32,
+    )
+    sector_codes = unique_codes[positions]
+    return pd.Series(
+        pd.Categorical.from_codes(sector_codes, categories=categories),
+        index=codes.index,
+        name=codes.name,
+    )
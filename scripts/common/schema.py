@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+schema.py
+---------
+Typed CSV I/O compiled from the BigQuery DDL files in bigquery/ddl/.
+
+The DDLs are the source of truth for column types, so instead of reading every
+extract as `dtype=str` and calling `pd.to_numeric` column by column, readers
+look the table up here and parse straight into the final dtypes:
+
+  BigQuery  | pandas                        | Arrow
+  ----------+-------------------------------+-----------------
+  STRING    | object (str)                  | string
+  INT64     | Int64 (or float64, see below) | int64
+  NUMERIC   | float64                       | decimal128(38, 9)
+  FLOAT64   | float64                       | float64
+  BOOL      | boolean                       | bool
+  DATE/...  | object (str)                  | string
+
+`read_typed_csv` tries a single typed parse first; that parse is also the cast
+validation, since pandas rejects any value that does not fit its column type.
+Only when it fails does the reader fall back to text for the typed columns,
+coerce them, and report how many values per column could not be cast.
+`nullable_ints=False` reads INT64 columns as float64 for analysis code that
+relies on NumPy NaN semantics. `write_typed_csv` casts a frame to the table
+schema before writing so INT64 columns are emitted as integers (no "150.0").
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DDL_DIR = REPO_ROOT / "bigquery" / "ddl"
+
+PANDAS_TYPES = {
+    "STRING": "str",
+    "INT64": "Int64",
+    "NUMERIC": "float64",
+    "BIGNUMERIC": "float64",
+    "FLOAT64": "float64",
+    "BOOL": "boolean",
+    "DATE": "str",
+    "DATETIME": "str",
+    "TIMESTAMP": "str",
+}
+
+_TABLE_RE = re.compile(r"CREATE\s+(?:OR\s+REPLACE\s+)?TABLE\s+`([^`]+)`\s*\(", re.IGNORECASE)
+_COLUMN_RE = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_]*)\s+([A-Za-z0-9]+)(.*)$", re.DOTALL)
+_DESCRIPTION_RE = re.compile(r'description\s*=\s*"((?:[^"\\]|\\.)*)"', re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    name: str
+    bq_type: str
+    description: str = ""
+
+
+@dataclass(frozen=True)
+class TableSchema:
+    table_id: str
+    columns: tuple[ColumnSpec, ...]
+
+    @property
+    def name(self) -> str:
+        return self.table_id.split(".")[-1]
+
+    @property
+    def column_names(self) -> list[str]:
+        return [col.name for col in self.columns]
+
+    def bq_types(self) -> dict[str, str]:
+        return {col.name: col.bq_type for col in self.columns}
+
+    def pandas_dtypes(self, nullable_ints: bool = True) -> dict[str, str]:
+        out = {}
+        for col in self.columns:
+            dtype = PANDAS_TYPES.get(col.bq_type, "str")
+            if dtype == "Int64" and not nullable_ints:
+                dtype = "float64"
+            out[col.name] = dtype
+        return out
+
+    def arrow_schema(self):
+        import pyarrow as pa
+
+        arrow_types = {
+            "STRING": pa.string(),
+            "INT64": pa.int64(),
+            "NUMERIC": pa.decimal128(38, 9),
+            "BIGNUMERIC": pa.float64(),
+            "FLOAT64": pa.float64(),
+            "BOOL": pa.bool_(),
+        }
+        return pa.schema(
+            [(col.name, arrow_types.get(col.bq_type, pa.string())) for col in self.columns]
+        )
+
+
+def _strip_comments(sql: str) -> str:
+    """Drop `-- ...` comments that are not inside a string literal."""
+    lines = []
+    for line in sql.splitlines():
+        out, quote = [], None
+        i = 0
+        while i < len(line):
+            ch = line[i]
+            if quote:
+                if ch == quote:
+                    quote = None
+            elif ch in ("'", '"'):
+                quote = ch
+            elif line.startswith("--", i):
+                break
+            out.append(ch)
+            i += 1
+        lines.append("".join(out))
+    return "\n".join(lines)
+
+
+def split_top_level(body: str) -> list[str]:
+    """Split a comma-separated SQL list on commas outside parentheses and quotes."""
+    parts, depth, quote, current = [], 0, None, []
+    for ch in body:
+        if quote:
+            current.append(ch)
+            if ch == quote:
+                quote = None
+            continue
+        if ch in ("'", '"'):
+            quote = ch
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(ch)
+    parts.append("".join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+def parse_ddl(sql: str) -> TableSchema:
+    """Parse one `CREATE [OR REPLACE] TABLE` statement into a TableSchema."""
+    sql = _strip_comments(sql)
+    match = _TABLE_RE.search(sql)
+    if not match:
+        raise ValueError("No CREATE TABLE statement found in DDL.")
+    # Walk to the parenthesis that closes the column list.
+    start = match.end()
+    depth, quote, end = 1, None, None
+    for idx in range(start, len(sql)):
+        ch = sql[idx]
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in ("'", '"'):
+            quote = ch
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+            if depth == 0:
+                end = idx
+                break
+    if end is None:
+        raise ValueError(f"Unbalanced column list in DDL for {match.group(1)}.")
+
+    columns = []
+    for part in split_top_level(sql[start:end]):
+        col_match = _COLUMN_RE.match(part)
+        if not col_match:
+            raise ValueError(f"Cannot parse column definition: {part!r}")
+        name, bq_type, rest = col_match.groups()
+        desc_match = _DESCRIPTION_RE.search(rest)
+        columns.append(
+            ColumnSpec(name, bq_type.upper(), desc_match.group(1) if desc_match else "")
+        )
+    return TableSchema(match.group(1), tuple(columns))
+
+
+@lru_cache(maxsize=None)
+def load_schemas(ddl_dir: Path = DDL_DIR) -> dict[str, TableSchema]:
+    """Compile every DDL in `ddl_dir`, keyed by short table name."""
+    schemas = {}
+    for path in sorted(Path(ddl_dir).glob("*.sql")):
+        schema = parse_ddl(path.read_text())
+        schemas[schema.name] = schema
+    return schemas
+
+
+def get_schema(table: Union[str, TableSchema]) -> TableSchema:
+    if isinstance(table, TableSchema):
+        return table
+    schemas = load_schemas()
+    if table not in schemas:
+        raise KeyError(f"No DDL found for table {table!r} in {DDL_DIR}")
+    return schemas[table]
+
+
+def _coerce(series: pd.Series, dtype: str) -> tuple[pd.Series, int]:
+    """Cast a text column to `dtype`; return (values, failed non-empty casts)."""
+    text = series.astype("string").str.strip()
+    present = text.notna() & text.ne("")
+    if dtype == "boolean":
+        lowered = text.str.lower()
+        values = lowered.map({"true": True, "false": False, "1": True, "0": False})
+        values = values.astype("boolean")
+    else:
+        values = pd.to_numeric(text, errors="coerce")
+        if dtype == "Int64":
+            integral = values.isna() | (values % 1 == 0)
+            values = values.where(integral)
+            values = values.astype("Int64")
+        else:
+            values = values.astype(dtype)
+    failed = int((present & values.isna()).sum())
+    return values, failed
+
+
+def read_typed_csv(
+    path: Union[str, Path],
+    table: Union[str, TableSchema],
+    usecols: Optional[Union[list[str], Callable[[str], bool]]] = None,
+    nullable_ints: bool = True,
+    on_error: str = "coerce",
+    **read_kwargs,
+) -> pd.DataFrame:
+    """Read a CSV straight into the DDL dtypes for `table`.
+
+    Columns not in the DDL keep pandas' default inference. Cast failures are
+    recorded in `df.attrs["cast_failures"]` ({column: count}); with
+    `on_error="raise"` they raise ValueError instead.
+    """
+    schema = get_schema(table)
+    header = pd.read_csv(path, nrows=0, **read_kwargs).columns
+    if usecols is None:
+        wanted = list(header)
+    elif callable(usecols):
+        wanted = [c for c in header if usecols(c)]
+    else:
+        wanted = [c for c in header if c in set(usecols)]
+    dtypes = {
+        col: dtype
+        for col, dtype in schema.pandas_dtypes(nullable_ints=nullable_ints).items()
+        if col in wanted
+    }
+
+    try:
+        df = pd.read_csv(path, dtype=dtypes, usecols=usecols, **read_kwargs)
+        df.attrs["cast_failures"] = {}
+        return df
+    except (ValueError, TypeError):
+        pass
+
+    # Slow path: text for every typed column, then cast and count failures.
+    text_dtypes = {col: str for col in dtypes}
+    df = pd.read_csv(path, dtype=text_dtypes, usecols=usecols, **read_kwargs)
+    failures = {}
+    for col, dtype in dtypes.items():
+        if dtype == "str":
+            continue
+        df[col], failed = _coerce(df[col], dtype)
+        if failed:
+            failures[col] = failed
+    if failures:
+        message = f"[SCHEMA] {path}: values not castable to {schema.name} types: {failures}"
+        if on_error == "raise":
+            raise ValueError(message)
+        print(message)
+    df.attrs["cast_failures"] = failures
+    return df
+
+
+def cast_to_schema(df: pd.DataFrame, table: Union[str, TableSchema]) -> pd.DataFrame:
+    """Cast the DDL columns present in `df` to their types, raising on lossy casts."""
+    schema = get_schema(table)
+    out = df.copy()
+    for col, dtype in schema.pandas_dtypes().items():
+        if col not in out.columns:
+            continue
+        series = out[col]
+        if dtype == "str":
+            out[col] = series.astype(object).where(series.notna(), None)
+            out[col] = out[col].map(lambda v: v if v is None or isinstance(v, str) else str(v))
+            continue
+        if dtype == "Int64":
+            numeric = pd.to_numeric(series, errors="coerce")
+            lossy = numeric.notna() & (numeric % 1 != 0)
+            bad = (series.notna() & numeric.isna()) | lossy
+            if bad.any():
+                raise ValueError(
+                    f"{schema.name}.{col}: {int(bad.sum())} values are not INT64 "
+                    f"(e.g. {series[bad].iloc[0]!r})."
+                )
+            out[col] = numeric.astype("Int64")
+            continue
+        if dtype == "float64":
+            numeric = pd.to_numeric(series, errors="coerce")
+            bad = series.notna() & numeric.isna()
+            if bad.any():
+                raise ValueError(
+                    f"{schema.name}.{col}: {int(bad.sum())} values are not numeric "
+                    f"(e.g. {series[bad].iloc[0]!r})."
+                )
+            out[col] = numeric.astype("float64")
+    return out
+
+
+def write_typed_csv(
+    df: pd.DataFrame, path: Union[str, Path], table: Union[str, TableSchema]
+) -> pd.DataFrame:
+    """Validate/cast `df` against the DDL, then write it; returns the cast frame."""
+    typed = cast_to_schema(df, table)
+    typed.to_csv(path, index=False)
+    return typed
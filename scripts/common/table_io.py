@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+table_io.py
+-----------
+CSV or Parquet outputs for data_clean, behind one read/write pair.
+
+Builders take `--format csv|parquet` and call `write_table`; downstream loaders
+call `read_table`, which accepts either format for the same logical path:
+
+  - csv     : written exactly as before (`foo.csv`), cast to the DDL types
+              when a table name is given (see schema.py).
+  - parquet : `foo.parquet` next to the CSV path. Frames carrying `year_num`
+              become a Hive-partitioned dataset directory
+              (`foo.parquet/year_num=2022/part-0.parquet`); other frames are a
+              single file. zstd compression, dictionary encoding on the `*_cd`
+              key columns, and the original column order kept in the file
+              metadata so reads return the same layout as the CSV.
+
+`read_table("…/foo.csv")` falls back to `foo.parquet` when only the Parquet
+output exists, so loaders do not need their own format flag. `iter_table`
+reads the same outputs in bounded row chunks for full-file scans.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+import pandas as pd
+
+from scripts.common.schema import cast_to_schema, get_schema, read_typed_csv  # type: ignore
+
+FORMATS = ("csv", "parquet")
+DEFAULT_CHUNK_ROWS = 200_000
+PARTITION_COLUMN = "year_num"
+COMPRESSION = "zstd"
+_COLUMNS_KEY = b"rdm_columns"
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+    except ImportError as exc:  # pragma: no cover - dependency guard
+        raise RuntimeError("pyarrow is required for Parquet outputs (conda install pyarrow).") from exc
+    return pa, ds, pq
+
+
+def output_path(path: Union[str, Path], fmt: str = "csv") -> Path:
+    """Where `write_table` puts a frame for the CSV-style `path`."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown output format {fmt!r}; expected one of {FORMATS}.")
+    path = Path(path)
+    return path if fmt == "csv" else path.with_suffix(".parquet")
+
+
+def resolve_input(path: Union[str, Path]) -> tuple[Path, str]:
+    """Return (existing path, format) for a CSV path or its Parquet sibling."""
+    path = Path(path)
+    if path.suffix == ".parquet" or path.is_dir():
+        if not path.exists():
+            raise FileNotFoundError(f"Parquet output not found: {path}")
+        return path, "parquet"
+    if path.exists():
+        return path, "csv"
+    sibling = path.with_suffix(".parquet")
+    if sibling.exists():
+        return sibling, "parquet"
+    raise FileNotFoundError(f"Neither {path} nor {sibling} exists.")
+
+
+def _write_parquet(df: pd.DataFrame, dest: Path) -> None:
+    pa, _, pq = _pyarrow()
+    dictionary_cols = [c for c in df.columns if c.endswith("_cd") and c != PARTITION_COLUMN]
+    metadata = {_COLUMNS_KEY: json.dumps(list(df.columns)).encode()}
+    options = {"compression": COMPRESSION, "use_dictionary": dictionary_cols or False}
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if PARTITION_COLUMN not in df.columns:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), **metadata})
+        fd, tmp = tempfile.mkstemp(dir=dest.parent, suffix=".parquet.tmp")
+        os.close(fd)
+        pq.write_table(table, tmp, **options)
+        os.replace(tmp, dest)
+        return
+
+    years = pd.to_numeric(df[PARTITION_COLUMN], errors="coerce")
+    if years.isna().any():
+        raise ValueError(f"Cannot partition {dest}: {int(years.isna().sum())} rows lack {PARTITION_COLUMN}.")
+    # Build the dataset beside the destination, then swap it in, so readers
+    # never see a half-written set of partitions.
+    staging = Path(tempfile.mkdtemp(dir=dest.parent, prefix=f".{dest.name}."))
+    try:
+        body = df.drop(columns=[PARTITION_COLUMN])
+        for year, part in body.groupby(years.astype("int64").to_numpy(), sort=True):
+            table = pa.Table.from_pandas(part, preserve_index=False)
+            table = table.replace_schema_metadata({**(table.schema.metadata or {}), **metadata})
+            part_dir = staging / f"{PARTITION_COLUMN}={year}"
+            part_dir.mkdir()
+            pq.write_table(table, part_dir / "part-0.parquet", **options)
+        if dest.is_dir():
+            shutil.rmtree(dest)
+        elif dest.exists():
+            dest.unlink()
+        staging.rename(dest)
+    finally:
+        if staging.exists():
+            shutil.rmtree(staging)
+
+
+def write_table(
+    df: pd.DataFrame,
+    path: Union[str, Path],
+    fmt: str = "csv",
+    table: Optional[str] = None,
+) -> Path:
+    """Write `df` as CSV or Parquet (see module docstring); returns the path written.
+
+    With `table`, the frame is validated and cast to that DDL first.
+    """
+    dest = output_path(path, fmt)
+    typed = cast_to_schema(df, table) if table else df
+    if fmt == "csv":
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        typed.to_csv(dest, index=False)
+    else:
+        _write_parquet(typed, dest)
+    return dest
+
+
+def _read_parquet(path: Path, columns: Optional[list[str]]) -> pd.DataFrame:
+    pa, ds, _ = _pyarrow()
+    dataset = ds.dataset(path, format="parquet", partitioning="hive" if path.is_dir() else None)
+    metadata = dataset.schema.metadata or {}
+    order = json.loads(metadata[_COLUMNS_KEY]) if _COLUMNS_KEY in metadata else dataset.schema.names
+    wanted = [c for c in order if columns is None or c in columns]
+    table = dataset.to_table(columns=[c for c in wanted if c in dataset.schema.names])
+    df = table.to_pandas()
+    if PARTITION_COLUMN in df.columns:
+        df[PARTITION_COLUMN] = df[PARTITION_COLUMN].astype("int64")
+    return df[[c for c in wanted if c in df.columns]]
+
+
+def read_table(
+    path: Union[str, Path],
+    table: Optional[str] = None,
+    columns: Optional[list[str]] = None,
+    nullable_ints: bool = True,
+    **csv_kwargs,
+) -> pd.DataFrame:
+    """Load a data_clean output written as CSV or Parquet.
+
+    With `table`, columns come back in the DDL dtypes either way (CSV goes
+    through `read_typed_csv`). Extra keyword arguments apply to CSV reads only.
+    """
+    resolved, fmt = resolve_input(path)
+    if fmt == "csv":
+        if table:
+            return read_typed_csv(
+                resolved, table, usecols=columns, nullable_ints=nullable_ints, **csv_kwargs
+            )
+        return pd.read_csv(resolved, usecols=columns, **csv_kwargs)
+
+    df = _read_parquet(resolved, columns)
+    if table:
+        for col, dtype in get_schema(table).pandas_dtypes(nullable_ints=nullable_ints).items():
+            if col in df.columns and dtype != "str":
+                df[col] = df[col].astype(dtype)
+    df.attrs["cast_failures"] = {}
+    return df
+
+
+def iter_table(
+    path: Union[str, Path],
+    chunksize: int = DEFAULT_CHUNK_ROWS,
+    **csv_kwargs,
+) -> Iterator[pd.DataFrame]:
+    """Yield `read_table(path)` (untyped) in chunks of at most `chunksize` rows.
+
+    CSV chunks come from `pd.read_csv(chunksize=…, **csv_kwargs)`. Parquet is
+    read one record batch at a time in the stored column order; integer
+    columns holding nulls anywhere in the dataset come back as float64 in
+    every chunk, as they would from a full read. At least one (possibly
+    empty) chunk is always yielded so callers see the columns.
+    """
+    resolved, fmt = resolve_input(path)
+    if fmt == "csv":
+        with pd.read_csv(resolved, chunksize=chunksize, **csv_kwargs) as reader:
+            yield from reader
+        return
+
+    pa, ds, _ = _pyarrow()
+    dataset = ds.dataset(resolved, format="parquet", partitioning="hive" if resolved.is_dir() else None)
+    metadata = dataset.schema.metadata or {}
+    order = json.loads(metadata[_COLUMNS_KEY]) if _COLUMNS_KEY in metadata else dataset.schema.names
+    names = [c for c in order if c in dataset.schema.names]
+    widen = [
+        name
+        for name in names
+        if name != PARTITION_COLUMN
+        and pa.types.is_integer(dataset.schema.field(name).type)
+        and dataset.count_rows(filter=ds.field(name).is_null()) > 0
+    ]
+    yielded = False
+    for batch in dataset.to_batches(columns=names, batch_size=chunksize):
+        if batch.num_rows == 0 and yielded:
+            continue
+        df = batch.to_pandas()
+        if PARTITION_COLUMN in df.columns:
+            df[PARTITION_COLUMN] = df[PARTITION_COLUMN].astype("int64")
+        for name in widen:
+            # Nullable Int64 columns (from pandas metadata) already hold the nulls.
+            if not pd.api.types.is_extension_array_dtype(df[name].dtype):
+                df[name] = df[name].astype("float64")
+        yielded = True
+        yield df
+    if not yielded:
+        yield dataset.schema.empty_table().select(names).to_pandas()
+
+
+def read_columns(path: Union[str, Path]) -> list[str]:
+    """Column names of a CSV or Parquet output without reading its rows."""
+    resolved, fmt = resolve_input(path)
+    if fmt == "csv":
+        return list(pd.read_csv(resolved, nrows=0).columns)
+    _, ds, _ = _pyarrow()
+    dataset = ds.dataset(resolved, format="parquet", partitioning="hive" if resolved.is_dir() else None)
+    metadata = dataset.schema.metadata or {}
+    if _COLUMNS_KEY in metadata:
+        return json.loads(metadata[_COLUMNS_KEY])
+    return list(dataset.schema.names)
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+warehouse.py
+------------
+Pluggable backend for the parameterized RDM warehouse queries used by QA.
+
+The fetchers in qa/ (`fetch_rdm_abs`, `fetch_rdm_qcew`, national totals, …)
+are written as BigQuery Standard SQL with query parameters
+(`year_num IN UNNEST(@years)`). `query_warehouse(sql, params)` runs them on
+the configured backend:
+
+  - bigquery : the live project via google-cloud-bigquery (default).
+  - local    : an embedded DuckDB engine over the data_clean exports
+               (CSV or the year_num-partitioned Parquet written by table_io).
+
+For the local backend each backtick table reference is resolved by its short
+name (`…portfolio_data.econ_bnchmrk_abs_qcew` → `econ_bnchmrk_abs_qcew`) to
+`{warehouse_dir}/{table}.parquet|.csv` when a directory is given, else to the
+pipeline's default output in data_clean (the first existing one when a table
+lists several). Array parameters used as
+`IN UNNEST(@p)` are inlined as literal IN lists so DuckDB pushes the
+predicates into the Parquet/CSV scan (row-group and partition pruning);
+scalar parameters are bound as `$p`. CSV inputs are read with the column
+types from bigquery/ddl.
+
+Scripts expose the choice through `add_warehouse_arguments` /
+`configure_from_args` (or RDM_WAREHOUSE / RDM_WAREHOUSE_DIR).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Mapping, Optional, Sequence, Union
+
+import pandas as pd
+
+from scripts.common.schema import get_schema  # type: ignore
+from scripts.common.table_io import resolve_input  # type: ignore
+
+BACKENDS = ("bigquery", "local")
+WAREHOUSE_ENV = "RDM_WAREHOUSE"
+WAREHOUSE_DIR_ENV = "RDM_WAREHOUSE_DIR"
+
+# Where each warehouse table is produced locally (CSV path; the Parquet
+# sibling is used when that is what the builder wrote). A tuple lists
+# candidates in order of preference.
+DEFAULT_LOCAL_TABLES = {
+    "econ_bnchmrk_abs": "data_clean/abs/econ_bnchmrk_abs_multiyear.csv",
+    "econ_bnchmrk_qcew": "data_clean/qcew/econ_bnchmrk_qcew_multiyear.csv",
+    # The SQL-built table mirrors BigQuery; the Python merge output is the
+    # fallback when the load layer has not been run locally.
+    "econ_bnchmrk_abs_qcew": (
+        "data_clean/warehouse/econ_bnchmrk_abs_qcew.csv",
+        "data_clean/integration/econ_bnchmrk_abs_qcew.csv",
+    ),
+    "ref_state_cnty_uscb": "data_clean/reference/ref_state_cnty_uscb.csv",
+    "ref_naics2_uscb": "data_clean/reference/ref_naics2_uscb.csv",
+    "gdp_bea": "data_clean/abs/gdp_bea.csv",
+    "tri_epa": "data_clean/tri/tri_epa.csv",
+    # Built from bigquery/load by scripts/integration/run_load_sql_local.py.
+    "econ_bnchmrk_abs_qcew_state_ttl": "data_clean/warehouse/econ_bnchmrk_abs_qcew_state_ttl.csv",
+    "econ_bnchmrk_abs_qcew_indstr_ttl": "data_clean/warehouse/econ_bnchmrk_abs_qcew_indstr_ttl.csv",
+    "econ_bnchmrk_abs_qcew_rollup": "data_clean/warehouse/econ_bnchmrk_abs_qcew_rollup.csv",
+}
+
+DUCKDB_TYPES = {
+    "STRING": "VARCHAR",
+    "INT64": "BIGINT",
+    "NUMERIC": "DOUBLE",
+    "BIGNUMERIC": "DOUBLE",
+    "FLOAT64": "DOUBLE",
+    "BOOL": "BOOLEAN",
+    "DATE": "DATE",
+    "DATETIME": "TIMESTAMP",
+    "TIMESTAMP": "TIMESTAMP",
+}
+
+_TABLE_REF_RE = re.compile(r"`([^`]+)`")
+_UNNEST_PARAM_RE = re.compile(r"\bUNNEST\s*\(\s*@(\w+)\s*\)", re.IGNORECASE)
+_PARAM_RE = re.compile(r"@(\w+)")
+
+Params = Mapping[str, Union[Any, Sequence[Any]]]
+TablePaths = Union[str, Path, Sequence[Union[str, Path]]]
+
+
+def _is_array(value: Any) -> bool:
+    return isinstance(value, (list, tuple, set, frozenset))
+
+
+def _sql_literal(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def translate_sql(sql: str, params: Optional[Params] = None) -> tuple[str, dict[str, Any]]:
+    """BigQuery-parameterized SQL → (DuckDB SQL, scalar parameters).
+
+    `UNNEST(@array)` becomes a literal list `(v1, v2, …)`; other `@name`
+    parameters become `$name`. Backtick table references become the quoted
+    short table name, which the local backend registers as a view.
+    """
+    params = dict(params or {})
+
+    def _unnest(match: re.Match) -> str:
+        name = match.group(1)
+        if name not in params:
+            raise KeyError(f"Missing query parameter @{name}")
+        values = params[name]
+        if not _is_array(values):
+            raise TypeError(f"@{name} is used with UNNEST but is not an array")
+        items = sorted(values) if isinstance(values, (set, frozenset)) else list(values)
+        return "(" + (", ".join(_sql_literal(v) for v in items) or "NULL") + ")"
+
+    translated = _UNNEST_PARAM_RE.sub(_unnest, sql)
+    translated = _TABLE_REF_RE.sub(lambda m: f'"{m.group(1).split(".")[-1]}"', translated)
+    scalars: dict[str, Any] = {}
+
+    def _scalar(match: re.Match) -> str:
+        name = match.group(1)
+        if name not in params:
+            raise KeyError(f"Missing query parameter @{name}")
+        scalars[name] = params[name]
+        return f"${name}"
+
+    translated = _PARAM_RE.sub(_scalar, translated)
+    return translated, scalars
+
+
+def table_names(sql: str) -> list[str]:
+    """Short names of the backtick table references in `sql`."""
+    return sorted({ref.split(".")[-1] for ref in _TABLE_REF_RE.findall(sql)})
+
+
+class BigQueryWarehouse:
+    """Runs the queries as written against the live BigQuery project."""
+
+    name = "bigquery"
+
+    def __init__(self) -> None:
+        self._client = None
+
+    def _bigquery(self):
+        try:
+            from google.cloud import bigquery
+        except ImportError as exc:
+            raise RuntimeError(
+                "google-cloud-bigquery is required for the BigQuery warehouse "
+                "(or run with --warehouse local)."
+            ) from exc
+        return bigquery
+
+    @staticmethod
+    def _param_type(values: Sequence[Any]) -> str:
+        sample = next((v for v in values if v is not None), "")
+        if isinstance(sample, bool):
+            return "BOOL"
+        if isinstance(sample, int):
+            return "INT64"
+        if isinstance(sample, float):
+            return "FLOAT64"
+        return "STRING"
+
+    def query(self, sql: str, params: Optional[Params] = None) -> pd.DataFrame:
+        bigquery = self._bigquery()
+        query_parameters = []
+        for name, value in (params or {}).items():
+            if _is_array(value):
+                values = list(value)
+                query_parameters.append(
+                    bigquery.ArrayQueryParameter(name, self._param_type(values), values)
+                )
+            else:
+                query_parameters.append(
+                    bigquery.ScalarQueryParameter(name, self._param_type([value]), value)
+                )
+        if self._client is None:
+            self._client = bigquery.Client()
+        job_config = bigquery.QueryJobConfig(query_parameters=query_parameters)
+        return self._client.query(sql, job_config=job_config).to_dataframe()
+
+
+class LocalWarehouse:
+    """DuckDB over local table exports; same SQL and parameters as BigQuery."""
+
+    name = "local"
+
+    def __init__(
+        self,
+        warehouse_dir: Optional[Union[str, Path]] = None,
+        tables: Optional[Mapping[str, TablePaths]] = None,
+    ) -> None:
+        self.warehouse_dir = Path(warehouse_dir) if warehouse_dir else None
+        self.tables = {
+            k: (Path(v),) if isinstance(v, (str, Path)) else tuple(Path(p) for p in v)
+            for k, v in (tables or DEFAULT_LOCAL_TABLES).items()
+        }
+        self._con = None
+        self._views: set[str] = set()
+        self._lock = threading.Lock()
+
+    def _duckdb(self):
+        try:
+            import duckdb
+        except ImportError as exc:
+            raise RuntimeError(
+                "duckdb is required for the local warehouse (pip install duckdb)."
+            ) from exc
+        return duckdb
+
+    def table_path(self, table: str) -> tuple[Path, str]:
+        """(existing path, format) backing `table`."""
+        candidates = []
+        if self.warehouse_dir is not None:
+            candidates.append(self.warehouse_dir / f"{table}.csv")
+        candidates.extend(self.tables.get(table, ()))
+        for candidate in candidates:
+            try:
+                return resolve_input(candidate)
+            except FileNotFoundError:
+                continue
+        tried = ", ".join(str(c) for c in candidates) or "no known path"
+        raise FileNotFoundError(f"No local export for warehouse table {table!r} (tried {tried}).")
+
+    def relation_sql(self, table: str) -> str:
+        """DuckDB table function reading the export backing `table`."""
+        path, fmt = self.table_path(table)
+        if fmt == "parquet":
+            if path.is_dir():
+                glob = _sql_literal(str(path / "**" / "*.parquet"))
+                return f"read_parquet({glob}, hive_partitioning = true)"
+            return f"read_parquet({_sql_literal(str(path))})"
+        try:
+            schema = get_schema(table)
+        except KeyError:
+            return f"read_csv({_sql_literal(str(path))}, header = true, all_varchar = true)"
+        header = pd.read_csv(path, nrows=0).columns
+        types = schema.bq_types()
+        columns = ", ".join(
+            f"{_sql_literal(col)}: {_sql_literal(DUCKDB_TYPES.get(types.get(col, 'STRING'), 'VARCHAR'))}"
+            for col in header
+        )
+        return f"read_csv({_sql_literal(str(path))}, header = true, columns = {{{columns}}})"
+
+    def connection(self):
+        if self._con is None:
+            self._con = self._duckdb().connect()
+        return self._con
+
+    def register(self, table: str) -> None:
+        if table in self._views:
+            return
+        con = self.connection()
+        con.execute(f'CREATE OR REPLACE VIEW "{table}" AS SELECT * FROM {self.relation_sql(table)}')
+        self._views.add(table)
+
+    def mark_materialized(self, table: str) -> None:
+        """Serve `table` from the connection (e.g. a CREATE TABLE result), not an export."""
+        self._views.add(table)
+
+    def query(self, sql: str, params: Optional[Params] = None) -> pd.DataFrame:
+        translated, scalars = translate_sql(sql, params)
+        with self._lock:
+            for table in table_names(sql):
+                self.register(table)
+            return self.connection().execute(translated, scalars or None).fetchdf()
+
+    def close(self) -> None:
+        if self._con is not None:
+            self._con.close()
+            self._con = None
+            self._views.clear()
+
+
+Warehouse = Union[BigQueryWarehouse, LocalWarehouse]
+
+_default_warehouse: Optional[Warehouse] = None
+_default_lock = threading.Lock()
+
+
+def configure_warehouse(backend: Optional[str] = None, warehouse_dir: Optional[str] = None) -> Warehouse:
+    """Replace the process-wide backend used by `query_warehouse`."""
+    global _default_warehouse
+    backend = (backend or os.environ.get(WAREHOUSE_ENV) or "bigquery").lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown warehouse backend {backend!r}; expected one of {BACKENDS}.")
+    with _default_lock:
+        if backend == "local":
+            _default_warehouse = LocalWarehouse(warehouse_dir or os.environ.get(WAREHOUSE_DIR_ENV))
+        else:
+            _default_warehouse = BigQueryWarehouse()
+        return _default_warehouse
+
+
+def default_warehouse() -> Warehouse:
+    with _default_lock:
+        configured = _default_warehouse
+    return configured if configured is not None else configure_warehouse()
+
+
+def query_warehouse(sql: str, params: Optional[Params] = None) -> pd.DataFrame:
+    """Run a BigQuery-parameterized query on the configured backend."""
+    return default_warehouse().query(sql, params)
+
+
+def add_warehouse_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--warehouse",
+        choices=BACKENDS,
+        default=None,
+        help=f"Backend for RDM warehouse queries (default: ${WAREHOUSE_ENV} or bigquery).",
+    )
+    parser.add_argument(
+        "--warehouse_dir",
+        default=None,
+        help="Directory of {table}.csv/.parquet exports for --warehouse local "
+        "(default: the data_clean pipeline outputs).",
+    )
+
+
+def configure_from_args(args: argparse.Namespace) -> Warehouse:
+    return configure_warehouse(args.warehouse, args.warehouse_dir)
@@ -7,7 +7,27 @@ run non-interactively:
   1. Read the EPA 1A tab-delimited release file (robust to ragged rows).
   2. Derive total release pounds (on-site + off-site) per facility.
   3. Aggregate to (state, county name, NAICS2) totals.
-  4. Enrich with Simplemaps county reference to attach 5-digit FIPS codes.
+  4. Enrich with Simplemaps county reference to attach 5-digit FIPS codes
+     (via the compiled, memory-mapped index in scripts/common/county_fips_index.py).
+
+Steps 1–3 stream by default: `aggregate_tri_1a` reads the 1A file in
+`--chunksize` record chunks, keeps only the five columns the aggregation uses
+(as per-column buffers rather than full rows), and folds each chunk into a
+`GroupSumAggregator`. Memory is bounded by the (state, county, NAICS2) groups
+instead of the facility rows. `--chunksize 0` keeps the whole-file read.
+
+Usage:
+  python scripts/epa/tri_epa_pipeline.py --tri_txt data_raw/us_series/US_1a_2022.txt
+  python scripts/epa/tri_epa_pipeline.py --years 2020 2021 2022 --workers 3
+  # Batch mode reads --tri_template per year, adds year_num, writes per-year
+  # tables plus a stacked data_clean/tri/tri_epa_multiyear.csv.
+
+In batch mode the county FIPS index and fuzzy matcher are built once in the
+parent. Workers receive the index as its compiled directory and memory-map it
+(an in-memory index, `--fips_index_dir ""`, is pickled instead). Worker
+processes normalize county names with their own copy of the name memo and
+return the names they normalized; the parent merges them into its memo, which
+`main` saves once the batch is done.
 """
 
 from __future__ import annotations
@@ -15,34 +35,60 @@ from __future__ import annotations
 import argparse
 import csv
 import re
+import sys
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Iterable, Iterator, List, Optional, TextIO, Union
 
 import pandas as pd
 
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from scripts.common.aggregate import GroupSumAggregator  # type: ignore # noqa: E402
+from scripts.common.batch import iter_year_results  # type: ignore # noqa: E402
+from scripts.common.county_fips_index import (  # type: ignore # noqa: E402
+    DEFAULT_INDEX_DIR,
+    CountyFipsIndex,
+    load_county_fips_index,
+)
+from scripts.common.county_fuzzy import (  # type: ignore # noqa: E402
+    DEFAULT_THRESHOLD,
+    CountyNameMatcher,
+)
+from scripts.common.county_names import (  # type: ignore # noqa: E402
+    DEFAULT_MEMO_PATH,
+    CountyNameMemo,
+    configure_county_name_memo,
+    default_memo,
+    normalize_county_name,
+)
+from scripts.common.keys import decode_fips  # type: ignore # noqa: E402
+from scripts.common.table_io import FORMATS, write_table  # type: ignore # noqa: E402
+
 DEFAULT_TRI_PATH = Path("data_raw/us_series/US_1a_2022.txt")
+DEFAULT_TRI_TEMPLATE = "data_raw/us_series/US_1a_{year}.txt"
 DEFAULT_SIMPLEMAPS = Path(
     "data_raw/external/simplemaps/simplemaps_uscounties_basicv1.91/uscounties.csv"
 )
 DEFAULT_OUT = Path("data_clean/tri/tri_epa.csv")
+DEFAULT_STACKED_OUT = Path("data_clean/tri/tri_epa_multiyear.csv")
+DEFAULT_PER_YEAR_PATTERN = "data_clean/tri/tri_epa_{year}.csv"
+DEFAULT_FUZZY_AUDIT = Path("data_clean/tri/tri_epa_fuzzy_matches.csv")
+DEFAULT_CHUNKSIZE = 100_000
 
-COUNTY_SUFFIX_TERMS = [
-    "county",
-    "parish",
-    "borough",
-    "boro",
-    "municipio",
-    "municipality",
-    "census area",
-    "census are",
-    "censu",
-    "census district",
-    "city and borough",
-    "city",
-    "island",
-]
 TERRITORY_SKIP = {"PR", "VI"}
 
+# derive_tri_aggregates inputs: output name → header keyword matched by find_column.
+TRI_SOURCE_KEYWORDS = {
+    "primary NAICS": "PRIMARY NAICS CODE",
+    "facility state": "FACILITY STATE",
+    "facility county": "FACILITY COUNTY",
+    "total on-site releases": "TOTAL ON-SITE RELEASES",
+    "total off-site releases": "TOTAL TRANSFERRED OFF SITE FOR DISPOSAL",
+}
+TRI_GROUP_COLS = ["state_cd", "cnty_nm", "naics2_sector_cd"]
+
 
 def normalize_row(fields: List[str], width: int) -> List[str]:
     """Return exactly `width` fields by padding or gluing overflow."""
@@ -54,42 +100,93 @@ def normalize_row(fields: List[str], width: int) -> List[str]:
     return fields
 
 
+def _tri_records(fh: TextIO, tri_path: Path) -> tuple[List[str], Iterator[List[str]]]:
+    """Header columns and an iterator over the data records of an open 1A file.
+
+    Blank records and the "total output lines" footer are skipped.
+    """
+    for raw_line in fh:
+        line = raw_line.lstrip("\ufeff").rstrip("\r\n")
+        if not line or line.lower().startswith("total output lines"):
+            continue
+        header_cols = line.split("\t")
+        if header_cols and (header_cols[-1] == "" or header_cols[-1].isdigit()):
+            header_cols = header_cols[:-1]
+        break
+    else:
+        raise ValueError(f"Could not locate header row in {tri_path}")
+
+    reader = csv.reader(fh, delimiter="\t", quotechar='"', doublequote=True, escapechar="\\")
+    records = (
+        record
+        for record in reader
+        if record and not record[0].lower().startswith("total output lines")
+    )
+    return header_cols, records
+
+
+def _kept_columns(header_cols: List[str]) -> List[str]:
+    return [col for col in header_cols if not re.fullmatch(r"Unnamed:.*|^$", col)]
+
+
 def read_tri_1a(tri_path: Path) -> pd.DataFrame:
     """Read the EPA TRI 1A TSV export (with no header row)."""
     tri_path = Path(tri_path)
     if not tri_path.exists():
         raise FileNotFoundError(tri_path)
 
-    header_cols: Optional[List[str]] = None
-    rows: List[List[str]] = []
     with tri_path.open("r", encoding="latin1", newline="") as fh:
-        for raw_line in fh:
-            line = raw_line.lstrip("\ufeff").rstrip("\r\n")
-            if not line or line.lower().startswith("total output lines"):
-                continue
-            header_cols = line.split("\t")
-            if header_cols and (header_cols[-1] == "" or header_cols[-1].isdigit()):
-                header_cols = header_cols[:-1]
-            width = len(header_cols)
-            reader = csv.reader(
-                fh, delimiter="\t", quotechar='"', doublequote=True, escapechar="\\"
-            )
-            for record in reader:
-                if not record:
-                    continue
-                if record[0].lower().startswith("total output lines"):
-                    continue
-                rows.append(normalize_row(record, width))
-            break
-
-    if header_cols is None:
-        raise ValueError(f"Could not locate header row in {tri_path}")
+        header_cols, records = _tri_records(fh, tri_path)
+        width = len(header_cols)
+        rows = [normalize_row(record, width) for record in records]
 
     df = pd.DataFrame(rows, columns=header_cols)
     df = df.loc[:, ~df.columns.astype(str).str.fullmatch(r"Unnamed:.*|^$")]
     return df
 
 
+def iter_tri_1a(
+    tri_path: Path,
+    keywords: Optional[dict[str, str]] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[pd.DataFrame]:
+    """Yield `read_tri_1a` in chunks, projected to the `keywords` columns.
+
+    Each requested column (resolved with `find_column`, default
+    TRI_SOURCE_KEYWORDS) is collected into its own list buffer and turned into
+    a frame every `chunksize` records; ragged records are padded/glued exactly
+    as `normalize_row` does. At least one (possibly empty) chunk is yielded.
+    """
+    tri_path = Path(tri_path)
+    if not tri_path.exists():
+        raise FileNotFoundError(tri_path)
+
+    with tri_path.open("r", encoding="latin1", newline="") as fh:
+        header_cols, records = _tri_records(fh, tri_path)
+        width = len(header_cols)
+        resolved = resolve_tri_columns(_kept_columns(header_cols), keywords)
+        # Header order, so find_column on a chunk picks the same columns.
+        names = sorted(set(resolved.values()), key=header_cols.index)
+        positions = [header_cols.index(col) for col in names]
+
+        buffers: List[List[str]] = [[] for _ in names]
+        buffered = 0
+        yielded = False
+        for record in records:
+            if len(record) != width:
+                record = normalize_row(record, width)
+            for buffer, pos in zip(buffers, positions):
+                buffer.append(record[pos])
+            buffered += 1
+            if buffered >= chunksize:
+                yield pd.DataFrame(dict(zip(names, buffers)), columns=names)
+                yielded = True
+                buffers = [[] for _ in names]
+                buffered = 0
+        if buffered or not yielded:
+            yield pd.DataFrame(dict(zip(names, buffers)), columns=names)
+
+
 def find_column(columns: Iterable[str], keyword: str) -> Optional[str]:
     keyword = keyword.upper()
     for col in columns:
@@ -98,112 +195,92 @@ def find_column(columns: Iterable[str], keyword: str) -> Optional[str]:
     return None
 
 
-def derive_tri_aggregates(df: pd.DataFrame) -> pd.DataFrame:
-    naics_col = find_column(df.columns, "PRIMARY NAICS CODE")
-    state_col = find_column(df.columns, "FACILITY STATE")
-    county_col = find_column(df.columns, "FACILITY COUNTY")
-    col_on = find_column(df.columns, "TOTAL ON-SITE RELEASES")
-    col_off = find_column(df.columns, "TOTAL TRANSFERRED OFF SITE FOR DISPOSAL")
-
-    required = {
-        "primary NAICS": naics_col,
-        "facility state": state_col,
-        "facility county": county_col,
-        "total on-site releases": col_on,
-        "total off-site releases": col_off,
-    }
+def resolve_tri_columns(
+    columns: Iterable[str], keywords: Optional[dict[str, str]] = None
+) -> dict[str, str]:
+    """Map each `keywords` entry (default TRI_SOURCE_KEYWORDS) to its header column, or raise."""
+    columns = list(columns)
+    keywords = TRI_SOURCE_KEYWORDS if keywords is None else keywords
+    required = {name: find_column(columns, kw) for name, kw in keywords.items()}
     missing = [name for name, col in required.items() if col is None]
     if missing:
         raise ValueError(f"TRI file missing required columns: {missing}")
+    return required
 
-    df = df.copy()
-    df["naics2_sector_cd"] = (
-        df[naics_col].astype(str).str.extract(r"(\d+)", expand=False).str[:2]
-    )
-    df["state_cd"] = (
-        df[state_col].astype(str).str.strip().str.upper().str[:2]
-    )  # e.g., CA, NY
-    df["cnty_nm"] = df[county_col].astype(str).str.strip().str.upper()
 
-    df["tri_ttl_rls_lbs_amt"] = (
-        pd.to_numeric(df[col_on], errors="coerce").fillna(0)
-        + pd.to_numeric(df[col_off], errors="coerce").fillna(0)
+def tri_release_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Facility rows keyed by (state, county name, NAICS2) with total release pounds."""
+    cols = resolve_tri_columns(df.columns)
+    out = pd.DataFrame(index=df.index)
+    out["state_cd"] = (
+        df[cols["facility state"]].astype(str).str.strip().str.upper().str[:2]
+    )  # e.g., CA, NY
+    out["cnty_nm"] = df[cols["facility county"]].astype(str).str.strip().str.upper()
+    out["naics2_sector_cd"] = (
+        df[cols["primary NAICS"]].astype(str).str.extract(r"(\d+)", expand=False).str[:2]
+    )
+    out["tri_ttl_rls_lbs_amt"] = (
+        pd.to_numeric(df[cols["total on-site releases"]], errors="coerce").fillna(0)
+        + pd.to_numeric(df[cols["total off-site releases"]], errors="coerce").fillna(0)
     )
+    return out.dropna(subset=TRI_GROUP_COLS + ["tri_ttl_rls_lbs_amt"])
+
 
+def derive_tri_aggregates(df: pd.DataFrame) -> pd.DataFrame:
     tri_g = (
-        df.dropna(
-            subset=["state_cd", "cnty_nm", "naics2_sector_cd", "tri_ttl_rls_lbs_amt"]
-        )
-        .groupby(["state_cd", "cnty_nm", "naics2_sector_cd"], as_index=False)[
-            "tri_ttl_rls_lbs_amt"
-        ]
+        tri_release_rows(df)
+        .groupby(TRI_GROUP_COLS, as_index=False)["tri_ttl_rls_lbs_amt"]
         .sum()
     )
     return tri_g
 
 
-def normalize_county_name(series: pd.Series) -> pd.Series:
-    cleaned = series.fillna("").str.lower().str.replace(r"[^a-z0-9\s]", " ", regex=True)
-    for term in COUNTY_SUFFIX_TERMS:
-        pattern = r"\b" + term.replace(" ", r"\s+") + r"\b"
-        cleaned = cleaned.str.replace(pattern, " ", regex=True)
-    cleaned = (
-        cleaned.str.replace(r"\bst\b", "saint", regex=True)
-        .str.replace(r"\band\b", "and", regex=True)
-        .str.replace(r"\s+", "", regex=True)
-        .str.strip()
+def aggregate_tri_1a(tri_path: Path, chunksize: int = DEFAULT_CHUNKSIZE) -> pd.DataFrame:
+    """Streaming `derive_tri_aggregates(read_tri_1a(tri_path))`."""
+    aggregator = GroupSumAggregator(TRI_GROUP_COLS, ["tri_ttl_rls_lbs_amt"])
+    for chunk in iter_tri_1a(tri_path, chunksize=chunksize):
+        aggregator.update(tri_release_rows(chunk))
+    return aggregator.finalize()
+
+
+def enrich_with_fips(
+    tri_g: pd.DataFrame,
+    index: CountyFipsIndex,
+    matcher: Optional[CountyNameMatcher] = None,
+) -> pd.DataFrame:
+    """Attach FIPS by exact (state, normalized name) lookup, then the fuzzy fallback.
+
+    With a `matcher`, names the index cannot resolve (outside TERRITORY_SKIP)
+    go through the trigram matcher; its accepted matches are returned as
+    records in `tri_final.attrs["fuzzy_matches"]` for the audit CSV.
+    """
+    tri_normed = tri_g.reset_index(drop=True).assign(
+        state_code=lambda df: df["state_cd"].str.upper(),
+        county_name_norm=lambda df: normalize_county_name(df["cnty_nm"]),
     )
-    return cleaned
-
-
-def build_county_lookup(simplemaps_csv: Path) -> pd.DataFrame:
-    county_ref = pd.read_csv(simplemaps_csv, dtype=str)
-    name_cols = ["county", "county_ascii", "county_full"]
-    for col in name_cols:
-        county_ref[f"{col}_norm"] = normalize_county_name(county_ref[col])
-
-    lookup = (
-        county_ref.assign(state_code=county_ref["state_id"].str.upper())
-        .melt(
-            id_vars=["state_code", "county_fips"],
-            value_vars=[f"{col}_norm" for col in name_cols],
-            value_name="county_name_norm",
+    fips = index.resolve(tri_normed["state_code"], tri_normed["county_name_norm"])
+    merged = tri_normed.assign(county_fips_5=decode_fips(fips).to_numpy())
+
+    fuzzy_audit = pd.DataFrame()
+    if matcher is not None:
+        pending = merged["county_fips_5"].isna() & ~merged["state_code"].isin(TERRITORY_SKIP)
+        matches = matcher.match_frame(
+            merged.loc[pending, "state_code"], merged.loc[pending, "county_name_norm"]
         )
-        .dropna(subset=["county_name_norm"])
-        .drop_duplicates(["state_code", "county_name_norm"])
-        .assign(county_fips_5=lambda df: df["county_fips"].astype(str).str.zfill(5))
-    )
-
-    manual_overrides = pd.DataFrame(
-        [
-            ("CT", "fairfield", "09001"),
-            ("CT", "hartford", "09003"),
-            ("CT", "litchfield", "09005"),
-            ("CT", "middlesex", "09007"),
-            ("CT", "newhaven", "09009"),
-            ("CT", "newlondon", "09011"),
-            ("CT", "tolland", "09013"),
-            ("CT", "windham", "09015"),
-            ("AK", "valdezcordova", "02261"),
-        ],
-        columns=["state_code", "county_name_norm", "county_fips_5"],
-    )
-    lookup = (
-        pd.concat([lookup, manual_overrides], ignore_index=True)
-        .drop_duplicates(["state_code", "county_name_norm"], keep="last")
-        .reset_index(drop=True)
-    )
-    return lookup
-
-
-def enrich_with_fips(tri_g: pd.DataFrame, lookup: pd.DataFrame) -> pd.DataFrame:
-    tri_normed = tri_g.assign(
-        state_code=tri_g["state_cd"].str.upper(),
-        county_name_norm=normalize_county_name(tri_g["cnty_nm"]),
-    )
-    merged = tri_normed.merge(
-        lookup, on=["state_code", "county_name_norm"], how="left"
-    )
+        if not matches.empty:
+            keys = ["state_code", "county_name_norm"]
+            fuzzy_fips = merged[keys].merge(matches, on=keys, how="left")["county_fips_5"]
+            hit = pending & fuzzy_fips.notna()
+            merged.loc[hit, "county_fips_5"] = fuzzy_fips[hit]
+            fuzzy_audit = (
+                merged.loc[hit, ["state_cd", "cnty_nm"] + keys]
+                .drop_duplicates(["state_cd", "cnty_nm"])
+                .merge(matches, on=keys, how="left")
+            )
+            print(
+                f"Fuzzy-matched {len(fuzzy_audit):,} county names ({int(hit.sum()):,} rows) "
+                f"at threshold {matcher.threshold:.2f}."
+            )
     merged["state_cnty_fips_cd"] = merged["county_fips_5"]
     merged["state_fips_cd"] = merged["county_fips_5"].str[:2]
     merged["county_fips_cd"] = merged["county_fips_5"].str[2:]
@@ -235,9 +312,89 @@ def enrich_with_fips(tri_g: pd.DataFrame, lookup: pd.DataFrame) -> pd.DataFrame:
         .fillna(0)
         .round(2)
     )
+    tri_final.attrs["fuzzy_matches"] = fuzzy_audit.to_dict("records")
     return tri_final
 
 
+def process_year(
+    year: int,
+    tri_path: Path,
+    chunksize: int,
+    index: CountyFipsIndex,
+    matcher: Optional[CountyNameMatcher],
+) -> tuple[pd.DataFrame, list[dict], dict[str, str]]:
+    """One vintage: (tri_epa frame with year_num first, fuzzy-match audit records,
+    raw → normalized county names for the caller's memo)."""
+    print(f"[TRI] Processing {year} from {tri_path}")
+    if chunksize:
+        tri_g = aggregate_tri_1a(Path(tri_path), chunksize=chunksize)
+    else:
+        tri_g = derive_tri_aggregates(read_tri_1a(Path(tri_path)))
+    tri_final = enrich_with_fips(tri_g, index, matcher)
+    audit = [{"year_num": year, **record} for record in tri_final.attrs.pop("fuzzy_matches", [])]
+    tri_final.insert(0, "year_num", year)
+    raw_names = [name for name in tri_g["cnty_nm"].unique() if isinstance(name, str)]
+    names = dict(zip(raw_names, default_memo().lookup(raw_names)))
+    return tri_final, audit, names
+
+
+def write_fuzzy_audit(records: list[dict], audit_csv: Union[str, Path]) -> None:
+    fuzzy_audit = pd.DataFrame(records)
+    if not fuzzy_audit.empty:
+        audit_path = Path(audit_csv)
+        audit_path.parent.mkdir(parents=True, exist_ok=True)
+        fuzzy_audit.to_csv(audit_path, index=False)
+        print(f"Wrote fuzzy-match audit {audit_path} ({len(fuzzy_audit):,} names).")
+
+
+def run_batch(
+    years: List[int],
+    tri_template: str,
+    per_year_pattern: str,
+    stacked_out: Optional[str],
+    index: CountyFipsIndex,
+    matcher: Optional[CountyNameMatcher] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    workers: int = 1,
+    fmt: str = "csv",
+    fuzzy_audit_csv: Optional[str] = None,
+    memo: Optional[CountyNameMemo] = None,
+) -> pd.DataFrame:
+    """Build each year's tri_epa table (in parallel when workers > 1) and stack them.
+
+    County names normalized by the workers are merged into `memo` (default:
+    the process-wide memo); saving it is left to the caller.
+    """
+    if memo is None:
+        memo = default_memo()
+    year_args = {
+        year: (year, Path(tri_template.format(year=year)), chunksize, index, matcher)
+        for year in years
+    }
+    frames_by_year: dict[int, pd.DataFrame] = {}
+    audits_by_year: dict[int, list[dict]] = {}
+    for year, (df, audit, names) in iter_year_results(process_year, year_args, workers=workers):
+        memo.update(names)
+        if per_year_pattern:
+            per_year_path = write_table(
+                df, per_year_pattern.format(year=year), fmt, table="tri_epa"
+            )
+            print(f"[TRI] Wrote {per_year_path} ({len(df):,} rows).")
+        frames_by_year[year] = df
+        audits_by_year[year] = audit
+
+    combined = pd.concat([frames_by_year[year] for year in years], ignore_index=True)
+    dupes = int(combined.duplicated(["year_num"] + TRI_GROUP_COLS).sum())
+    if dupes:
+        raise AssertionError(f"Found {dupes} duplicate rows in combined TRI output.")
+    if fuzzy_audit_csv:
+        write_fuzzy_audit([r for year in years for r in audits_by_year[year]], fuzzy_audit_csv)
+    if stacked_out:
+        out_path = write_table(combined, stacked_out, fmt, table="tri_epa")
+        print(f"[TRI] Wrote combined dataset: {out_path} ({len(combined):,} rows).")
+    return combined
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Aggregate EPA TRI 1A file to county × NAICS2 with FIPS enrichment."
@@ -247,6 +404,29 @@ def parse_args() -> argparse.Namespace:
         default=str(DEFAULT_TRI_PATH),
         help=f"Raw EPA 1A TSV export (default: {DEFAULT_TRI_PATH})",
     )
+    parser.add_argument(
+        "--years",
+        type=int,
+        nargs="+",
+        help="Batch mode: process these TRI vintages via --tri_template instead of --tri_txt.",
+    )
+    parser.add_argument(
+        "--tri_template",
+        default=DEFAULT_TRI_TEMPLATE,
+        help="Batch-mode 1A path pattern (use '{year}' placeholder; default: %(default)s)",
+    )
+    parser.add_argument(
+        "--per_year_pattern",
+        default=DEFAULT_PER_YEAR_PATTERN,
+        help="Batch-mode per-year outputs (use '{year}' placeholder; empty skips; "
+        "default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Batch mode: process vintages in parallel with this many worker processes (default: 1)",
+    )
     parser.add_argument(
         "--simplemaps",
         default=str(DEFAULT_SIMPLEMAPS),
@@ -254,22 +434,85 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--out_csv",
-        default=str(DEFAULT_OUT),
-        help=f"Output CSV path (default: {DEFAULT_OUT})",
+        default=None,
+        help=f"Output CSV path (default: {DEFAULT_OUT}; with --years the stacked output, "
+        f"default {DEFAULT_STACKED_OUT}, empty skips it)",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=DEFAULT_CHUNKSIZE,
+        help="Records per streamed chunk of the 1A file (0 reads the whole file at once).",
+    )
+    parser.add_argument(
+        "--fips_index_dir",
+        default=DEFAULT_INDEX_DIR,
+        help="Directory for the compiled county-name → FIPS index; empty compiles in memory "
+        "(default: %(default)s).",
+    )
+    parser.add_argument(
+        "--fuzzy_threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Minimum trigram Dice score for the fuzzy county-name fallback (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--no_fuzzy",
+        action="store_true",
+        help="Disable the fuzzy county-name fallback (exact index matches only).",
+    )
+    parser.add_argument(
+        "--fuzzy_audit_csv",
+        default=str(DEFAULT_FUZZY_AUDIT),
+        help=f"Audit CSV of accepted fuzzy matches (default: {DEFAULT_FUZZY_AUDIT})",
+    )
+    parser.add_argument(
+        "--county_name_memo",
+        default=DEFAULT_MEMO_PATH,
+        help="JSON memo of normalized county names reused across runs; empty disables "
+        "(default: %(default)s).",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="csv",
+        help="Output format; parquet writes a zstd file next to --out_csv (default: csv).",
     )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    tri_raw = read_tri_1a(Path(args.tri_txt))
-    tri_g = derive_tri_aggregates(tri_raw)
-    lookup = build_county_lookup(Path(args.simplemaps))
-    tri_final = enrich_with_fips(tri_g, lookup)
-
-    out_path = Path(args.out_csv)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    tri_final.to_csv(out_path, index=False)
+    memo = configure_county_name_memo(args.county_name_memo or None)
+    index = load_county_fips_index(Path(args.simplemaps), args.fips_index_dir or None)
+    matcher = None if args.no_fuzzy else CountyNameMatcher.from_index(index, threshold=args.fuzzy_threshold)
+
+    if args.years:
+        run_batch(
+            sorted(set(args.years)),
+            args.tri_template,
+            args.per_year_pattern,
+            str(DEFAULT_STACKED_OUT) if args.out_csv is None else args.out_csv,
+            index,
+            matcher,
+            chunksize=args.chunksize,
+            workers=args.workers,
+            fmt=args.format,
+            fuzzy_audit_csv=args.fuzzy_audit_csv,
+            memo=memo,
+        )
+        memo.save()
+        return
+
+    if args.chunksize:
+        tri_g = aggregate_tri_1a(Path(args.tri_txt), chunksize=args.chunksize)
+    else:
+        tri_g = derive_tri_aggregates(read_tri_1a(Path(args.tri_txt)))
+    tri_final = enrich_with_fips(tri_g, index, matcher)
+    memo.save()
+    write_fuzzy_audit(tri_final.attrs.pop("fuzzy_matches", []), args.fuzzy_audit_csv)
+
+    out_path = write_table(tri_final, args.out_csv or DEFAULT_OUT, args.format, table="tri_epa")
     print(f"Wrote {out_path} with {len(tri_final):,} rows.")
 
 
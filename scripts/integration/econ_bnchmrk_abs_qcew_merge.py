@@ -13,12 +13,21 @@ out-of-scope.
 from __future__ import annotations
 
 import argparse
+import sys
 from pathlib import Path
 from typing import List
 
 import numpy as np
 import pandas as pd
 
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from scripts.common.keys import count_duplicate_keys, merge_on_keys  # type: ignore # noqa: E402
+from scripts.common.schema import read_typed_csv  # type: ignore # noqa: E402
+from scripts.common.table_io import FORMATS, read_table, write_table  # type: ignore # noqa: E402
+
 ABS_PATTERN_DEFAULT = "data_clean/abs/econ_bnchmrk_abs_{year}.csv"
 QCEW_PATTERN_DEFAULT = "data_clean/qcew/econ_bnchmrk_qcew_{year}.csv"
 REF_DEFAULT = "data_clean/reference/ref_state_cnty_uscb.csv"
@@ -33,26 +42,28 @@ def safe_divide(num: pd.Series, den: pd.Series) -> pd.Series:
 
 def load_abs(year: int, pattern: str) -> pd.DataFrame:
     path = Path(pattern.format(year=year))
-    if not path.exists():
-        raise FileNotFoundError(f"ABS file missing for {year}: {path}")
-    df = pd.read_csv(path, dtype={"state_cnty_fips_cd": str, "naics2_sector_cd": str})
+    try:
+        df = read_table(path, "econ_bnchmrk_abs")
+    except FileNotFoundError as exc:
+        raise FileNotFoundError(f"ABS file missing for {year}: {path}") from exc
     df["year_num"] = year
     return df
 
 
 def load_qcew(year: int, pattern: str) -> pd.DataFrame:
     path = Path(pattern.format(year=year))
-    if not path.exists():
-        raise FileNotFoundError(f"QCEW file missing for {year}: {path}")
-    df = pd.read_csv(path, dtype={"state_cnty_fips_cd": str, "naics2_sector_cd": str})
+    try:
+        df = read_table(path, "econ_bnchmrk_qcew")
+    except FileNotFoundError as exc:
+        raise FileNotFoundError(f"QCEW file missing for {year}: {path}") from exc
     df["year_num"] = year
     return df
 
 
 def merge_year(abs_df: pd.DataFrame, qcew_df: pd.DataFrame) -> pd.DataFrame:
     """Merge ABS + QCEW for a single year."""
-    merge_cols = ["year_num", "state_cnty_fips_cd", "naics2_sector_cd"]
-    merged = abs_df.merge(qcew_df, how="outer", on=merge_cols, suffixes=("", "_qcew"))
+    # Join on integer-coded year/FIPS/NAICS2 keys; decoded back to strings.
+    merged = merge_on_keys(abs_df, qcew_df, how="outer", suffixes=("", "_qcew"))
     merged["state_fips_cd"] = merged["state_cnty_fips_cd"].str[:2]
     if "state_fips_cd_qcew" in merged.columns:
         merged["state_fips_cd"] = merged["state_fips_cd"].fillna(
@@ -62,9 +73,9 @@ def merge_year(abs_df: pd.DataFrame, qcew_df: pd.DataFrame) -> pd.DataFrame:
 
 
 def enrich_population(df: pd.DataFrame, ref_path: Path) -> pd.DataFrame:
-    ref = pd.read_csv(
+    ref = read_typed_csv(
         ref_path,
-        dtype={"state_cnty_fips_cd": str},
+        "ref_state_cnty_uscb",
         usecols=lambda c: c
         in {"state_cnty_fips_cd", "state_cd", "cnty_nm", "population_num", "population_year"},
     )
@@ -76,17 +87,7 @@ def enrich_population(df: pd.DataFrame, ref_path: Path) -> pd.DataFrame:
 
 def derive_metrics(df: pd.DataFrame) -> pd.DataFrame:
     """Compute per-employee / per-firm ratios with graceful NaN handling."""
-    for col in [
-        "abs_firm_num",
-        "abs_emp_num",
-        "abs_payroll_usd_amt",
-        "abs_rcpt_usd_amt",
-        "qcew_ann_avg_emp_lvl_num",
-        "qcew_ttl_ann_wage_usd_amt",
-    ]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-
+    # Inputs are already typed from the DDLs by read_typed_csv.
     df["abs_rcpt_per_emp_usd_amt"] = safe_divide(df["abs_rcpt_usd_amt"], df["abs_emp_num"])
     df["abs_wage_per_emp_usd_amt"] = safe_divide(df["abs_payroll_usd_amt"], df["abs_emp_num"])
     df["abs_rcpt_per_firm_usd_amt"] = safe_divide(df["abs_rcpt_usd_amt"], df["abs_firm_num"])
@@ -115,9 +116,7 @@ def assemble(
         ["year_num", "state_cnty_fips_cd", "naics2_sector_cd"]
     ).reset_index(drop=True)
 
-    dupes = combined.duplicated(
-        subset=["year_num", "state_cnty_fips_cd", "naics2_sector_cd"]
-    ).sum()
+    dupes = count_duplicate_keys(combined)
     if dupes:
         raise AssertionError(f"Duplicate merged rows detected: {dupes}")
     return combined
@@ -153,6 +152,12 @@ def parse_args() -> argparse.Namespace:
         default=OUT_DEFAULT,
         help="Destination for merged dataset (default: %(default)s)",
     )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="csv",
+        help="Output format; parquet writes year_num-partitioned zstd datasets (default: csv).",
+    )
     return parser.parse_args()
 
 
@@ -161,9 +166,7 @@ def main() -> None:
     years = sorted(set(args.years)) if args.years else MVP_YEARS.copy()
     ref_path = Path(args.ref_csv)
     merged = assemble(years, args.abs_pattern, args.qcew_pattern, ref_path)
-    out_path = Path(args.out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    merged.to_csv(out_path, index=False)
+    out_path = write_table(merged, args.out, args.format, table="econ_bnchmrk_abs_qcew")
     print(f"[MERGE] Wrote merged dataset: {out_path} ({len(merged):,} rows).")
 
 
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Run the bigquery/load SQL locally against DuckDB over the data_clean outputs.
+
+The warehouse layer (`econ_bnchmrk_abs_qcew`, `_rollup`, `_state_ttl`,
+`_indstr_ttl`) is defined by shell-wrapped `bq query` scripts. This runner
+extracts the SQL from those scripts, translates the BigQuery dialect, and
+materializes each table in an embedded DuckDB database whose inputs are the
+local exports (see scripts/common/warehouse.py for how tables are resolved).
+The results are then written to `--out_dir` as CSV or Parquet.
+
+Translation:
+  - "…" and r"…" string literals  -> '…' (DuckDB reads "…" as identifiers)
+  - FROM UNNEST([STRUCT(…), …])     -> FROM (VALUES (…), …) AS t(fields)
+  - `project.dataset.table`         -> the local view/table of that name
+  - GROUP BY select_alias           -> GROUP BY its expression (BigQuery
+                                       prefers the alias over input columns)
+  - SAFE_DIVIDE, REGEXP_CONTAINS    -> DuckDB macros with BigQuery semantics
+  - NULL ordering follows BigQuery (NULLS FIRST on ASC, LAST on DESC).
+
+Scripts run in dependency order (the county table reads `_state_ttl`), so a
+single invocation builds the whole layer. `--compare_merge` then diffs the
+SQL `econ_bnchmrk_abs_qcew` against the Python merge output.
+
+Example:
+    python scripts/integration/run_load_sql_local.py --format parquet \
+        --compare_merge data_clean/integration/econ_bnchmrk_abs_qcew.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from scripts.common.keys import KEY_COLUMNS, merge_on_keys  # type: ignore # noqa: E402
+from scripts.common.schema import load_schemas, split_top_level  # type: ignore # noqa: E402
+from scripts.common.table_io import FORMATS, read_table, write_table  # type: ignore # noqa: E402
+from scripts.common.warehouse import LocalWarehouse, table_names, translate_sql  # type: ignore # noqa: E402
+
+SQL_DIR_DEFAULT = REPO_ROOT / "bigquery" / "load"
+OUT_DIR_DEFAULT = "data_clean/warehouse"
+LAYER_SCRIPTS = [
+    "econ_bnchmrk_abs_qcew_state_ttl.sql",
+    "econ_bnchmrk_abs_qcew_indstr_ttl.sql",
+    "econ_bnchmrk_abs_qcew_rollup.sql",
+    "econ_bnchmrk_abs_qcew.sql",
+]
+
+MACROS = [
+    "CREATE OR REPLACE MACRO safe_divide(a, b) AS CASE WHEN b = 0 THEN NULL ELSE a / b END",
+    "CREATE OR REPLACE MACRO regexp_contains(s, pattern) AS regexp_matches(s, pattern)",
+]
+
+_QUERY_BODY_RE = re.compile(r"\bbq\s+query\b(?P<flags>.*?)'(?P<sql>.*)'", re.DOTALL)
+_DESTINATION_RE = re.compile(r"--destination_table=(?:[\w-]+:)?(?:[\w-]+\.)?(\w+)")
+_CREATE_RE = re.compile(r"^\s*CREATE\s+(?:OR\s+REPLACE\s+)?TABLE\s+`([^`]+)`\s+AS\s+", re.IGNORECASE)
+_UNNEST_ARRAY_RE = re.compile(r"\bUNNEST\s*\(\s*\[", re.IGNORECASE)
+_AS_RE = re.compile(r"\s+AS\s+", re.IGNORECASE)
+_SELECT_RE = re.compile(r"\bSELECT\b", re.IGNORECASE)
+_FROM_RE = re.compile(r"\bFROM\b", re.IGNORECASE)
+_GROUP_BY_RE = re.compile(r"\bGROUP\s+BY\b", re.IGNORECASE)
+_CLAUSE_END_RE = re.compile(r"\b(?:HAVING|QUALIFY|WINDOW|ORDER|LIMIT|UNION|EXCEPT|INTERSECT)\b", re.IGNORECASE)
+
+
+def log(msg: str) -> None:
+    print(f"[WAREHOUSE] {msg}")
+
+
+def extract_query(script: str) -> tuple[str, str]:
+    """Return (destination table, SELECT sql) from a `bq query` shell script."""
+    match = _QUERY_BODY_RE.search(script)
+    if not match:
+        raise ValueError("No `bq query '…'` block found.")
+    sql = match.group("sql").strip().rstrip(";").strip()
+    create = _CREATE_RE.match(sql)
+    if create:
+        return create.group(1).split(".")[-1], sql[create.end():]
+    destination = _DESTINATION_RE.search(match.group("flags"))
+    if not destination:
+        raise ValueError("Query has neither CREATE TABLE … AS nor --destination_table.")
+    return destination.group(1), sql
+
+
+def _convert_string_literals(sql: str) -> str:
+    """Rewrite BigQuery "…" / r"…" literals as standard '…' literals."""
+    out: list[str] = []
+    i, n = 0, len(sql)
+    while i < n:
+        ch = sql[i]
+        if sql.startswith("--", i):
+            end = sql.find("\n", i)
+            end = n if end == -1 else end
+            out.append(sql[i:end])
+            i = end
+            continue
+        raw = ch in "rR" and i + 1 < n and sql[i + 1] in "\"'" and (i == 0 or not sql[i - 1].isalnum())
+        if raw or ch in "\"'":
+            quote_at = i + 1 if raw else i
+            quote = sql[quote_at]
+            j = quote_at + 1
+            chars: list[str] = []
+            while j < n and sql[j] != quote:
+                if sql[j] == "\\" and j + 1 < n and not raw:
+                    chars.append(sql[j + 1])
+                    j += 2
+                    continue
+                if sql[j] == "\\" and j + 1 < n and sql[j + 1] == quote:
+                    chars.append(sql[j : j + 2])
+                    j += 2
+                    continue
+                chars.append(sql[j])
+                j += 1
+            if j >= n:
+                raise ValueError(f"Unterminated string literal at offset {i}.")
+            out.append("'" + "".join(chars).replace("'", "''") + "'")
+            i = j + 1
+            continue
+        out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def _closing(sql: str, start: int, open_ch: str, close_ch: str) -> int:
+    """Index of the bracket closing the one opened just before `start`."""
+    depth, quote = 1, None
+    for idx in range(start, len(sql)):
+        ch = sql[idx]
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in ("'", '"'):
+            quote = ch
+        elif ch == open_ch:
+            depth += 1
+        elif ch == close_ch:
+            depth -= 1
+            if depth == 0:
+                return idx
+    raise ValueError(f"Unbalanced {open_ch}{close_ch} in SQL.")
+
+
+def _depths(sql: str) -> list[int]:
+    """Parenthesis depth at each character (quoted text keeps its depth)."""
+    depths, depth, quote = [], 0, None
+    for ch in sql:
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in ("'", '"'):
+            quote = ch
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+            depths.append(depth + 1)
+            continue
+        depths.append(depth)
+    return depths
+
+
+def _split_alias(field: str) -> tuple[str, str]:
+    """`expr AS name` -> (expr, name) on the last top-level AS; (field, "") if none."""
+    depths = _depths(field)
+    top = [m for m in _AS_RE.finditer(field) if depths[m.start()] == 0]
+    if not top:
+        return field.strip(), ""
+    return field[: top[-1].start()].strip(), field[top[-1].end():].strip()
+
+
+def _expand_group_by_aliases(sql: str) -> str:
+    """Replace SELECT-list aliases in GROUP BY with their expressions.
+
+    BigQuery resolves `GROUP BY name` to the SELECT alias first; DuckDB binds
+    it to an input column of the same name when one exists (e.g. the QCEW
+    `state_fips_cd` vs `SUBSTR(state_cnty_fips_cd, 1, 2) AS state_fips_cd`).
+    """
+    depths = _depths(sql)
+    for group in reversed(list(_GROUP_BY_RE.finditer(sql))):
+        level = depths[group.start()]
+        selects = [
+            m for m in _SELECT_RE.finditer(sql, 0, group.start())
+            if depths[m.start()] == level
+            and all(d >= level for d in depths[m.start():group.start()])
+        ]
+        if not selects:
+            continue
+        select = selects[-1]
+        from_ = next(
+            (m for m in _FROM_RE.finditer(sql, select.end(), group.start()) if depths[m.start()] == level),
+            None,
+        )
+        if from_ is None:
+            continue
+        aliases = {}
+        for item in split_top_level(sql[select.end():from_.start()]):
+            expr, alias = _split_alias(item)
+            if alias and expr.lower() != alias.lower():
+                aliases[alias.lower()] = expr
+        end = group.end()
+        while end < len(sql) and depths[end] >= level and sql[end] != ";":
+            if depths[end] == level and _CLAUSE_END_RE.match(sql, end):
+                break
+            end += 1
+        items = [aliases.get(item.lower(), item) for item in split_top_level(sql[group.end():end])]
+        trailing = sql[group.end():end][len(sql[group.end():end].rstrip()):]
+        sql = sql[: group.end()] + " " + ", ".join(items) + trailing + sql[end:]
+    return sql
+
+
+def _rewrite_struct_arrays(sql: str) -> str:
+    """FROM UNNEST([STRUCT(x AS a, y AS b), STRUCT(…)]) -> FROM (VALUES …) AS t(a, b)."""
+    counter = 0
+    while True:
+        match = _UNNEST_ARRAY_RE.search(sql)
+        if not match:
+            return sql
+        array_end = _closing(sql, match.end(), "[", "]")
+        paren_end = _closing(sql, array_end + 1, "(", ")")
+        names: list[str] = []
+        rows: list[str] = []
+        for item in split_top_level(sql[match.end():array_end]):
+            if not item.upper().startswith("STRUCT(") or not item.endswith(")"):
+                raise ValueError(f"Only arrays of STRUCT literals are supported: {item[:40]!r}")
+            values = []
+            for pos, field in enumerate(split_top_level(item[len("STRUCT("):-1])):
+                expr, alias = _split_alias(field)
+                if not rows and len(names) == pos:
+                    names.append(alias or f"f{pos}")
+                values.append(expr)
+            rows.append("(" + ", ".join(values) + ")")
+        counter += 1
+        values_sql = f"(VALUES {', '.join(rows)}) AS _struct_array_{counter}({', '.join(names)})"
+        sql = sql[: match.start()] + values_sql + sql[paren_end + 1 :]
+
+
+def translate_bigquery(sql: str) -> str:
+    """BigQuery Standard SQL SELECT -> DuckDB SQL (see module docstring)."""
+    sql = _convert_string_literals(sql)
+    sql = _rewrite_struct_arrays(sql)
+    sql = _expand_group_by_aliases(sql)
+    translated, _ = translate_sql(sql)
+    return translated
+
+
+def load_layer(sql_dir: Path, scripts: list[str]) -> dict[str, str]:
+    """{table: translated SELECT} for each script, in dependency order."""
+    queries: dict[str, str] = {}
+    depends: dict[str, list[str]] = {}
+    for script in scripts:
+        table, sql = extract_query((sql_dir / script).read_text())
+        queries[table] = translate_bigquery(sql)
+        depends[table] = table_names(sql)
+    ordered: list[str] = []
+
+    def visit(table: str, stack: tuple[str, ...] = ()) -> None:
+        if table in ordered:
+            return
+        if table in stack:
+            raise ValueError(f"Cyclic load dependency: {' -> '.join(stack + (table,))}")
+        for dep in depends.get(table, []):
+            if dep in queries:
+                visit(dep, stack + (table,))
+        ordered.append(table)
+
+    for table in queries:
+        visit(table)
+    return {table: queries[table] for table in ordered}
+
+
+def build_layer(
+    warehouse: LocalWarehouse,
+    queries: dict[str, str],
+) -> dict[str, pd.DataFrame]:
+    """Materialize each query as a DuckDB table and return the results."""
+    con = warehouse.connection()
+    con.execute("SET default_null_order = 'nulls_first_on_asc_last_on_desc'")
+    for macro in MACROS:
+        con.execute(macro)
+    results: dict[str, pd.DataFrame] = {}
+    for table, sql in queries.items():
+        # Only table references are double-quoted after translation.
+        for ref in sorted(set(re.findall(r'"(\w+)"', sql))):
+            if ref not in queries:
+                warehouse.register(ref)
+        con.execute(f'DROP VIEW IF EXISTS "{table}"')
+        con.execute(f'CREATE OR REPLACE TABLE "{table}" AS {sql}')
+        # Downstream scripts read this table, not an export on disk.
+        warehouse.mark_materialized(table)
+        results[table] = con.execute(f'SELECT * FROM "{table}"').fetchdf()
+        log(f"{table}: {len(results[table]):,} rows")
+    return results
+
+
+def compare_merge(sql_df: pd.DataFrame, merge_df: pd.DataFrame) -> pd.DataFrame:
+    """Per-column mismatch counts between the SQL table and the Python merge.
+
+    Rows are matched on KEY_COLUMNS; numeric columns compare with np.isclose
+    (NaN == NaN), everything else as strings. Rows present on one side only
+    are reported under `_rows_sql_only` / `_rows_merge_only`.
+    """
+    shared = [c for c in sql_df.columns if c in merge_df.columns and c not in KEY_COLUMNS]
+    left = sql_df[KEY_COLUMNS + shared].copy()
+    right = merge_df[KEY_COLUMNS + shared].copy()
+    for frame in (left, right):
+        frame["year_num"] = pd.to_numeric(frame["year_num"], errors="coerce").astype("Int64")
+        for col in ("state_cnty_fips_cd", "naics2_sector_cd"):
+            frame[col] = frame[col].astype("string")
+    joined = merge_on_keys(left, right, how="outer", suffixes=("_sql", "_merge"), indicator=True)
+    both = joined["_merge"] == "both"
+    rows = [
+        {"column": "_rows_sql_only", "mismatch_cnt": int((joined["_merge"] == "left_only").sum())},
+        {"column": "_rows_merge_only", "mismatch_cnt": int((joined["_merge"] == "right_only").sum())},
+    ]
+    matched = joined[both]
+    for col in shared:
+        a, b = matched[f"{col}_sql"], matched[f"{col}_merge"]
+        a_num = pd.to_numeric(a, errors="coerce")
+        b_num = pd.to_numeric(b, errors="coerce")
+        if a_num.notna().sum() == a.notna().sum() and b_num.notna().sum() == b.notna().sum():
+            equal = np.isclose(
+                a_num.to_numpy(dtype=float, na_value=np.nan),
+                b_num.to_numpy(dtype=float, na_value=np.nan),
+                rtol=1e-9,
+                atol=1e-6,
+                equal_nan=True,
+            )
+        else:
+            equal = (a.astype("string").fillna("<NA>") == b.astype("string").fillna("<NA>")).to_numpy()
+        rows.append({"column": col, "mismatch_cnt": int((~equal).sum())})
+    return pd.DataFrame(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Build the bigquery/load warehouse tables locally with DuckDB."
+    )
+    parser.add_argument("--sql_dir", default=str(SQL_DIR_DEFAULT), help="Directory of bq query scripts.")
+    parser.add_argument(
+        "--tables",
+        nargs="+",
+        default=None,
+        help="Load scripts to run (file names; default: the abs_qcew layer).",
+    )
+    parser.add_argument(
+        "--warehouse_dir",
+        default=None,
+        help="Directory of {table}.csv/.parquet inputs (default: the data_clean pipeline outputs).",
+    )
+    parser.add_argument("--out_dir", default=OUT_DIR_DEFAULT, help="Where to write the built tables.")
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="csv",
+        help="Output format: csv (default) or parquet (partitioned by year_num).",
+    )
+    parser.add_argument(
+        "--compare_merge",
+        default=None,
+        help="Python merge output to diff against the SQL econ_bnchmrk_abs_qcew.",
+    )
+    args = parser.parse_args()
+
+    queries = load_layer(Path(args.sql_dir), args.tables or LAYER_SCRIPTS)
+    warehouse = LocalWarehouse(args.warehouse_dir)
+    try:
+        results = build_layer(warehouse, queries)
+    finally:
+        warehouse.close()
+
+    schemas = load_schemas()
+    out_dir = Path(args.out_dir)
+    for table, df in results.items():
+        dest = write_table(
+            df, out_dir / f"{table}.csv", args.format, table=table if table in schemas else None
+        )
+        log(f"Wrote {dest}")
+
+    if args.compare_merge:
+        if "econ_bnchmrk_abs_qcew" not in results:
+            raise SystemExit("--compare_merge needs econ_bnchmrk_abs_qcew.sql in --tables.")
+        report = compare_merge(results["econ_bnchmrk_abs_qcew"], read_table(args.compare_merge))
+        print(report.to_string(index=False))
+        if report["mismatch_cnt"].any():
+            raise SystemExit("[WAREHOUSE] SQL and Python merge disagree (see counts above).")
+        log("SQL and Python merge agree.")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,8 @@ Features:
   - Filters to own_code == "5" (private) and NAICS sector grain (agg level 74).
   - Writes outputs that match the econ_bnchmrk_qcew BigQuery schema, including
     state/county splits and NUMERIC precision-friendly wage calculations.
+  - Streams the raw singlefile in bounded chunks (--chunksize) and drops
+    non-private / non-sector rows per chunk so peak memory stays flat.
 
 Usage:
   # Default MVP years (2022–2023)
@@ -21,87 +23,48 @@ Usage:
       --raw_template data_raw/qcew/{year}.annual.singlefile.csv \
       --per_year_pattern data_clean/qcew/econ_bnchmrk_qcew_{year}.csv \
       --out data_clean/qcew/econ_bnchmrk_qcew_multiyear.csv
+
+  # Legacy whole-file read (no chunking)
+  python scripts/qcew/econ_bnchmrk_qcew.py --chunksize 0
+
+  # One worker process per year
+  python scripts/qcew/econ_bnchmrk_qcew.py --years 2021 2022 2023 --workers 3
 """
 
 from __future__ import annotations
 
 import argparse
+import sys
 from pathlib import Path
 from typing import Optional
 
 import numpy as np
 import pandas as pd
 
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from scripts.common.aggregate import GroupSumAggregator  # type: ignore # noqa: E402
+from scripts.common.batch import iter_year_results  # type: ignore # noqa: E402
+from scripts.common.keys import count_duplicate_keys  # type: ignore # noqa: E402
+from scripts.common.table_io import FORMATS, write_table  # type: ignore # noqa: E402
+from scripts.common.naics import (  # type: ignore # noqa: E402
+    VALID_SECTORS,
+    derive_naics2,
+    map_naics_sectors,
+)
+from scripts.qcew.qcew_reader import (  # type: ignore # noqa: E402
+    DEFAULT_CHUNKSIZE,
+    iter_qcew_filtered,
+)
+
 NUMERIC_PRECISION = 9
 MVP_YEARS = [2022, 2023]
 DEFAULT_RAW_TEMPLATE = "data_raw/qcew/{year}.annual.singlefile.csv"
 DEFAULT_PER_YEAR_PATTERN = "data_clean/qcew/econ_bnchmrk_qcew_{year}.csv"
 DEFAULT_STACKED_OUT = "data_clean/qcew/econ_bnchmrk_qcew_multiyear.csv"
 
-# Canonical NAICS2 buckets we support downstream. This doubles as an explicit
-# allowlist so any surprise NAICS codes in the raw input will be dropped during
-# prep instead of leaking into BigQuery.
-VALID_SECTORS = {
-    "11",
-    "21",
-    "22",
-    "23",
-    "31-33",
-    "42",
-    "44-45",
-    "48-49",
-    "51",
-    "52",
-    "53",
-    "54",
-    "55",
-    "56",
-    "61",
-    "62",
-    "71",
-    "72",
-    "81",
-    "92",
-}
-
-
-def derive_naics2(code: Optional[str]) -> Optional[str]:
-    """Map raw NAICS codes to canonical sector labels."""
-    if not isinstance(code, str):
-        return None
-    cleaned = "".join(ch for ch in code.strip() if ch.isdigit())
-    if len(cleaned) < 2:
-        return None
-    base = cleaned[:2]
-    if base in {"31", "32", "33"}:
-        return "31-33"
-    if base in {"44", "45"}:
-        return "44-45"
-    if base in {"48", "49"}:
-        return "48-49"
-    if base in {
-        "11",
-        "21",
-        "22",
-        "23",
-        "42",
-        "51",
-        "52",
-        "53",
-        "54",
-        "55",
-        "56",
-        "61",
-        "62",
-        "71",
-        "72",
-        "81",
-        "92",
-    }:
-        return base
-    return None
-
-
 def normalize_qcew_columns(df: pd.DataFrame) -> pd.DataFrame:
     """Standardize key column names with flexible matching."""
     frame = df.copy()
@@ -184,8 +147,19 @@ def normalize_qcew_columns(df: pd.DataFrame) -> pd.DataFrame:
     return frame
 
 
-def prepare_qcew_private(df: pd.DataFrame, year: int) -> pd.DataFrame:
-    """Filter normalized QCEW data to private NAICS2 sectors for one year."""
+PRIVATE_GROUP_COLS = [
+    "year_num",
+    "state_cnty_fips_cd",
+    "state_fips_cd",
+    "cnty_fips_cd",
+    "naics2_sector_cd",
+    "own_code",
+]
+PRIVATE_SUM_COLS = ["qcew_ann_avg_emp_lvl_num", "qcew_ttl_ann_wage_usd_amt"]
+
+
+def filter_private_rows(df: pd.DataFrame, year: int) -> pd.DataFrame:
+    """Row-level prep: private county × sector rows for one year, numerics coerced."""
     working = df.copy()
     # Restrict the normalized frame to the active year. We keep year as string
     # comparisons here to avoid dropping rows that were parsed as floats in
@@ -218,8 +192,11 @@ def prepare_qcew_private(df: pd.DataFrame, year: int) -> pd.DataFrame:
         working = working[working["agg_lvl_cd"].astype(str) == "74"].copy()
 
     working["indstr_cd"] = working["indstr_cd"].astype(str).str.strip()
-    working["naics2_sector_cd"] = working["indstr_cd"].apply(derive_naics2)
-    working = working[working["naics2_sector_cd"].isin(VALID_SECTORS)].copy()
+    # Map each distinct industry code once and broadcast back as a categorical.
+    working["naics2_sector_cd"] = map_naics_sectors(
+        working["indstr_cd"], derive_naics2, allowed=VALID_SECTORS
+    )
+    working = working[working["naics2_sector_cd"].notna()].copy()
 
     for col in [
         "qcew_ann_avg_emp_lvl_num",
@@ -229,23 +206,12 @@ def prepare_qcew_private(df: pd.DataFrame, year: int) -> pd.DataFrame:
     ]:
         working[col] = pd.to_numeric(working[col], errors="coerce")
 
-    group_cols = [
-        "year_num",
-        "state_cnty_fips_cd",
-        "state_fips_cd",
-        "cnty_fips_cd",
-        "naics2_sector_cd",
-        "own_code",
-    ]
-    grouped = (
-        working.groupby(group_cols, as_index=False)
-        .agg(
-            {
-                "qcew_ann_avg_emp_lvl_num": "sum",
-                "qcew_ttl_ann_wage_usd_amt": "sum",
-            }
-        )
-    )
+    return working
+
+
+def finalize_private(grouped: pd.DataFrame) -> pd.DataFrame:
+    """Derive ratios from summed private totals and order the output columns."""
+    grouped = grouped.copy()
     # Recompute average weekly wage after summing employment/wage totals so the
     # ratios stay internally consistent with the aggregate employment counts.
     grouped["qcew_avg_wkly_wage_usd_amt"] = np.where(
@@ -272,11 +238,65 @@ def prepare_qcew_private(df: pd.DataFrame, year: int) -> pd.DataFrame:
     return grouped[cols]
 
 
-def process_year(year: int, raw_path: Path) -> pd.DataFrame:
+def private_aggregator() -> GroupSumAggregator:
+    return GroupSumAggregator(PRIVATE_GROUP_COLS, PRIVATE_SUM_COLS)
+
+
+def prepare_qcew_private(df: pd.DataFrame, year: int) -> pd.DataFrame:
+    """Filter normalized QCEW data to private NAICS2 sectors for one year."""
+    aggregator = private_aggregator().update(filter_private_rows(df, year))
+    return finalize_private(aggregator.finalize())
+
+
+# Columns prepare_qcew_private actually touches; everything else in the
+# singlefile (lq_*, oty_*, disclosure codes, …) is never parsed when streaming.
+PRIVATE_COLUMNS = [
+    "state_cnty_fips_cd",
+    "indstr_cd",
+    "year_num",
+    "qcew_ann_avg_emp_lvl_num",
+    "qcew_ttl_ann_wage_usd_amt",
+    "qcew_avg_wkly_wage_usd_amt",
+    "agg_lvl_cd",
+    "own_code",
+    "qtr",
+]
+
+
+def private_row_filters(year: int) -> dict[str, list[str]]:
+    """Row filters pushed into the chunked reader (mirrors prepare_qcew_private)."""
+    return {
+        "year_num": [str(year)],
+        "qtr": ["A"],
+        "own_code": ["5"],
+        "agg_lvl_cd": ["74"],
+    }
+
+
+def process_year(
+    year: int, raw_path: Path, chunksize: Optional[int] = DEFAULT_CHUNKSIZE
+) -> pd.DataFrame:
     # Single-year helper that allows callers (including tests) to inject custom
     # paths without touching the batch runner and keeps file IO localized.
     if not raw_path.exists():
         raise FileNotFoundError(f"QCEW raw file not found: {raw_path}")
+    if chunksize:
+        # Streaming mode: the header is normalized once, then each chunk is cut
+        # down to private county × sector annual rows (~1% of the file) and
+        # folded into running county × sector sums, so neither the raw file
+        # nor the filtered rows are ever held in full. filter_private_rows
+        # re-applies the reader's pre-filters, so the output is identical to
+        # the whole-file read.
+        aggregator = private_aggregator()
+        for chunk in iter_qcew_filtered(
+            raw_path,
+            normalize_qcew_columns,
+            keep=private_row_filters(year),
+            columns=PRIVATE_COLUMNS,
+            chunksize=chunksize,
+        ):
+            aggregator.update(filter_private_rows(chunk, year))
+        return finalize_private(aggregator.finalize())
     raw = pd.read_csv(raw_path, dtype=str, low_memory=False)
     normalized = normalize_qcew_columns(raw)
     prepped = prepare_qcew_private(normalized, year=year)
@@ -289,8 +309,11 @@ def run_batch(
     per_year_pattern: str,
     stacked_out: Optional[str],
     single_raw: Optional[str] = None,
+    chunksize: Optional[int] = DEFAULT_CHUNKSIZE,
+    workers: int = 1,
+    fmt: str = "csv",
 ) -> None:
-    combined_frames: list[pd.DataFrame] = []
+    year_args = {}
     for year in years:
         raw_path = (
             Path(single_raw)
@@ -298,26 +321,28 @@ def run_batch(
             else Path(raw_template.format(year=year))
         )
         print(f"[QCEW] Loading {raw_path} for {year}")
-        yearly = process_year(year, raw_path)
-        per_year_path = Path(per_year_pattern.format(year=year))
-        per_year_path.parent.mkdir(parents=True, exist_ok=True)
-        yearly.to_csv(per_year_path, index=False)
+        year_args[year] = (year, raw_path, chunksize)
+
+    # Years are independent until the stacked dedup check, so with --workers
+    # they run in a process pool and each per-year file lands as it finishes.
+    yearly_frames: dict[int, pd.DataFrame] = {}
+    for year, yearly in iter_year_results(process_year, year_args, workers=workers):
+        per_year_path = write_table(
+            yearly, per_year_pattern.format(year=year), fmt, table="econ_bnchmrk_qcew"
+        )
         print(f"[QCEW] Wrote {per_year_path} ({len(yearly):,} rows).")
-        combined_frames.append(yearly)
+        yearly_frames[year] = yearly
+    combined_frames = [yearly_frames[year] for year in years]
 
     if stacked_out:
         # Stack + QA the multiyear output that feeds BigQuery. Duplicate keys
         # are treated as fatal because they would lead to silent overwrite on
         # load and undo the aggregation work above.
         combined = pd.concat(combined_frames, ignore_index=True)
-        dupes = combined.duplicated(
-            subset=["year_num", "state_cnty_fips_cd", "naics2_sector_cd"]
-        ).sum()
+        dupes = count_duplicate_keys(combined)
         if dupes:
             raise AssertionError(f"Found {dupes} duplicate rows in combined QCEW output.")
-        out_path = Path(stacked_out)
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        combined.to_csv(out_path, index=False)
+        out_path = write_table(combined, stacked_out, fmt, table="econ_bnchmrk_qcew")
         print(f"[QCEW] Wrote combined dataset: {out_path} ({len(combined):,} rows).")
 
 
@@ -353,6 +378,24 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_STACKED_OUT,
         help="Combined multiyear output path (set empty to skip).",
     )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=DEFAULT_CHUNKSIZE,
+        help="Rows per streamed chunk of the raw file (0 reads the whole file at once).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Process years in parallel with this many worker processes (default: 1).",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="csv",
+        help="Output format; parquet writes year_num-partitioned zstd datasets (default: csv).",
+    )
     return parser.parse_args()
 
 
@@ -370,6 +413,9 @@ def main() -> None:
         per_year_pattern=args.per_year_pattern,
         stacked_out=args.out,
         single_raw=args.qcew_raw,
+        chunksize=args.chunksize,
+        workers=args.workers,
+        fmt=args.format,
     )
 
 
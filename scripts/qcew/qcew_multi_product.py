@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+qcew_multi_product.py
+---------------------
+Build several QCEW deliverables from a single pass over each raw year.
+
+The three county × NAICS products used to scan the same singlefile three times:
+  - private  : econ_bnchmrk_qcew.py        (own_code 5, agglvl 74, NAICS2 allowlist)
+  - naics2   : qcew_prep_naics2.py         (own_code 0, first two NAICS digits)
+  - sector   : qcew_prep_naics_sector.py   (own_code 5 sector rows, 2dp wages)
+
+Here the raw file is read once in chunks. Each chunk is fanned out to every
+requested product: the product's own column normalizer and row pre-filters cut
+it down to the rows that product can use, and only those rows are kept. At the
+end of the year each product runs its existing prepare/aggregate function on
+its rows, so outputs are identical to the standalone scripts. When an indexed
+Parquet store exists for the raw file (qcew_store.py), each product instead
+reads its rows from the store with filters pushed down.
+
+Usage:
+  python scripts/qcew/qcew_multi_product.py --years 2022 2023
+  python scripts/qcew/qcew_multi_product.py --years 2022 --products private sector \\
+      --workers 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Mapping, Optional
+
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from scripts.common.batch import iter_year_results  # type: ignore # noqa: E402
+from scripts.common.keys import count_duplicate_keys  # type: ignore # noqa: E402
+from scripts.common.table_io import FORMATS, write_table  # type: ignore # noqa: E402
+from scripts.qcew import (  # type: ignore # noqa: E402
+    econ_bnchmrk_qcew,
+    qcew_prep_naics2,
+    qcew_prep_naics_sector,
+)
+from scripts.qcew.qcew_reader import (  # type: ignore # noqa: E402
+    DEFAULT_CHUNKSIZE,
+    Normalizer,
+    apply_filters,
+    read_header_map,
+    read_store_filtered,
+)
+from scripts.qcew.qcew_store import DEFAULT_STORE_DIR, find_store  # type: ignore # noqa: E402
+
+MVP_YEARS = [2022, 2023]
+DEFAULT_RAW_TEMPLATE = "data_raw/qcew/{year}.annual.singlefile.csv"
+
+
+@dataclass(frozen=True)
+class ProductSpec:
+    name: str
+    normalize: Normalizer
+    row_filters: Callable[[int], Mapping[str, Iterable[str]]]
+    columns: Optional[list[str]]
+    build: Callable[[pd.DataFrame, int], pd.DataFrame]
+    per_year_pattern: str
+    stacked_out: str
+    table: Optional[str] = None  # BigQuery DDL the output is cast to on write
+
+
+def _build_private(df: pd.DataFrame, year: int) -> pd.DataFrame:
+    return econ_bnchmrk_qcew.prepare_qcew_private(df, year=year)
+
+
+def _naics2_filters(year: int) -> dict[str, list[str]]:
+    return {"year": [str(year)], "own_code": ["0"]}
+
+
+def _build_naics2(df: pd.DataFrame, year: int) -> pd.DataFrame:
+    prepped = qcew_prep_naics2.prepare_qcew_naics2(df, year=year, keep_own_code_zero=True)
+    return qcew_prep_naics2.finalize_qcew(prepped)
+
+
+def _sector_filters(year: int) -> dict[str, list[str]]:
+    return {
+        "year_num": [str(year)],
+        "qtr": ["A"],
+        "own_code": ["5"],
+        "agg_lvl_cd": ["74"],
+    }
+
+
+def _build_sector(df: pd.DataFrame, year: int) -> pd.DataFrame:
+    return qcew_prep_naics_sector.prepare_qcew_sector(
+        df, year=year, prefer_private_if_total_missing=True
+    )
+
+
+# Registry of products the builder knows how to emit. Row filters are only a
+# pre-cut (a superset of what each build function keeps); the build functions
+# re-apply their own rules, which is what keeps outputs identical.
+PRODUCTS: dict[str, ProductSpec] = {
+    "private": ProductSpec(
+        name="private",
+        normalize=econ_bnchmrk_qcew.normalize_qcew_columns,
+        row_filters=econ_bnchmrk_qcew.private_row_filters,
+        columns=econ_bnchmrk_qcew.PRIVATE_COLUMNS,
+        build=_build_private,
+        per_year_pattern=econ_bnchmrk_qcew.DEFAULT_PER_YEAR_PATTERN,
+        stacked_out=econ_bnchmrk_qcew.DEFAULT_STACKED_OUT,
+        table="econ_bnchmrk_qcew",
+    ),
+    "naics2": ProductSpec(
+        name="naics2",
+        normalize=qcew_prep_naics2.normalize_qcew_columns,
+        row_filters=_naics2_filters,
+        columns=[
+            "area_fips",
+            "industry_code",
+            "year",
+            "annual_avg_emplvl",
+            "total_annual_wages",
+            "avg_weekly_wage",
+            "own_code",
+        ],
+        build=_build_naics2,
+        per_year_pattern="data_clean/qcew/qcew_naics2_own0_{year}.csv",
+        stacked_out="data_clean/qcew/qcew_naics2_own0_multiyear.csv",
+    ),
+    "sector": ProductSpec(
+        name="sector",
+        normalize=qcew_prep_naics_sector.normalize_qcew_columns,
+        row_filters=_sector_filters,
+        columns=[
+            "state_cnty_fips_cd",
+            "indstr_cd",
+            "year_num",
+            "qcew_ann_avg_emp_lvl_num",
+            "qcew_ttl_ann_wage_usd_amt",
+            "qcew_avg_wkly_wage_usd_amt",
+            "agg_lvl_cd",
+            "own_code",
+            "qtr",
+        ],
+        build=_build_sector,
+        per_year_pattern="data_clean/qcew/qcew_naics_sector_{year}.csv",
+        stacked_out="data_clean/qcew/qcew_naics_sector_multiyear.csv",
+    ),
+}
+
+
+def _scan_csv(
+    raw_path: Path,
+    year: int,
+    specs: list[ProductSpec],
+    chunksize: int,
+) -> dict[str, pd.DataFrame]:
+    """One chunked pass over the raw CSV, fanning rows out to every product."""
+    plans = []
+    usecols: set[str] = set()
+    for spec in specs:
+        header_map = read_header_map(raw_path, spec.normalize)
+        wanted = set(spec.columns) if spec.columns is not None else None
+        raw_cols = [
+            raw for raw, norm in header_map.items() if wanted is None or norm in wanted
+        ]
+        usecols.update(raw_cols)
+        plans.append((spec, raw_cols, {raw: header_map[raw] for raw in raw_cols}))
+
+    kept: dict[str, list[pd.DataFrame]] = {spec.name: [] for spec in specs}
+    reader = pd.read_csv(
+        raw_path,
+        dtype=str,
+        usecols=sorted(usecols),
+        chunksize=chunksize,
+        low_memory=False,
+    )
+    for chunk in reader:
+        for spec, raw_cols, rename in plans:
+            part = apply_filters(chunk[raw_cols].rename(columns=rename), spec.row_filters(year))
+            if not part.empty:
+                kept[spec.name].append(part)
+
+    frames = {}
+    for spec, _, rename in plans:
+        parts = kept[spec.name]
+        frames[spec.name] = (
+            pd.concat(parts, ignore_index=True)
+            if parts
+            else pd.DataFrame(columns=list(rename.values()), dtype=str)
+        )
+    return frames
+
+
+def build_year_products(
+    year: int,
+    raw_path: Path,
+    product_names: list[str],
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    store_dir: Optional[Path] = Path(DEFAULT_STORE_DIR),
+) -> dict[str, pd.DataFrame]:
+    """Read one raw year once and return {product name: finished frame}."""
+    if not raw_path.exists():
+        raise FileNotFoundError(f"QCEW raw file not found: {raw_path}")
+    specs = [PRODUCTS[name] for name in product_names]
+
+    store_path = find_store(raw_path, store_dir)
+    if store_path is not None:
+        print(f"[QCEW] Reading indexed store {store_path} for {year}")
+        inputs = {
+            spec.name: read_store_filtered(
+                store_path, spec.normalize, keep=spec.row_filters(year), columns=spec.columns
+            )
+            for spec in specs
+        }
+    else:
+        print(f"[QCEW] Scanning {raw_path} once for {year}: {', '.join(product_names)}")
+        inputs = _scan_csv(raw_path, year, specs, chunksize)
+
+    return {spec.name: spec.build(inputs[spec.name], year) for spec in specs}
+
+
+def run_batch(
+    years: list[int],
+    raw_template: str,
+    product_names: list[str],
+    patterns: Optional[Mapping[str, str]] = None,
+    stacked_outs: Optional[Mapping[str, Optional[str]]] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    workers: int = 1,
+    fmt: str = "csv",
+) -> None:
+    patterns = dict(patterns or {})
+    stacked_outs = dict(stacked_outs or {})
+    year_args = {
+        year: (year, Path(raw_template.format(year=year)), product_names, chunksize)
+        for year in years
+    }
+
+    by_product: dict[str, dict[int, pd.DataFrame]] = {name: {} for name in product_names}
+    for year, outputs in iter_year_results(build_year_products, year_args, workers=workers):
+        for name, frame in outputs.items():
+            pattern = patterns.get(name, PRODUCTS[name].per_year_pattern)
+            per_year_path = write_table(
+                frame, pattern.format(year=year), fmt, table=PRODUCTS[name].table
+            )
+            print(f"[QCEW] Wrote {name} {per_year_path} ({len(frame):,} rows).")
+            by_product[name][year] = frame
+
+    for name in product_names:
+        stacked_out = stacked_outs.get(name, PRODUCTS[name].stacked_out)
+        if not stacked_out:
+            continue
+        combined = pd.concat([by_product[name][year] for year in years], ignore_index=True)
+        dupes = count_duplicate_keys(combined)
+        if dupes:
+            raise AssertionError(f"Found {dupes} duplicate rows in combined QCEW {name} output.")
+        out_path = write_table(combined, stacked_out, fmt, table=PRODUCTS[name].table)
+        print(f"[QCEW] Wrote combined {name} dataset: {out_path} ({len(combined):,} rows).")
+
+
+def _parse_overrides(values: Optional[list[str]], flag: str) -> dict[str, str]:
+    overrides = {}
+    for item in values or []:
+        name, sep, value = item.partition("=")
+        if not sep or name not in PRODUCTS:
+            raise ValueError(f"{flag} expects PRODUCT=PATH with PRODUCT in {sorted(PRODUCTS)}: {item}")
+        overrides[name] = value
+    return overrides
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Build several QCEW products from one scan of each raw year."
+    )
+    parser.add_argument("--years", type=int, nargs="+", help="Years to process (default: MVP years).")
+    parser.add_argument(
+        "--raw_template",
+        default=DEFAULT_RAW_TEMPLATE,
+        help="Template for raw QCEW files (use '{year}' placeholder).",
+    )
+    parser.add_argument(
+        "--products",
+        nargs="+",
+        choices=sorted(PRODUCTS),
+        default=list(PRODUCTS),
+        help="Products to emit (default: all).",
+    )
+    parser.add_argument(
+        "--per_year_pattern",
+        action="append",
+        metavar="PRODUCT=PATTERN",
+        help="Override a product's per-year output pattern (repeatable).",
+    )
+    parser.add_argument(
+        "--stacked_out",
+        action="append",
+        metavar="PRODUCT=PATH",
+        help="Override a product's multiyear output path; empty PATH skips it (repeatable).",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=DEFAULT_CHUNKSIZE,
+        help="Rows per streamed chunk of the raw file.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Process years in parallel with this many worker processes (default: 1).",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="csv",
+        help="Output format; parquet writes year_num-partitioned zstd datasets (default: csv).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    years = sorted(set(args.years)) if args.years else MVP_YEARS.copy()
+    run_batch(
+        years=years,
+        raw_template=args.raw_template,
+        product_names=list(dict.fromkeys(args.products)),
+        patterns=_parse_overrides(args.per_year_pattern, "--per_year_pattern"),
+        stacked_outs=_parse_overrides(args.stacked_out, "--stacked_out"),
+        chunksize=args.chunksize,
+        workers=args.workers,
+        fmt=args.format,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -26,10 +26,14 @@ from scripts.qcew.qcew_prep_naics_sector import (  # type: ignore # noqa: E402
     normalize_qcew_columns,
     prepare_qcew_sector,
 )
+from scripts.qcew.qcew_reader import read_qcew_filtered  # type: ignore # noqa: E402
 
 
-def load_normalized(raw_path: Path) -> pd.DataFrame:
-    df = pd.read_csv(raw_path, dtype=str, low_memory=False)
+def load_normalized(raw_path: Path, area: str | None = None) -> pd.DataFrame:
+    # Only the inspected county's rows are needed downstream; with an indexed
+    # store (qcew_store.py) this reads a few row groups instead of the file.
+    keep = {"area_fips": [area]} if area else None
+    df = read_qcew_filtered(raw_path, lambda frame: frame, keep=keep)
     lower = {c.lower(): c for c in df.columns}
     weekly_col = lower.get("avg_wkly_wage") or lower.get("avg_weekly_wage")
     if not weekly_col:
@@ -162,7 +166,7 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> None:
     args = parse_args()
-    raw = load_normalized(Path(args.qcew_raw))
+    raw = load_normalized(Path(args.qcew_raw), area=args.area)
     pipeline = run_pipeline(raw, year=args.year, area=args.area, agg_filter=args.agg_filter)
     bls = pull_bls_reference(raw, year=args.year, area=args.area)
     merged = build_comparison(pipeline, bls)
@@ -15,11 +15,22 @@
 from __future__ import annotations
 
 import argparse
+import sys
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
 
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from scripts.common.aggregate import GroupSumAggregator  # type: ignore # noqa: E402
+from scripts.common.batch import iter_year_results  # type: ignore # noqa: E402
+from scripts.common.keys import count_duplicate_keys  # type: ignore # noqa: E402
+from scripts.common.table_io import FORMATS, write_table  # type: ignore # noqa: E402
+from scripts.qcew.qcew_reader import iter_qcew_filtered  # type: ignore # noqa: E402
+
 NUMERIC_PRECISION = 9  # BigQuery NUMERIC supports up to 9 decimal places
 
 def normalize_qcew_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -91,10 +102,14 @@ def normalize_qcew_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def prepare_qcew_naics2(
+NAICS2_GROUP_COLS = ["state_fips", "county_fips", "naics2", "year"]
+NAICS2_SUM_COLS = ["annual_avg_emplvl", "total_annual_wages"]
+
+
+def filter_naics2_rows(
     qdf: pd.DataFrame, year: int | None = None, keep_own_code_zero: bool = True
 ) -> pd.DataFrame:
-    """Filter, aggregate, and derive NAICS2-level QCEW metrics."""
+    """Row-level prep: county rows with a 2-digit NAICS key and numeric measures."""
     df = qdf.copy()
     if year is not None and "year" in df.columns:
         df = df[df["year"].astype(str) == str(year)]
@@ -115,13 +130,12 @@ def prepare_qcew_naics2(
     if "year" in df.columns:
         df["year"] = pd.to_numeric(df["year"], errors="coerce")
 
-    grp = (
-        df.groupby(["state_fips", "county_fips", "naics2", "year"], as_index=False)
-        .agg({
-            "annual_avg_emplvl": "sum",
-            "total_annual_wages": "sum"
-        })
-    )
+    return df
+
+
+def finalize_naics2(grp: pd.DataFrame) -> pd.DataFrame:
+    """Derive average weekly wage from summed NAICS2 totals."""
+    grp = grp.copy()
     grp["avg_weekly_wage"] = np.where(
         grp["annual_avg_emplvl"] > 0,
         grp["total_annual_wages"] / (grp["annual_avg_emplvl"] * 52.0),
@@ -142,6 +156,18 @@ def prepare_qcew_naics2(
     return out
 
 
+def naics2_aggregator() -> GroupSumAggregator:
+    return GroupSumAggregator(NAICS2_GROUP_COLS, NAICS2_SUM_COLS)
+
+
+def prepare_qcew_naics2(
+    qdf: pd.DataFrame, year: int | None = None, keep_own_code_zero: bool = True
+) -> pd.DataFrame:
+    """Filter, aggregate, and derive NAICS2-level QCEW metrics."""
+    filtered = filter_naics2_rows(qdf, year=year, keep_own_code_zero=keep_own_code_zero)
+    return finalize_naics2(naics2_aggregator().update(filtered).finalize())
+
+
 def finalize_qcew(df: pd.DataFrame) -> pd.DataFrame:
     """Align QCEW columns to the canonical schema."""
     out = df.rename(
@@ -178,15 +204,34 @@ DEFAULT_STACKED_OUT = "data_clean/qcew/econ_bnchmrk_qcew_multiyear.csv"
 MVP_YEARS = [2022, 2023]
 
 
+def process_year(year: int, raw_path: Path) -> pd.DataFrame:
+    """Load, prep, and finalize a single QCEW year."""
+    if not raw_path.exists():
+        raise FileNotFoundError(f"QCEW raw file not found: {raw_path}")
+    print(f"[QCEW] Loading raw file for {year}: {raw_path}")
+    # Stream own_code 0 rows for the year into running county × NAICS2 sums;
+    # filter_naics2_rows re-applies the same filters on each chunk.
+    aggregator = naics2_aggregator()
+    for chunk in iter_qcew_filtered(
+        raw_path,
+        normalize_qcew_columns,
+        keep={"year": [str(year)], "own_code": ["0"]},
+    ):
+        aggregator.update(filter_naics2_rows(chunk, year=year, keep_own_code_zero=True))
+    return finalize_qcew(finalize_naics2(aggregator.finalize()))
+
+
 def run_batch(
     years: list[int],
     raw_template: str,
     per_year_pattern: str,
     stacked_out: str | None,
     single_raw: str | None = None,
+    workers: int = 1,
+    fmt: str = "csv",
 ) -> None:
     """Process multiple QCEW years using provided templates."""
-    stacked_frames: list[pd.DataFrame] = []
+    year_args = {}
     for year in years:
         raw_path = (
             Path(single_raw)
@@ -195,30 +240,25 @@ def run_batch(
         )
         if not raw_path.exists():
             raise FileNotFoundError(f"QCEW raw file not found: {raw_path}")
-        print(f"[QCEW] Loading raw file for {year}: {raw_path}")
-        raw = pd.read_csv(raw_path, dtype=str)
-        raw = normalize_qcew_columns(raw)
-        prepped = prepare_qcew_naics2(raw, year=year, keep_own_code_zero=True)
-        finalized = finalize_qcew(prepped)
-
-        per_year_path = Path(per_year_pattern.format(year=year))
-        per_year_path.parent.mkdir(parents=True, exist_ok=True)
-        finalized.to_csv(per_year_path, index=False)
+        year_args[year] = (year, raw_path)
+
+    finalized_by_year: dict[int, pd.DataFrame] = {}
+    for year, finalized in iter_year_results(process_year, year_args, workers=workers):
+        per_year_path = write_table(
+            finalized, per_year_pattern.format(year=year), fmt, table="econ_bnchmrk_qcew"
+        )
         print(f"[QCEW] Wrote {per_year_path} ({len(finalized):,} rows).")
-        stacked_frames.append(finalized)
+        finalized_by_year[year] = finalized
+    stacked_frames = [finalized_by_year[year] for year in years]
 
     if stacked_out:
         combined = pd.concat(stacked_frames, ignore_index=True)
-        dupes = combined.duplicated(
-            subset=["year_num", "state_cnty_fips_cd", "naics2_sector_cd"]
-        ).sum()
+        dupes = count_duplicate_keys(combined)
         if dupes:
             raise AssertionError(
                 f"Found {dupes} duplicate rows in combined QCEW output."
             )
-        out_path = Path(stacked_out)
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        combined.to_csv(out_path, index=False)
+        out_path = write_table(combined, stacked_out, fmt, table="econ_bnchmrk_qcew")
         print(f"[QCEW] Wrote combined dataset: {out_path} ({len(combined):,} rows).")
 
 
@@ -255,6 +295,18 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_STACKED_OUT,
         help="Combined multiyear output path (default: %(default)s).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Process years in parallel with this many worker processes (default: 1).",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="csv",
+        help="Output format; parquet writes year_num-partitioned zstd datasets (default: csv).",
+    )
     return parser.parse_args()
 
 
@@ -272,6 +324,8 @@ def main() -> None:
         per_year_pattern=args.per_year_pattern,
         stacked_out=args.out,
         single_raw=args.qcew_raw,
+        workers=args.workers,
+        fmt=args.format,
     )
 
 
@@ -18,11 +18,20 @@
 #       --out data_clean/qcew/econ_bnchmrk_qcew.csv
 #
 import argparse
+import sys
+from pathlib import Path
 from typing import Optional
 
 import pandas as pd
 import numpy as np
 
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from scripts.common.naics import map_naics_sectors  # type: ignore # noqa: E402
+from scripts.common.table_io import FORMATS, write_table  # type: ignore # noqa: E402
+
 VALID_SECTORS = {
     "11","21","22","23","31-33","42","44-45","48-49","51","52","53","54",
     "55","56","61","62","71","72","81","92"
@@ -120,7 +129,7 @@ def prepare_qcew_sector(qdf, year=None, prefer_private_if_total_missing=True):
 
     # Sector labels
     df["indstr_cd"] = df["indstr_cd"].astype(str).str.strip()
-    df["naics2_sector_cd"] = df["indstr_cd"].apply(derive_naics2)
+    df["naics2_sector_cd"] = map_naics_sectors(df["indstr_cd"], derive_naics2)
     df = df[df["naics2_sector_cd"].notna()].copy()
 
     # Numerics
@@ -130,7 +139,7 @@ def prepare_qcew_sector(qdf, year=None, prefer_private_if_total_missing=True):
         df["year_num"] = pd.to_numeric(df["year_num"], errors="coerce")
 
     # Aggregate
-    out = (df.groupby(["state_cnty_fips_cd","naics2_sector_cd","year_num","own_code"], as_index=False)
+    out = (df.groupby(["state_cnty_fips_cd","naics2_sector_cd","year_num","own_code"], as_index=False, observed=True)
              .agg({
                  "qcew_ann_avg_emp_lvl_num":"sum",
                  "qcew_ttl_ann_wage_usd_amt":"sum"
@@ -142,6 +151,7 @@ def prepare_qcew_sector(qdf, year=None, prefer_private_if_total_missing=True):
     )
     out["qcew_avg_wkly_wage_usd_amt"] = out["qcew_avg_wkly_wage_usd_amt"].replace([np.inf,-np.inf], np.nan).round(2)
     out["own_cd"] = out["own_code"]
+    out["naics2_sector_cd"] = out["naics2_sector_cd"].astype(str)
 
     # QA
     assert out.duplicated(subset=["state_cnty_fips_cd","naics2_sector_cd","year_num","own_cd"]).sum() == 0
@@ -156,6 +166,8 @@ def main():
     ap.add_argument("--qcew_raw", required=True, help="Path to raw QCEW annual CSV (singlefile preferred)")
     ap.add_argument("--year", type=int, default=2022, help="Year (default 2022)")
     ap.add_argument("--out", default="data_clean/qcew/econ_bnchmrk_qcew.csv", help="Output CSV path")
+    ap.add_argument("--format", choices=FORMATS, default="csv",
+                    help="Output format; parquet writes a year_num-partitioned zstd dataset next to --out")
     args = ap.parse_args()
 
     raw = pd.read_csv(args.qcew_raw, dtype=str)
@@ -170,8 +182,8 @@ def main():
     print("Diagnostics:", diag)
 
     out = prepare_qcew_sector(raw, year=args.year, prefer_private_if_total_missing=True)
-    out.to_csv(args.out, index=False)
-    print(f"Wrote {args.out} with {len(out):,} rows.")
+    out_path = write_table(out, args.out, args.format, table="econ_bnchmrk_qcew")
+    print(f"Wrote {out_path} with {len(out):,} rows.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+qcew_reader.py
+--------------
+Chunked reader for the BLS QCEW annual single file.
+
+The national singlefile is ~3.5M rows, but every consumer keeps only a small
+slice of it (e.g., county × NAICS sector rows for one ownership code). Reading
+the whole file with `pd.read_csv(dtype=str)` makes peak memory scale with the
+file; this helper streams it in bounded chunks instead and applies the row
+filters per chunk, so only the surviving rows are ever held at once.
+
+Column-name normalization stays with the caller: the `normalize` callable
+(e.g., `normalize_qcew_columns` from one of the prep scripts) runs once on the
+header, and the resulting rename map is applied to every chunk.
+
+When a Parquet store built from the same raw file exists (see qcew_store.py),
+`read_qcew_filtered` reads from it instead and pushes the filters down to the
+store's row groups. Frames served from a store carry
+`attrs[STORE_ATTR] = True`: the store holds non-numeric metric cells
+(suppression flags) as nulls, so callers that care can tell them apart from
+empty CSV cells.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Mapping, Optional
+
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from scripts.qcew.qcew_store import DEFAULT_STORE_DIR, find_store, read_store, store_columns  # type: ignore # noqa: E402
+
+DEFAULT_CHUNKSIZE = 500_000
+STORE_ATTR = "qcew_store"
+
+Normalizer = Callable[[pd.DataFrame], pd.DataFrame]
+
+
+def read_header_map(raw_path: Path, normalize: Normalizer) -> dict[str, str]:
+    """Return {raw column -> normalized column} by normalizing the header only."""
+    header = pd.read_csv(raw_path, dtype=str, nrows=0)
+    normalized = normalize(header)
+    # read_csv de-duplicates repeated header names ("x", "x.1"), so the
+    # normalizer keeps every column and the positions line up one-to-one.
+    return dict(zip(header.columns, normalized.columns))
+
+
+def apply_filters(chunk: pd.DataFrame, keep: Mapping[str, Iterable[str]]) -> pd.DataFrame:
+    """Keep rows whose (stripped, upper-cased) value is allowed for every filter column.
+
+    Filters on columns that are absent from the chunk are skipped so callers can
+    keep their "missing column means already filtered" fallbacks.
+    """
+    mask = pd.Series(True, index=chunk.index)
+    for col, values in keep.items():
+        if col not in chunk.columns:
+            continue
+        allowed = {str(v).strip().upper() for v in values}
+        mask &= chunk[col].astype(str).str.strip().str.upper().isin(allowed)
+    return chunk[mask]
+
+
+def iter_qcew_chunks(
+    raw_path: Path,
+    normalize: Normalizer,
+    keep: Optional[Mapping[str, Iterable[str]]] = None,
+    columns: Optional[Iterable[str]] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[pd.DataFrame]:
+    """Yield normalized, filtered chunks of a raw QCEW CSV.
+
+    `keep` maps normalized column names to allowed values; `columns` optionally
+    projects the normalized columns so the rest are never parsed.
+    """
+    raw_path = Path(raw_path)
+    if not raw_path.exists():
+        raise FileNotFoundError(f"QCEW raw file not found: {raw_path}")
+
+    header_map = read_header_map(raw_path, normalize)
+    if columns is not None:
+        wanted = set(columns)
+        usecols = [raw for raw, norm in header_map.items() if norm in wanted]
+    else:
+        usecols = list(header_map)
+
+    reader = pd.read_csv(
+        raw_path,
+        dtype=str,
+        usecols=usecols,
+        chunksize=chunksize,
+        low_memory=False,
+    )
+    for chunk in reader:
+        chunk = chunk.rename(columns=header_map)
+        if keep:
+            chunk = apply_filters(chunk, keep)
+        if not chunk.empty:
+            yield chunk
+
+
+def read_store_filtered(
+    store_path: Path,
+    normalize: Normalizer,
+    keep: Optional[Mapping[str, Iterable[str]]] = None,
+    columns: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """Read a Parquet store with the same normalized keep/columns contract."""
+    raw_names = store_columns(store_path)
+    header_map = dict(zip(raw_names, normalize(pd.DataFrame(columns=raw_names)).columns))
+    reverse = {norm: raw for raw, norm in header_map.items()}
+    wanted = set(columns) if columns is not None else None
+    raw_columns = [raw for raw, norm in header_map.items() if wanted is None or norm in wanted]
+    raw_filters = {reverse[col]: values for col, values in (keep or {}).items() if col in reverse}
+    frame = read_store(store_path, columns=raw_columns, filters=raw_filters)
+    frame = frame.rename(columns=header_map)
+    if keep:
+        # Pushdown is exact-match; re-apply the strip/upper semantics here.
+        frame = apply_filters(frame, keep).reset_index(drop=True)
+    frame.attrs[STORE_ATTR] = True
+    return frame
+
+
+def iter_qcew_filtered(
+    raw_path: Path,
+    normalize: Normalizer,
+    keep: Optional[Mapping[str, Iterable[str]]] = None,
+    columns: Optional[Iterable[str]] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    store_dir: Optional[Path] = Path(DEFAULT_STORE_DIR),
+) -> Iterator[pd.DataFrame]:
+    """Like `iter_qcew_chunks`, but served from the Parquet store when one exists.
+
+    The store path yields a single (already filtered) frame.
+    """
+    store_path = find_store(Path(raw_path), store_dir)
+    if store_path is not None:
+        print(f"[QCEW] Reading indexed store {store_path}")
+        frame = read_store_filtered(store_path, normalize, keep=keep, columns=columns)
+        if not frame.empty:
+            yield frame
+        return
+    yield from iter_qcew_chunks(
+        raw_path,
+        normalize,
+        keep=keep,
+        columns=columns,
+        chunksize=chunksize,
+    )
+
+
+def read_qcew_filtered(
+    raw_path: Path,
+    normalize: Normalizer,
+    keep: Optional[Mapping[str, Iterable[str]]] = None,
+    columns: Optional[Iterable[str]] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    store_dir: Optional[Path] = Path(DEFAULT_STORE_DIR),
+) -> pd.DataFrame:
+    """Concatenate `iter_qcew_filtered` output into one normalized frame.
+
+    Reads from the Parquet store for `raw_path` when one exists in `store_dir`.
+    """
+    frames = list(
+        iter_qcew_filtered(
+            raw_path,
+            normalize,
+            keep=keep,
+            columns=columns,
+            chunksize=chunksize,
+            store_dir=store_dir,
+        )
+    )
+    if not frames:
+        header_map = read_header_map(Path(raw_path), normalize)
+        names = list(header_map.values())
+        if columns is not None:
+            names = [name for name in names if name in set(columns)]
+        return pd.DataFrame(columns=names, dtype=str)
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+qcew_store.py
+-------------
+One-time conversion of the BLS QCEW annual singlefile into an indexed Parquet
+store, so readers stop re-parsing multi-GB CSVs.
+
+Layout:
+  data_raw/qcew/store/{raw stem}.{sha256[:16]}.parquet
+  data_raw/qcew/store/{raw stem}.{sha256[:16]}.json   (build manifest)
+
+The store is keyed by the SHA-256 of the source CSV, so a re-downloaded or
+revised singlefile never matches a stale store. Rows are sorted by
+area_fips / agglvl_code / own_code / industry_code and written in small row
+groups; Parquet min/max statistics then let a one-county lookup (spotcheck,
+reconciliation) read a handful of row groups instead of the whole year.
+
+Column typing follows the BLS layout: identifiers and codes stay strings
+(leading zeros matter), `year` is an integer, and every measure (emplvl,
+wages, lq_*, oty_* …) is float64 with non-numeric cells stored as null.
+
+Usage:
+  python scripts/qcew/qcew_store.py --years 2022 2023
+  python scripts/qcew/qcew_store.py --qcew_raw data_raw/qcew/2022.annual.singlefile.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Mapping, Optional
+
+import pandas as pd
+
+DEFAULT_RAW_TEMPLATE = "data_raw/qcew/{year}.annual.singlefile.csv"
+DEFAULT_STORE_DIR = "data_raw/qcew/store"
+DEFAULT_ROW_GROUP_SIZE = 50_000
+BUILD_CHUNKSIZE = 500_000
+MVP_YEARS = [2022, 2023]
+
+DIGEST_CACHE_NAME = "digests.json"
+SORT_COLUMNS = ["area_fips", "agglvl_code", "own_code", "industry_code"]
+INT_COLUMNS = {"year"}
+NUMERIC_COLUMNS = {
+    "annual_avg_estabs",
+    "annual_avg_emplvl",
+    "total_annual_wages",
+    "taxable_annual_wages",
+    "annual_contributions",
+    "annual_avg_wkly_wage",
+    "avg_annual_pay",
+}
+
+
+def _column_kind(name: str) -> str:
+    """Classify a raw singlefile column as 'int', 'float', or 'string'."""
+    lowered = name.lower()
+    if lowered in INT_COLUMNS:
+        return "int"
+    if lowered in NUMERIC_COLUMNS:
+        return "float"
+    if lowered.startswith(("lq_", "oty_")) and not lowered.endswith("disclosure_code"):
+        return "float"
+    return "string"
+
+
+def file_digest(raw_path: Path, store_dir: Path = Path(DEFAULT_STORE_DIR)) -> str:
+    """SHA-256 of the raw file, memoized on (size, mtime) in the store directory."""
+    raw_path = Path(raw_path)
+    stat = raw_path.stat()
+    cache_path = Path(store_dir) / DIGEST_CACHE_NAME
+    cache: dict[str, dict] = {}
+    if cache_path.exists():
+        try:
+            cache = json.loads(cache_path.read_text())
+        except json.JSONDecodeError:
+            cache = {}
+    key = str(raw_path.resolve())
+    entry = cache.get(key)
+    if entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+        return entry["sha256"]
+
+    hasher = hashlib.sha256()
+    with raw_path.open("rb") as fh:
+        for block in iter(lambda: fh.read(8 * 1024 * 1024), b""):
+            hasher.update(block)
+    digest = hasher.hexdigest()
+
+    # Only persist the memo once the store directory exists (i.e. a store has
+    # been built); read-only lookups should not create directories.
+    if cache_path.parent.exists():
+        cache[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+        cache_path.write_text(json.dumps(cache, indent=2, sort_keys=True))
+    return digest
+
+
+def store_path_for(raw_path: Path, store_dir: Path = Path(DEFAULT_STORE_DIR)) -> Path:
+    raw_path = Path(raw_path)
+    digest = file_digest(raw_path, store_dir)
+    return Path(store_dir) / f"{raw_path.stem}.{digest[:16]}.parquet"
+
+
+def find_store(raw_path: Path, store_dir: Optional[Path] = Path(DEFAULT_STORE_DIR)) -> Optional[Path]:
+    """Return the Parquet store for `raw_path` if one was built from this exact file."""
+    if store_dir is None:
+        return None
+    store_dir = Path(store_dir)
+    raw_path = Path(raw_path)
+    if not store_dir.exists() or not raw_path.exists():
+        return None
+    # Cheap pre-check: skip hashing entirely when no store exists for the stem.
+    if not any(store_dir.glob(f"{raw_path.stem}.*.parquet")):
+        return None
+    path = store_path_for(raw_path, store_dir)
+    return path if path.exists() else None
+
+
+def _typed_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    out = {}
+    for col in chunk.columns:
+        kind = _column_kind(col)
+        if kind == "int":
+            out[col] = pd.to_numeric(chunk[col], errors="coerce").astype("Int64")
+        elif kind == "float":
+            out[col] = pd.to_numeric(chunk[col], errors="coerce").astype("float64")
+        else:
+            out[col] = chunk[col].astype("string").str.strip()
+    return pd.DataFrame(out, index=chunk.index)
+
+
+def build_store(
+    raw_path: Path,
+    store_dir: Path = Path(DEFAULT_STORE_DIR),
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    chunksize: int = BUILD_CHUNKSIZE,
+    force: bool = False,
+) -> Path:
+    """Convert one raw singlefile into a sorted, row-grouped Parquet store."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    raw_path = Path(raw_path)
+    if not raw_path.exists():
+        raise FileNotFoundError(f"QCEW raw file not found: {raw_path}")
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    out_path = store_path_for(raw_path, store_dir)
+    if out_path.exists() and not force:
+        print(f"[QCEW STORE] Up to date: {out_path}")
+        return out_path
+
+    print(f"[QCEW STORE] Converting {raw_path} → {out_path}")
+    # Typed Arrow chunks are far more compact than the dtype=str frame, so the
+    # full year fits comfortably for the one-time global sort.
+    tables = []
+    for chunk in pd.read_csv(raw_path, dtype=str, chunksize=chunksize, low_memory=False):
+        tables.append(pa.Table.from_pandas(_typed_chunk(chunk), preserve_index=False))
+    if not tables:
+        raise ValueError(f"QCEW raw file has no rows: {raw_path}")
+    table = pa.concat_tables(tables)
+    sort_keys = [(col, "ascending") for col in SORT_COLUMNS if col in table.column_names]
+    if sort_keys:
+        table = table.sort_by(sort_keys)
+
+    string_cols = [
+        name for name in table.column_names if _column_kind(name) == "string"
+    ]
+    tmp_path = out_path.with_suffix(".parquet.tmp")
+    pq.write_table(
+        table,
+        tmp_path,
+        row_group_size=row_group_size,
+        compression="zstd",
+        use_dictionary=string_cols,
+        write_statistics=True,
+    )
+    os.replace(tmp_path, out_path)
+
+    manifest = {
+        "source": str(raw_path),
+        "sha256": file_digest(raw_path, store_dir),
+        "rows": table.num_rows,
+        "row_group_size": row_group_size,
+        "sort_columns": [col for col, _ in sort_keys],
+        "built_at_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+    out_path.with_suffix(".json").write_text(json.dumps(manifest, indent=2))
+    print(f"[QCEW STORE] Wrote {out_path} ({table.num_rows:,} rows).")
+    return out_path
+
+
+def store_columns(path: Path) -> list[str]:
+    import pyarrow.parquet as pq
+
+    return list(pq.read_schema(path).names)
+
+
+def _filter_values(column: str, values: Iterable) -> list:
+    if _column_kind(column) == "int":
+        out = []
+        for value in values:
+            try:
+                out.append(int(str(value).strip()))
+            except ValueError:
+                continue
+        return out
+    out: set[str] = set()
+    for value in values:
+        text = str(value).strip()
+        out.update({text, text.upper(), text.lower()})
+    return sorted(out)
+
+
+def read_store(
+    path: Path,
+    columns: Optional[Iterable[str]] = None,
+    filters: Optional[Mapping[str, Iterable]] = None,
+) -> pd.DataFrame:
+    """Read selected columns/rows from a store; filters are pushed to row groups."""
+    import pyarrow.parquet as pq
+
+    available = set(store_columns(path))
+    cols = [c for c in columns if c in available] if columns is not None else None
+    predicates = []
+    for col, values in (filters or {}).items():
+        if col not in available:
+            continue
+        predicates.append((col, "in", _filter_values(col, values)))
+    table = pq.read_table(path, columns=cols, filters=predicates or None)
+    df = table.to_pandas()
+    for col in df.columns:
+        kind = _column_kind(col)
+        if kind == "string":
+            df[col] = df[col].astype(object).where(df[col].notna(), None)
+        elif kind == "int" and df[col].notna().all():
+            df[col] = df[col].astype("int64")
+    return df
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Convert QCEW annual singlefiles into indexed Parquet stores."
+    )
+    parser.add_argument("--qcew_raw", help="Single raw QCEW CSV to convert.")
+    parser.add_argument("--years", type=int, nargs="+", help="Years to convert via --raw_template.")
+    parser.add_argument(
+        "--raw_template",
+        default=DEFAULT_RAW_TEMPLATE,
+        help="Template for raw QCEW files (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--store_dir",
+        default=DEFAULT_STORE_DIR,
+        help="Destination directory for Parquet stores (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--row_group_size",
+        type=int,
+        default=DEFAULT_ROW_GROUP_SIZE,
+        help="Rows per Parquet row group (default: %(default)s).",
+    )
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the store is current.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.qcew_raw:
+        raw_paths = [Path(args.qcew_raw)]
+    else:
+        years = sorted(set(args.years)) if args.years else MVP_YEARS.copy()
+        raw_paths = [Path(args.raw_template.format(year=year)) for year in years]
+    for raw_path in raw_paths:
+        build_store(
+            raw_path,
+            store_dir=Path(args.store_dir),
+            row_group_size=args.row_group_size,
+            force=args.force,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -10,11 +10,22 @@ enriched CSV (including `population_num` and `population_year`).
 from __future__ import annotations
 
 import argparse
+import sys
 from pathlib import Path
 from typing import Tuple
 
 import pandas as pd
-import requests
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from scripts.common.census_cache import (  # type: ignore # noqa: E402
+    add_census_cache_arguments,
+    cached_frame,
+    configure_from_args,
+)
+from scripts.common.table_io import FORMATS, read_table, write_table  # type: ignore # noqa: E402
 
 ACS_TABLE_VAR = "B01001_001E"
 ACS_DATASET = "acs/acs5"
@@ -24,10 +35,7 @@ def fetch_population(year: int) -> pd.DataFrame:
     """Fetch population counts for every county from the ACS API."""
     endpoint = f"https://api.census.gov/data/{year}/{ACS_DATASET}"
     params = {"get": f"NAME,{ACS_TABLE_VAR}", "for": "county:*", "in": "state:*"}
-    resp = requests.get(endpoint, params=params, timeout=60)
-    resp.raise_for_status()
-    header, *rows = resp.json()
-    df = pd.DataFrame(rows, columns=header)
+    df = cached_frame(endpoint, params)
     df["state_cnty_fips_cd"] = (
         df["state"].astype(str).str.zfill(2) + df["county"].astype(str).str.zfill(3)
     )
@@ -65,19 +73,24 @@ def parse_args() -> argparse.Namespace:
         default=2022,
         help="ACS vintage to use for population (default: %(default)s)",
     )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="csv",
+        help="Output format; parquet writes a zstd file next to the output CSV path (default: csv).",
+    )
+    add_census_cache_arguments(parser)
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
+    configure_from_args(args)
     ref_path = Path(args.ref_csv)
     out_path = Path(args.out_csv) if args.out_csv else ref_path
 
-    if not ref_path.exists():
-        raise FileNotFoundError(f"Reference CSV not found: {ref_path}")
-
     print(f"[POP] Loading reference: {ref_path}")
-    ref_df = pd.read_csv(ref_path, dtype={"state_cnty_fips_cd": str})
+    ref_df = read_table(ref_path, dtype={"state_cnty_fips_cd": str})
 
     print(f"[POP] Fetching ACS population for {args.year} …")
     pop_df = fetch_population(args.year)
@@ -89,8 +102,7 @@ def main() -> None:
             merged[col] = pd.to_numeric(merged[col], errors="coerce").astype("Int64")
     print(f"[POP] Matched population for {matched:,} counties.")
 
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    merged.to_csv(out_path, index=False)
+    out_path = write_table(merged, out_path, args.format, table="ref_state_cnty_uscb")
     print(f"[POP] Wrote updated reference: {out_path}")
 
 
@@ -1,19 +1,17 @@
+import json
+import tempfile
+import time
 import unittest
+from pathlib import Path
 from unittest.mock import patch
 
 import pandas as pd
 
 from qa import abs_reconciliation
+from scripts.common.census_cache import CensusSnapshotCache
 
 
 class TestAbsReconciliation(unittest.TestCase):
-    def test_parse_census_payload(self) -> None:
-        payload = '[["NAICS2022","NAME","FIRMPDEMP","EMP","PAYANN","RCPPDEMP","state","county"],' \
-                  '["42","Sample County","10","100","200","300","06","075"]]'
-        parsed = abs_reconciliation.parse_census_payload(payload)
-        self.assertEqual(parsed["NAICS2022"], "42")
-        self.assertEqual(parsed["FIRMPDEMP"], "10")
-
     def test_census_scaling(self) -> None:
         fake_record = {
             "FIRMPDEMP": "10",
@@ -27,6 +25,97 @@ class TestAbsReconciliation(unittest.TestCase):
         self.assertEqual(row["source_census_payann_usd"], 200000)
         self.assertEqual(row["source_census_rcppdemp_usd"], 300000)
 
+    def test_census_notes_merge_fetch_errors(self) -> None:
+        records = {
+            (2022, "06", "075", "42"): {"FIRMPDEMP": "D", "EMP": "100", "PAYANN": None, "RCPPDEMP": "abc"},
+            (2022, "06", "075", "62"): {"notes": "census_http_error:boom"},
+        }
+        with patch.object(abs_reconciliation, "fetch_census_records", return_value=records):
+            df = abs_reconciliation.fetch_census_data([2022], ["06075"], ["42", "62"])
+        self.assertEqual(
+            df["notes"].tolist(),
+            [
+                "source_missing;source_non_numeric;source_suppressed",
+                "census_http_error:boom;source_missing",
+            ],
+        )
+        self.assertEqual(df["source_census_emp"].tolist()[0], 100.0)
+
+    def test_offline_cache_miss_is_not_reported_as_http_error(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = CensusSnapshotCache(Path(tmp), offline=True)
+            with patch.object(abs_reconciliation, "default_cache", return_value=cache), patch.object(
+                abs_reconciliation, "cached_frame", side_effect=cache.get_frame
+            ):
+                slices = abs_reconciliation.fetch_census_data([2022], ["06075"], ["42"])
+                states = abs_reconciliation.fetch_census_data_states([2022], ["06"])
+        self.assertEqual(slices["notes"].tolist(), ["census_cache_miss;source_missing"])
+        self.assertEqual(states["notes"].tolist(), ["census_cache_miss"])
+
+    def test_concurrent_state_fetch_matches_sequential(self) -> None:
+        columns = ["NAICS2022", "NAME", "FIRMPDEMP", "EMP", "PAYANN", "RCPPDEMP", "state", "county"]
+
+        def fake_frame(year: int, state: str) -> pd.DataFrame:
+            # Later states answer first, so completion order differs from job order.
+            time.sleep(0.01 * (4 - int(state)))
+            if state == "02":
+                raise OSError("connection reset")
+            if state == "03":
+                raise json.JSONDecodeError("Expecting value", "not json", 0)
+            return pd.DataFrame([["42", "X", "10", "(D)", "200", "300", state, "001"]], columns=columns)
+
+        with patch.object(abs_reconciliation, "_fetch_state_frame", side_effect=fake_frame):
+            states = ["01", "02", "03", "04"]
+            sequential = abs_reconciliation.fetch_census_data_states([2022, 2023], states)
+            concurrent = abs_reconciliation.fetch_census_data_states(
+                [2022, 2023], states, concurrency=4
+            )
+        pd.testing.assert_frame_equal(concurrent, sequential)
+        notes = concurrent.groupby("state_cnty_fips_cd")["notes"].first()
+        self.assertTrue(notes["02000"].startswith("census_http_error:"))
+        self.assertTrue(notes["03000"].startswith("census_json_error:"))
+        self.assertEqual(notes["01001"], "source_suppressed")
+        self.assertEqual(concurrent["state_cnty_fips_cd"].tolist()[:4], ["01001", "02000", "03000", "04001"])
+
+    def test_planner_collapses_slices_into_bulk_calls(self) -> None:
+        columns = ["NAICS2022", "NAME", "FIRMPDEMP", "EMP", "PAYANN", "RCPPDEMP", "state", "county"]
+        fetched: list[tuple[str, str]] = []
+
+        def fake_fetch(url, params) -> pd.DataFrame:
+            fetched.append((url.rsplit("/", 2)[-2], params.get("in", "national")))
+            states = [params["in"][-2:]] if "in" in params else ["06", "36", "41", "48", "53"]
+            return pd.DataFrame(
+                [[n, "X", "1", "2", "3", "4", s, c] for s in states for c in ("061", "075") for n in ("42", "62")],
+                columns=columns,
+            )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = CensusSnapshotCache(Path(tmp))
+            url_2022 = abs_reconciliation.CENSUS_BASE_URL.format(year=2022)
+            cache.store(url_2022, abs_reconciliation._partition_params("06"), fake_fetch(url_2022, {"in": "state:06"}))
+            fetched.clear()
+            slices = (
+                [(2022, "06", "075", n) for n in ("42", "62")]  # cached state partition
+                + [(2022, "41", c, "42") for c in ("061", "075")]  # one state pull
+                + [(2022, "36", "061", "42")]  # lone slice: fetched directly
+                + [(2023, s, "075", "62") for s in ("06", "36", "41", "48", "53")]  # national pull
+                + [(2023, "06", "075", "99")]  # not in the response
+            )
+            direct = {"FIRMPDEMP": "7"}
+            with patch.object(abs_reconciliation, "default_cache", return_value=cache), patch.object(
+                abs_reconciliation, "cached_frame", side_effect=lambda u, p: cache.get_frame(u, p, fetch=fake_fetch)
+            ), patch.object(abs_reconciliation, "_fetch_census_slice", return_value=direct) as slice_mock:
+                plan = abs_reconciliation.plan_census_requests(slices)
+                records = abs_reconciliation.fetch_census_records(slices)
+
+        self.assertEqual(plan.request_count, 3)
+        self.assertEqual(sorted(fetched), [("2022", "state:41"), ("2023", "national")])
+        slice_mock.assert_called_once_with(2022, "36", "061", "42")
+        self.assertEqual(records[(2022, "06", "075", "62")]["FIRMPDEMP"], "1")
+        self.assertEqual(records[(2023, "48", "075", "62")]["state"], "48")
+        self.assertEqual(records[(2022, "36", "061", "42")], direct)
+        self.assertEqual(records[(2023, "06", "075", "99")], {"notes": "census_empty_response"})
+
     def test_tolerance_logic(self) -> None:
         census_df = pd.DataFrame(
             [
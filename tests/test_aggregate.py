@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from scripts.common.aggregate import GroupSumAggregator
+
+
+class TestGroupSumAggregator(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(7)
+        rows = 500
+        self.frame = pd.DataFrame(
+            {
+                "fips": rng.choice(["06075", "06085", "06001"], rows),
+                "naics": rng.choice(["42", "62", "31-33"], rows),
+                "emp": rng.integers(0, 100, rows).astype(float),
+                "wages": rng.integers(0, 10_000, rows).astype(float),
+            }
+        )
+        self.frame.loc[self.frame.index % 7 == 0, "emp"] = np.nan
+        # One group whose values are all missing, to exercise min_count.
+        self.frame.loc[len(self.frame)] = ["06013", "42", np.nan, np.nan]
+
+    def expected(self, min_count: int = 0) -> pd.DataFrame:
+        return self.frame.groupby(["fips", "naics"], as_index=False)[["emp", "wages"]].sum(
+            min_count=min_count
+        )
+
+    def test_chunked_updates_match_groupby(self) -> None:
+        aggregator = GroupSumAggregator(["fips", "naics"], ["emp", "wages"])
+        for start in range(0, len(self.frame), 64):
+            aggregator.update(self.frame.iloc[start:start + 64])
+        for min_count in (0, 1):
+            with self.subTest(min_count=min_count):
+                pd.testing.assert_frame_equal(
+                    aggregator.finalize(min_count=min_count), self.expected(min_count)
+                )
+
+    def test_merge_partial_states(self) -> None:
+        halves = [self.frame.iloc[::2], self.frame.iloc[1::2]]
+        left, right = (
+            GroupSumAggregator(["fips", "naics"], ["emp", "wages"]).update(half)
+            for half in halves
+        )
+        merged = left.merge(right)
+        self.assertEqual(merged.n_groups, 10)
+        pd.testing.assert_frame_equal(merged.finalize(min_count=1), self.expected(1))
+
+    def test_merge_rejects_different_layouts(self) -> None:
+        with self.assertRaises(ValueError):
+            GroupSumAggregator(["fips"], ["emp"]).merge(GroupSumAggregator(["naics"], ["emp"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
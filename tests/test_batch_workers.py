@@ -0,0 +1,111 @@
+import functools
+import multiprocessing
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+from scripts.abs import econ_bnchmrk_abs
+from scripts.common import census_cache
+from scripts.common.batch import iter_year_results
+from scripts.qcew import econ_bnchmrk_qcew
+
+
+COLUMNS = [
+    "area_fips",
+    "own_code",
+    "industry_code",
+    "agglvl_code",
+    "year",
+    "qtr",
+    "annual_avg_emplvl",
+    "total_annual_wages",
+    "annual_avg_wkly_wage",
+]
+
+
+def _square(value: int) -> int:
+    return value * value
+
+
+class TestBatchWorkers(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        for year in (2022, 2023):
+            pd.DataFrame(
+                [
+                    ("06075", "5", "42", "74", str(year), "A", "100", "5200000", "1000"),
+                    ("06085", "5", "62", "74", str(year), "A", "50", "2600000", "1000"),
+                ],
+                columns=COLUMNS,
+            ).to_csv(self.root / f"{year}.annual.singlefile.csv", index=False)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_iter_year_results_covers_every_year(self) -> None:
+        results = dict(iter_year_results(_square, {2: (2,), 3: (3,), 4: (4,)}, workers=2))
+        self.assertEqual(results, {2: 4, 3: 9, 4: 16})
+
+    def test_parallel_batch_matches_sequential(self) -> None:
+        outputs = {}
+        for workers in (1, 2):
+            out_dir = self.root / f"workers_{workers}"
+            stacked = out_dir / "multiyear.csv"
+            econ_bnchmrk_qcew.run_batch(
+                years=[2022, 2023],
+                raw_template=str(self.root / "{year}.annual.singlefile.csv"),
+                per_year_pattern=str(out_dir / "qcew_{year}.csv"),
+                stacked_out=str(stacked),
+                workers=workers,
+            )
+            self.assertTrue((out_dir / "qcew_2022.csv").exists())
+            self.assertTrue((out_dir / "qcew_2023.csv").exists())
+            outputs[workers] = stacked.read_text()
+        self.assertEqual(outputs[1], outputs[2])
+
+    def seed_abs_snapshot(self, cache_dir: Path, year: int) -> None:
+        url = f"https://api.census.gov/data/{year}/abscs"
+        params = {"get": econ_bnchmrk_abs.build_field_list(year), "for": "county:*", "INDLEVEL": "2"}
+        frame = pd.DataFrame(
+            [["Alameda County, California", "0500000US06001", "10", "100", "5000", "20000", "2",
+              "42", "Wholesale trade", "06", "001"]],
+            columns=econ_bnchmrk_abs.ABS_BASE_FIELDS + ["NAICS2022", "NAICS2022_LABEL", "state", "county"],
+        )
+        census_cache.CensusSnapshotCache(cache_dir).store(url, params, frame)
+
+    def run_abs_spawned(self, cache_dir: Path, out_csv: Path) -> None:
+        argv = [
+            "econ_bnchmrk_abs.py", "--years", "2022", "2023", "--workers", "2", "--offline",
+            "--census_cache_dir", str(cache_dir), "--out_csv", str(out_csv),
+            "--per_year_pattern", str(out_csv.parent / "abs_{year}.csv"),
+        ]
+        spawn_pool = functools.partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn"))
+        with mock.patch.object(sys, "argv", argv), mock.patch(
+            "scripts.common.batch.ProcessPoolExecutor", spawn_pool
+        ):
+            try:
+                econ_bnchmrk_abs.main()
+            finally:
+                census_cache.configure_census_cache()
+
+    def test_spawned_abs_workers_honour_offline_cache(self) -> None:
+        cache_dir = self.root / "census_cache"
+        out_csv = self.root / "abs" / "multiyear.csv"
+        self.seed_abs_snapshot(cache_dir, 2022)
+        with self.assertRaises(census_cache.CensusCacheMiss):
+            self.run_abs_spawned(cache_dir, out_csv)
+
+        self.seed_abs_snapshot(cache_dir, 2023)
+        self.run_abs_spawned(cache_dir, out_csv)
+        stacked = pd.read_csv(out_csv)
+        self.assertEqual(stacked["year_num"].tolist(), [2022, 2023])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from scripts.common.census_cache import CensusCacheMiss, CensusSnapshotCache
+
+URL = "https://api.census.gov/data/2022/abscs"
+PARAMS = {"get": "NAME,EMP", "for": "county:*", "in": "state:06"}
+
+
+class TestCensusSnapshotCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.calls = 0
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def fetch(self, url, params) -> pd.DataFrame:
+        self.calls += 1
+        return pd.DataFrame([["Alameda", "100", None], ["Marin", "N", "041"]], columns=["NAME", "EMP", "county"])
+
+    def test_second_read_is_served_from_snapshot(self) -> None:
+        cache = CensusSnapshotCache(self.root)
+        first = cache.get_frame(URL, PARAMS, fetch=self.fetch)
+        # The API key does not change the snapshot identity.
+        second = cache.get_frame(URL, {**PARAMS, "key": "secret"}, fetch=self.fetch)
+        self.assertEqual(self.calls, 1)
+        pd.testing.assert_frame_equal(first, second)
+        self.assertIsNone(second.loc[0, "county"])
+        data_path, _ = cache.paths(URL, PARAMS)
+        self.assertEqual(data_path.relative_to(self.root).parts[:2], ("abscs", "2022"))
+        self.assertEqual(cache.manifest(URL, PARAMS)["rows"], 2)
+        # A different geography filter is a different snapshot.
+        cache.get_frame(URL, {**PARAMS, "in": "state:41"}, fetch=self.fetch)
+        self.assertEqual(self.calls, 2)
+
+    def test_ttl_refresh_and_offline(self) -> None:
+        CensusSnapshotCache(self.root).get_frame(URL, PARAMS, fetch=self.fetch)
+        _, manifest_path = CensusSnapshotCache(self.root).paths(URL, PARAMS)
+        stale = manifest_path.read_text().replace(
+            datetime.now(timezone.utc).isoformat(timespec="seconds")[:10],
+            (datetime.now(timezone.utc) - timedelta(days=30)).isoformat(timespec="seconds")[:10],
+        )
+        manifest_path.write_text(stale)
+
+        CensusSnapshotCache(self.root, ttl_days=365).get_frame(URL, PARAMS, fetch=self.fetch)
+        self.assertEqual(self.calls, 1)
+        CensusSnapshotCache(self.root, ttl_days=7).get_frame(URL, PARAMS, fetch=self.fetch)
+        self.assertEqual(self.calls, 2)
+        CensusSnapshotCache(self.root, refresh=True).get_frame(URL, PARAMS, fetch=self.fetch)
+        self.assertEqual(self.calls, 3)
+
+        offline = CensusSnapshotCache(self.root, offline=True)
+        self.assertEqual(len(offline.get_frame(URL, PARAMS, fetch=self.fetch)), 2)
+        with self.assertRaises(CensusCacheMiss):
+            offline.get_frame(URL, {**PARAMS, "in": "state:41"}, fetch=self.fetch)
+        self.assertEqual(self.calls, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import gzip
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from scripts.common.census_client import CensusAPIError, CensusClient, RetryPolicy, TokenBucket
+
+PAYLOAD = [["NAME", "EMP", "state", "county"], ["Sample County", "100", "06", "075"]]
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, *args) -> None:  # keep test output quiet
+        pass
+
+    def do_GET(self) -> None:
+        server = self.server
+        server.seen.append(self.path)
+        server.ports.add(self.client_address[1])
+        status = server.statuses.pop(0) if server.statuses else 200
+        body = json.dumps(PAYLOAD).encode() if status == 200 else b"error: unknown variable"
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "2")
+        if status == 200 and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestCensusClient(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self.server.seen, self.server.ports, self.server.statuses = [], set(), []
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.sleeps: list[float] = []
+        host, port = self.server.server_address
+        self.client = CensusClient(
+            base_url=f"http://{host}:{port}",
+            api_key="secret",
+            rate=1000,
+            retry=RetryPolicy(max_attempts=3, backoff=0.1),
+            sleep=self.sleeps.append,
+        )
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_pooled_gzip_requests_with_key(self) -> None:
+        for _ in range(3):
+            frame = self.client.get_frame("/data/2022/abscs", {"get": "NAME,EMP", "for": "county:*"})
+        self.assertEqual(frame.to_dict("records")[0]["EMP"], "100")
+        query = parse_qs(urlsplit(self.server.seen[0]).query)
+        self.assertEqual(query["key"], ["secret"])
+        self.assertEqual(query["for"], ["county:*"])
+        # Three requests over one keep-alive connection.
+        self.assertEqual(self.client.connections_opened, 1)
+        self.assertEqual(len(self.server.ports), 1)
+
+    def test_retries_transient_statuses(self) -> None:
+        self.server.statuses = [503, 429]
+        self.assertEqual(self.client.get_json("/data/2022/abscs"), PAYLOAD)
+        self.assertEqual(len(self.server.seen), 3)
+        self.assertEqual(self.sleeps[1], 2.0)  # Retry-After honoured
+
+    def test_gives_up_and_does_not_retry_client_errors(self) -> None:
+        self.server.statuses = [503, 503, 503]
+        with self.assertRaises(CensusAPIError) as ctx:
+            self.client.get("/data/2022/abscs")
+        self.assertEqual(ctx.exception.status, 503)
+        self.server.statuses = [400]
+        seen = len(self.server.seen)
+        with self.assertRaises(CensusAPIError):
+            self.client.get("/data/2022/abscs")
+        self.assertEqual(len(self.server.seen), seen + 1)
+
+    def test_token_bucket_spaces_requests(self) -> None:
+        now = [0.0]
+
+        def sleep(seconds: float) -> None:
+            now[0] += seconds
+
+        bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0], sleep=sleep)
+        waits = [bucket.acquire() for _ in range(4)]
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertAlmostEqual(now[0], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import json
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from scripts.common.census_json import (
+    NOTE_MISSING,
+    NOTE_NON_NUMERIC,
+    NOTE_SUPPRESSED,
+    decode_census_json,
+    parse_census_numeric,
+    render_notes,
+)
+
+
+class TestCensusJson(unittest.TestCase):
+    def test_decode_matches_row_wise_frame(self) -> None:
+        payload = [
+            ["NAICS2022", "EMP", "state", "county"],
+            ["42", "100", "06", "075"],
+            ["31-33", None, "06", "085"],
+        ]
+        body = ("[" + ",\n".join(json.dumps(row) for row in payload) + "]").encode()
+        expected = pd.DataFrame(payload[1:], columns=payload[0])
+        pd.testing.assert_frame_equal(decode_census_json(body), expected)
+        self.assertEqual(list(decode_census_json(b'[["EMP"]]').columns), ["EMP"])
+        self.assertTrue(decode_census_json(b" \n").empty)
+
+    def test_decode_single_record_payload(self) -> None:
+        payload = '[["NAICS2022","NAME","FIRMPDEMP","EMP","PAYANN","RCPPDEMP","state","county"],' \
+                  '["42","Sample County","10","100","200","300","06","075"]]'
+        record = decode_census_json(payload).iloc[0]
+        self.assertEqual(record["NAICS2022"], "42")
+        self.assertEqual(record["FIRMPDEMP"], "10")
+
+    def test_decode_rejects_malformed_payloads(self) -> None:
+        with self.assertRaises(json.JSONDecodeError):
+            decode_census_json(b'[["EMP"],["1"]')
+        with self.assertRaises(json.JSONDecodeError):
+            decode_census_json(b"error: unknown variable")
+        with self.assertRaises(ValueError):
+            decode_census_json(b'[["EMP","state"],["1"]]')
+
+    def test_numeric_parse_and_notes(self) -> None:
+        values = pd.Series(["12", " 3.5 ", "D", "(S)", "", None, "abc"], dtype=object)
+        parsed, notes = parse_census_numeric(values)
+        np.testing.assert_array_equal(parsed[:2], [12.0, 3.5])
+        self.assertTrue(np.isnan(parsed[2:]).all())
+        self.assertEqual(
+            notes.tolist(),
+            [0, 0, NOTE_SUPPRESSED, NOTE_SUPPRESSED, NOTE_SUPPRESSED, NOTE_MISSING, NOTE_NON_NUMERIC],
+        )
+        masks = np.array([0, NOTE_SUPPRESSED | NOTE_MISSING, NOTE_NON_NUMERIC, 0], dtype=np.uint8)
+        self.assertEqual(
+            render_notes(masks).tolist(),
+            ["", "source_missing;source_suppressed", "source_non_numeric", ""],
+        )
+        _, absent = parse_census_numeric(None, 2)
+        self.assertEqual(absent.tolist(), [NOTE_MISSING, NOTE_MISSING])
+
+
+if __name__ == "__main__":
+    unittest.main()
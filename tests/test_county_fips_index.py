@@ -0,0 +1,92 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from scripts.common import county_fips_index as cfi
+from scripts.common.keys import decode_fips
+from scripts.epa.tri_epa_pipeline import enrich_with_fips
+
+SIMPLEMAPS = pd.DataFrame(
+    {
+        "county": ["Baltimore", "Baltimore", "St. Louis", "Doña Ana", "Capitol", "Juneau"],
+        "county_ascii": ["Baltimore", "Baltimore", "St. Louis", "Dona Ana", "Capitol", "Juneau"],
+        "county_full": [
+            "Baltimore County",
+            "Baltimore city",
+            "St. Louis County",
+            "Doña Ana County",
+            "Capitol Planning Region",
+            "Juneau City and Borough",
+        ],
+        "state_id": ["MD", "MD", "MO", "NM", "CT", "AK"],
+        "county_fips": ["24005", "24510", "29189", "35013", "9110", "02110"],
+    }
+)
+
+
+class TestCountyFipsIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.csv = self.root / "uscounties.csv"
+        SIMPLEMAPS.to_csv(self.csv, index=False)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_resolve_matches_lookup_merge(self) -> None:
+        lookup = cfi.build_lookup_frame(self.csv)
+        index = cfi.compile_county_fips_index(self.csv)
+        queries = pd.DataFrame(
+            {
+                "state_code": ["MD", "MO", "NM", "NM", "CT", "CT", "AK", "TX", None, "MD"],
+                "county_name_norm": [
+                    "baltimore", "saintlouis", "doaana", "donaana", "capitolplanningregion",
+                    "newhaven", "valdezcordova", "harris", "baltimore", None,
+                ],
+            }
+        )
+        expected = queries.merge(lookup, on=["state_code", "county_name_norm"], how="left")["county_fips_5"]
+        actual = decode_fips(index.resolve(queries["state_code"], queries["county_name_norm"]))
+        pd.testing.assert_series_equal(actual, expected, check_names=False)
+        self.assertEqual(actual.tolist()[:4], ["24005", "29189", "35013", "35013"])
+        # Baltimore city loses the name to Baltimore County but is still a valid FIPS.
+        self.assertIn(24510, index.valid_fips.tolist())
+        self.assertIn(9110, index.valid_fips.tolist())
+        self.assertNotIn(9009, index.valid_fips.tolist())
+
+    def test_persisted_index_is_reused_and_keyed_by_inputs(self) -> None:
+        index_dir = self.root / "index"
+        first = cfi.load_county_fips_index(self.csv, index_dir)
+        self.assertIsInstance(first.key_hash, np.memmap)
+        second = cfi.load_county_fips_index(self.csv, index_dir)
+        self.assertEqual(second.manifest["built_at"], first.manifest["built_at"])
+        self.assertEqual(second.manifest["entries"], len(first))
+
+        cfi.load_county_fips_index(self.csv, index_dir, overrides=cfi.MANUAL_OVERRIDES[:1])
+        SIMPLEMAPS.iloc[:-1].to_csv(self.csv, index=False)
+        cfi.load_county_fips_index(self.csv, index_dir)
+        self.assertEqual(len(list(index_dir.iterdir())), 3)
+
+    def test_enrich_with_fips(self) -> None:
+        index = cfi.load_county_fips_index(self.csv, index_dir=None)
+        tri_g = pd.DataFrame(
+            {
+                "state_cd": ["MD", "MO", "CT", "PR"],
+                "cnty_nm": ["BALTIMORE", "ST. LOUIS", "NEW HAVEN", "SAN JUAN"],
+                "naics2_sector_cd": ["32", "33", "32", "32"],
+                "tri_ttl_rls_lbs_amt": [1.234, 2.0, 3.0, 4.0],
+            },
+            index=[10, 11, 12, 13],
+        )
+        out = enrich_with_fips(tri_g, index)
+        self.assertEqual(out["state_cnty_fips_cd"].tolist()[:3], ["24005", "29189", "09009"])
+        self.assertTrue(pd.isna(out["state_cnty_fips_cd"].iloc[3]))
+        self.assertEqual(out["tri_ttl_rls_lbs_amt"].tolist()[0], 1.23)
+
+
+if __name__ == "__main__":
+    unittest.main()
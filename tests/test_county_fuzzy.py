@@ -0,0 +1,72 @@
+import unittest
+
+import pandas as pd
+
+from scripts.common.county_fips_index import CountyFipsIndex
+from scripts.common.county_fuzzy import AUDIT_COLUMNS, CountyNameMatcher
+from scripts.epa.tri_epa_pipeline import enrich_with_fips
+
+LOOKUP = pd.DataFrame(
+    [
+        ("WI", "sheboygan", "55117"),
+        ("WI", "sheboygancounty", "55117"),
+        ("WI", "manitowoc", "55071"),
+        ("LA", "stjohnthebaptist", "22095"),
+        ("LA", "saintjohnthebaptist", "22095"),
+        ("LA", "saintjames", "22093"),
+        ("VA", "franklin", "51067"),
+        ("VA", "franklincity", "51620"),
+        ("MN", "sheboygan", "27999"),
+    ],
+    columns=["state_code", "county_name_norm", "county_fips_5"],
+)
+
+
+class TestCountyNameMatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = CountyFipsIndex.from_frame(LOOKUP)
+        self.matcher = CountyNameMatcher.from_index(self.index, threshold=0.6)
+
+    def test_accepts_close_spellings_within_state(self) -> None:
+        found = self.matcher.match("WI", "sheboyagn")
+        self.assertEqual(found.county_fips, 55117)
+        self.assertEqual(found.matched_name_norm, "sheboygan")
+        self.assertEqual(found.runner_up_name_norm, None)
+        self.assertEqual(self.matcher.match("LA", "saintjohnbaptist").county_fips, 22095)
+        # Only the query's own state is searched.
+        self.assertIsNone(self.matcher.match("TX", "sheboygan"))
+        self.assertEqual(self.matcher.match("MN", "sheboygann").county_fips, 27999)
+
+    def test_rejects_low_scores_and_ambiguous_counties(self) -> None:
+        self.assertIsNone(self.matcher.match("WI", "milwaukee"))
+        self.assertIsNone(self.matcher.match("WI", ""))
+        # "franklinci" scores 0.83 for Franklin city but 0.80 for Franklin County.
+        self.assertIsNone(self.matcher.match("VA", "franklinci"))
+        self.assertEqual(self.matcher.match("VA", "franklincit").county_fips, 51620)
+        strict = CountyNameMatcher.from_index(self.index, threshold=0.95)
+        self.assertIsNone(strict.match("WI", "sheboyagn"))
+
+    def test_enrich_falls_back_and_records_audit(self) -> None:
+        tri_g = pd.DataFrame(
+            {
+                "state_cd": ["WI", "WI", "WI", "PR"],
+                "cnty_nm": ["SHEBOYGAN", "SHEBOYAGN", "SHEBOYAGN COUNTY", "SHEBOYAGN"],
+                "naics2_sector_cd": ["32", "32", "33", "32"],
+                "tri_ttl_rls_lbs_amt": [1.0, 2.0, 3.0, 4.0],
+            }
+        )
+        exact_only = enrich_with_fips(tri_g, self.index)
+        self.assertEqual(exact_only["state_cnty_fips_cd"].notna().tolist(), [True, False, False, False])
+        self.assertEqual(exact_only.attrs["fuzzy_matches"], [])
+
+        out = enrich_with_fips(tri_g, self.index, self.matcher)
+        self.assertEqual(out["state_cnty_fips_cd"].tolist()[:3], ["55117"] * 3)
+        self.assertTrue(pd.isna(out["state_cnty_fips_cd"].iloc[3]))
+        audit = pd.DataFrame(out.attrs["fuzzy_matches"])
+        self.assertEqual(list(audit.columns), ["state_cd", "cnty_nm"] + AUDIT_COLUMNS)
+        self.assertEqual(audit["cnty_nm"].tolist(), ["SHEBOYAGN", "SHEBOYAGN COUNTY"])
+        self.assertTrue((audit["score"] >= 0.6).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import json
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from scripts.common import county_names
+from scripts.common.county_names import COUNTY_SUFFIX_TERMS, CountyNameMemo, normalize_county_name
+
+
+def legacy_normalize(series: pd.Series) -> pd.Series:
+    """The per-term pandas passes the TRI pipeline used before county_names."""
+    cleaned = series.fillna("").str.lower().str.replace(r"[^a-z0-9\s]", " ", regex=True)
+    for term in COUNTY_SUFFIX_TERMS:
+        pattern = r"\b" + term.replace(" ", r"\s+") + r"\b"
+        cleaned = cleaned.str.replace(pattern, " ", regex=True)
+    return (
+        cleaned.str.replace(r"\bst\b", "saint", regex=True)
+        .str.replace(r"\band\b", "and", regex=True)
+        .str.replace(r"\s+", "", regex=True)
+        .str.strip()
+    )
+
+
+class TestNormalizeCountyName(unittest.TestCase):
+    def test_matches_legacy_passes(self) -> None:
+        fixed = [
+            "St. Louis County",
+            "JUNEAU CITY AND BOROUGH",
+            "Valdez-Cordova Census Area",
+            "census county area",
+            "Census  Are",
+            "Doña Ana",
+            "Prince George's",
+            "New London",
+            "Boroughbridge",
+            "",
+            None,
+            np.nan,
+        ]
+        rng = random.Random(3)
+        vocab = COUNTY_SUFFIX_TERMS + ["st", "st.", "and", "harris", "o'brien", "city1", "-", "  ", "ñ", "DE KALB"]
+        fuzz = [" ".join(rng.choice(vocab) for _ in range(rng.randint(1, 5))) for _ in range(2_000)]
+        series = pd.Series(fixed + fuzz, name="cnty_nm", index=range(100, 100 + len(fixed) + len(fuzz)))
+
+        memo = CountyNameMemo()
+        actual = normalize_county_name(series, memo=memo)
+        pd.testing.assert_series_equal(actual, legacy_normalize(series))
+        self.assertEqual(actual.iloc[0], "saintlouis")
+        self.assertEqual(actual.iloc[1], "juneauand")
+        self.assertEqual(memo.misses, len(memo))
+
+    def test_memo_persists_and_ignores_other_rules(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "memo" / "county_names.json"
+            first = CountyNameMemo(path)
+            normalize_county_name(pd.Series(["Harris County", "Harris County", "Kern"]), memo=first)
+            self.assertEqual(first.save(), path)
+
+            second = CountyNameMemo(path)
+            out = normalize_county_name(pd.Series(["Kern", "Harris County"]), memo=second)
+            self.assertEqual(out.tolist(), ["kern", "harris"])
+            self.assertEqual((second.hits, second.misses), (2, 0))
+            self.assertIsNone(second.save())
+
+            payload = json.loads(path.read_text())
+            payload["rules"] = "older-rules"
+            path.write_text(json.dumps(payload))
+            self.assertEqual(len(CountyNameMemo(path)), 0)
+            self.assertNotEqual(county_names.RULES_DIGEST, "older-rules")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+from qa import export_sanity_check
+from scripts.common.table_io import write_table
+
+
+class TestStreamedSanityCheck(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.fact = pd.DataFrame(
+            {
+                "year_num": [2022, 2022, 2022, 2023, 2023, 2023],
+                "state_cnty_fips_cd": ["06075", "06085", "06075", "06075", "06085", "01001"],
+                "naics2_sector_cd": ["42", "42", "42", "62", "62", "42"],
+                "abs_firm_num": [10, 3, 10, 8, None, 2],
+                "abs_emp_num": [100, 30, 100, 80, None, 20],
+                "abs_payroll_usd_amt": [1000.0, 300.0, 1000.0, 800.0, None, 200.0],
+                "abs_rcpt_usd_amt": [5000.0, 900.0, 5000.0, 4000.0, None, 700.0],
+                "qcew_ann_avg_emp_lvl_num": [90, 31, 90, 75, 12, 18],
+                "qcew_ttl_ann_wage_usd_amt": [900.0, 310.0, 900.0, 750.0, 120.0, 180.0],
+                "qcew_avg_wkly_wage_usd_amt": [0.19, 0.19, 0.19, 0.19, 0.19, 0.19],
+            }
+        )
+        pd.DataFrame({"naics2_sector_cd": ["42", "62"], "naics2_sector_desc": ["Wholesale", "Health"]}).to_csv(
+            self.root / "naics.csv", index=False
+        )
+        pd.DataFrame(
+            {"state_cnty_fips_cd": ["06075", "06085", "01001"], "cnty_nm": ["a", "b", "c"], "state_cd": ["CA", "CA", "AL"]}
+        ).to_csv(self.root / "county.csv", index=False)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def run_check(self, fact_path: Path, chunksize: int) -> dict:
+        outdir = self.root / f"out_{fact_path.suffix}_{chunksize}"
+        argv = [
+            "export_sanity_check",
+            "--fact", str(fact_path),
+            "--naics", str(self.root / "naics.csv"),
+            "--county", str(self.root / "county.csv"),
+            "--outdir", str(outdir),
+            "--chunksize", str(chunksize),
+        ]
+        with patch.object(sys, "argv", argv), self.assertRaises(SystemExit):
+            export_sanity_check.main()
+        payload = json.loads(next(outdir.glob("*.json")).read_text())
+        payload.pop("run_timestamp")
+        payload.pop("inputs")
+        return payload
+
+    def test_chunk_size_does_not_change_report(self) -> None:
+        csv_path = self.root / "fact.csv"
+        self.fact.to_csv(csv_path, index=False)
+        whole = self.run_check(csv_path, 1_000)
+        self.assertEqual(self.run_check(csv_path, 2), whole)
+
+        checks = {c["name"]: c for c in whole["checks"]}
+        self.assertFalse(checks["fact: duplicate keys"]["passed"])
+        self.assertEqual(checks["fact: duplicate keys"]["detail"], "1 duplicate keys found.")
+
+        pq_path = write_table(self.fact, self.root / "pq" / "fact.csv", "parquet")
+        from_parquet = self.run_check(pq_path, 2)
+        self.assertEqual(from_parquet["checks"][0]["name"], "fact: Parquet parses cleanly")
+        self.assertEqual(from_parquet["checks"][1:], whole["checks"][1:])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from scripts.common.keys import (
+    NAICS_LABELS,
+    composite_key,
+    count_duplicate_keys,
+    decode_key_columns,
+    encode_fips,
+    encode_key_columns,
+    merge_on_keys,
+    pack_keys,
+    unpack_keys,
+)
+
+
+class TestKeyCodec(unittest.TestCase):
+    def setUp(self) -> None:
+        self.frame = pd.DataFrame(
+            {
+                "year_num": [2022, 2022, 2023, 2023],
+                "state_cnty_fips_cd": ["06075", "01001", "56045", None],
+                "naics2_sector_cd": ["31-33", "42", "99", "00"],
+                "value": [1.0, 2.0, 3.0, 4.0],
+            }
+        )
+
+    def test_round_trip_restores_canonical_strings(self) -> None:
+        encoded = encode_key_columns(self.frame)
+        self.assertEqual(encoded["state_cnty_fips_cd"].dtype, np.int32)
+        self.assertEqual(encoded["naics2_sector_cd"].dtype, np.uint8)
+        self.assertEqual(encoded["year_num"].dtype, np.uint16)
+        decoded = decode_key_columns(encoded)
+        self.assertEqual(decoded["state_cnty_fips_cd"].tolist()[:3], ["06075", "01001", "56045"])
+        self.assertTrue(pd.isna(decoded["state_cnty_fips_cd"].iloc[3]))
+        self.assertEqual(decoded["naics2_sector_cd"].tolist(), ["31-33", "42", "99", "00"])
+        self.assertEqual(decoded["year_num"].tolist(), [2022, 2022, 2023, 2023])
+
+    def test_packed_keys_unpack_and_sort_like_strings(self) -> None:
+        keys = composite_key(self.frame)
+        year, fips, naics = unpack_keys(keys)
+        np.testing.assert_array_equal(pack_keys(year, fips, naics), keys)
+        self.assertEqual(list(NAICS_LABELS[1:]), sorted(NAICS_LABELS[1:]))
+
+    def test_unknown_naics_label_raises(self) -> None:
+        bad = self.frame.assign(naics2_sector_cd=["42", "42", "4X", "42"])
+        with self.assertRaises(ValueError):
+            composite_key(bad)
+
+    def test_duplicates_and_merge_match_string_keys(self) -> None:
+        doubled = pd.concat([self.frame, self.frame.iloc[[1]]], ignore_index=True)
+        self.assertEqual(count_duplicate_keys(doubled), 1)
+
+        left = self.frame.iloc[:3]
+        right = pd.DataFrame(
+            {
+                "year_num": [2022, 2024],
+                "state_cnty_fips_cd": ["06075", "06085"],
+                "naics2_sector_cd": ["31-33", "62"],
+                "value": [9.0, 8.0],
+            }
+        )
+        expected = left.merge(
+            right,
+            how="outer",
+            on=["year_num", "state_cnty_fips_cd", "naics2_sector_cd"],
+            suffixes=("", "_r"),
+        )
+        actual = merge_on_keys(left, right, how="outer", suffixes=("", "_r"))
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_fips_must_be_exactly_five_digits(self) -> None:
+        values = pd.Series(["06075", " 06075 ", "06X75", "C1234", "6075", "060750", None])
+        self.assertEqual(encode_fips(values).tolist(), [6075, 6075, -1, -1, -1, -1, -1])
+        self.assertEqual(encode_fips(pd.Series([6075, 6075.5, 100_000])).tolist(), [6075, -1, -1])
+
+    def test_uncodable_keys_fall_back_to_strings(self) -> None:
+        bad = pd.DataFrame(
+            {
+                "year_num": [2022, 2022, 2022, 2022],
+                "state_cnty_fips_cd": ["06X75", "C1234", "C1234", "00675"],
+                "naics2_sector_cd": ["42", "4x", "4x", "42"],
+                "value": [1.0, 2.0, 3.0, 4.0],
+            }
+        )
+        self.assertEqual(count_duplicate_keys(bad), 1)
+        self.assertEqual(count_duplicate_keys(bad.iloc[[0, 3]]), 0)
+
+        right = bad.iloc[[3]].assign(value=9.0)
+        expected = bad.merge(
+            right, how="outer", on=["year_num", "state_cnty_fips_cd", "naics2_sector_cd"], suffixes=("", "_r")
+        )
+        actual = merge_on_keys(bad, right, how="outer", suffixes=("", "_r"))
+        pd.testing.assert_frame_equal(actual, expected)
+        self.assertEqual(actual["value_r"].notna().sum(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from qa.qcew_reconciliation import _normalize_naics2
+from scripts.common.naics import VALID_SECTORS, derive_naics2, map_naics_sectors
+from scripts.qcew import qcew_prep_naics_sector
+
+
+CODES = pd.Series(
+    ["42", "423", "31-33", "336111", "44-45", "48", "10", "1012", "99", "", None, np.nan, " 62 ", "5", "N"],
+    index=range(100, 115),
+)
+
+
+class TestNaicsSectorMapping(unittest.TestCase):
+    def assert_matches_apply(self, rule, allowed=None) -> None:
+        expected = CODES.apply(rule)
+        if allowed is not None:
+            expected = expected.where(expected.isin(allowed), None)
+        actual = map_naics_sectors(CODES, rule, allowed=allowed)
+        self.assertIsInstance(actual.dtype, pd.CategoricalDtype)
+        self.assertEqual(list(actual.index), list(CODES.index))
+        self.assertEqual(
+            [None if pd.isna(v) else v for v in expected],
+            [None if pd.isna(v) else v for v in actual],
+        )
+
+    def test_matches_each_scalar_rule(self) -> None:
+        self.assert_matches_apply(derive_naics2, allowed=VALID_SECTORS)
+        self.assert_matches_apply(qcew_prep_naics_sector.derive_naics2)
+        self.assert_matches_apply(_normalize_naics2)
+
+    def test_categories_sorted_lexically(self) -> None:
+        mapped = map_naics_sectors(pd.Series(["62", "31", "42", "62"]))
+        self.assertEqual(list(mapped.cat.categories), ["31-33", "42", "62"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from scripts.qcew import (
+    econ_bnchmrk_qcew,
+    qcew_multi_product,
+    qcew_prep_naics2,
+    qcew_prep_naics_sector,
+)
+
+
+SAMPLE_ROWS = [
+    # area_fips, own_code, industry_code, agglvl_code, year, qtr, emp, wages, wkly
+    ("06075", "5", "42", "74", "2022", "A", "100", "5200000", "1000"),
+    ("06075", "5", "62", "74", "2022", "A", "50", "2600000", "1000"),
+    ("06075", "0", "10", "70", "2022", "A", "999", "51948000", "1000"),
+    ("06075", "0", "1012", "72", "2022", "A", "300", "15600000", "1000"),
+    ("06075", "5", "423", "75", "2022", "A", "70", "1", "1"),
+    ("06085", "5", "31-33", "74", "2022", "A", "10", "520000", "1000"),
+    ("06085", "0", "10", "70", "2022", "A", "400", "20800000", "1000"),
+    ("06085", "5", "62", "74", "2022", "1", "11", "1", "1"),
+    ("06000", "5", "62", "54", "2022", "A", "5000", "1", "1"),
+]
+
+
+class TestQcewMultiProduct(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.raw_path = Path(self.tmp.name) / "2022.annual.singlefile.csv"
+        pd.DataFrame(
+            SAMPLE_ROWS,
+            columns=[
+                "area_fips",
+                "own_code",
+                "industry_code",
+                "agglvl_code",
+                "year",
+                "qtr",
+                "annual_avg_emplvl",
+                "total_annual_wages",
+                "annual_avg_wkly_wage",
+            ],
+        ).to_csv(self.raw_path, index=False)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_single_scan_matches_standalone_builders(self) -> None:
+        outputs = qcew_multi_product.build_year_products(
+            2022,
+            self.raw_path,
+            ["private", "naics2", "sector"],
+            chunksize=3,
+            store_dir=None,
+        )
+        raw = pd.read_csv(self.raw_path, dtype=str)
+        expected = {
+            "private": econ_bnchmrk_qcew.process_year(2022, self.raw_path, chunksize=0),
+            "naics2": qcew_prep_naics2.finalize_qcew(
+                qcew_prep_naics2.prepare_qcew_naics2(
+                    qcew_prep_naics2.normalize_qcew_columns(raw), year=2022
+                )
+            ),
+            "sector": qcew_prep_naics_sector.prepare_qcew_sector(
+                qcew_prep_naics_sector.normalize_qcew_columns(raw), year=2022
+            ),
+        }
+        for name, frame in expected.items():
+            with self.subTest(product=name):
+                self.assertFalse(frame.empty)
+                pd.testing.assert_frame_equal(
+                    outputs[name].reset_index(drop=True), frame.reset_index(drop=True)
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
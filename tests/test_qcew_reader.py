@@ -0,0 +1,70 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from scripts.qcew import econ_bnchmrk_qcew
+from scripts.qcew.qcew_reader import iter_qcew_chunks
+
+
+SAMPLE_ROWS = [
+    # area_fips, own_code, industry_code, agglvl_code, year, qtr, emp, wages, wkly
+    ("06075", "5", "42", "74", "2022", "A", "100", "5200000", "1000"),
+    ("06075", "5", "62", "74", "2022", "A", "50", "2600000", "1000"),
+    ("06075", "0", "42", "74", "2022", "A", "999", "1", "1"),
+    ("06075", "5", "423", "75", "2022", "A", "70", "1", "1"),
+    ("06085", "5", "31-33", "74", "2022", "A", "10", "520000", "1000"),
+    ("06085", "5", "62", "74", "2022", "1", "11", "1", "1"),
+    ("06085", "5", "62", "74", "2021", "A", "12", "1", "1"),
+]
+
+
+class TestQcewReader(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.raw_path = Path(self.tmp.name) / "2022.annual.singlefile.csv"
+        pd.DataFrame(
+            SAMPLE_ROWS,
+            columns=[
+                "area_fips",
+                "own_code",
+                "industry_code",
+                "agglvl_code",
+                "year",
+                "qtr",
+                "annual_avg_emplvl",
+                "total_annual_wages",
+                "annual_avg_wkly_wage",
+            ],
+        ).to_csv(self.raw_path, index=False)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_chunk_filters_normalize_header_once(self) -> None:
+        chunks = list(
+            iter_qcew_chunks(
+                self.raw_path,
+                econ_bnchmrk_qcew.normalize_qcew_columns,
+                keep=econ_bnchmrk_qcew.private_row_filters(2022),
+                columns=econ_bnchmrk_qcew.PRIVATE_COLUMNS,
+                chunksize=2,
+            )
+        )
+        combined = pd.concat(chunks, ignore_index=True)
+        self.assertEqual(len(combined), 3)
+        self.assertIn("state_cnty_fips_cd", combined.columns)
+        self.assertEqual(set(combined["own_code"]), {"5"})
+
+    def test_streaming_matches_whole_file(self) -> None:
+        streamed = econ_bnchmrk_qcew.process_year(2022, self.raw_path, chunksize=2)
+        whole = econ_bnchmrk_qcew.process_year(2022, self.raw_path, chunksize=0)
+        pd.testing.assert_frame_equal(
+            streamed.reset_index(drop=True), whole.reset_index(drop=True)
+        )
+        self.assertEqual(len(streamed), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,32 @@
+import shutil
+import tempfile
 import unittest
 
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from qa import qcew_reconciliation
+from scripts.qcew.qcew_reader import read_qcew_filtered
+from scripts.qcew.qcew_store import build_store
+
+
+def _fixture_config(rdm_csv=None) -> qcew_reconciliation.QcewConfig:
+    return qcew_reconciliation.QcewConfig(
+        years=[2022],
+        counties=["06075", "06085"],
+        naics=["42", "62"],
+        outdir=Path("artifacts/qa"),
+        publish_bq=False,
+        bq_table="unused",
+        raw_template="tests/fixtures/qcew_singlefile_sample.csv",
+        cache_dir=Path("data_raw/qcew/source_qa"),
+        ownership_code="5",
+        agg_level="74",
+        allow_wage_tolerance=True,
+        rdm_csv=rdm_csv,
+    )
 
 
 class TestQcewReconciliation(unittest.TestCase):
@@ -28,6 +50,45 @@ class TestQcewReconciliation(unittest.TestCase):
         self.assertIn("naics2_sector_cd", source.columns)
         self.assertIn("state_cnty_fips_cd", source.columns)
 
+    def test_full_surface_streams_every_county_sector(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            rdm_csv = Path(tmp) / "rdm.csv"
+            pd.DataFrame(
+                [
+                    {
+                        "year_num": 2022,
+                        "state_cnty_fips_cd": "06075",
+                        "naics2_sector_cd": "42",
+                        "qcew_ann_avg_emp_lvl_num": 100,
+                        "qcew_ttl_ann_wage_usd_amt": 5200000,
+                        "qcew_avg_wkly_wage_usd_amt": 1000,
+                    },
+                    {
+                        "year_num": 2022,
+                        "state_cnty_fips_cd": "01001",
+                        "naics2_sector_cd": "72",
+                        "qcew_ann_avg_emp_lvl_num": 5,
+                        "qcew_ttl_ann_wage_usd_amt": 26000,
+                        "qcew_avg_wkly_wage_usd_amt": 100,
+                    },
+                ]
+            ).to_csv(rdm_csv, index=False)
+            # Counties/NAICS lists are ignored in full-surface mode.
+            config = _fixture_config(rdm_csv)
+            config = qcew_reconciliation.QcewConfig(**{**config.__dict__, "counties": ["99999"]})
+            reconciled = qcew_reconciliation.run_full_surface(config)
+            self.assertEqual(sorted(reconciled["state_cnty_fips_cd"]), ["01001", "06075", "06085"])
+            by_county = reconciled.set_index("state_cnty_fips_cd")
+            self.assertIs(by_county.loc["06075", "pass_all"], True)
+            self.assertEqual(by_county.loc["01001", "notes"], "missing_from_source")
+
+            out_path, latest_path = qcew_reconciliation.write_outputs_full(
+                reconciled, Path(tmp) / "qa", publish_bq=False, bq_table="unused"
+            )
+            self.assertEqual(latest_path.name, "qcew_reconciliation_full_latest.parquet")
+            self.assertEqual([p.name for p in out_path.iterdir()], ["year_num=2022"])
+            self.assertEqual(len(pd.read_parquet(latest_path)), 3)
+
     def test_suppression_handling(self) -> None:
         source_df = pd.DataFrame(
             [
@@ -60,6 +121,68 @@ class TestQcewReconciliation(unittest.TestCase):
         self.assertIn("source_suppressed", row["notes"])
         self.assertTrue(pd.isna(row["pass_all"]))
 
+    def test_csv_nulls_are_not_suppressed(self) -> None:
+        source_df = pd.DataFrame(
+            [
+                {
+                    "year": "2022",
+                    "state_cnty_fips_cd": "06085",
+                    "state_fips": "06",
+                    "county_fips": "085",
+                    "naics2_sector_cd": "62",
+                    "annual_avg_emplvl": np.nan,
+                    "total_annual_wages": "nan",
+                    "annual_avg_wkly_wage": "1000",
+                }
+            ]
+        )
+        rdm_df = pd.DataFrame(
+            [
+                {
+                    "year_num": 2022,
+                    "state_cnty_fips_cd": "06085",
+                    "naics2_sector_cd": "62",
+                    "rdm_qcew_emp": 100,
+                    "rdm_qcew_wages_usd": 5200000,
+                    "rdm_qcew_avg_weekly_wage_usd": 1000,
+                }
+            ]
+        )
+        reconciled = qcew_reconciliation.reconcile_qcew(source_df, rdm_df, allow_wage_tolerance=True)
+        row = reconciled.iloc[0]
+        self.assertNotIn("source_", row["notes"])
+        self.assertTrue(pd.isna(row["source_qcew_annual_avg_emplvl"]))
+        self.assertTrue(pd.isna(row["source_qcew_total_annual_wages_usd"]))
+
+    def test_store_nulls_are_suppressed(self) -> None:
+        config = _fixture_config()
+        with tempfile.TemporaryDirectory() as tmp:
+            raw_path = Path(tmp) / "2022.annual.singlefile.csv"
+            shutil.copy(config.raw_template, raw_path)
+            store_dir = Path(tmp) / "store"
+            build_store(raw_path, store_dir)
+            normalized = read_qcew_filtered(
+                raw_path, qcew_reconciliation._normalize_columns, store_dir=store_dir
+            )
+            source_df = qcew_reconciliation._prepare_source(normalized, 2022, config)
+        rdm_df = pd.DataFrame(
+            [
+                {
+                    "year_num": 2022,
+                    "state_cnty_fips_cd": code,
+                    "naics2_sector_cd": sector,
+                    "rdm_qcew_emp": 100,
+                    "rdm_qcew_wages_usd": 5200000,
+                    "rdm_qcew_avg_weekly_wage_usd": 1000,
+                }
+                for code, sector in (("06075", "42"), ("06085", "62"))
+            ]
+        )
+        reconciled = qcew_reconciliation.reconcile_qcew(source_df, rdm_df, allow_wage_tolerance=True)
+        notes = reconciled.set_index("state_cnty_fips_cd")["notes"]
+        self.assertIn("source_suppressed", notes["06085"])
+        self.assertNotIn("source_suppressed", notes["06075"])
+
     def test_avg_weekly_wage_tolerance(self) -> None:
         source_df = pd.DataFrame(
             [
@@ -91,6 +214,42 @@ class TestQcewReconciliation(unittest.TestCase):
         row = reconciled.iloc[0]
         self.assertTrue(row["pass_avg_weekly_wage"])
 
+    def test_missing_rows_are_flagged(self) -> None:
+        source_df = pd.DataFrame(
+            [
+                {
+                    "year": "2022",
+                    "state_cnty_fips_cd": "06075",
+                    "state_fips": "06",
+                    "county_fips": "075",
+                    "naics2_sector_cd": "42",
+                    "annual_avg_emplvl": "100",
+                    "total_annual_wages": None,
+                    "annual_avg_wkly_wage": "x",
+                }
+            ]
+        )
+        rdm_df = pd.DataFrame(
+            [
+                {
+                    "year_num": 2022,
+                    "state_cnty_fips_cd": "06085",
+                    "naics2_sector_cd": "62",
+                    "rdm_qcew_emp": 100,
+                    "rdm_qcew_wages_usd": 5200000,
+                    "rdm_qcew_avg_weekly_wage_usd": 1000,
+                }
+            ]
+        )
+        reconciled = qcew_reconciliation.reconcile_qcew(source_df, rdm_df, allow_wage_tolerance=True)
+        by_county = reconciled.set_index("state_cnty_fips_cd")
+        self.assertEqual(
+            by_county.loc["06075", "notes"], "source_missing;source_non_numeric;missing_from_rdm"
+        )
+        self.assertIs(by_county.loc["06075", "pass_all"], False)
+        self.assertEqual(by_county.loc["06085", "notes"], "missing_from_source")
+        self.assertIsNone(by_county.loc["06085", "pass_all"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,82 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from scripts.qcew import econ_bnchmrk_qcew
+from scripts.qcew.qcew_reader import read_qcew_filtered
+from scripts.qcew.qcew_store import build_store, find_store, read_store
+
+
+SAMPLE_ROWS = [
+    # area_fips, own_code, industry_code, agglvl_code, year, qtr, emp, wages, wkly
+    ("06085", "5", "62", "74", "2022", "A", "11", "572000", "1000"),
+    ("06075", "5", "42", "74", "2022", "A", "100", "5200000", "1000"),
+    ("06075", "5", "62", "74", "2022", "A", "D", "D", "D"),
+    ("06075", "0", "42", "74", "2022", "A", "999", "1", "1"),
+    ("06085", "5", "31-33", "74", "2022", "A", "10", "520000", "1000"),
+    ("06001", "5", "42", "74", "2022", "A", "40", "2080000", "1000"),
+]
+
+
+class TestQcewStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.raw_path = root / "2022.annual.singlefile.csv"
+        self.store_dir = root / "store"
+        pd.DataFrame(
+            SAMPLE_ROWS,
+            columns=[
+                "area_fips",
+                "own_code",
+                "industry_code",
+                "agglvl_code",
+                "year",
+                "qtr",
+                "annual_avg_emplvl",
+                "total_annual_wages",
+                "annual_avg_wkly_wage",
+            ],
+        ).to_csv(self.raw_path, index=False)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_store_is_keyed_by_source_digest(self) -> None:
+        self.assertIsNone(find_store(self.raw_path, self.store_dir))
+        path = build_store(self.raw_path, self.store_dir, row_group_size=2)
+        self.assertEqual(find_store(self.raw_path, self.store_dir), path)
+
+        # A revised source file must not match the stale store.
+        with self.raw_path.open("a") as fh:
+            fh.write("06013,5,42,74,2022,A,1,1,1\n")
+        self.assertIsNone(find_store(self.raw_path, self.store_dir))
+
+    def test_point_lookup_is_typed(self) -> None:
+        path = build_store(self.raw_path, self.store_dir, row_group_size=2)
+        rows = read_store(path, filters={"area_fips": ["06075"], "own_code": ["5"]})
+        self.assertEqual(sorted(rows["industry_code"]), ["42", "62"])
+        self.assertEqual(rows["year"].tolist(), [2022, 2022])
+        suppressed = rows[rows["industry_code"] == "62"].iloc[0]
+        self.assertTrue(pd.isna(suppressed["annual_avg_emplvl"]))
+
+    def test_store_read_matches_csv_read(self) -> None:
+        from_csv = econ_bnchmrk_qcew.process_year(2022, self.raw_path, chunksize=2)
+        build_store(self.raw_path, self.store_dir, row_group_size=2)
+        normalized = read_qcew_filtered(
+            self.raw_path,
+            econ_bnchmrk_qcew.normalize_qcew_columns,
+            keep=econ_bnchmrk_qcew.private_row_filters(2022),
+            columns=econ_bnchmrk_qcew.PRIVATE_COLUMNS,
+            store_dir=self.store_dir,
+        )
+        from_store = econ_bnchmrk_qcew.prepare_qcew_private(normalized, year=2022)
+        pd.testing.assert_frame_equal(
+            from_store.reset_index(drop=True), from_csv.reset_index(drop=True)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from scripts.abs import rdm_abs_naics3_cbsa as cbsa
+
+ABS = pd.DataFrame(
+    {
+        "state": ["6", "06", "06", "1", "1", "1", "12"],
+        "county": ["75", "075", "75", "1", "1", "1", "86"],
+        "NAICS2022": ["00", "311", "541", "00", "111", "111", "00"],
+        "FIRMPDEMP": ["10", "4", "5", "3", "1", "", "9"],
+        "EMP": ["100", "60", "40", "30", "10", "20", "5"],
+        "PAYANN": ["9", "5", "4", "3", "1", "2", "1"],
+        "RCPPDEMP": ["20", "9", "11", "6", "2", "4", "1"],
+    }
+)
+XWALK = pd.DataFrame(
+    {
+        "state_fips": ["06", "01"],
+        "county_fips": ["075", "001"],
+        "cbsa_code": ["41860", "10000"],
+        "cbsa_title": ["San Francisco", "Autauga"],
+    }
+)
+
+
+class TestAbsRollup(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "abs.csv"
+        ABS.to_csv(self.path, index=False)
+        self.xwalk = cbsa.normalize_crosswalk(XWALK.copy())
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_streamed_chunks_match_whole_frame(self) -> None:
+        whole = cbsa.normalize_abs_columns(pd.read_csv(self.path, dtype=str))
+        rollup = cbsa.AbsRollup(self.xwalk)
+        for chunk in cbsa.iter_abs_chunks(self.path, chunksize=2):
+            rollup.update(chunk)
+        pd.testing.assert_frame_equal(rollup.cbsa_naics3(), cbsa.aggregate_to_cbsa(whole, self.xwalk))
+        pd.testing.assert_frame_equal(rollup.recon_report(), cbsa.reconcile_county_totals(whole))
+
+    def test_rollup_values(self) -> None:
+        rollup = cbsa.AbsRollup(self.xwalk)
+        for chunk in cbsa.iter_abs_chunks(self.path, chunksize=3):
+            rollup.update(chunk)
+        out = rollup.cbsa_naics3()
+        self.assertEqual(out["cbsa_code"].tolist(), ["10000", "41860", "41860"])
+        self.assertEqual(out["naics3"].tolist(), ["111", "311", "541"])
+        self.assertEqual(out["EMP"].tolist(), [30.0, 60.0, 40.0])
+        self.assertEqual(out["FIRMPDEMP"].tolist(), [1.0, 4.0, 5.0])
+        self.assertEqual(out["cbsa_tot_payroll"].tolist(), [3000.0, 9000.0, 9000.0])
+
+        recon = rollup.recon_report().set_index(["state", "county"])
+        # 12086 is outside the crosswalk but still reconciled at county level.
+        self.assertEqual(recon.index.tolist(), [("01", "001"), ("06", "075"), ("12", "086")])
+        self.assertTrue(recon.loc[("06", "075"), "recon_ok"])
+        self.assertFalse(recon.loc[("01", "001"), "recon_ok"])
+
+
+if __name__ == "__main__":
+    unittest.main()
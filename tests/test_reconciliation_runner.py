@@ -0,0 +1,66 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+from qa import reconciliation
+
+
+def _frame(system: str) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "year_num": [2022],
+            "state_cnty_fips_cd": ["06075"],
+            "naics2_sector_cd": ["42"],
+            "pass_all": [True],
+            "system_marker": [system],
+        }
+    )
+
+
+class TestConcurrentSystems(unittest.TestCase):
+    def test_systems_overlap_and_summary_follows_both(self) -> None:
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fake_run(system):
+            def run(config):
+                # Both systems must be in flight at once for the barrier to open.
+                barrier.wait()
+                time.sleep(0.05)
+                return _frame(system)
+
+            return run
+
+        with tempfile.TemporaryDirectory() as tmp, patch.object(
+            reconciliation, "run_abs", side_effect=fake_run("abs")
+        ), patch.object(reconciliation, "run_qcew", side_effect=fake_run("qcew")):
+            reconciliation.main(["--outdir", tmp, "--concurrent", "true"])
+            combined = pd.read_csv(next(Path(tmp).glob("reconciliation_all_*.csv")))
+            summary = next(Path(tmp).glob("reconciliation_summary_*.md")).read_text()
+
+        self.assertEqual(combined["source_system"].tolist(), ["abs", "qcew"])
+        self.assertIn("ABS pass_all: 1/1", summary)
+        self.assertIn("QCEW pass_all: 1/1", summary)
+
+    def test_failure_is_raised_after_other_system_finishes(self) -> None:
+        finished = []
+
+        def slow_ok():
+            time.sleep(0.05)
+            finished.append("qcew")
+            return _frame("qcew")
+
+        def broken():
+            raise RuntimeError("census down")
+
+        with self.assertRaisesRegex(RuntimeError, "census down"):
+            reconciliation.run_systems({"abs": broken, "qcew": slow_ok}, concurrent=True)
+        self.assertEqual(finished, ["qcew"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from scripts.common.keys import KEY_COLUMNS as KEYS
+from scripts.common.table_io import write_table
+from scripts.common.warehouse import LocalWarehouse
+from scripts.integration import run_load_sql_local as runner
+
+HAS_DUCKDB = importlib.util.find_spec("duckdb") is not None
+
+
+class TestTranslateBigQuery(unittest.TestCase):
+    def test_extracts_destination_and_rewrites_dialect(self) -> None:
+        script = """bq query \\
+  --use_legacy_sql=false \\
+  --destination_table=proj:ds.out_tbl \\
+  '
+SELECT s.state_nm, SAFE_DIVIDE(a.x, a.y) AS ratio
+FROM `proj.ds.src` AS a
+JOIN UNNEST([STRUCT("AL" AS state_cd, "Alabama" AS state_nm), STRUCT("HI", "Hawai\\"i")]) AS s
+  ON a.st = s.state_cd
+WHERE REGEXP_CONTAINS(a.fips, r"^\\d{5}$") AND a.nm != "O'Brien";
+'
+"""
+        table, sql = runner.extract_query(script)
+        self.assertEqual(table, "out_tbl")
+        translated = runner.translate_bigquery(sql)
+        self.assertIn('FROM "src" AS a', translated)
+        self.assertIn(
+            "(VALUES ('AL', 'Alabama'), ('HI', 'Hawai\"i')) AS _struct_array_1(state_cd, state_nm) AS s",
+            translated,
+        )
+        self.assertIn(r"REGEXP_CONTAINS(a.fips, '^\d{5}$')", translated)
+        self.assertIn("a.nm != 'O''Brien'", translated)
+        self.assertFalse(translated.rstrip().endswith(";"))
+
+        create = "bq query '\nCREATE OR REPLACE TABLE `p.d.built` AS\nSELECT 1 AS x;\n'"
+        self.assertEqual(runner.extract_query(create), ("built", "SELECT 1 AS x"))
+
+
+@unittest.skipUnless(HAS_DUCKDB, "duckdb is not installed")
+class TestBuildLayer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        abs_df = pd.DataFrame(
+            {
+                "year_num": [2022, 2022, 2022, 2022, 2023],
+                "state_cnty_fips_cd": ["06075", "06085", "06075", "06000", "06075"],
+                "naics2_sector_cd": ["42", "42", "00", "42", "42"],
+                "cnty_nm": ["San Francisco", "Santa Clara", "San Francisco", "California", "San Francisco"],
+                "geo_id": ["g1", "g2", "g3", "g4", "g5"],
+                "naics2_sector_desc": ["Wholesale", "Wholesale", "Total", "Wholesale", "Wholesale"],
+                "ind_level_num": [2, 2, 2, 2, 2],
+                "abs_firm_num": [10, 0, 40, 10, 12],
+                "abs_emp_num": [100, 0, 400, 100, 120],
+                "abs_payroll_usd_amt": [1000.0, 0.0, 4000.0, 1000.0, 1300.0],
+                "abs_rcpt_usd_amt": [5000.0, 0.0, 9000.0, 5000.0, 6000.0],
+                "abs_rcpt_per_emp_usd_amt": [50.0, None, 22.5, 50.0, 50.0],
+                "abs_rcpt_per_firm_usd_amt": [500.0, None, 225.0, 500.0, 500.0],
+            }
+        )
+        qcew_df = pd.DataFrame(
+            {
+                "year_num": [2022, 2022, 2023],
+                "naics2_sector_cd": ["42", "42", "42"],
+                "state_cnty_fips_cd": ["06075", "06001", "06075"],
+                "state_fips_cd": ["06", "06", "06"],
+                "cnty_fips_cd": ["075", "001", "075"],
+                "own_cd": ["5", "5", "5"],
+                "qcew_ann_avg_emp_lvl_num": [90, 20, 110],
+                "qcew_ttl_ann_wage_usd_amt": [900.0, 200.0, 1210.0],
+                "qcew_avg_wkly_wage_usd_amt": [0.19, 0.19, 0.21],
+            }
+        )
+        ref_df = pd.DataFrame(
+            {
+                "state_cnty_fips_cd": ["06075", "06085", "06001", "06000"],
+                "state_cd": ["CA", "CA", "CA", "CA"],
+                "cnty_ansi_nm": ["x", "x", "x", "x"],
+                "cnty_nm": ["San Francisco County", "Santa Clara County", "Alameda County", "California"],
+                "population_num": [800000, 1900000, 1600000, 39000000],
+                "population_year": [2023, 2023, 2023, 2023],
+            }
+        )
+        naics_df = pd.DataFrame({"naics2_sector_cd": ["42"], "naics2_sector_desc": ["Wholesale Trade"]})
+        for name, frame in [
+            ("econ_bnchmrk_abs", abs_df),
+            ("econ_bnchmrk_qcew", qcew_df),
+            ("ref_state_cnty_uscb", ref_df),
+            ("ref_naics2_uscb", naics_df),
+        ]:
+            write_table(frame, self.root / f"{name}.csv", "csv")
+        self.warehouse = LocalWarehouse(self.root, tables={})
+        queries = runner.load_layer(runner.SQL_DIR_DEFAULT, runner.LAYER_SCRIPTS)
+        self.results = runner.build_layer(self.warehouse, queries)
+
+    def tearDown(self) -> None:
+        self.warehouse.close()
+        self.tmp.cleanup()
+
+    def test_layer_tables(self) -> None:
+        state = self.results["econ_bnchmrk_abs_qcew_state_ttl"].set_index(["year_num", "naics2_sector_cd"])
+        self.assertEqual(int(state.loc[(2022, "42"), "abs_firm_num"]), 20)
+        self.assertEqual(int(state.loc[(2022, "42"), "qcew_ann_avg_emp_lvl_num"]), 110)
+
+        indstr = self.results["econ_bnchmrk_abs_qcew_indstr_ttl"]
+        self.assertEqual(indstr["state_cnty_fips_cd"].tolist(), ["06075"])
+
+        rollup = self.results["econ_bnchmrk_abs_qcew_rollup"]
+        self.assertEqual(rollup["state_cnty_fips_cd"].tolist(), ["06000"])
+        self.assertEqual(rollup["state_nm"].tolist(), ["California"])
+
+        county = self.results["econ_bnchmrk_abs_qcew"].set_index(KEYS)
+        self.assertEqual(len(county), 4)
+        sf = county.loc[(2022, "06075", "42")]
+        self.assertEqual(sf["cnty_full_nm"], "San Francisco County, California")
+        self.assertEqual(sf["naics2_sector_desc"], "Wholesale Trade")
+        self.assertAlmostEqual(sf["qcew_wage_per_emp_usd_amt"], 10.0)
+        self.assertTrue(pd.isna(county.loc[(2022, "06085", "42"), "abs_wage_per_emp_usd_amt"]))
+        self.assertEqual(county.loc[(2023, "06075", "42"), "abs_firm_prev_year_num"], 10)
+        self.assertEqual(int(county.loc[(2022, "06001", "42"), "qcew_ann_avg_emp_lvl_num"]), 20)
+
+    def test_written_tables_follow_ddl_and_compare_to_merge(self) -> None:
+        county = self.results["econ_bnchmrk_abs_qcew"]
+        dest = write_table(county, self.root / "out" / "econ_bnchmrk_abs_qcew.csv", "csv", "econ_bnchmrk_abs_qcew")
+        self.assertTrue(dest.exists())
+
+        merge_df = county[KEYS + ["abs_firm_num", "qcew_ann_avg_emp_lvl_num", "cnty_nm"]].copy()
+        report = runner.compare_merge(county, merge_df).set_index("column")["mismatch_cnt"]
+        self.assertFalse(report.any())
+
+        merge_df.loc[0, "abs_firm_num"] = 999
+        merge_df = merge_df.iloc[:-1]
+        report = runner.compare_merge(county, merge_df).set_index("column")["mismatch_cnt"]
+        self.assertEqual(report["abs_firm_num"], 1)
+        self.assertEqual(report["_rows_sql_only"], 1)
+        self.assertEqual(report["cnty_nm"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
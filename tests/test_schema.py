@@ -0,0 +1,75 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from scripts.common.schema import cast_to_schema, load_schemas, parse_ddl, read_typed_csv
+
+DDL = """
+-- leading comment, with (parens), and a comma
+C_CREATE OR REPLACE TABLE `proj.dataset.sample_tbl` (
+  state_cnty_fips_cd STRING OPTIONS(description="County FIPS (5, zero-padded)"),
+  year_num INT64,   -- trailing comment
+  amt_usd NUMERIC(18, 2),
+  ratio FLOAT64
+);
+"""
+
+
+class TestSchema(unittest.TestCase):
+    def setUp(self) -> None:
+        self.schema = parse_ddl(DDL)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "sample.csv"
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_parse_handles_comments_options_and_precision(self) -> None:
+        self.assertEqual(self.schema.name, "sample_tbl")
+        self.assertEqual(
+            self.schema.bq_types(),
+            {
+                "state_cnty_fips_cd": "STRING",
+                "year_num": "INT64",
+                "amt_usd": "NUMERIC",
+                "ratio": "FLOAT64",
+            },
+        )
+        self.assertEqual(self.schema.columns[0].description, "County FIPS (5, zero-padded)")
+
+    def test_repo_ddls_compile(self) -> None:
+        schemas = load_schemas()
+        self.assertIn("econ_bnchmrk_abs_qcew", schemas)
+        dtypes = schemas["econ_bnchmrk_qcew"].pandas_dtypes()
+        self.assertEqual(dtypes["qcew_ann_avg_emp_lvl_num"], "Int64")
+        self.assertEqual(dtypes["state_cnty_fips_cd"], "str")
+
+    def test_typed_read_fast_path(self) -> None:
+        self.path.write_text("state_cnty_fips_cd,year_num,amt_usd,ratio,extra\n06075,2022,1.5,,x\n01001,,2,0.25,y\n")
+        df = read_typed_csv(self.path, self.schema)
+        self.assertEqual(df["state_cnty_fips_cd"].tolist(), ["06075", "01001"])
+        self.assertEqual(str(df["year_num"].dtype), "Int64")
+        self.assertTrue(pd.isna(df["year_num"].iloc[1]))
+        self.assertEqual(df["amt_usd"].dtype, "float64")
+        self.assertEqual(df.attrs["cast_failures"], {})
+
+    def test_bad_values_are_coerced_and_counted(self) -> None:
+        self.path.write_text("state_cnty_fips_cd,year_num,amt_usd\n06075,2022,1.5\n01001,20x2,(D)\n56045,2022.5,3\n")
+        df = read_typed_csv(self.path, self.schema)
+        self.assertEqual(df.attrs["cast_failures"], {"year_num": 2, "amt_usd": 1})
+        self.assertEqual(df["year_num"].tolist()[0], 2022)
+        with self.assertRaises(ValueError):
+            read_typed_csv(self.path, self.schema, on_error="raise")
+
+    def test_cast_to_schema_writes_integers_and_rejects_lossy(self) -> None:
+        frame = pd.DataFrame({"state_cnty_fips_cd": ["06075"], "year_num": [2022.0], "ratio": [0.5]})
+        typed = cast_to_schema(frame, self.schema)
+        self.assertEqual(typed.to_csv(index=False).splitlines()[1], "06075,2022,0.5")
+        with self.assertRaises(ValueError):
+            cast_to_schema(frame.assign(year_num=[2022.5]), self.schema)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from scripts.common.table_io import iter_table, read_columns, read_table, write_table
+
+
+class TestTableIO(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.frame = pd.DataFrame(
+            {
+                "year_num": [2022, 2022, 2023],
+                "naics2_sector_cd": ["31-33", "42", "42"],
+                "state_cnty_fips_cd": ["06075", "01001", "06075"],
+                "state_fips_cd": ["06", "01", "06"],
+                "cnty_fips_cd": ["075", "001", "075"],
+                "own_cd": ["5", "5", "5"],
+                "qcew_ann_avg_emp_lvl_num": [150.0, None, 7.0],
+                "qcew_ttl_ann_wage_usd_amt": [1_000.5, 20.0, None],
+                "qcew_avg_wkly_wage_usd_amt": [0.13, None, 2.5],
+            }
+        )
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_parquet_round_trip_matches_csv(self) -> None:
+        csv_path = write_table(self.frame, self.root / "csv" / "qcew.csv", "csv", table="econ_bnchmrk_qcew")
+        pq_path = write_table(self.frame, self.root / "pq" / "qcew.csv", "parquet", table="econ_bnchmrk_qcew")
+        self.assertEqual(pq_path.name, "qcew.parquet")
+        self.assertEqual(
+            sorted(p.name for p in pq_path.iterdir()), ["year_num=2022", "year_num=2023"]
+        )
+        from_csv = read_table(csv_path, "econ_bnchmrk_qcew")
+        # The CSV path falls back to the Parquet sibling when only that exists.
+        from_parquet = read_table(self.root / "pq" / "qcew.csv", "econ_bnchmrk_qcew")
+        pd.testing.assert_frame_equal(from_parquet, from_csv)
+        self.assertEqual(read_columns(pq_path), list(self.frame.columns))
+
+    def test_rewrite_replaces_partitions(self) -> None:
+        path = self.root / "qcew.csv"
+        write_table(self.frame, path, "parquet")
+        pq_path = write_table(self.frame[self.frame["year_num"] == 2023], path, "parquet")
+        self.assertEqual([p.name for p in pq_path.iterdir()], ["year_num=2023"])
+        self.assertEqual(len(read_table(pq_path)), 1)
+
+    def test_unpartitioned_frame_writes_single_file(self) -> None:
+        frame = self.frame.drop(columns=["year_num"])
+        pq_path = write_table(frame, self.root / "tri.csv", "parquet")
+        self.assertTrue(pq_path.is_file())
+        pd.testing.assert_frame_equal(read_table(pq_path), frame)
+
+    def test_iter_table_chunks_match_full_read(self) -> None:
+        frame = self.frame.astype({"qcew_ann_avg_emp_lvl_num": "Int64"})
+        for fmt in ("csv", "parquet"):
+            path = write_table(frame, self.root / fmt / "qcew.csv", fmt)
+            # CSV keyword arguments (here dtype) are ignored for Parquet.
+            chunks = list(iter_table(path, chunksize=1, dtype=str))
+            self.assertEqual(len(chunks), 3)
+            combined = pd.concat(chunks, ignore_index=True)
+            pd.testing.assert_frame_equal(combined, read_table(path, dtype=str))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import json
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from scripts.common.county_fips_index import load_county_fips_index
+from scripts.common.county_fuzzy import CountyNameMatcher
+from scripts.common.county_names import CountyNameMemo
+from scripts.epa import tri_epa_pipeline as tri
+
+HEADER = [
+    "1. YEAR",
+    "2. FACILITY NAME",
+    "3. FACILITY COUNTY",
+    "",
+    "4. FACILITY STATE",
+    "5. PRIMARY NAICS CODE",
+    "6. TOTAL ON-SITE RELEASES",
+    "7. TOTAL TRANSFERRED OFF SITE FOR DISPOSAL",
+    "8. COMMENT",
+]
+RECORDS = [
+    ["2022", "Acme", "Harris", "", "TX", "325110", "10.5", "1.25", "ok"],
+    ["2022", "Beta", " harris ", "", "tx", "325199", "4", "", "ok"],
+    ["2022", "Gamma", "Harris", "", "TX", "211120", "2", "3"],
+    ["2022", "Delta", "Kern", "", "CA", "", "7", "0", "no naics"],
+    ["2022", "Echo", "Kern", "", "CA", "221112", "n/a", "5", "glued", "overflow"],
+    ["2022", "Fox", "Cook", "", "IL", "331110", "1.1", "2.2", "ok"],
+]
+
+
+SIMPLEMAPS = pd.DataFrame(
+    {
+        "county": ["Harris", "Kern", "Cook"],
+        "county_ascii": ["Harris", "Kern", "Cook"],
+        "county_full": ["Harris County", "Kern County", "Cook County"],
+        "state_id": ["TX", "CA", "IL"],
+        "county_fips": ["48201", "6029", "17031"],
+    }
+)
+
+
+def write_1a(path: Path, records: list = RECORDS) -> Path:
+    lines = ["", "\t".join(HEADER) + "\t"]
+    for i, record in enumerate(records):
+        lines.append("\t".join(record))
+        if i == 2:
+            lines.append("")
+    lines.append(f"Total output lines: {len(records)}")
+    path.write_text("\n".join(lines) + "\n", encoding="latin1")
+    return path
+
+
+class TestStreamingTri(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = write_1a(Path(self.tmp.name) / "US_1a_2022.txt")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_chunks_project_and_pad_like_whole_read(self) -> None:
+        whole = tri.read_tri_1a(self.path)
+        self.assertEqual(len(whole), len(RECORDS))
+        self.assertEqual(whole["8. COMMENT"].tolist()[4], "glued\toverflow")
+
+        keywords = {"county": "FACILITY COUNTY", "comment": "COMMENT"}
+        chunks = list(tri.iter_tri_1a(self.path, keywords=keywords, chunksize=4))
+        self.assertEqual([len(c) for c in chunks], [4, 2])
+        pd.testing.assert_frame_equal(
+            pd.concat(chunks, ignore_index=True), whole[["3. FACILITY COUNTY", "8. COMMENT"]]
+        )
+
+    def test_streamed_aggregate_matches_whole_file(self) -> None:
+        expected = tri.derive_tri_aggregates(tri.read_tri_1a(self.path))
+        for chunksize in (1, 2, 100):
+            streamed = tri.aggregate_tri_1a(self.path, chunksize=chunksize)
+            pd.testing.assert_frame_equal(streamed, expected)
+        harris = expected.set_index(["state_cd", "cnty_nm", "naics2_sector_cd"]).loc[("TX", "HARRIS", "32")]
+        self.assertAlmostEqual(harris["tri_ttl_rls_lbs_amt"], 15.75)
+        self.assertNotIn("", expected["naics2_sector_cd"].tolist())
+
+    def test_missing_column_is_reported(self) -> None:
+        with self.assertRaisesRegex(ValueError, "missing required columns"):
+            next(tri.iter_tri_1a(self.path, keywords={"lat": "LATITUDE"}))
+
+
+class TestTriBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        typo = ["2021", "Kilo", "Kernn", "", "CA", "221112", "1", "1"]
+        write_1a(self.root / "US_1a_2021.txt", RECORDS[:3] + [typo])
+        write_1a(self.root / "US_1a_2022.txt")
+        SIMPLEMAPS.to_csv(self.root / "uscounties.csv", index=False)
+        self.index = load_county_fips_index(self.root / "uscounties.csv", self.root / "index")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_loaded_index_pickles_as_its_directory(self) -> None:
+        restored = pickle.loads(pickle.dumps(self.index))
+        self.assertEqual(restored.path, self.index.path)
+        self.assertEqual(restored.fips.filename, self.index.fips.filename)
+
+    def test_batch_stacks_years_like_single_runs(self) -> None:
+        matcher = CountyNameMatcher.from_index(self.index, threshold=0.7)
+        memo = CountyNameMemo(self.root / "memo" / "county_names.json")
+        combined = tri.run_batch(
+            [2022, 2021],
+            str(self.root / "US_1a_{year}.txt"),
+            str(self.root / "out" / "tri_epa_{year}.csv"),
+            str(self.root / "out" / "tri_epa_multiyear.csv"),
+            self.index,
+            matcher,
+            chunksize=2,
+            workers=2,
+            fuzzy_audit_csv=str(self.root / "out" / "fuzzy.csv"),
+            memo=memo,
+        )
+        self.assertEqual(combined.columns[0], "year_num")
+        # Names normalized in the worker processes reach the parent's memo.
+        self.assertEqual(memo.save(), memo.path)
+        names = json.loads(memo.path.read_text())["names"]
+        self.assertEqual(names, {"COOK": "cook", "HARRIS": "harris", "KERN": "kern", "KERNN": "kernn"})
+        self.assertEqual(combined["year_num"].drop_duplicates().tolist(), [2022, 2021])
+
+        single = tri.enrich_with_fips(
+            tri.aggregate_tri_1a(self.root / "US_1a_2022.txt"), self.index, matcher
+        )
+        dtypes = {"state_cnty_fips_cd": str, "naics2_sector_cd": str}
+        per_year = pd.read_csv(self.root / "out" / "tri_epa_2022.csv", dtype=dtypes)
+        pd.testing.assert_frame_equal(per_year.drop(columns="year_num"), single, check_dtype=False)
+
+        stacked = pd.read_csv(self.root / "out" / "tri_epa_multiyear.csv", dtype=dtypes)
+        self.assertEqual(len(stacked), len(combined))
+        self.assertIn("06029", stacked.loc[stacked["year_num"] == 2021, "state_cnty_fips_cd"].tolist())
+        audit = pd.read_csv(self.root / "out" / "fuzzy.csv")
+        self.assertEqual(audit[["year_num", "cnty_nm"]].values.tolist(), [[2021, "KERNN"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from qa import abs_reconciliation, national_totals_snapshot
+from scripts.common import warehouse
+from scripts.common.table_io import write_table
+
+HAS_DUCKDB = importlib.util.find_spec("duckdb") is not None
+
+QUERY = """
+    SELECT year_num, state_cnty_fips_cd, abs_firm_num AS firms
+    FROM `rdm-datalab-portfolio.portfolio_data.econ_bnchmrk_abs_qcew`
+    WHERE year_num IN UNNEST(@years)
+      AND state_cnty_fips_cd IN UNNEST(@counties)
+      AND abs_firm_num >= @min_firms
+    ORDER BY year_num, state_cnty_fips_cd
+"""
+
+
+class TestTranslateSql(unittest.TestCase):
+    def test_inlines_arrays_and_binds_scalars(self) -> None:
+        sql, scalars = warehouse.translate_sql(
+            QUERY, {"years": [2022, 2023], "counties": ["06075", "O'Brien"], "min_firms": 2}
+        )
+        self.assertIn("year_num IN (2022, 2023)", sql)
+        self.assertIn("state_cnty_fips_cd IN ('06075', 'O''Brien')", sql)
+        self.assertIn('FROM "econ_bnchmrk_abs_qcew"', sql)
+        self.assertIn("abs_firm_num >= $min_firms", sql)
+        self.assertEqual(scalars, {"min_firms": 2})
+        with self.assertRaises(KeyError):
+            warehouse.translate_sql(QUERY, {"years": [2022]})
+
+
+@unittest.skipUnless(HAS_DUCKDB, "duckdb is not installed")
+class TestLocalWarehouse(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.frame = pd.DataFrame(
+            {
+                "state_cnty_fips_cd": ["06075", "06075", "06085", "01001"],
+                "naics2_sector_cd": ["42", "62", "42", "42"],
+                "year_num": [2022, 2023, 2022, 2022],
+                "abs_firm_num": [10, 3, 1, 7],
+                "abs_emp_num": [100, 30, 5, 70],
+                "abs_payroll_usd_amt": [1000.0, 300.0, 50.0, 700.0],
+                "abs_rcpt_usd_amt": [5000.0, 900.0, 80.0, 1200.0],
+                "qcew_ann_avg_emp_lvl_num": [90, 31, None, 65],
+                "qcew_ttl_ann_wage_usd_amt": [900.0, 310.0, None, 650.0],
+            }
+        )
+
+    def tearDown(self) -> None:
+        warehouse.configure_warehouse("bigquery")
+        self.tmp.cleanup()
+
+    def test_csv_and_partitioned_parquet_agree(self) -> None:
+        write_table(self.frame, self.root / "csv" / "econ_bnchmrk_abs_qcew.csv", "csv")
+        write_table(self.frame, self.root / "pq" / "econ_bnchmrk_abs_qcew.csv", "parquet")
+        params = {"years": [2022], "counties": ["06075", "06085"], "min_firms": 2}
+        from_csv = warehouse.LocalWarehouse(self.root / "csv").query(QUERY, params)
+        from_parquet = warehouse.LocalWarehouse(self.root / "pq").query(QUERY, params)
+        self.assertEqual(from_csv.to_dict("records"), [{"year_num": 2022, "state_cnty_fips_cd": "06075", "firms": 10}])
+        pd.testing.assert_frame_equal(from_parquet, from_csv, check_dtype=False)
+
+    def test_qa_fetchers_run_locally(self) -> None:
+        write_table(self.frame, self.root / "econ_bnchmrk_abs_qcew.csv", "parquet")
+        warehouse.configure_warehouse("local", str(self.root))
+        rdm = abs_reconciliation.fetch_rdm_abs([2022], ["06075", "06085"], ["42"])
+        self.assertEqual(sorted(rdm["state_cnty_fips_cd"]), ["06075", "06085"])
+        self.assertEqual(list(rdm.columns)[-1], "rdm_abs_rcpt_usd_amt")
+
+        totals = national_totals_snapshot.fetch_totals([2022, 2023]).set_index("year_num")
+        self.assertEqual(int(totals.loc[2022, "row_cnt"]), 3)
+        self.assertEqual(int(totals.loc[2022, "county_cnt"]), 3)
+        self.assertEqual(float(totals.loc[2022, "abs_firms_natl"]), 18)
+        self.assertEqual(float(totals.loc[2022, "qcew_emp_natl"]), 155)
+
+    def test_table_path_prefers_first_existing_candidate(self) -> None:
+        built = self.root / "warehouse" / "econ_bnchmrk_abs_qcew.csv"
+        merged = self.root / "integration" / "econ_bnchmrk_abs_qcew.csv"
+        local = warehouse.LocalWarehouse(tables={"econ_bnchmrk_abs_qcew": (built, merged)})
+        write_table(self.frame, merged, "csv")
+        self.assertEqual(local.table_path("econ_bnchmrk_abs_qcew"), (merged, "csv"))
+        write_table(self.frame, built, "parquet")
+        self.assertEqual(local.table_path("econ_bnchmrk_abs_qcew"), (built.with_suffix(".parquet"), "parquet"))
+        self.assertEqual(
+            warehouse.LocalWarehouse().tables["econ_bnchmrk_abs_qcew"][0],
+            Path("data_clean/warehouse/econ_bnchmrk_abs_qcew.csv"),
+        )
+
+    def test_materialized_table_skips_export_lookup(self) -> None:
+        local = warehouse.LocalWarehouse(self.root, tables={})
+        con = local.connection()
+        con.register("frame", self.frame)
+        con.execute('CREATE TABLE "econ_bnchmrk_abs_qcew" AS SELECT * FROM frame')
+        local.mark_materialized("econ_bnchmrk_abs_qcew")
+        rows = local.query(QUERY, {"years": [2022], "counties": ["01001"], "min_firms": 0})
+        self.assertEqual(rows["firms"].tolist(), [7])
+
+    def test_missing_export_names_table(self) -> None:
+        with self.assertRaisesRegex(FileNotFoundError, "econ_bnchmrk_abs_qcew"):
+            warehouse.LocalWarehouse(self.root, tables={}).query(QUERY, {"years": [], "counties": [], "min_firms": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()